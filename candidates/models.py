@@ -1,4 +1,4 @@
-from django.db import models
+from django.db import models, transaction
 from authapp.models import CustomUser
 from jobs.models import Job, Domain
 from resumes.models import Resume
@@ -39,6 +39,15 @@ class CandidateDraft(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    def save(self, *args, **kwargs):
+        from file_management.blob_store import attach_blob
+        from file_management.models import StoredBlob
+
+        # Identical resume uploads share one content-addressed file
+        with transaction.atomic():
+            attach_blob(self.resume_file, StoredBlob.Kind.RESUME)
+            super().save(*args, **kwargs)
+
     def __str__(self):
         return f"Draft {self.id} - {self.domain}/{self.role} ({self.status})"
 
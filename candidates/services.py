@@ -0,0 +1,177 @@
+"""
+Batch candidate creation for the bulk candidate flow.
+
+All candidate drafts of a batch are validated up front, deduplicated by email
+with a single query and inserted with ``bulk_create`` inside one transaction,
+so the cost of a batch is a constant number of queries instead of several
+queries, signals and notifications per row.
+"""
+from django.core.exceptions import ValidationError
+from django.core.validators import validate_email
+from django.db import transaction
+from django.db.models.functions import Lower
+
+from candidates.models import Candidate
+from resumes.models import Resume
+
+# Rows per INSERT / UPDATE statement; keeps SQLite under its variable limit
+BULK_BATCH_SIZE = 200
+
+MATCH_SCORE_FIELDS = [
+    "match_percentage",
+    "skill_match",
+    "experience_match",
+    "education_match",
+    "relevance_score",
+]
+
+
+def _normalize_email(email):
+    return (email or "").strip().lower()
+
+
+def _clean_score(value):
+    """Match scores are stored as 0-100 floats; anything unparsable becomes None."""
+    if value in (None, ""):
+        return None
+    try:
+        return round(min(100.0, max(0.0, float(value))), 1)
+    except (TypeError, ValueError):
+        return None
+
+
+def _clean_experience(value):
+    if value in (None, ""):
+        return 0
+    try:
+        return max(0, int(float(value)))
+    except (TypeError, ValueError):
+        raise ValidationError("work_experience must be a number")
+
+
+def validate_candidate_drafts(candidates_data):
+    """
+    Validate every draft before touching the database.
+
+    Returns ``(valid, errors)`` where ``valid`` is a list of
+    ``(index, filename, cleaned)`` tuples and ``errors`` maps index to message.
+    """
+    valid = []
+    errors = {}
+    seen_emails = set()
+
+    for index, candidate_data in enumerate(candidates_data):
+        filename = candidate_data.get("filename", "unknown")
+        edited_data = candidate_data.get("edited_data") or {}
+        try:
+            name = (edited_data.get("name") or "").strip()
+            if not name:
+                raise ValidationError("Name is required")
+
+            email = _normalize_email(edited_data.get("email"))
+            if email:
+                validate_email(email)
+                if email in seen_emails:
+                    raise ValidationError(f"Duplicate email {email} in this batch")
+                seen_emails.add(email)
+
+            cleaned = {
+                "full_name": name[:100],
+                "email": email or None,
+                "phone": (edited_data.get("phone") or "")[:20],
+                "work_experience": _clean_experience(edited_data.get("work_experience")),
+                "domain": edited_data.get("domain") or "",
+                "resume_analysis": edited_data.get("resume_analysis") or {},
+                "scores": {field: edited_data.get(field) for field in MATCH_SCORE_FIELDS},
+            }
+            valid.append((index, filename, cleaned))
+        except ValidationError as e:
+            errors[index] = "; ".join(e.messages)
+
+    return valid, errors
+
+
+def find_existing_emails(emails, job):
+    """Emails (lowercased) that already have a candidate for this job - one query."""
+    if not emails:
+        return set()
+    return set(
+        Candidate.objects.annotate(email_lower=Lower("email"))
+        .filter(job=job, email_lower__in=list(emails))
+        .values_list("email_lower", flat=True)
+    )
+
+
+def bulk_create_candidates(candidates_data, job, recruiter, domain_name, poc_email=""):
+    """
+    Create candidates (and their placeholder resumes) for a whole batch.
+
+    Returns ``(results, created)``: ``results`` has one entry per input draft in
+    input order, ``created`` is the list of saved Candidate instances.
+    """
+    valid, errors = validate_candidate_drafts(candidates_data)
+
+    existing = find_existing_emails(
+        {cleaned["email"] for _, _, cleaned in valid if cleaned["email"]}, job
+    )
+    to_create = []
+    for index, filename, cleaned in valid:
+        if cleaned["email"] and cleaned["email"] in existing:
+            errors[index] = f"Candidate with email {cleaned['email']} already exists for this job"
+        else:
+            to_create.append((index, filename, cleaned))
+
+    created = []
+    if to_create:
+        with transaction.atomic():
+            # Resume has a client-side UUID pk, so ids are known before insert
+            resumes = [
+                Resume(user=recruiter, parsed_text=f"Resume for {cleaned['full_name']}")
+                for _, _, cleaned in to_create
+            ]
+            Resume.objects.bulk_create(resumes, batch_size=BULK_BATCH_SIZE)
+
+            created = Candidate.objects.bulk_create(
+                [
+                    Candidate(
+                        full_name=cleaned["full_name"],
+                        email=cleaned["email"],
+                        phone=cleaned["phone"],
+                        work_experience=cleaned["work_experience"],
+                        job=job,
+                        recruiter=recruiter,
+                        resume=resume,
+                        domain=cleaned["domain"] or domain_name,
+                        poc_email=poc_email or None,
+                        resume_analysis=cleaned["resume_analysis"],
+                    )
+                    for (_, _, cleaned), resume in zip(to_create, resumes)
+                ],
+                batch_size=BULK_BATCH_SIZE,
+            )
+
+            # Derived fields are written in one pass once every row exists
+            for candidate, (_, _, cleaned) in zip(created, to_create):
+                for field in MATCH_SCORE_FIELDS:
+                    setattr(candidate, field, _clean_score(cleaned["scores"][field]))
+                candidate.status = Candidate.Status.NEW
+            Candidate.objects.bulk_update(
+                created, MATCH_SCORE_FIELDS + ["status"], batch_size=BULK_BATCH_SIZE
+            )
+
+    results = [None] * len(candidates_data)
+    for candidate, (index, filename, _) in zip(created, to_create):
+        results[index] = {
+            "success": True,
+            "filename": filename,
+            "candidate_id": candidate.id,
+            "resume_id": candidate.resume_id,
+            "candidate_name": candidate.full_name,
+        }
+    for index, message in errors.items():
+        results[index] = {
+            "success": False,
+            "filename": candidates_data[index].get("filename", "unknown"),
+            "error": message,
+        }
+    return results, created
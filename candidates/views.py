@@ -21,6 +21,10 @@ from jobs.models import Job, Domain
 from utils.hierarchy_permissions import DataIsolationMixin, HierarchyPermission
 from utils.logger import ActionLogger
 from resumes.utils import extract_resume_fields, calculate_resume_job_match, analyze_resume_comprehensive
+from utils.semantic_matcher import semantic_matcher
+from notifications.services import NotificationService
+from .services import bulk_create_candidates
+from file_management.blob_store import blob_for_name, find_blob, set_cached_analysis, set_cached_text
 import PyPDF2
 import io
 
@@ -189,15 +193,20 @@ class DataExtractionView(APIView):
             role = serializer.validated_data['role']
             job_id = request.data.get('job_id', '')  # Get job_id for match calculation
             
-            # Extract text from PDF
-            try:
-                pdf_reader = PyPDF2.PdfReader(resume_file)
-                resume_text = ""
-                for page in pdf_reader.pages:
-                    resume_text += page.extract_text()
-            except Exception as e:
-                return Response({'error': f'Failed to extract text from PDF: {str(e)}'}, 
-                              status=status.HTTP_400_BAD_REQUEST)
+            # Identical uploads reuse the text and analysis of the stored copy
+            blob = find_blob(resume_file)
+            if blob is not None and blob.extracted_text:
+                resume_text = blob.extracted_text
+            else:
+                # Extract text from PDF
+                try:
+                    pdf_reader = PyPDF2.PdfReader(resume_file)
+                    resume_text = ""
+                    for page in pdf_reader.pages:
+                        resume_text += page.extract_text()
+                except Exception as e:
+                    return Response({'error': f'Failed to extract text from PDF: {str(e)}'}, 
+                                  status=status.HTTP_400_BAD_REQUEST)
             
             # Get job description for match calculation
             job_description = ""
@@ -210,7 +219,7 @@ class DataExtractionView(APIView):
                     job_description = ""
             
             # Extract fields from text using Gemini (including match scores and parameters)
-            extracted_data = extract_resume_fields(resume_text, job_description)
+            extracted_data = extract_resume_fields(resume_text, job_description, blob=blob)
             
             # Since extract_resume_fields now returns comprehensive data including match scores,
             # we don't need to call calculate_resume_job_match separately if it was successful.
@@ -242,6 +251,12 @@ class DataExtractionView(APIView):
                 extracted_data=extracted_data,
                 status=CandidateDraft.Status.EXTRACTED
             )
+            if blob is None:
+                # First time this file is seen - cache its text and analysis on the new blob
+                blob = blob_for_name(draft.resume_file.name)
+                set_cached_text(blob, resume_text)
+                if 'resume_analysis' in extracted_data:
+                    set_cached_analysis(blob, job_description, extracted_data)
             
             return Response({
                 'message': 'Resume uploaded and data extracted successfully',
@@ -384,7 +399,7 @@ class BulkCandidateCreationView(APIView):
     
     def _handle_extract_step(self, request):
         """Extract data from uploaded resume files"""
-        from resumes.models import extract_text
+        from resumes.models import Resume, extract_text
         from resumes.utils import extract_resume_fields, calculate_resume_job_match, analyze_resume_comprehensive
         from jobs.models import Job
         import PyPDF2
@@ -401,6 +416,7 @@ class BulkCandidateCreationView(APIView):
             }, status=status.HTTP_400_BAD_REQUEST)
         
         # Get job description for match calculation
+        job = None
         job_description = ""
         if job_id:
             try:
@@ -420,61 +436,58 @@ class BulkCandidateCreationView(APIView):
         successful_extractions = 0
         failed_extractions = 0
         
+        # Pass 1: parse every file so the semantic pre-filter can score the whole batch at once
+        parsed_resumes = []  # (resume_file, resume_text, error, blob)
         for resume_file in resume_files:
+            parsed_resumes.append((resume_file, *self._read_resume_text(resume_file)))
+        
+        # Pass 2: one embedding matmul decides which resumes get the Gemini deep analysis
+        readable = [i for i, (_, _, error, _) in enumerate(parsed_resumes) if not error]
+        # Re-uploaded files already have a Resume row whose embedding is stored
+        blob_names = [parsed_resumes[i][3].file.name for i in readable if parsed_resumes[i][3] is not None]
+        saved_resumes = {}
+        for resume in Resume.objects.filter(file__in=blob_names):
+            saved_resumes.setdefault(resume.file.name, resume)
+        prefilter = semantic_matcher.prefilter(
+            [parsed_resumes[i][1] for i in readable],
+            job_description,
+            job=job,
+            resumes=[
+                saved_resumes.get(parsed_resumes[i][3].file.name) if parsed_resumes[i][3] is not None else None
+                for i in readable
+            ],
+        )
+        semantic_scores = dict(zip(readable, prefilter['scores']))
+        deep_analysis = dict(zip(readable, prefilter['selected']))
+        
+        for index, (resume_file, resume_text, error, blob) in enumerate(parsed_resumes):
+            if error:
+                extracted_candidates.append({
+                    'filename': resume_file.name,
+                    'extracted_data': {},
+                    'error': error,
+                    'can_edit': False
+                })
+                failed_extractions += 1
+                continue
+            
             try:
-                # Extract text from file
-                resume_text = ""
-                
-                # Handle different file types
-                if resume_file.name.lower().endswith('.pdf'):
-                    try:
-                        # Read PDF file
-                        pdf_content = resume_file.read()
-                        pdf_reader = PyPDF2.PdfReader(io.BytesIO(pdf_content))
-                        for page in pdf_reader.pages:
-                            resume_text += page.extract_text()
-                        # Reset file pointer for potential future use
-                        resume_file.seek(0)
-                    except Exception as e:
-                        print(f"Error reading PDF {resume_file.name}: {e}")
-                        resume_text = ""
-                
-                elif resume_file.name.lower().endswith(('.docx', '.doc')):
-                    try:
-                        import docx
-                        doc = docx.Document(io.BytesIO(resume_file.read()))
-                        resume_text = "\n".join([p.text for p in doc.paragraphs])
-                        resume_file.seek(0)
-                    except Exception as e:
-                        print(f"Error reading DOCX {resume_file.name}: {e}")
-                        resume_text = ""
-                else:
-                    extracted_candidates.append({
-                        'filename': resume_file.name,
-                        'extracted_data': {},
-                        'error': 'Unsupported file type. Only PDF, DOCX, and DOC files are allowed.',
-                        'can_edit': False
-                    })
-                    failed_extractions += 1
-                    continue
-                
-                if not resume_text.strip():
-                    extracted_candidates.append({
-                        'filename': resume_file.name,
-                        'extracted_data': {},
-                        'error': 'Could not extract text from file',
-                        'can_edit': False
-                    })
-                    failed_extractions += 1
-                    continue
-                
                 # Extract fields from text using Gemini (including match scores and parameters)
-                extracted_data = extract_resume_fields(resume_text, job_description)
+                extracted_data = extract_resume_fields(
+                    resume_text, job_description, deep_analysis=deep_analysis[index], blob=blob
+                )
                 
                 # If comprehensive extraction was used, domain and role might be updated from resume
                 # otherwise keep the ones from request if they are present in extracted_data
                 
-                if 'resume_analysis' not in extracted_data and job_description and resume_text:
+                if not deep_analysis[index]:
+                    # Below the semantic threshold: report the embedding score instead of calling Gemini
+                    semantic_percentage = semantic_matcher.score_to_percentage(semantic_scores[index])
+                    extracted_data.update({
+                        'match_percentage': semantic_percentage,
+                        'relevance_score': semantic_percentage,
+                    })
+                elif 'resume_analysis' not in extracted_data and job_description and resume_text:
                     # Fallback for Match calculation if not done in comprehensive step
                     try:
                         match_scores = calculate_resume_job_match(resume_text, job_description)
@@ -491,6 +504,10 @@ class BulkCandidateCreationView(APIView):
                     except Exception as e:
                         print(f"⚠️ Gemini AI analysis failed for {resume_file.name}: {e}")
                 
+                if semantic_scores[index] is not None:
+                    extracted_data['semantic_score'] = semantic_scores[index]
+                    extracted_data['deep_analysis'] = deep_analysis[index]
+                
                 # Ensure additional fields exist
                 if 'current_company' not in extracted_data:
                     extracted_data.update({
@@ -527,20 +544,61 @@ class BulkCandidateCreationView(APIView):
             'summary': {
                 'total_files': len(resume_files),
                 'successful_extractions': successful_extractions,
-                'failed_extractions': failed_extractions
+                'failed_extractions': failed_extractions,
+                'semantic_prefilter': prefilter['stats'],
             },
             'next_step': 'review_and_edit'
         }, status=status.HTTP_200_OK)
     
+    def _read_resume_text(self, resume_file):
+        """
+        Return (text, error, blob) for an uploaded PDF/DOCX resume.
+        ``blob`` is the stored copy of an identical earlier upload, whose
+        extracted text is reused instead of parsing the file again.
+        """
+        resume_text = ""
+        error = None
+        blob = find_blob(resume_file)
+        if blob is not None and blob.extracted_text:
+            return blob.extracted_text, None, blob
+        try:
+            # Handle different file types
+            if resume_file.name.lower().endswith('.pdf'):
+                try:
+                    # Read PDF file
+                    pdf_content = resume_file.read()
+                    pdf_reader = PyPDF2.PdfReader(io.BytesIO(pdf_content))
+                    for page in pdf_reader.pages:
+                        resume_text += page.extract_text()
+                    # Reset file pointer for potential future use
+                    resume_file.seek(0)
+                except Exception as e:
+                    print(f"Error reading PDF {resume_file.name}: {e}")
+                    resume_text = ""
+            
+            elif resume_file.name.lower().endswith(('.docx', '.doc')):
+                try:
+                    import docx
+                    doc = docx.Document(io.BytesIO(resume_file.read()))
+                    resume_text = "\n".join([p.text for p in doc.paragraphs])
+                    resume_file.seek(0)
+                except Exception as e:
+                    print(f"Error reading DOCX {resume_file.name}: {e}")
+                    resume_text = ""
+            else:
+                error = 'Unsupported file type. Only PDF, DOCX, and DOC files are allowed.'
+            
+            if not error and not resume_text.strip():
+                error = 'Could not extract text from file'
+        except Exception as e:
+            print(f"Error processing {resume_file.name}: {e}")
+            error = f'Error processing file: {str(e)}'
+        set_cached_text(blob, resume_text)
+        return resume_text, error, blob
+    
     def _handle_submit_step(self, request):
         """Submit edited candidate data to create candidates"""
         from candidates.serializers import BulkCandidateSubmissionSerializer
-        from candidates.models import Candidate
-        from resumes.models import Resume
-        from jobs.models import Job, Domain
-        from django.contrib.auth import get_user_model
-        
-        User = get_user_model()
         
         serializer = BulkCandidateSubmissionSerializer(data=request.data)
         if not serializer.is_valid():
@@ -552,6 +610,31 @@ class BulkCandidateCreationView(APIView):
         poc_email = validated_data.get('poc_email', '')
         candidates_data = validated_data['candidates']
         
+        job, error_response = self._resolve_job(request, domain_name, role_name)
+        if error_response is not None:
+            return error_response
+        
+        results, successful_creations, failed_creations = self._create_batch(
+            request, candidates_data, job, domain_name, role_name, poc_email
+        )
+        
+        return Response({
+            'message': f'Bulk candidate creation completed: {successful_creations} successful, {failed_creations} failed',
+            'domain': domain_name,
+            'role': role_name,
+            'results': results,
+            'summary': {
+                'total_candidates': len(candidates_data),
+                'successful_creations': successful_creations,
+                'failed_creations': failed_creations
+            }
+        }, status=status.HTTP_201_CREATED)
+    
+    def _resolve_job(self, request, domain_name, role_name):
+        """
+        Find the job a bulk batch is created for and fill in missing required fields.
+        Returns (job, None) or (None, error_response).
+        """
         # Get or create domain
         domain, _ = Domain.objects.get_or_create(name=domain_name)
         
@@ -580,7 +663,7 @@ class BulkCandidateCreationView(APIView):
         
         # If no job exists, enforce explicit configuration before proceeding
         if not job:
-            return Response(
+            return None, Response(
                 {
                     "error": (
                         f"Job '{role_name}' (company '{company_name}') does not exist. "
@@ -592,7 +675,7 @@ class BulkCandidateCreationView(APIView):
 
         # Require the job to have coding_language defined (no automatic fallback)
         if not job.coding_language:
-            return Response(
+            return None, Response(
                 {
                     "error": (
                         f"Job '{job.job_title}' is missing a coding language. "
@@ -640,6 +723,18 @@ class BulkCandidateCreationView(APIView):
         else:
             job.save()
         
+        return job, None
+    
+    def _create_batch(self, request, candidates_data, job, domain_name, role_name, poc_email):
+        """
+        Create all candidates of a batch in one transaction and emit a single
+        aggregated log entry and notification.
+        Returns (results, successful_count, failed_count).
+        """
+        from django.contrib.auth import get_user_model
+        
+        User = get_user_model()
+        
         # Get recruiter (POC)
         recruiter = request.user
         if poc_email:
@@ -648,93 +743,75 @@ class BulkCandidateCreationView(APIView):
             except User.DoesNotExist:
                 pass
         
-        results = []
-        successful_creations = 0
-        failed_creations = 0
+        results, created = bulk_create_candidates(
+            candidates_data, job, recruiter, domain_name, poc_email
+        )
+        successful_creations = len(created)
+        failed_creations = len(results) - successful_creations
         
-        for candidate_data in candidates_data:
-            try:
-                filename = candidate_data['filename']
-                edited_data = candidate_data['edited_data']
-                
-                # Create candidate
-                # Only use fields that exist in the Candidate model
-                candidate = Candidate.objects.create(
-                    full_name=edited_data.get('name', ''),
-                    email=edited_data.get('email', ''),
-                    phone=edited_data.get('phone', ''),
-                    work_experience=edited_data.get('work_experience', 0) or 0,
-                    job=job,
-                    recruiter=recruiter,
-                    domain=edited_data.get('domain', domain_name),  # Use edited domain if available
-                    # Save Gemini AI analysis fields from edited data
-                    match_percentage=edited_data.get('match_percentage'),
-                    skill_match=edited_data.get('skill_match'),
-                    experience_match=edited_data.get('experience_match'),
-                    education_match=edited_data.get('education_match'),
-                    relevance_score=edited_data.get('relevance_score'),
-                    resume_analysis=edited_data.get('resume_analysis', {}),
-                    status=Candidate.Status.NEW,
-                )
-                
-                # Set poc_email if provided
-                if poc_email:
-                    candidate.poc_email = poc_email
-                    candidate.save(update_fields=['poc_email'])
-                
-                # Create resume (if file exists in memory, would need to be stored)
-                # For now, just create a placeholder resume
-                resume = Resume.objects.create(
-                    user=recruiter,
-                    parsed_text=f"Resume for {candidate.full_name}",
-                )
-                candidate.resume = resume
-                candidate.save()
-                
-                results.append({
-                    'success': True,
-                    'filename': filename,
-                    'candidate_id': candidate.id,
-                    'resume_id': resume.id,
-                    'candidate_name': candidate.full_name
-                })
-                successful_creations += 1
-                
-            except Exception as e:
-                print(f"Error creating candidate from {candidate_data.get('filename', 'unknown')}: {e}")
-                import traceback
-                traceback.print_exc()
-                results.append({
-                    'success': False,
-                    'filename': candidate_data.get('filename', 'unknown'),
-                    'error': str(e)
-                })
-                failed_creations += 1
+        ActionLogger.log_user_action(
+            user=request.user,
+            action="bulk_candidate_create",
+            details={
+                "job_id": job.id,
+                "total": len(results),
+                "created": successful_creations,
+                "failed": failed_creations,
+            },
+            status="SUCCESS" if successful_creations else "FAILED",
+        )
+        if successful_creations:
+            NotificationService.send_bulk_candidate_creation_notification(
+                recruiter, successful_creations, domain_name, role_name, failed_creations
+            )
+        
+        return results, successful_creations, failed_creations
+    
+    def _handle_direct_creation(self, request):
+        """Legacy direct bulk creation (not used by frontend): extract and create in one request"""
+        serializer = BulkCandidateCreationSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        
+        validated_data = serializer.validated_data
+        domain_name = validated_data['domain']
+        role_name = validated_data['role']
+        poc_email = validated_data.get('poc_email', '')
+        
+        job, error_response = self._resolve_job(request, domain_name, role_name)
+        if error_response is not None:
+            return error_response
+        
+        # Build the same draft payloads the submit step receives, then use the batch path
+        candidates_data = []
+        read_errors = []
+        for resume_file in validated_data['resume_files']:
+            resume_text, error, blob = self._read_resume_text(resume_file)
+            if error:
+                read_errors.append({'success': False, 'filename': resume_file.name, 'error': error})
+                continue
+            candidates_data.append({
+                'filename': resume_file.name,
+                'edited_data': extract_resume_fields(resume_text, job.job_description or None, blob=blob),
+            })
+        
+        results, successful_creations, failed_creations = [], 0, 0
+        if candidates_data:
+            results, successful_creations, failed_creations = self._create_batch(
+                request, candidates_data, job, domain_name, role_name, poc_email
+            )
+        results.extend(read_errors)
         
         return Response({
-            'message': f'Bulk candidate creation completed: {successful_creations} successful, {failed_creations} failed',
-            'domain': domain_name,
-            'role': role_name,
+            'message': 'Bulk candidate creation completed',
+            'candidates_created': [r for r in results if r['success']],
             'results': results,
             'summary': {
-                'total_candidates': len(candidates_data),
+                'total_candidates': len(results),
                 'successful_creations': successful_creations,
-                'failed_creations': failed_creations
+                'failed_creations': failed_creations + len(read_errors)
             }
         }, status=status.HTTP_201_CREATED)
-    
-    def _handle_direct_creation(self, request):
-        """Legacy direct bulk creation (not used by frontend)"""
-        serializer = BulkCandidateCreationSerializer(data=request.data)
-        if serializer.is_valid():
-            # Process bulk creation
-            candidates_created = []
-            # Implementation would go here
-            return Response({
-                'message': 'Bulk candidate creation completed',
-                'candidates_created': candidates_created
-            }, status=status.HTTP_201_CREATED)
-        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
 class PendingRequestsView(APIView):
@@ -7,3 +7,6 @@ class FileManagementConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "file_management"
     path = os.path.join(settings.BASE_DIR, "file_management")
+
+    def ready(self):
+        import file_management.signals
@@ -0,0 +1,179 @@
+"""
+Content-addressed storage for uploaded resumes and ID images.
+
+Uploads are hashed with SHA-256 in fixed-size chunks (never read into memory
+as a whole) and stored once under ``blobs/<kind>/<aa>/<digest><ext>``. Every
+model row using the file holds one reference; the file is deleted when the
+last reference is released.
+"""
+import hashlib
+import os
+
+from django.core.files.storage import default_storage
+from django.db import IntegrityError, transaction
+from django.db.models import F
+
+from .models import StoredBlob
+
+HASH_CHUNK_SIZE = 1024 * 1024  # 1 MB
+
+
+def hash_file(file_obj, chunk_size=HASH_CHUNK_SIZE):
+    """
+    Stream a file-like object through SHA-256 and rewind it.
+    Works with Django UploadedFile/File objects and plain binary files.
+    """
+    digest = hashlib.sha256()
+    if hasattr(file_obj, "seek"):
+        file_obj.seek(0)
+    if hasattr(file_obj, "chunks"):
+        for chunk in file_obj.chunks(chunk_size):
+            digest.update(chunk)
+    else:
+        for chunk in iter(lambda: file_obj.read(chunk_size), b""):
+            digest.update(chunk)
+    if hasattr(file_obj, "seek"):
+        file_obj.seek(0)
+    return digest.hexdigest()
+
+
+def file_digest(file_obj):
+    """
+    SHA-256 of an upload, hashed once: the digest is kept on the file object
+    so looking a file up and then storing it does not read it twice.
+    """
+    sha256 = getattr(file_obj, "_blob_sha256", None)
+    if sha256 is None:
+        sha256 = hash_file(file_obj)
+        try:
+            file_obj._blob_sha256 = sha256
+        except AttributeError:
+            pass
+    return sha256
+
+
+def blob_path(kind, sha256, original_name):
+    ext = os.path.splitext(original_name or "")[1].lower()
+    return f"blobs/{kind}/{sha256[:2]}/{sha256}{ext}"
+
+
+def find_blob(file_obj):
+    """Return the existing blob with the same content as ``file_obj``, if any."""
+    return StoredBlob.objects.filter(sha256=file_digest(file_obj)).first()
+
+
+def store_blob(file_obj, kind, name=None):
+    """
+    Store ``file_obj`` content-addressed and take a reference to it.
+
+    Returns ``(blob, created)``. When a blob with the same digest already
+    exists nothing is written to storage; only its reference count grows.
+    Call it inside the transaction that saves the referencing row, so the
+    reference is dropped again if that save fails.
+    """
+    sha256 = file_digest(file_obj)
+    name = name or getattr(file_obj, "name", "") or ""
+
+    # The row lock keeps a concurrent release from deleting the blob before it is referenced
+    with transaction.atomic():
+        blob = StoredBlob.objects.select_for_update().filter(sha256=sha256).first()
+        if blob is not None:
+            StoredBlob.objects.filter(pk=blob.pk).update(ref_count=F("ref_count") + 1)
+            blob.refresh_from_db(fields=["ref_count"])
+            return blob, False
+
+    path = blob_path(kind, sha256, name)
+    if not default_storage.exists(path):
+        # Storage streams file_obj.chunks() to disk
+        path = default_storage.save(path, file_obj)
+
+    try:
+        with transaction.atomic():
+            blob = StoredBlob.objects.create(
+                sha256=sha256,
+                kind=kind,
+                file=path,
+                size=getattr(file_obj, "size", None) or default_storage.size(path),
+                ref_count=1,
+            )
+        return blob, True
+    except IntegrityError:
+        # A concurrent upload of the same bytes won the race
+        with transaction.atomic():
+            blob = StoredBlob.objects.select_for_update().get(sha256=sha256)
+            StoredBlob.objects.filter(pk=blob.pk).update(ref_count=F("ref_count") + 1)
+            blob.refresh_from_db(fields=["ref_count"])
+        return blob, False
+
+
+def attach_blob(field_file, kind):
+    """
+    Route a freshly assigned (uncommitted) FieldFile through the blob store.
+
+    The field is pointed at the shared blob file and marked committed so the
+    model's FileField does not write a second copy on save. Returns the blob,
+    or None when there is no new upload on the field. Like ``store_blob``, call
+    it in the same transaction as the owner's save.
+    """
+    if not field_file or getattr(field_file, "_committed", True):
+        return None
+    blob, _ = store_blob(field_file.file, kind, field_file.name)
+    field_file.name = blob.file.name
+    field_file._committed = True
+    return blob
+
+
+def blob_for_name(file_name):
+    if not file_name or not file_name.startswith("blobs/"):
+        return None
+    return StoredBlob.objects.filter(file=file_name).first()
+
+
+def release_blob_for_name(file_name):
+    """
+    Drop one reference to the blob stored at ``file_name`` (a FileField name).
+    The file and row are deleted when no references remain. Files that are
+    not content-addressed are left alone.
+    """
+    if not file_name or not file_name.startswith("blobs/"):
+        return
+    with transaction.atomic():
+        blob = StoredBlob.objects.select_for_update().filter(file=file_name).first()
+        if blob is None:
+            return
+        if blob.ref_count > 1:
+            StoredBlob.objects.filter(pk=blob.pk).update(ref_count=F("ref_count") - 1)
+            return
+        blob.delete()
+    try:
+        default_storage.delete(file_name)
+    except Exception as e:
+        print(f"⚠️ Could not delete blob file {file_name}: {e}")
+
+
+def _analysis_key(job_description):
+    if not job_description:
+        return ""
+    return hashlib.sha256(job_description.encode("utf-8", errors="ignore")).hexdigest()
+
+
+def get_cached_analysis(blob, job_description=None):
+    if blob is None:
+        return None
+    return (blob.analysis or {}).get(_analysis_key(job_description))
+
+
+def set_cached_analysis(blob, job_description, result):
+    if blob is None or not result:
+        return
+    analysis = dict(blob.analysis or {})
+    analysis[_analysis_key(job_description)] = result
+    blob.analysis = analysis
+    blob.save(update_fields=["analysis", "updated_at"])
+
+
+def set_cached_text(blob, text):
+    if blob is None or not text or blob.extracted_text:
+        return
+    blob.extracted_text = text
+    blob.save(update_fields=["extracted_text", "updated_at"])
@@ -1,3 +1,35 @@
 from django.db import models
 
-# Create your models here.
+
+class StoredBlob(models.Model):
+    """
+    Content-addressed file shared by every upload with the same bytes.
+
+    Resumes and ID images are stored once per SHA-256 digest; model rows that
+    use the file point their FileField at ``file.name`` and hold a reference.
+    Text extraction and AI analysis results are cached here so duplicates of
+    the same document are never parsed or analysed twice.
+    """
+
+    class Kind(models.TextChoices):
+        RESUME = "resume", "Resume"
+        ID_IMAGE = "id_image", "ID Image"
+
+    sha256 = models.CharField(max_length=64, unique=True)
+    kind = models.CharField(max_length=20, choices=Kind.choices)
+    file = models.FileField(upload_to="blobs/", max_length=255)
+    size = models.PositiveBigIntegerField(default=0)
+    ref_count = models.PositiveIntegerField(default=0)
+
+    extracted_text = models.TextField(blank=True)
+    # AI analysis results keyed by the SHA-256 of the job description ("" = no JD)
+    analysis = models.JSONField(default=dict, blank=True)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [models.Index(fields=["file"], name="file_manage_file_idx")]
+
+    def __str__(self):
+        return f"{self.kind} {self.sha256[:12]} ({self.ref_count} refs)"
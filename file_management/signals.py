@@ -0,0 +1,22 @@
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
+
+from .blob_store import release_blob_for_name
+
+
+@receiver(post_delete, sender="resumes.Resume")
+def release_resume_blob(sender, instance, **kwargs):
+    """Drop the resume's reference to its content-addressed file"""
+    release_blob_for_name(instance.file.name if instance.file else None)
+
+
+@receiver(post_delete, sender="candidates.CandidateDraft")
+def release_candidate_draft_blob(sender, instance, **kwargs):
+    """Drop the draft's reference to its content-addressed resume file"""
+    release_blob_for_name(instance.resume_file.name if instance.resume_file else None)
+
+
+@receiver(post_delete, sender="interview_app.InterviewSession")
+def release_id_card_blob(sender, instance, **kwargs):
+    """Drop the session's reference to its content-addressed ID image"""
+    release_blob_for_name(instance.id_card_image.name if instance.id_card_image else None)
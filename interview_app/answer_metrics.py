@@ -0,0 +1,173 @@
+"""
+Per-answer voice metrics, computed when each answer is uploaded.
+
+``record_answer_metrics`` scores one answer from its transcript (speaking
+rate, filler words, sentiment) and, when the upload carried audio, from that
+audio slice (speech/silence split and delay before the first word, via the
+energy VAD). It upserts the answer's AnswerVoiceAnalysis row and moves the
+session's SessionVoiceRollup running sums by the answer's contribution, so
+end-of-interview figures are read from one row instead of recomputed.
+
+Uploads call ``submit_answer_metrics``, which does the audio work (writing
+the clip, FFmpeg conversion, VAD) on a small background pool instead of the
+request thread.
+"""
+import os
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.db.models import Max
+
+from .energy_vad import detect_speech
+from .qa_conversation_service import calculate_sentiment_score, calculate_words_per_minute, count_filler_words
+from .voice_models import AnswerVoiceAnalysis, SessionVoiceRollup
+
+
+def _audio_metrics(audio_path):
+    """Speech/silence split and first-word delay of an answer's audio, or None."""
+    from .voice_analysis_service import VoiceAnalysisService
+
+    wav_path = VoiceAnalysisService()._ensure_compatible_audio_format(audio_path)
+    try:
+        result = detect_speech(wav_path)
+    except (OSError, ValueError) as e:
+        print(f"⚠️ Could not analyse answer audio {audio_path}: {e}")
+        return None
+    finally:
+        if wav_path != audio_path and os.path.exists(wav_path):
+            os.remove(wav_path)
+    duration = result['duration']
+    if duration <= 0:
+        return None
+    segments = result['speech_segments']
+    return {
+        'duration': duration,
+        'speech_seconds': result['speech_time'],
+        'speech_percentage': result['speech_time'] / duration * 100,
+        'silence_percentage': result['pause_time'] / duration * 100,
+        'response_delay_seconds': segments[0][0] if segments else duration,
+    }
+
+
+def _contribution(analysis):
+    """What one stored answer adds to each running sum."""
+    insights = analysis.insights or {}
+    has_audio = bool(insights.get('has_audio'))
+    timed = insights.get('timed', False)
+    return {
+        'answer_count': 1,
+        'total_duration': analysis.segment_duration if timed else 0,
+        'timed_words': insights.get('word_count', 0) if timed else 0,
+        'total_words': insights.get('word_count', 0),
+        'total_filler_words': analysis.filler_word_count,
+        'sentiment_sum': insights.get('sentiment_score', 0.0),
+        'audio_answer_count': 1 if has_audio else 0,
+        'audio_duration': analysis.segment_duration if has_audio else 0,
+        'speech_seconds': insights.get('speech_seconds', 0.0) if has_audio else 0,
+        'response_delay_sum': (analysis.response_delay_seconds or 0) if has_audio else 0,
+    }
+
+
+def record_answer_metrics(session, question, transcript, response_time_seconds=None, audio_path=None):
+    """
+    Score one answer and fold it into the session rollup. Answering the same
+    question again replaces its row and its share of the sums. Returns the
+    AnswerVoiceAnalysis row.
+    """
+    text = (transcript or '').strip()
+    if text.startswith('A:'):
+        text = text[2:].strip()
+    audio = _audio_metrics(audio_path) if audio_path else None
+    duration = audio['duration'] if audio else (response_time_seconds or 0)
+    word_count = len(text.split())
+
+    fields = {
+        'segment_duration': duration,
+        'speech_percentage': audio['speech_percentage'] if audio else None,
+        'silence_percentage': audio['silence_percentage'] if audio else None,
+        'words_per_minute': calculate_words_per_minute(text, duration),
+        'filler_word_count': count_filler_words(text),
+        'response_delay_seconds': audio['response_delay_seconds'] if audio else None,
+        'insights': {
+            'word_count': word_count,
+            'sentiment_score': calculate_sentiment_score(text),
+            'has_audio': audio is not None,
+            'timed': duration > 0,
+            'speech_seconds': audio['speech_seconds'] if audio else None,
+        },
+    }
+
+    with transaction.atomic():
+        rollup, _ = SessionVoiceRollup.objects.get_or_create(session=session)
+        # Row lock: concurrent uploads for one session apply their deltas in turn
+        rollup = SessionVoiceRollup.objects.select_for_update().get(pk=rollup.pk)
+        analysis = AnswerVoiceAnalysis.objects.filter(session=session, question=question).first() if question else None
+        previous = _contribution(analysis) if analysis else None
+
+        if analysis is None:
+            answer_number = (AnswerVoiceAnalysis.objects.filter(session=session).aggregate(
+                last=Max('answer_number'))['last'] or 0) + 1
+            start = rollup.total_duration
+            analysis = AnswerVoiceAnalysis(
+                session=session, question=question, answer_number=answer_number,
+                segment_start_time=start, segment_end_time=start + duration, **fields
+            )
+        else:
+            for name, value in fields.items():
+                setattr(analysis, name, value)
+            analysis.segment_end_time = analysis.segment_start_time + duration
+        analysis.save()
+
+        for name, value in _contribution(analysis).items():
+            if previous:
+                value -= previous[name]
+            setattr(rollup, name, getattr(rollup, name) + value)
+        rollup.save()
+
+    print(f"📈 Answer {analysis.answer_number} metrics: {fields['words_per_minute'] or 0:.0f} WPM, "
+          f"{fields['filler_word_count']} fillers"
+          + (f", {fields['speech_percentage']:.0f}% speech" if audio else ""))
+    return analysis
+
+
+_executor = ThreadPoolExecutor(
+    max_workers=int(getattr(settings, "ANSWER_METRICS_WORKERS", 2)),
+    thread_name_prefix="answer-metrics",
+)
+
+
+def _record_in_background(session, question, transcript, response_time_seconds, audio_path, audio_bytes, delete_audio):
+    try:
+        if audio_bytes is not None:
+            with tempfile.NamedTemporaryFile(suffix='.webm', delete=False) as clip:
+                clip.write(audio_bytes)
+            audio_path, delete_audio = clip.name, True
+        record_answer_metrics(
+            session, question, transcript, response_time_seconds=response_time_seconds, audio_path=audio_path
+        )
+    except Exception as e:
+        print(f"⚠️ Could not record answer voice metrics: {e}")
+    finally:
+        if delete_audio and audio_path and os.path.exists(audio_path):
+            os.remove(audio_path)
+        close_old_connections()
+
+
+def submit_answer_metrics(session, question, transcript, response_time_seconds=None,
+                          audio_path=None, audio_bytes=None, delete_audio=False):
+    """
+    Queue ``record_answer_metrics`` for one answer. The audio is given as a
+    file (removed afterwards with ``delete_audio``) or as the uploaded bytes.
+    """
+    return _executor.submit(
+        _record_in_background, session, question, transcript, response_time_seconds,
+        audio_path, audio_bytes, delete_audio,
+    )
+
+
+def session_voice_summary(session):
+    """The session's answer-level voice figures from its rollup (zeros before any answer)."""
+    rollup = SessionVoiceRollup.objects.filter(session=session).first()
+    return (rollup or SessionVoiceRollup(session=session)).summary()
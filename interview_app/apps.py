@@ -1,6 +1,15 @@
+import threading
+
 from django.apps import AppConfig
+from django.conf import settings
 
 
 class InterviewAppConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'interview_app'
+
+    def ready(self):
+        # Speech models listed in MODEL_PRELOAD load at startup, in the background
+        if getattr(settings, 'MODEL_PRELOAD', None):
+            from .model_registry import model_registry
+            threading.Thread(target=model_registry.preload, name='model-preload', daemon=True).start()
@@ -0,0 +1,137 @@
+"""
+Bounded on-disk cache of compiled coding-round submissions.
+
+Build outputs (C/C++ and Go binaries, Java class files) are stored under
+``CODE_ARTIFACT_CACHE_DIR/<key>/`` where the key is a SHA-256 of the language,
+toolchain version, compiler flags and the full generated harness source, so
+re-running unchanged code skips compilation entirely.
+
+Entries are published with an atomic directory rename and are copied into the
+caller's work directory on a hit, so an entry is never executed in place and
+can be evicted at any time. Eviction is least-recently-used by total size;
+a hit refreshes the entry's mtime.
+"""
+import hashlib
+import os
+import shutil
+import threading
+import uuid
+
+from django.conf import settings
+
+STAGING_PREFIX = ".tmp-"
+
+
+class ArtifactCache:
+    """LRU cache of build directories keyed by build inputs."""
+
+    def __init__(self, root=None, max_bytes=None):
+        self._root = root
+        self._max_bytes = max_bytes
+        self._evict_lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0, "stores": 0, "evictions": 0}
+
+    @property
+    def root(self):
+        if self._root is None:
+            default_dir = os.path.join(str(settings.BASE_DIR), "code_artifact_cache")
+            self._root = str(getattr(settings, "CODE_ARTIFACT_CACHE_DIR", default_dir))
+        return self._root
+
+    @property
+    def max_bytes(self):
+        if self._max_bytes is None:
+            self._max_bytes = int(getattr(settings, "CODE_ARTIFACT_CACHE_MAX_MB", 512)) * 1024 * 1024
+        return self._max_bytes
+
+    @property
+    def enabled(self):
+        return self.max_bytes > 0
+
+    @staticmethod
+    def key(*parts):
+        digest = hashlib.sha256()
+        for part in parts:
+            digest.update(str(part).encode("utf-8", errors="ignore"))
+            digest.update(b"\0")
+        return digest.hexdigest()
+
+    def _entry_path(self, key):
+        return os.path.join(self.root, key)
+
+    def restore(self, key, workdir):
+        """Copy a cached build into ``workdir``. Returns True on a hit."""
+        if not self.enabled:
+            return False
+        entry = self._entry_path(key)
+        try:
+            shutil.copytree(entry, workdir, dirs_exist_ok=True)
+            os.utime(entry)
+        except (FileNotFoundError, shutil.Error, OSError):
+            # Missing, or evicted while we were copying
+            self.stats["misses"] += 1
+            return False
+        self.stats["hits"] += 1
+        return True
+
+    def store(self, key, workdir, filenames):
+        """Publish ``filenames`` (relative to ``workdir``) as the build for ``key``."""
+        if not self.enabled or not filenames:
+            return
+        try:
+            os.makedirs(self.root, exist_ok=True)
+            staging = os.path.join(self.root, f"{STAGING_PREFIX}{uuid.uuid4().hex}")
+            os.makedirs(staging)
+            for name in filenames:
+                shutil.copy2(os.path.join(workdir, name), os.path.join(staging, name))
+            try:
+                os.rename(staging, self._entry_path(key))
+                self.stats["stores"] += 1
+            except OSError:
+                # A concurrent build of the same source was published first
+                shutil.rmtree(staging, ignore_errors=True)
+        except Exception as e:
+            print(f"⚠️ Could not cache build artifacts: {e}")
+            return
+        self._evict()
+
+    def _evict(self):
+        if not self._evict_lock.acquire(blocking=False):
+            return
+        try:
+            entries = []
+            total = 0
+            with os.scandir(self.root) as it:
+                for entry in it:
+                    if entry.name.startswith(STAGING_PREFIX) or not entry.is_dir():
+                        continue
+                    size = 0
+                    for dirpath, _, files in os.walk(entry.path):
+                        for name in files:
+                            try:
+                                size += os.path.getsize(os.path.join(dirpath, name))
+                            except OSError:
+                                pass
+                    entries.append((entry.stat().st_mtime, size, entry.path))
+                    total += size
+
+            for _, size, path in sorted(entries):
+                if total <= self.max_bytes:
+                    break
+                # Rename first so readers never see a half-deleted entry
+                trash = os.path.join(self.root, f"{STAGING_PREFIX}{uuid.uuid4().hex}")
+                try:
+                    os.rename(path, trash)
+                except OSError:
+                    continue
+                shutil.rmtree(trash, ignore_errors=True)
+                total -= size
+                self.stats["evictions"] += 1
+        except OSError as e:
+            print(f"⚠️ Build cache eviction failed: {e}")
+        finally:
+            self._evict_lock.release()
+
+
+# Global instance for easy access
+artifact_cache = ArtifactCache()
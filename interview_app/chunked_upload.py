@@ -0,0 +1,260 @@
+"""
+Resumable chunked uploads for interview recordings.
+
+A tus-like protocol in three steps, so a dropped connection only costs the
+chunk in flight and no worker is held for a whole transfer:
+
+1. ``create_upload`` records the expected length (and optionally the SHA-256
+   of the whole file) and returns an upload id,
+2. each PATCH appends one chunk at the offset the server reports; the body is
+   streamed in blocks to a staging file, never held in memory, and an
+   optional ``Upload-Checksum: sha256 <base64>`` header is verified per
+   chunk, before the upload row is locked to append it to the partial file,
+3. ``finalize_upload`` checks the length and the whole-file checksum, moves the
+   file into place and queues its processing on a background executor.
+
+Partial files live under ``MEDIA_ROOT`` so finalizing is a rename, not a
+copy. They are fsynced every ``CHUNKED_UPLOAD_FSYNC_BYTES`` rather than per
+chunk, and always before finalizing.
+"""
+import base64
+import hashlib
+import os
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+
+from file_management.blob_store import hash_file
+
+from .models import MediaUpload
+
+UPLOAD_DIR_NAME = "uploads_partial"
+READ_BLOCK_SIZE = 64 * 1024
+
+_executor = ThreadPoolExecutor(
+    max_workers=int(getattr(settings, "MEDIA_PROCESSING_WORKERS", 2)),
+    thread_name_prefix="media-upload",
+)
+
+
+class UploadError(Exception):
+    """A rejected upload request; ``status`` is the HTTP status to answer with."""
+
+    def __init__(self, message, status=400):
+        super().__init__(message)
+        self.status = status
+
+
+def partial_path(upload):
+    return os.path.join(settings.MEDIA_ROOT, UPLOAD_DIR_NAME, f"{upload.id}.part")
+
+
+def current_offset(upload):
+    """Bytes a client may resume after: what was acknowledged and is still on disk."""
+    path = partial_path(upload)
+    on_disk = os.path.getsize(path) if os.path.exists(path) else 0
+    return min(upload.offset, on_disk)
+
+
+def create_upload(session, kind, length, filename="", checksum="", metadata=None):
+    if kind not in MediaUpload.Kind.values:
+        raise UploadError(f"Unknown upload kind: {kind}")
+    if length <= 0:
+        raise UploadError("Upload length must be positive")
+    upload = MediaUpload.objects.create(
+        session=session, kind=kind, length=length, filename=os.path.basename(filename or ""),
+        checksum=(checksum or "").lower(), metadata=metadata or {},
+    )
+    path = partial_path(upload)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    open(path, "wb").close()
+    print(f"📤 Upload {upload.id} created: {kind}, {length / 1024 / 1024:.2f} MB expected")
+    return upload
+
+
+def _parse_chunk_checksum(header):
+    """``Upload-Checksum: sha256 <base64>`` -> raw digest (None without the header)."""
+    if not header:
+        return None
+    algorithm, _, encoded = header.partition(" ")
+    if algorithm.lower() != "sha256":
+        raise UploadError(f"Unsupported checksum algorithm: {algorithm}")
+    try:
+        return base64.b64decode(encoded.strip(), validate=True)
+    except ValueError:
+        raise UploadError("Malformed Upload-Checksum header")
+
+
+def stage_chunk(upload_id, stream, content_length, expected_digest=None):
+    """
+    Stream ``content_length`` bytes of ``stream`` to a staging file of their
+    own and return its path. The request body is read here, before the
+    upload row is locked, so a slow client holds no lock; a short or corrupt
+    body is discarded and raises UploadError.
+    """
+    staged = os.path.join(settings.MEDIA_ROOT, UPLOAD_DIR_NAME, f"{upload_id}.{uuid.uuid4().hex[:8]}.chunk")
+    os.makedirs(os.path.dirname(staged), exist_ok=True)
+    digest = hashlib.sha256()
+    written = 0
+    try:
+        with open(staged, "wb") as chunk:
+            while written < content_length:
+                block = stream.read(min(READ_BLOCK_SIZE, content_length - written))
+                if not block:
+                    break
+                chunk.write(block)
+                digest.update(block)
+                written += len(block)
+        if written != content_length:
+            raise UploadError(f"Chunk ended after {written} of {content_length} bytes")
+        if expected_digest is not None and digest.digest() != expected_digest:
+            raise UploadError("Chunk checksum mismatch", status=460)
+    except BaseException:
+        discard_staged(staged)
+        raise
+    return staged
+
+
+def discard_staged(staged):
+    try:
+        os.remove(staged)
+    except FileNotFoundError:
+        pass
+
+
+def append_staged(upload, staged, offset):
+    """
+    Append the staged chunk to the partial file at ``offset`` and advance
+    ``upload.offset`` (the caller holds the row lock and saves the row).
+    """
+    fsync_every = int(getattr(settings, "CHUNKED_UPLOAD_FSYNC_BYTES", 8 * 1024 * 1024))
+    with open(partial_path(upload), "r+b") as partial, open(staged, "rb") as chunk:
+        # Drop bytes past the acknowledged offset (a chunk interrupted mid-write)
+        partial.truncate(offset)
+        partial.seek(offset)
+        for block in iter(lambda: chunk.read(READ_BLOCK_SIZE), b""):
+            partial.write(block)
+        upload.offset = partial.tell()
+        if upload.offset - upload.synced_offset >= fsync_every or upload.offset == upload.length:
+            partial.flush()
+            os.fsync(partial.fileno())
+            upload.synced_offset = upload.offset
+
+
+def _check_chunk(upload, offset, content_length):
+    if upload is None:
+        raise UploadError("Upload not found", status=404)
+    if upload.status != MediaUpload.Status.UPLOADING:
+        raise UploadError(f"Upload is {upload.status.lower()}", status=409)
+    resume_at = current_offset(upload)
+    if offset != resume_at:
+        raise UploadError(f"Offset mismatch: server is at {resume_at}", status=409)
+    if offset + content_length > upload.length:
+        raise UploadError("Chunk goes past the declared upload length", status=413)
+
+
+def write_chunk(upload_id, stream, offset, content_length, checksum_header=None):
+    """
+    Append ``content_length`` bytes read from ``stream`` at ``offset``; returns
+    the new offset. The body is staged first; only the append runs under the
+    upload row lock, so concurrent PATCHes for one upload are applied one at
+    a time and the offset is checked again before each.
+    """
+    max_chunk = int(getattr(settings, "CHUNKED_UPLOAD_MAX_CHUNK_BYTES", 16 * 1024 * 1024))
+    expected_digest = _parse_chunk_checksum(checksum_header)
+    if content_length <= 0:
+        raise UploadError("Empty chunk")
+    if content_length > max_chunk:
+        raise UploadError(f"Chunk larger than {max_chunk} bytes", status=413)
+
+    # Refuse a stale offset before reading the body
+    _check_chunk(MediaUpload.objects.filter(pk=upload_id).first(), offset, content_length)
+    staged = stage_chunk(upload_id, stream, content_length, expected_digest)
+    try:
+        with transaction.atomic():
+            upload = MediaUpload.objects.select_for_update().filter(pk=upload_id).first()
+            _check_chunk(upload, offset, content_length)
+            append_staged(upload, staged, offset)
+            upload.save(update_fields=["offset", "synced_offset", "updated_at"])
+    finally:
+        discard_staged(staged)
+    return upload.offset
+
+
+def finalize_upload(upload_id, destination, process):
+    """
+    Verify a complete upload, move it to ``destination`` and queue
+    ``process(upload, path)``, whose return value (a JSON-serialisable dict)
+    becomes ``upload.result``. Returns the upload, now PROCESSING.
+    """
+    with transaction.atomic():
+        upload = MediaUpload.objects.select_for_update().filter(pk=upload_id).first()
+        if upload is None:
+            raise UploadError("Upload not found", status=404)
+        if upload.status != MediaUpload.Status.UPLOADING:
+            raise UploadError(f"Upload is {upload.status.lower()}", status=409)
+        path = partial_path(upload)
+        received = current_offset(upload)
+        if received != upload.length:
+            raise UploadError(f"Upload incomplete: {received} of {upload.length} bytes", status=409)
+
+        if upload.checksum:
+            with open(path, "rb") as partial:
+                actual = hash_file(partial)
+            if actual != upload.checksum:
+                os.remove(path)
+                upload.status = MediaUpload.Status.FAILED
+                upload.error = "Checksum mismatch"
+                upload.save(update_fields=["status", "error", "updated_at"])
+                raise UploadError("Checksum mismatch: upload discarded, start a new one", status=460)
+
+        if upload.synced_offset < upload.length:
+            with open(path, "r+b") as partial:
+                os.fsync(partial.fileno())
+            upload.synced_offset = upload.length
+
+        if destination:
+            os.makedirs(os.path.dirname(destination), exist_ok=True)
+            os.replace(path, destination)
+            path = destination
+        upload.status = MediaUpload.Status.PROCESSING
+        upload.final_path = os.path.relpath(path, settings.MEDIA_ROOT).replace("\\", "/")
+        upload.save(update_fields=["status", "final_path", "synced_offset", "updated_at"])
+
+    print(f"✅ Upload {upload.id} complete ({upload.length / 1024 / 1024:.2f} MB), processing queued")
+    enqueue(_run_processing, upload.pk, path, process)
+    return upload
+
+
+def enqueue(fn, *args):
+    """Run ``fn(*args)`` on the media processing executor."""
+    return _executor.submit(fn, *args)
+
+
+def _run_processing(upload_id, path, process):
+    upload = MediaUpload.objects.get(pk=upload_id)
+    try:
+        result = process(upload, path) or {}
+        MediaUpload.objects.filter(pk=upload_id).update(status=MediaUpload.Status.COMPLETED, result=result)
+        print(f"✅ Upload {upload_id} processed")
+    except Exception as e:
+        import traceback
+        traceback.print_exc()
+        MediaUpload.objects.filter(pk=upload_id).update(status=MediaUpload.Status.FAILED, error=str(e))
+    finally:
+        close_old_connections()
+
+
+def upload_state(upload):
+    """JSON view of an upload for the status endpoint."""
+    return {
+        "upload_id": str(upload.id),
+        "kind": upload.kind,
+        "upload_status": upload.status,
+        "offset": current_offset(upload) if upload.status == MediaUpload.Status.UPLOADING else upload.offset,
+        "length": upload.length,
+        "result": upload.result,
+        "error": upload.error or None,
+    }
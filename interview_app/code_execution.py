@@ -0,0 +1,916 @@
+"""
+Multi-language code execution for the coding round (Windows compatible).
+
+Interpreted languages run one process per test case. Compiled languages
+(C, C++, Java and Go) are compiled once per submission into a multi-case
+harness: every test case becomes a branch of the generated ``main`` selected
+by the case index passed on the command line, and the same binary is re-run
+for each case.
+"""
+import os
+import re
+import sqlite3
+import subprocess
+import tempfile
+import time
+import traceback
+
+from django.conf import settings
+
+from .artifact_cache import artifact_cache
+from .sandbox import SANDBOX_SUPPORTED, default_limits, run_sandboxed
+from .sandbox_scheduler import sandbox_scheduler
+from .toolchains import toolchains
+from .warm_workers import node_workers, python_workers
+
+# Per test case run; multiple test cases can accumulate, so keep this very short
+RUN_TIMEOUT_SECONDS = 5
+# A compile now happens once per submission instead of once per test case
+COMPILE_TIMEOUT_SECONDS = 30
+
+
+def run_subprocess_windows(command, cwd=None, input_data=None, env=None, timeout=RUN_TIMEOUT_SECONDS, limits=None):
+    """
+    Run a command with a wall-clock timeout. When ``limits`` are given and the
+    host supports it (Linux), the run goes through the rlimit sandbox and the
+    result carries ``cpu_ms`` / ``peak_rss_kb``.
+    """
+    if limits is not None and SANDBOX_SUPPORTED and getattr(settings, "SANDBOX_ENABLED", True):
+        return run_sandboxed(command, cwd=cwd, input_data=input_data, env=env, timeout=timeout, limits=limits)
+    try:
+        result = subprocess.run(
+            command,
+            capture_output=True,
+            text=True,
+            timeout=timeout,
+            cwd=cwd,
+            input=input_data,
+            env=env,
+        )
+        return result
+    except subprocess.TimeoutExpired:
+        return subprocess.CompletedProcess(command, 1, stdout=None, stderr=f"Execution timed out after {timeout} seconds. Code may be too slow or have infinite loops.")
+    except Exception as e:
+        return subprocess.CompletedProcess(command, 1, stdout=None, stderr=f"Server execution error: {str(e)}")
+
+class CompiledProgram:
+    """
+    A submission compiled into a multi-case harness inside ``workdir``.
+
+    ``run_case(i)`` runs the i-th test case the harness was built with. When
+    the build failed (or the toolchain is missing) ``compile_result`` holds
+    the failing process and ``ok`` is False.
+    """
+
+    def __init__(self, workdir, run_command=None, env=None, compile_result=None, cached=False, limits=None):
+        self.workdir = workdir
+        self.run_command = run_command
+        self.env = env
+        self.compile_result = compile_result
+        self.limits = limits or default_limits(RUN_TIMEOUT_SECONDS)
+        # True when the build was restored from the artifact cache
+        self.cached = cached
+
+    @property
+    def ok(self):
+        return self.run_command is not None
+
+    def run_case(self, index):
+        if not self.ok:
+            return self.compile_result
+        return run_subprocess_windows(
+            self.run_command + [str(index)], cwd=self.workdir, env=self.env, limits=self.limits
+        )
+
+
+def _execute_single_case(compile_function, code, test_input, **kwargs):
+    """Compile a one-case harness and run it (the per-call executor API)."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        program = compile_function(code, [test_input], temp_dir, **kwargs)
+        result = program.run_case(0)
+        # Lets the verdict report a failed per-case build as a compile error
+        result.compile_failed = not program.ok
+        return result
+
+def execute_python_windows(code, test_input):
+    """
+    Execute Python code with test input.
+    Handles both function-based and class-based code.
+    """
+    import re
+    
+    print(f"🔍 execute_python_windows called with test_input='{test_input}'")
+    
+    # Check if code contains a class definition (for OOP questions)
+    class_match = re.search(r'class\s+(\w+)', code)
+    
+    if class_match:
+        # Class-based code: test_input should be executable Python code
+        # Example: "finder = MedianFinder(); finder.addNum(1); finder.findMedian()"
+        # Split by semicolon, execute all but last, then print the result of the last
+        statements = [s.strip() for s in test_input.split(';') if s.strip()]
+        if len(statements) > 1:
+            # Execute all statements except the last
+            setup = '\n'.join(statements[:-1])
+            # Print the result of the last statement
+            full_script = f"{code}\n{setup}\nprint({statements[-1]})"
+        else:
+            # Single statement - just execute and print
+            full_script = f"{code}\nprint({test_input})"
+    else:
+        # Function-based code: find function name and call it
+        function_match = re.search(r'def\s+(\w+)\s*\(', code)
+        if function_match:
+            function_name = function_match.group(1)
+            # test_input already contains quotes (e.g., "'hello'" or '"hello"')
+            # so we can use it directly: reverse_string('hello')
+            # Use repr() to ensure the output is properly formatted for comparison
+            full_script = f"{code}\nresult = {function_name}({test_input})\nif result is not None:\n    print(result)\nelse:\n    print('None')"
+            print(f"🔍 Generated script (preview): {full_script[:300]}...")
+            print(f"🔍 Function name detected: {function_name}")
+        else:
+            # Fallback to 'solve' if no function found
+            full_script = f"{code}\nresult = solve({test_input})\nif result is not None:\n    print(result)\nelse:\n    print('None')"
+            print(f"🔍 Using fallback 'solve' function")
+    
+    result = python_workers.run(full_script, timeout=RUN_TIMEOUT_SECONDS)
+    if result is None:
+        result = run_subprocess_windows([toolchains.command('python'), '-c', full_script], limits=default_limits(RUN_TIMEOUT_SECONDS))
+    
+    # Clean up the output - remove any trailing newlines and normalize
+    if result.stdout:
+        result.stdout = result.stdout.strip()
+    if result.stderr:
+        result.stderr = result.stderr.strip()
+    
+    print(f"🔍 Execution result - stdout: '{result.stdout}', stderr: '{result.stderr}', returncode: {result.returncode}")
+    return result
+
+def execute_javascript_windows(code, test_input):
+    full_script = f"{code}\nconsole.log(solve({test_input}));"
+    result = node_workers.run(full_script, timeout=RUN_TIMEOUT_SECONDS)
+    if result is None:
+        result = run_subprocess_windows(
+            [toolchains.command('node'), '-e', full_script], limits=default_limits(RUN_TIMEOUT_SECONDS, limit_memory=False)
+        )
+    return result
+
+def _extract_go_imports_and_body(code: str):
+    """
+    Separate Go imports from the rest of the source so we can rebuild a harness.
+    Returns (imports_set, body_string).
+    """
+    imports = []
+    body_lines = []
+    lines = code.splitlines()
+    i = 0
+
+    # Skip leading shebang/comments/blank lines but capture everything else
+    while i < len(lines):
+        stripped = lines[i].strip()
+        if stripped.startswith("package "):
+            i += 1
+            break
+        if stripped:
+            break
+        i += 1
+
+    while i < len(lines):
+        line = lines[i]
+        stripped = line.strip()
+        if stripped.startswith("import"):
+            if stripped.startswith("import (") or stripped == "import(":
+                i += 1
+                while i < len(lines):
+                    inner = lines[i].strip()
+                    if inner == ")":
+                        break
+                    if inner:
+                        pkg = inner.split("//")[0].strip().strip('"').strip('`')
+                        if pkg:
+                            imports.append(pkg)
+                    i += 1
+            else:
+                remainder = stripped[len("import"):].split("//")[0].strip()
+                if remainder:
+                    pkg = remainder.split()[-1].strip('"').strip('`')
+                    if pkg:
+                        imports.append(pkg)
+        else:
+            body_lines.extend(lines[i:])
+            break
+        i += 1
+
+    body = "\n".join(body_lines).strip()
+    return set(imports), body
+
+def _format_go_arguments(raw_input: str) -> str:
+    if not raw_input or raw_input.lower() == "n/a":
+        return ""
+    raw = raw_input.strip()
+    if raw.startswith("(") and raw.endswith(")"):
+        raw = raw[1:-1]
+
+    parts = [p.strip() for p in raw.split(",") if p.strip()]
+    formatted = []
+    for part in parts:
+        lower = part.lower()
+        if re.fullmatch(r"-?\d+", part) or re.fullmatch(r"-?\d+\.\d+", part):
+            formatted.append(part)
+        elif lower in {"true", "false", "nil"}:
+            formatted.append(lower)
+        elif part.startswith('"') and part.endswith('"'):
+            formatted.append(part)
+        elif part.startswith("'") and part.endswith("'"):
+            inner = part[1:-1]
+            if len(inner) == 1:
+                formatted.append(f"'{inner}'")
+            else:
+                escaped = inner.replace('"', '\\"')
+                formatted.append(f"\"{escaped}\"")
+        else:
+            formatted.append(part)
+    return ", ".join(formatted)
+
+def _detect_go_entrypoint(code_body: str) -> str:
+    candidates = re.findall(r'^\s*func\s+(\w+)\s*\(', code_body, flags=re.MULTILINE)
+    for name in candidates:
+        if name and name != "main":
+            return name
+    return "solve"
+
+def compile_go(code, test_inputs, workdir):
+    """
+    Build a Go submission once with a harness whose main() calls the detected
+    function for the test case selected by ``os.Args[1]``.
+    """
+    go_cmd = toolchains.path("go")
+    if not go_cmd:
+        message = (
+            "Go toolchain is not available on the server. "
+            "Install Go and ensure the 'go' binary is on PATH."
+        )
+        return CompiledProgram(workdir, compile_result=subprocess.CompletedProcess(["go"], 1, stdout="", stderr=message))
+
+    imports, body = _extract_go_imports_and_body(code)
+    body = re.sub(r'func\s+main\s*\([^)]*\)\s*{[\s\S]*?}\s*', '', body)
+    imports.update({"fmt", "os"})
+
+    function_name = _detect_go_entrypoint(body)
+
+    import_section = "import (\n"
+    for pkg in sorted(imports):
+        import_section += f'    "{pkg}"\n'
+    import_section += ")\n"
+
+    cases = ""
+    for index, test_input in enumerate(test_inputs):
+        arg_expr = _format_go_arguments(test_input or "")
+        call_expr = f"{function_name}({arg_expr})" if arg_expr else f"{function_name}()"
+        cases += f'    case "{index}":\n        fmt.Println({call_expr})\n'
+
+    harness = (
+        "package main\n\n"
+        f"{import_section}\n"
+        f"{body}\n\n"
+        "func main() {\n"
+        '    caseIndex := "0"\n'
+        "    if len(os.Args) > 1 {\n"
+        "        caseIndex = os.Args[1]\n"
+        "    }\n"
+        "    switch caseIndex {\n"
+        f"{cases}"
+        "    default:\n"
+        '        fmt.Fprintln(os.Stderr, "unknown test case", caseIndex)\n'
+        "        os.Exit(2)\n"
+        "    }\n"
+        "}\n"
+    )
+
+    executable_name = "main.exe" if os.name == "nt" else "main"
+    executable_path = os.path.join(workdir, executable_name)
+    # The Go runtime reserves far more address space than it uses: cap the heap, not RLIMIT_AS
+    heap_mb = int(getattr(settings, "SANDBOX_MEMORY_LIMIT_MB", 512))
+    run_env = dict(os.environ, GOMEMLIMIT=f"{heap_mb}MiB")
+    run_limits = default_limits(RUN_TIMEOUT_SECONDS, limit_memory=False, limit_processes=False)
+    cache_key = artifact_cache.key("GO", toolchains.version("go"), harness)
+    if artifact_cache.restore(cache_key, workdir):
+        return CompiledProgram(workdir, run_command=[executable_path], env=run_env, cached=True, limits=run_limits)
+
+    go_file_path = os.path.join(workdir, "main.go")
+    with open(go_file_path, "w", encoding="utf-8") as go_file:
+        go_file.write(harness)
+
+    build_result = run_subprocess_windows(
+        [go_cmd, "build", "-o", executable_path, go_file_path],
+        cwd=workdir,
+        timeout=COMPILE_TIMEOUT_SECONDS,
+    )
+    if build_result.returncode != 0:
+        return CompiledProgram(workdir, compile_result=build_result)
+    artifact_cache.store(cache_key, workdir, [executable_name])
+    return CompiledProgram(workdir, run_command=[executable_path], env=run_env, limits=run_limits)
+
+def execute_go_windows(code, test_input):
+    """
+    Compile and execute Go code by wrapping the submission with a harness
+    that calls the detected function using the provided test input.
+    """
+    return _execute_single_case(compile_go, code, test_input)
+
+def _detect_cpp_entrypoint(code: str) -> str:
+    pattern = re.compile(r'^\s*[^\s#][\w\s:<>,*&\[\]]+\s+([A-Za-z_]\w*)\s*\(', flags=re.MULTILINE)
+    for match in pattern.finditer(code):
+        name = match.group(1)
+        if name and name not in {"if", "for", "while", "switch", "return", "main"}:
+            return name
+    return "solve"
+
+def _format_cpp_arguments(raw_input: str) -> str:
+    if not raw_input or raw_input.lower() == "n/a":
+        return ""
+    raw = raw_input.strip()
+    if raw.startswith(("'", '"')) and raw.endswith(("'", '"')) and "," in raw:
+        raw = raw[1:-1]
+    if raw.startswith("(") and raw.endswith(")"):
+        raw = raw[1:-1]
+
+    parts = [p.strip() for p in raw.split(",") if p.strip()]
+    formatted = []
+    for part in parts:
+        lower = part.lower()
+        if re.fullmatch(r"-?\d+", part) or re.fullmatch(r"-?\d+\.\d+", part):
+            formatted.append(part)
+        elif lower in {"true", "false", "nullptr", "null"}:
+            formatted.append(lower)
+        elif part.startswith('"') and part.endswith('"'):
+            inner = part[1:-1].replace('"', r'\"')
+            formatted.append(f"\"{inner}\"")
+        elif part.startswith("'") and part.endswith("'"):
+            inner = part[1:-1]
+            if len(inner) == 1:
+                formatted.append(f"'{inner}'")
+            else:
+                escaped = inner.replace('"', '\\"')
+                formatted.append(f"\"{escaped}\"")
+        else:
+            formatted.append(part)
+    return ", ".join(formatted)
+
+def compile_cpp(code, test_inputs, workdir, treat_as_c=False):
+    """
+    Compile a C/C++ submission once with a harness whose main() invokes the
+    detected function for the test case selected by ``argv[1]``.
+    """
+    compiler = toolchains.path("cpp")
+    if not compiler:
+        message = (
+            "C/C++ compiler not available on the server. "
+            "Install MinGW-w64 (g++) and ensure it is on PATH."
+        )
+        return CompiledProgram(workdir, compile_result=subprocess.CompletedProcess(["g++"], 1, stdout="", stderr=message))
+
+    function_name = _detect_cpp_entrypoint(code)
+
+    base_includes = [
+        "#include <bits/stdc++.h>",
+        "#include <type_traits>",
+        "#include <functional>",
+    ]
+
+    extra_includes = []
+    body_content = code
+    if treat_as_c:
+        user_lines = code.splitlines()
+        remaining_lines = []
+        for line in user_lines:
+            stripped = line.strip()
+            if stripped.startswith("#include"):
+                extra_includes.append(line)
+            else:
+                remaining_lines.append(line)
+        body_content = "\n".join(remaining_lines)
+
+    includes_block = "\n".join(base_includes + extra_includes) + "\n\n"
+    harness = includes_block
+    if treat_as_c:
+        harness += "#ifdef __cplusplus\nextern \"C\" {\n#endif\n"
+        harness += body_content + "\n"
+        harness += "#ifdef __cplusplus\n}\n#endif\n"
+    else:
+        harness += body_content + "\n"
+
+    harness += """
+template <typename Func, typename... Args>
+void invoke_and_print(Func&& func, Args&&... args) {
+    using Result = std::invoke_result_t<Func, Args...>;
+    if constexpr (std::is_void_v<Result>) {
+        std::invoke(std::forward<Func>(func), std::forward<Args>(args)...);
+    } else {
+        auto result = std::invoke(std::forward<Func>(func), std::forward<Args>(args)...);
+        std::cout << result;
+    }
+}
+
+int main(int argc, char** argv) {
+    std::ios::sync_with_stdio(false);
+    std::cin.tie(nullptr);
+    int case_index = argc > 1 ? std::atoi(argv[1]) : 0;
+    switch (case_index) {
+"""
+    for index, test_input in enumerate(test_inputs):
+        arg_expr = _format_cpp_arguments(test_input or "")
+        if arg_expr:
+            harness += f"    case {index}: invoke_and_print({function_name}, {arg_expr}); break;\n"
+        else:
+            harness += f"    case {index}: invoke_and_print({function_name}); break;\n"
+    harness += (
+        "    default:\n"
+        "        std::cerr << \"unknown test case \" << case_index;\n"
+        "        return 2;\n"
+        "    }\n"
+        "    return 0;\n}\n"
+    )
+
+    env = toolchains.cpp_env()
+
+    executable_path = os.path.join(workdir, "solution.exe")
+    cache_key = artifact_cache.key(
+        "C" if treat_as_c else "CPP", toolchains.version("cpp"), "-std=c++17", harness
+    )
+    if artifact_cache.restore(cache_key, workdir):
+        return CompiledProgram(workdir, run_command=[executable_path], env=env, cached=True)
+
+    source_path = os.path.join(workdir, "solution.cpp")
+    with open(source_path, "w", encoding="utf-8") as cpp_file:
+        cpp_file.write(harness)
+
+    compile_result = run_subprocess_windows(
+        [compiler, "-std=c++17", source_path, "-o", executable_path],
+        env=env,
+        timeout=COMPILE_TIMEOUT_SECONDS,
+    )
+    if compile_result.returncode != 0:
+        return CompiledProgram(workdir, compile_result=compile_result)
+    artifact_cache.store(cache_key, workdir, ["solution.exe"])
+    return CompiledProgram(workdir, run_command=[executable_path], env=env)
+
+def execute_cpp_windows(code, test_input, treat_as_c=False):
+    return _execute_single_case(compile_cpp, code, test_input, treat_as_c=treat_as_c)
+
+def _format_java_arguments(raw_input: str) -> str:
+    """
+    Convert stored test case input (e.g., '1,2' or '\'hello\'') into
+    Java-friendly argument expressions.
+    """
+    if raw_input is None:
+        return ""
+
+    raw = raw_input.strip()
+    if not raw:
+        return ""
+
+    if raw.startswith("(") and raw.endswith(")"):
+        raw = raw[1:-1]
+
+    parts = [part.strip() for part in raw.split(",") if part.strip()]
+    formatted_parts = []
+
+    for part in parts:
+        if re.fullmatch(r"-?\d+", part) or re.fullmatch(r"-?\d+\.\d+", part):
+            formatted_parts.append(part)
+        elif part.lower() in {"true", "false", "null"}:
+            formatted_parts.append(part.lower())
+        elif part.startswith('"') and part.endswith('"'):
+            formatted_parts.append(part)
+        elif part.startswith("'") and part.endswith("'"):
+            inner = part[1:-1]
+            if len(inner) == 1:
+                formatted_parts.append(f"'{inner}'")
+            else:
+                escaped = inner.replace('"', '\\"')
+                formatted_parts.append(f"\"{escaped}\"")
+        else:
+            formatted_parts.append(part)
+
+    return ", ".join(formatted_parts)
+
+def _detect_java_entrypoint(code: str):
+    """
+    Determine class name, method name, and whether the method is static.
+    Defaults to Solution.solve if not found.
+    """
+    class_match = re.search(r'class\s+(\w+)', code)
+    class_name = class_match.group(1) if class_match else "Solution"
+
+    preferred_methods = ["solve", "add", "answer", "result"]
+    method_name = "solve"
+    is_static = True
+
+    for method in preferred_methods:
+        pattern = re.compile(r'(public\s+)?(static\s+)?[^\s]+\s+' + re.escape(method) + r'\s*\(')
+        match = pattern.search(code)
+        if match:
+            method_name = method
+            is_static = bool(match.group(2))
+            break
+    else:
+        generic_match = re.search(r'(public\s+)?(static\s+)?[^\s]+\s+(\w+)\s*\(', code)
+        if generic_match:
+            method_name = generic_match.group(3)
+            is_static = bool(generic_match.group(2))
+
+    return class_name, method_name, is_static
+
+def _ensure_java_class_wrapper(code: str, class_name: str) -> str:
+    """
+    If user code does not declare a class, wrap it in a public class so it compiles.
+    """
+    if re.search(r'\bclass\b', code):
+        return code
+
+    indented = []
+    for line in code.splitlines():
+        if line.strip():
+            indented.append(f"    {line}")
+        else:
+            indented.append("")
+    body = "\n".join(indented)
+    return f"public class {class_name} {{\n{body}\n}}\n"
+
+def compile_java(code, test_inputs, workdir):
+    """
+    Compile a Java submission once together with a Main class that invokes
+    the detected method for the test case selected by ``args[0]``.
+    """
+    javac_cmd = toolchains.path("javac")
+    java_cmd = toolchains.path("java")
+
+    missing = []
+    if not javac_cmd:
+        missing.append("javac")
+    if not java_cmd:
+        missing.append("java")
+
+    if missing:
+        message = (
+            "Java runtime is not available on the server. "
+            f"Missing executables: {', '.join(missing)}. "
+            "Install a JDK (17+) and ensure JAVA_HOME or PATH is configured."
+        )
+        return CompiledProgram(workdir, compile_result=subprocess.CompletedProcess(missing, 1, stdout="", stderr=message))
+
+    class_name, method_name, is_static = _detect_java_entrypoint(code)
+    prepared_code = _ensure_java_class_wrapper(code, class_name)
+    solution_filename = f"{class_name}.java"
+
+    invocation_target = f"{class_name}.{method_name}" if is_static else f"(new {class_name}()).{method_name}"
+    cases = ""
+    for index, test_input in enumerate(test_inputs):
+        formatted_args = _format_java_arguments(test_input or "")
+        invocation_call = f"{invocation_target}({formatted_args})" if formatted_args else f"{invocation_target}()"
+        cases += (
+            f"                case {index}:\n"
+            f"                    System.out.println({invocation_call});\n"
+            "                    break;\n"
+        )
+
+    main_code = (
+        "public class Main {\n"
+        "    public static void main(String[] args) {\n"
+        "        int caseIndex = args.length > 0 ? Integer.parseInt(args[0]) : 0;\n"
+        "        try {\n"
+        "            switch (caseIndex) {\n"
+        f"{cases}"
+        "                default:\n"
+        "                    System.err.println(\"unknown test case \" + caseIndex);\n"
+        "                    System.exit(2);\n"
+        "            }\n"
+        "        } catch (Exception e) {\n"
+        "            e.printStackTrace();\n"
+        "        }\n"
+        "    }\n"
+        "}\n"
+    )
+
+    # The JVM reserves far more address space than it uses: cap the heap, not RLIMIT_AS
+    heap_mb = int(getattr(settings, "SANDBOX_MEMORY_LIMIT_MB", 512))
+    run_command = [java_cmd, f"-Xmx{heap_mb}m", "-XX:+UseSerialGC", "-cp", ".", "Main"]
+    run_limits = default_limits(RUN_TIMEOUT_SECONDS, limit_memory=False, limit_processes=False)
+    cache_key = artifact_cache.key(
+        "JAVA", toolchains.version("javac"), solution_filename, prepared_code, main_code
+    )
+    if artifact_cache.restore(cache_key, workdir):
+        return CompiledProgram(workdir, run_command=run_command, cached=True, limits=run_limits)
+
+    solution_path = os.path.join(workdir, solution_filename)
+    main_path = os.path.join(workdir, "Main.java")
+
+    with open(solution_path, "w", encoding="utf-8") as solution_file:
+        solution_file.write(prepared_code)
+
+    with open(main_path, "w", encoding="utf-8") as main_file:
+        main_file.write(main_code)
+
+    compile_result = run_subprocess_windows(
+        [javac_cmd, "Main.java", solution_filename], cwd=workdir, timeout=COMPILE_TIMEOUT_SECONDS
+    )
+
+    if compile_result.returncode != 0:
+        if not compile_result.stderr and compile_result.stdout:
+            compile_result.stderr = compile_result.stdout
+        return CompiledProgram(workdir, compile_result=compile_result)
+
+    class_files = [name for name in os.listdir(workdir) if name.endswith(".class")]
+    artifact_cache.store(cache_key, workdir, class_files)
+    return CompiledProgram(workdir, run_command=run_command, limits=run_limits)
+
+def execute_java_windows(code, test_input):
+    """
+    Compiles and then executes Java code safely on Windows.
+    The user's code is compiled alongside a generated Main class in a
+    temporary directory and run once for the given test input.
+    It returns a standard subprocess.CompletedProcess object for consistency.
+    """
+    return _execute_single_case(compile_java, code, test_input)
+
+def execute_php_windows(code, test_input):
+    full_script = f"<?php {code} echo solve({test_input}); ?>"
+    php_cmd = toolchains.path("php")
+    if not php_cmd:
+        message = (
+            "PHP runtime is not available on the server. "
+            "Install PHP and ensure the executable is on PATH or configure PHP_PATH."
+        )
+        return subprocess.CompletedProcess(["php"], 1, stdout="", stderr=message)
+
+    temp_file = tempfile.NamedTemporaryFile(mode='w', suffix='.php', delete=False, encoding='utf-8')
+    try:
+        temp_file.write(full_script)
+        temp_file.flush()
+        temp_file.close()
+        result = run_subprocess_windows([php_cmd, temp_file.name], limits=default_limits(RUN_TIMEOUT_SECONDS))
+    finally:
+        try:
+            os.remove(temp_file.name)
+        except OSError:
+            pass
+    return result
+
+def execute_ruby_windows(code, test_input):
+    full_script = f"{code}\nputs solve({test_input})"
+    return run_subprocess_windows([toolchains.command('ruby'), '-e', full_script], limits=default_limits(RUN_TIMEOUT_SECONDS))
+
+def execute_csharp_windows(code, test_input):
+    with tempfile.TemporaryDirectory() as temp_dir:
+        subprocess.run([toolchains.command('dotnet'), 'new', 'console', '--force'], cwd=temp_dir, capture_output=True)
+        program_cs_path = os.path.join(temp_dir, 'Program.cs')
+        full_code = f"using System; public class Program {{ public static void Main(string[] args) {{ Console.WriteLine(Solve({test_input})); }} {code} }}"
+        with open(program_cs_path, 'w') as f: f.write(full_code)
+        return run_subprocess_windows([toolchains.command('dotnet'), 'run'], cwd=temp_dir)
+
+def execute_sql_windows(code, test_input):
+    try:
+        con = sqlite3.connect(":memory:")
+        cur = con.cursor()
+        cur.executescript(code)
+        res = cur.fetchall()
+        output_str = "\n".join([str(row) for row in res])
+        con.close()
+        return subprocess.CompletedProcess(None, 0, stdout=output_str, stderr=None)
+    except Exception as e:
+        return subprocess.CompletedProcess(None, 1, stdout=None, stderr=str(e))
+
+def execute_html_windows(code, test_input):
+    """
+    HTML doesn't need execution; evaluate by returning the provided markup.
+    Test cases simply compare the submitted HTML to the expected output.
+    """
+    normalized = code.strip()
+    return subprocess.CompletedProcess(None, 0, stdout=normalized, stderr=None)
+    
+LANGUAGE_EXECUTORS = {
+    'PYTHON': execute_python_windows,
+    'JAVASCRIPT': execute_javascript_windows,
+    'JAVA': execute_java_windows,
+    'GO': execute_go_windows,
+    'C': lambda code, test_input: execute_cpp_windows(code, test_input, treat_as_c=True),
+    'CPP': execute_cpp_windows,
+    'PHP': execute_php_windows,
+    'RUBY': execute_ruby_windows,
+    'CSHARP': execute_csharp_windows,
+    'HTML': execute_html_windows,
+    'SQL': execute_sql_windows,
+}
+
+# Languages built once per submission into a multi-case harness
+COMPILED_LANGUAGES = {
+    'JAVA': compile_java,
+    'GO': compile_go,
+    'C': lambda code, test_inputs, workdir: compile_cpp(code, test_inputs, workdir, treat_as_c=True),
+    'CPP': compile_cpp,
+}
+
+
+def compile_submission(code, language, test_inputs, workdir):
+    """
+    Compile ``code`` once for all ``test_inputs``. Returns a CompiledProgram,
+    or None when the cases have to be executed one by one instead.
+
+    A single bad test input (e.g. an argument of the wrong type) would break
+    the shared harness, so when the multi-case build fails the bare solution
+    is compiled on its own: if that also fails the error belongs to the code
+    and is reported for every case, otherwise each case falls back to its own
+    build so only the offending cases fail.
+    """
+    compile_function = COMPILED_LANGUAGES.get(language)
+    if compile_function is None:
+        return None
+
+    program = compile_function(code, test_inputs, workdir)
+    if program.cached:
+        print(f"♻️ Reusing cached {language} build for unchanged code")
+    if program.ok or len(test_inputs) <= 1:
+        return program
+
+    probe_dir = os.path.join(workdir, "probe")
+    os.makedirs(probe_dir, exist_ok=True)
+    probe = compile_function(code, [], probe_dir)
+    if not probe.ok:
+        return probe
+    print("⚠️ Multi-case build failed on a test input; compiling test cases individually")
+    return None
+
+
+MEMORY_ERROR_MARKERS = ("MemoryError", "std::bad_alloc", "OutOfMemoryError", "heap out of memory")
+
+
+def _classify_error(stderr, compile_failed):
+    if compile_failed:
+        return "compile"
+    if stderr.startswith("Execution timed out"):
+        return "timeout"
+    if "CPU time limit exceeded" in stderr:
+        return "cpu_limit"
+    if any(marker in stderr for marker in MEMORY_ERROR_MARKERS):
+        return "memory"
+    return "runtime"
+
+
+def _case_result(index, test_case, result_obj, error, wall_ms, compile_failed=False):
+    """
+    Compact, JSON-serialisable verdict of one test case. ``status`` is
+    PASSED, FAILED (wrong answer), ERROR (non-zero exit / stderr) or
+    EXCEPTION (the executor itself raised).
+    """
+    case = {
+        "index": index,
+        "hidden": bool(test_case.is_hidden),
+        "status": "EXCEPTION",
+        "passed": False,
+        "actual": "",
+        "error": "",
+        "error_type": None,
+        "returncode": None,
+        "wall_ms": round(wall_ms, 1),
+        "cpu_ms": None,
+        "peak_rss_kb": None,
+    }
+    if error is not None:
+        case.update({"error": str(error), "error_type": "exception"})
+        return case
+
+    stdout = result_obj.stdout.strip() if result_obj.stdout else ""
+    stderr = result_obj.stderr.strip() if result_obj.stderr else ""
+    case.update({
+        "actual": stdout,
+        "error": stderr,
+        "returncode": result_obj.returncode,
+        "cpu_ms": getattr(result_obj, "cpu_ms", None),
+        "peak_rss_kb": getattr(result_obj, "peak_rss_kb", None),
+    })
+    if result_obj.returncode != 0 or stderr:
+        compile_failed = compile_failed or getattr(result_obj, "compile_failed", False)
+        case.update({"status": "ERROR", "error_type": _classify_error(stderr, compile_failed)})
+    elif stdout == test_case.expected_output.strip():
+        case.update({"status": "PASSED", "passed": True})
+    else:
+        case.update({"status": "FAILED", "error_type": "wrong_answer"})
+    return case
+
+
+def _case_log_lines(case, test_case):
+    test_case_label = f"Test Case {case['index'] + 1}"
+    if test_case.is_hidden:
+        test_case_label += " (Hidden)"
+    expected = test_case.expected_output.strip()
+
+    usage_line = None
+    if case["cpu_ms"] is not None:
+        usage_line = f"  Resources: CPU {case['cpu_ms']:.1f} ms"
+        if case["peak_rss_kb"] is not None:
+            usage_line += f", peak memory {case['peak_rss_kb'] / 1024:.1f} MB"
+
+    lines = []
+    if case["status"] == "EXCEPTION":
+        lines.append(f"{test_case_label}: FAILED (Exception)")
+        lines.append(f"  Exception: {case['error']}")
+        lines.append(f"  Input: {test_case.input_data}")
+        lines.append(f"  Expected: '{expected}'")
+        return lines
+
+    if case["status"] == "ERROR":
+        lines.append(f"{test_case_label}: FAILED (Error)")
+        if case["error"]:
+            lines.append(f"  Error: {case['error']}")
+        else:
+            lines.append(f"  Exit code: {case['returncode']}")
+        lines.append(f"  Input: {test_case.input_data}")
+        lines.append(f"  Expected: '{expected}'")
+        if case["actual"]:
+            lines.append(f"  Got: '{case['actual']}'")
+    elif case["status"] == "PASSED":
+        lines.append(f"{test_case_label}: PASSED ✅")
+    else:
+        actual_output = case["actual"]
+        lines.append(f"{test_case_label}: FAILED ❌")
+        lines.append(f"  Input: {test_case.input_data}")
+        lines.append(f"  Expected: '{expected}'")
+        lines.append(f"  Got: '{actual_output}'")
+        lines.append(f"  (Character diff: expected {len(expected)} chars, got {len(actual_output)} chars)")
+    if usage_line:
+        lines.append(usage_line)
+    return lines
+
+
+def run_test_suite(code, language, test_cases, session_key=None, on_result=None):
+    """
+    Runs the given code against a set of test cases for a specific language.
+    Compiled languages are built once and the binary is reused for every case.
+    Cases run in parallel (up to SANDBOX_PER_SUBMISSION_PARALLELISM), each
+    holding a slot of the process-wide sandbox scheduler; ``session_key``
+    keeps the slot queue fair across candidates. ``on_result(case)`` is
+    called with each case's result dict as soon as that case finishes.
+    Returns a tuple: (all_passed, output_log_string, summary) where summary
+    has the per-case result dicts (``cases``), the total CPU ms and the
+    highest peak RSS over all cases (None when they cannot be measured).
+    """
+    summary = {"cpu_time_ms": None, "peak_memory_kb": None, "cases": []}
+    if not test_cases:
+        return False, "No test cases found for this question.", summary
+
+    execution_function = LANGUAGE_EXECUTORS.get(language)
+    if not execution_function:
+        return False, f"Language '{language}' is not supported.", summary
+
+    test_inputs = [test_case.input_data.strip() for test_case in test_cases]
+    print(f"🧪 Running {len(test_cases)} test cases ({language}), code preview: {code[:100]}...")
+
+    with tempfile.TemporaryDirectory() as build_dir:
+        if language in COMPILED_LANGUAGES:
+            with sandbox_scheduler.slot(session_key):
+                program = compile_submission(code, language, test_inputs, build_dir)
+        else:
+            program = None
+        compile_failed = program is not None and not program.ok
+
+        def execute_case(index, test_input):
+            started = time.perf_counter()
+            result_obj, error = None, None
+            try:
+                if program is not None:
+                    result_obj = program.run_case(index)
+                else:
+                    result_obj = execution_function(code, test_input)
+            except Exception as e:
+                traceback.print_exc()
+                error = e
+            case = _case_result(
+                index, test_cases[index], result_obj, error,
+                (time.perf_counter() - started) * 1000, compile_failed=compile_failed,
+            )
+            if on_result is not None:
+                try:
+                    on_result(case)
+                except Exception as e:
+                    print(f"⚠️ Test case result callback failed: {e}")
+            return case
+
+        cases = sandbox_scheduler.map(execute_case, test_inputs, session_key=session_key)
+
+    output_log_lines = []
+    for case, test_case in zip(cases, test_cases):
+        print(
+            f"🧪 Test case {case['index'] + 1}: {case['status']} "
+            f"(input '{test_inputs[case['index']]}', expected '{test_case.expected_output.strip()}', "
+            f"got '{case['actual']}', error '{case['error'][:200]}')"
+        )
+        output_log_lines.extend(_case_log_lines(case, test_case))
+        if case["cpu_ms"] is not None:
+            summary["cpu_time_ms"] = round((summary["cpu_time_ms"] or 0) + case["cpu_ms"], 1)
+        if case["peak_rss_kb"] is not None:
+            summary["peak_memory_kb"] = max(summary["peak_memory_kb"] or 0, case["peak_rss_kb"])
+
+    summary["cases"] = cases
+    all_passed = all(case["passed"] for case in cases)
+    return all_passed, "\n".join(output_log_lines), summary
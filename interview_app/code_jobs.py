@@ -0,0 +1,169 @@
+"""
+Asynchronous coding-round execution.
+
+``start_code_job`` returns a job id immediately and runs the test suite on a
+bounded background executor, so web workers are not held while sandboxes
+run. Per-case results are published as each case finishes:
+
+* in this process (``get_job_state``), for the fastest streaming,
+* in the Django cache (``code_job:<id>``), for streams served by other
+  workers.
+
+Final submissions are persisted on their ``CodeSubmission`` row when the
+job ends, which survives restarts and cache outages.
+"""
+import threading
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import close_old_connections
+
+from .code_execution import run_test_suite
+
+JOB_CACHE_TIMEOUT = 60 * 60  # 1 hour
+FINISHED_STATES = ("COMPLETED", "FAILED")
+# Finished jobs kept in memory for late pollers when the cache is unavailable
+MAX_FINISHED_JOBS = 500
+
+_executor = ThreadPoolExecutor(
+    max_workers=int(getattr(settings, "CODE_JOB_WORKERS", 4)),
+    thread_name_prefix="code-job",
+)
+_jobs = OrderedDict()
+_jobs_lock = threading.Lock()
+
+
+def _cache_key(job_id):
+    return f"code_job:{job_id}"
+
+
+def public_case(case, test_case):
+    """Case result as shown to the candidate: hidden cases reveal no data."""
+    payload = {
+        "test_case": case["index"] + 1,
+        "status": case["status"],
+        "passed": case["passed"],
+        "hidden": case["hidden"],
+        "error_type": case["error_type"],
+        "wall_ms": case["wall_ms"],
+        "cpu_ms": case["cpu_ms"],
+        "peak_rss_kb": case["peak_rss_kb"],
+    }
+    if not case["hidden"]:
+        payload.update({
+            "input": test_case.input_data,
+            "expected": test_case.expected_output.strip(),
+            "actual": case["actual"],
+            "error": case["error"],
+        })
+    return payload
+
+
+def _publish(state):
+    cache.set(_cache_key(state["job_id"]), state, JOB_CACHE_TIMEOUT)
+
+
+def get_job_state(job_id):
+    """Latest known state of a job, or None. Falls back to the submission row."""
+    job_id = str(job_id)
+    with _jobs_lock:
+        state = _jobs.get(job_id)
+        if state is not None:
+            return dict(state, results=list(state["results"]))
+    state = cache.get(_cache_key(job_id))
+    if state is not None:
+        return state
+
+    from .models import CodeSubmission
+
+    submission = CodeSubmission.objects.filter(job_id=job_id).first()
+    if submission is None:
+        return None
+    return {
+        "job_id": job_id,
+        "kind": "submit",
+        "status": submission.status,
+        "total": submission.total_count,
+        "results": submission.test_results or [],
+        "all_passed": submission.passed_all_tests,
+        "output_log": submission.output_log,
+        "submission_id": submission.id,
+    }
+
+
+def start_code_job(code, language, test_cases, session_key=None, submission=None, on_complete=None):
+    """
+    Queue a test-suite run and return its job id.
+
+    ``submission`` (a CodeSubmission with ``job_id`` set) receives progress and
+    the final result; ``on_complete(all_passed, output_log, summary)`` runs in
+    the background thread once every case has finished.
+    """
+    job_id = str(submission.job_id if submission is not None else uuid.uuid4())
+    test_cases = list(test_cases)
+    state = {
+        "job_id": job_id,
+        "kind": "submit" if submission is not None else "run",
+        "status": "QUEUED",
+        "total": len(test_cases),
+        "results": [],
+        "all_passed": None,
+        "output_log": None,
+        "submission_id": submission.id if submission is not None else None,
+    }
+    with _jobs_lock:
+        _jobs[job_id] = state
+    _publish(state)
+    _executor.submit(_run_job, job_id, code, language, test_cases, session_key, submission, on_complete)
+    return job_id
+
+
+def _update(job_id, **changes):
+    with _jobs_lock:
+        state = _jobs[job_id]
+        state.update(changes)
+        snapshot = dict(state, results=list(state["results"]))
+    _publish(snapshot)
+    return snapshot
+
+
+def _run_job(job_id, code, language, test_cases, session_key, submission, on_complete):
+    results_lock = threading.Lock()
+
+    def on_result(case):
+        # Called from sandbox threads as each case finishes
+        with results_lock:
+            with _jobs_lock:
+                _jobs[job_id]["results"].append(public_case(case, test_cases[case["index"]]))
+                snapshot = dict(_jobs[job_id], results=list(_jobs[job_id]["results"]))
+            _publish(snapshot)
+
+    try:
+        _update(job_id, status="RUNNING")
+        if submission is not None:
+            type(submission).objects.filter(pk=submission.pk).update(status="RUNNING")
+
+        all_passed, output_log, summary = run_test_suite(
+            code, language, test_cases, session_key=session_key, on_result=on_result
+        )
+        if on_complete is not None:
+            on_complete(all_passed, output_log, summary)
+        # Final ordering is by test case, not by completion time
+        ordered = [public_case(case, test_case) for case, test_case in zip(summary["cases"], test_cases)]
+        _update(job_id, status="COMPLETED", results=ordered, all_passed=all_passed, output_log=output_log)
+        print(f"✅ Code job {job_id} finished: {'all passed' if all_passed else 'some cases failed'}")
+    except Exception as e:
+        import traceback
+        traceback.print_exc()
+        _update(job_id, status="FAILED", output_log=f"Execution failed: {e}")
+        if submission is not None:
+            type(submission).objects.filter(pk=submission.pk).update(status="FAILED", output_log=f"Execution failed: {e}")
+    finally:
+        close_old_connections()
+        with _jobs_lock:
+            finished = [key for key, job in _jobs.items() if job["status"] in FINISHED_STATES]
+            for key in finished[:max(0, len(finished) - MAX_FINISHED_JOBS)]:
+                del _jobs[key]
@@ -0,0 +1,169 @@
+"""
+Empirical time-complexity estimation for coding submissions.
+
+A ``TestCase`` can declare a scaling series: an input template with an
+``{n}`` placeholder (an argument expression in the question's language, e.g.
+``list(range({n}, 0, -1))``) and a list of sizes. The solution is run once
+per size under the normal sandbox, and ``t = a + b * f(n)`` is fitted by least
+squares for each candidate growth class; the intercept absorbs interpreter
+start-up and input construction. The class with the lowest residual wins, and
+O(1) is reported when no class explains the variation.
+"""
+import math
+import tempfile
+import time
+
+from django.conf import settings
+
+from .code_execution import COMPILED_LANGUAGES, LANGUAGE_EXECUTORS, compile_submission
+from .sandbox_scheduler import sandbox_scheduler
+
+COMPLEXITY_CLASSES = (
+    ("O(1)", None),
+    ("O(log n)", lambda n: math.log(n)),
+    ("O(n)", lambda n: n),
+    ("O(n log n)", lambda n: n * math.log(n)),
+    ("O(n^2)", lambda n: n * n),
+    ("O(n^3)", lambda n: n ** 3),
+)
+COMPLEXITY_ORDER = [name for name, _ in COMPLEXITY_CLASSES]
+
+# Below this R² the growth is treated as noise around a constant
+MIN_GROWTH_R2 = 0.5
+MIN_SAMPLES = 3
+
+
+def _fit(sizes, times, f):
+    """Least-squares fit of t = a + b*f(n); returns (rss, b)."""
+    xs = [f(n) for n in sizes]
+    count = len(xs)
+    mean_x = sum(xs) / count
+    mean_t = sum(times) / count
+    sxx = sum((x - mean_x) ** 2 for x in xs)
+    if sxx == 0:
+        return None, 0.0
+    b = sum((x - mean_x) * (t - mean_t) for x, t in zip(xs, times)) / sxx
+    a = mean_t - b * mean_x
+    rss = sum((t - (a + b * x)) ** 2 for x, t in zip(xs, times))
+    return rss, b
+
+
+def fit_complexity(samples):
+    """
+    Pick the growth class that best explains ``samples`` (a list of
+    ``(n, milliseconds)``). Returns ``(complexity, r2, fits)`` where ``fits``
+    maps every class to its R².
+    """
+    sizes = [n for n, _ in samples]
+    times = [t for _, t in samples]
+    mean_t = sum(times) / len(times)
+    tss = sum((t - mean_t) ** 2 for t in times)
+    if tss == 0:
+        return "O(1)", 1.0, {"O(1)": 1.0}
+
+    fits = {}
+    best, best_rss = None, None
+    for name, f in COMPLEXITY_CLASSES[1:]:
+        rss, slope = _fit(sizes, times, f)
+        if rss is None or slope <= 0:
+            # Decreasing run time is not growth of this order
+            continue
+        fits[name] = round(1 - rss / tss, 4)
+        if best_rss is None or rss < best_rss:
+            best, best_rss = name, rss
+    if best is None or fits[best] < MIN_GROWTH_R2:
+        return "O(1)", 0.0, fits
+    return best, fits[best], fits
+
+
+def _scaling_case(test_cases):
+    for test_case in test_cases:
+        template = getattr(test_case, "scaling_input_template", None)
+        sizes = getattr(test_case, "scaling_sizes", None)
+        if template and "{n}" in template and sizes:
+            return test_case
+    return None
+
+
+def estimate_complexity(code, language, test_cases, session_key=None):
+    """
+    Run the first declared scaling series and return the fitted growth class
+    with its samples, or None when no test case declares a series.
+    """
+    if not getattr(settings, "CODE_COMPLEXITY_ENABLED", True):
+        return None
+    test_case = _scaling_case(test_cases)
+    execution_function = LANGUAGE_EXECUTORS.get(language)
+    if test_case is None or execution_function is None:
+        return None
+
+    sizes = sorted({int(n) for n in test_case.scaling_sizes if int(n) > 1})
+    inputs = [test_case.scaling_input_template.replace("{n}", str(n)) for n in sizes]
+    repeats = max(1, int(getattr(settings, "CODE_COMPLEXITY_REPEATS", 2)))
+    print(f"📈 Measuring {language} run time over N = {sizes}")
+
+    samples, metric, limit_reached_at = [], "cpu_ms", None
+    # One slot for the whole series: the runs must not compete with each other
+    with sandbox_scheduler.slot(session_key), tempfile.TemporaryDirectory() as build_dir:
+        program = None
+        if language in COMPILED_LANGUAGES:
+            program = compile_submission(code, language, inputs, build_dir)
+            if program is not None and not program.ok:
+                return None
+
+        for index, (n, test_input) in enumerate(zip(sizes, inputs)):
+            best = None
+            for _ in range(repeats):
+                started = time.perf_counter()
+                result = program.run_case(index) if program is not None else execution_function(code, test_input)
+                wall_ms = (time.perf_counter() - started) * 1000
+                if result.returncode != 0:
+                    best = None
+                    break
+                elapsed = getattr(result, "cpu_ms", None)
+                if elapsed is None or metric == "wall_ms":
+                    # No rusage on this platform: wall time for the whole series
+                    metric, elapsed = "wall_ms", wall_ms
+                best = elapsed if best is None else min(best, elapsed)
+            if best is None:
+                limit_reached_at = n
+                break
+            samples.append((n, best))
+
+    details = {
+        "test_case_id": getattr(test_case, "id", None),
+        "metric": metric,
+        "samples": [{"n": n, "ms": round(ms, 2)} for n, ms in samples],
+        "limit_reached_at": limit_reached_at,
+        "complexity": None,
+        "r2": None,
+        "fits": {},
+        "expected": getattr(test_case, "expected_complexity", None) or None,
+        "meets_expected": None,
+    }
+    if len(samples) < MIN_SAMPLES:
+        print(f"⚠️ Not enough scaling samples to fit a complexity ({len(samples)}/{len(sizes)})")
+        return details
+
+    complexity, r2, fits = fit_complexity(samples)
+    details.update({"complexity": complexity, "r2": r2, "fits": fits})
+    if details["expected"] in COMPLEXITY_ORDER:
+        details["meets_expected"] = COMPLEXITY_ORDER.index(complexity) <= COMPLEXITY_ORDER.index(details["expected"])
+    print(f"📈 Fitted complexity {complexity} (R² {r2})")
+    return details
+
+
+def describe_complexity(details):
+    """One-line summary used in logs, prompts and reports."""
+    if not details:
+        return None
+    if details.get("complexity") is None:
+        if details.get("limit_reached_at"):
+            return f"Not measured: run failed or timed out at N={details['limit_reached_at']}"
+        return "Not measured: too few samples"
+    sizes = [sample["n"] for sample in details["samples"]]
+    text = f"{details['complexity']} (R² {details['r2']:.2f} over N={sizes[0]}..{sizes[-1]})"
+    if details.get("expected"):
+        verdict = "meets" if details.get("meets_expected") else "slower than"
+        text += f", {verdict} expected {details['expected']}"
+    return text
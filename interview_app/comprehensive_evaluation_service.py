@@ -6,6 +6,7 @@ import re
 import google.generativeai as genai
 from django.conf import settings
 from interview_app.models import InterviewSession, InterviewQuestion, CodeSubmission
+from interview_app.complexity import describe_complexity
 
 # Configure Gemini
 api_key = getattr(settings, 'GEMINI_API_KEY', None) or getattr(settings, 'GOOGLE_API_KEY', None)
@@ -132,23 +133,9 @@ class ComprehensiveEvaluationService:
                     
                     question_text = question.question_text if question and question.question_text else f"Coding Challenge {len(coding_submissions) + 1}"
                     
-                    # Parse test counts from output_log since passed_count/total_count fields don't exist
-                    passed_tests = 0
-                    total_tests = 0
-                    if code_submission.output_log:
-                        # Look for pattern like "Test Results: 3/3 passed"
-                        import re
-                        match = re.search(r'Test Results:\s*(\d+)/(\d+)\s+passed', code_submission.output_log)
-                        if match:
-                            passed_tests = int(match.group(1))
-                            total_tests = int(match.group(2))
-                        else:
-                            # Alternative: look for individual test results
-                            test_results = re.findall(r'✅.*?Test Case \d+:', code_submission.output_log)
-                            if test_results:
-                                total_tests = len(test_results)
-                                # If passed_all_tests is True, all tests passed
-                                passed_tests = total_tests if code_submission.passed_all_tests else 0
+                    # Stored when the suite ran; 0/0 for submissions that never ran
+                    passed_tests = code_submission.passed_count or 0
+                    total_tests = code_submission.total_count or 0
                     
                     coding_submissions.append({
                         'question': question_text,
@@ -157,7 +144,10 @@ class ComprehensiveEvaluationService:
                         'test_results': code_submission.output_log or 'No test results',
                         'passed_tests': passed_tests,
                         'total_tests': total_tests,
-                        'passed_all_tests': code_submission.passed_all_tests or False
+                        'passed_all_tests': code_submission.passed_all_tests or False,
+                        'failures': code_submission.failure_counts(),
+                        # Measured, not LLM-estimated: see interview_app/complexity.py
+                        'complexity': describe_complexity(code_submission.complexity_details)
                     })
                     print(f"✅ Added coding submission: {question_text[:50]}... ({code_submission.language}, {passed_tests}/{total_tests} tests passed)")
                 except Exception as e:
@@ -184,7 +174,8 @@ class ComprehensiveEvaluationService:
                             'test_results': 'No submission received',
                             'passed_tests': 0,
                             'total_tests': 0,
-                            'passed_all_tests': False
+                            'passed_all_tests': False,
+                            'complexity': None
                         })
                         print(f"⚠️ Coding question found but no submission: {q.question_text[:50]}...")
             
@@ -403,6 +394,11 @@ class ComprehensiveEvaluationService:
                 coding_text += f"Problem: {sub['question']}\n"
                 coding_text += f"Language: {sub['language']}\n"
                 coding_text += f"Tests Passed: {sub['passed_tests']}/{sub['total_tests']}\n"
+                if sub.get('failures'):
+                    failures = ", ".join(f"{count} {error_type}" for error_type, count in sub['failures'].items())
+                    coding_text += f"Failed Cases By Type: {failures}\n"
+                if sub.get('complexity'):
+                    coding_text += f"Measured Time Complexity (from timed runs, use as-is for efficiency): {sub['complexity']}\n"
                 coding_text += f"Test Results: {sub['test_results']}\n"
                 coding_text += f"Submitted Code:\n```\n{sub['code']}\n```\n\n"
         
@@ -797,6 +793,8 @@ Be specific, constructive, and professional. Base your scores on the actual cont
             language = sub.get('language', 'Unknown')
             if total > 0:
                 analysis_parts.append(f"Challenge {i} ({language}): {passed}/{total} tests passed.")
+            if sub.get('complexity'):
+                analysis_parts.append(f"Measured time complexity: {sub['complexity']}.")
         
         return " ".join(analysis_parts)
 
@@ -22,6 +22,7 @@ except ImportError as e:
         traceback.print_exc()
 
 from .models import InterviewSession, CodeSubmission
+from .complexity import describe_complexity
 
 
 def _sanitize_for_pdf(text: str) -> str:
@@ -304,17 +305,27 @@ def generate_comprehensive_pdf(session_key: str) -> bytes:
                 pdf.cell(usable_width, 6, _sanitize_for_pdf(f"Language: {submission.language}"), ln=True)
                 status_text = "All Tests Passed" if submission.passed_all_tests else "Some Tests Failed"
                 pdf.cell(usable_width, 6, _sanitize_for_pdf(f"Status: {status_text}"), ln=True)
+                if submission.total_count is not None:
+                    pdf.cell(usable_width, 6, _sanitize_for_pdf(f"Tests Passed: {submission.passed_count}/{submission.total_count}"), ln=True)
+                failures = submission.failure_counts()
+                if failures:
+                    failure_text = ", ".join(f"{count} {error_type.replace('_', ' ')}" for error_type, count in failures.items())
+                    pdf.cell(usable_width, 6, _sanitize_for_pdf(f"Failures: {failure_text}"), ln=True)
+                if submission.cpu_time_ms is not None:
+                    resources = f"Resources: CPU {submission.cpu_time_ms:.1f} ms total"
+                    if submission.peak_memory_kb is not None:
+                        resources += f", peak memory {submission.peak_memory_kb / 1024:.1f} MB"
+                    pdf.cell(usable_width, 6, _sanitize_for_pdf(resources), ln=True)
+                if submission.complexity_details:
+                    pdf.cell(usable_width, 6, _sanitize_for_pdf(f"Measured Complexity: {describe_complexity(submission.complexity_details)}"), ln=True)
                 pdf.ln(2)
                 
                 # Gemini evaluation if available
                 if submission.gemini_evaluation:
                     gemini_score = submission.gemini_evaluation.get('score', 'N/A')
-                    passed_tests = submission.gemini_evaluation.get('passed_tests', 0)
-                    total_tests = submission.gemini_evaluation.get('total_tests', 0)
                     
                     pdf.set_font("Arial", "B", 11)
                     pdf.cell(usable_width, 6, _sanitize_for_pdf(f"AI Score: {gemini_score}/100"), ln=True)
-                    pdf.cell(usable_width, 6, _sanitize_for_pdf(f"Tests Passed: {passed_tests}/{total_tests}"), ln=True)
                     pdf.ln(2)
                 
                 # Submitted code
@@ -338,8 +349,21 @@ def generate_comprehensive_pdf(session_key: str) -> bytes:
                 
                 pdf.ln(3)
                 
-                # Test results / Output log
-                if submission.output_log:
+                # Test results: one line per stored case result; the log only for older submissions
+                if submission.test_results:
+                    pdf.set_font("Arial", "B", 11)
+                    pdf.cell(usable_width, 6, _sanitize_for_pdf("Test Results:"), ln=True)
+                    pdf.set_font("Arial", size=9)
+                    for case in submission.test_results[:20]:
+                        label = f"Test Case {case.get('test_case')}" + (" (Hidden)" if case.get('hidden') else "")
+                        verdict = "PASSED" if case.get('passed') else f"FAILED ({(case.get('error_type') or 'unknown').replace('_', ' ')})"
+                        line = f"{label}: {verdict}"
+                        if case.get('cpu_ms') is not None:
+                            line += f", {case['cpu_ms']:.1f} ms CPU"
+                        if case.get('peak_rss_kb') is not None:
+                            line += f", {case['peak_rss_kb'] / 1024:.1f} MB"
+                        pdf.cell(usable_width, 5, _sanitize_for_pdf(line), ln=True)
+                elif submission.output_log:
                     pdf.set_font("Arial", "B", 11)
                     pdf.cell(usable_width, 6, _sanitize_for_pdf("Test Results:"), ln=True)
                     pdf.set_font("Arial", size=9)
@@ -466,7 +490,9 @@ def generate_comprehensive_pdf(session_key: str) -> bytes:
                     coding_analysis_text.append(f"""
                     Language: {submission.language}
                     Code: {submission.submitted_code[:1000]}
-                    Tests Passed: {'Yes' if submission.passed_all_tests else 'No'}
+                    Tests Passed: {f"{submission.passed_count}/{submission.total_count}" if submission.total_count is not None else ('Yes' if submission.passed_all_tests else 'No')}
+                    Failures By Type: {submission.failure_counts() or 'None'}
+                    Measured Complexity: {describe_complexity(submission.complexity_details) or 'N/A'}
                     Output: {submission.output_log[:500] if submission.output_log else 'N/A'}
                     """)
                 
@@ -0,0 +1,257 @@
+"""
+CPU-only voice activity detection for interview recordings.
+
+Used when the pyannote models are not installed or cannot be loaded. The WAV
+data chunk is memory-mapped, cut into fixed frames and processed in blocks,
+so an hour of 16 kHz audio never sits in memory as floats. Three vectorised
+features are computed per frame:
+
+* short-time energy (dBFS),
+* zero-crossing rate,
+* spectral flatness over the voiced band (tonal speech ~0.1, noise ~0.55).
+
+Thresholds adapt to the recording's own noise floor. Runs of frames above
+the low threshold are joined across short pauses, and hysteresis keeps a
+joined run only when it contains a voiced frame above the high threshold.
+"""
+import struct
+import time
+
+import numpy as np
+from django.conf import settings
+
+FRAME_MS = 32
+# ~128k samples per block: the float copy of a block stays in cache
+BLOCK_FRAMES = 256
+# Voicing features are computed on audio decimated to about this rate
+VOICING_RATE_HZ = 4000
+SPEECH_BAND_HZ = (100, 2000)
+# Per-frame periodogram of white noise has flatness exp(-0.577) ~ 0.56
+MAX_VOICED_FLATNESS = 0.45
+# Crossings per second: voiced speech stays well below band-limited noise (~2300/s at 2 kHz)
+MAX_VOICED_ZCR = 1600
+# Absolute gate: nothing quieter than this is speech, whatever the floor
+MIN_SPEECH_DBFS = -55.0
+
+# (wFormatTag, bits per sample) -> (dtype, scale to [-1, 1], offset)
+PCM_FORMATS = {
+    (1, 8): ("u1", 1 / 128.0, -128.0),
+    (1, 16): ("<i2", 1 / 32768.0, 0.0),
+    (1, 32): ("<i4", 1 / 2147483648.0, 0.0),
+    (3, 32): ("<f4", 1.0, 0.0),
+}
+
+
+class WavAudio:
+    """Memory-mapped PCM samples of a WAV file, shape ``(frames, channels)``."""
+
+    def __init__(self, samples, sample_rate, scale, offset):
+        self.samples = samples
+        self.sample_rate = sample_rate
+        self.scale = scale
+        self.offset = offset
+
+    @property
+    def duration(self):
+        return len(self.samples) / self.sample_rate if self.sample_rate else 0.0
+
+
+def open_wav(path):
+    """Parse the RIFF header of ``path`` and memory-map its data chunk."""
+    with open(path, "rb") as wav_file:
+        header = wav_file.read(12)
+        if len(header) < 12 or header[:4] not in (b"RIFF", b"RF64") or header[8:12] != b"WAVE":
+            raise ValueError(f"{path} is not a WAV file")
+        fmt = None
+        while True:
+            chunk = wav_file.read(8)
+            if len(chunk) < 8:
+                raise ValueError(f"{path} has no data chunk")
+            chunk_id, size = struct.unpack("<4sI", chunk)
+            if chunk_id == b"fmt ":
+                fmt_data = wav_file.read(size)
+                audio_format, channels, sample_rate, _, block_align, bits = struct.unpack("<HHIIHH", fmt_data[:16])
+                if audio_format == 0xFFFE and size >= 26:
+                    # WAVE_FORMAT_EXTENSIBLE: the real format tag opens the sub-format GUID
+                    audio_format = struct.unpack("<H", fmt_data[24:26])[0]
+                fmt = (audio_format, channels, sample_rate, block_align, bits)
+            elif chunk_id == b"data":
+                data_offset = wav_file.tell()
+                wav_file.seek(0, 2)
+                # Streamed WAVs (ffmpeg to a pipe) leave the size at 0 or 0xFFFFFFFF
+                available = wav_file.tell() - data_offset
+                data_size = size if 0 < size <= available else available
+                break
+            else:
+                wav_file.seek(size, 1)
+            if size % 2:
+                wav_file.seek(1, 1)
+
+    if fmt is None:
+        raise ValueError(f"{path} has no fmt chunk")
+    audio_format, channels, sample_rate, block_align, bits = fmt
+    if (audio_format, bits) not in PCM_FORMATS:
+        raise ValueError(f"Unsupported WAV encoding (format {audio_format}, {bits} bits) in {path}")
+    dtype, scale, offset = PCM_FORMATS[(audio_format, bits)]
+    frame_count = data_size // block_align if block_align else 0
+    if frame_count == 0:
+        samples = np.zeros((0, channels), dtype=dtype)
+    else:
+        samples = np.memmap(path, dtype=dtype, mode="r", offset=data_offset, shape=(frame_count, channels))
+    return WavAudio(samples, sample_rate, scale, offset)
+
+
+def _frame_view(audio, frame_len):
+    """``(frames, frame_len, channels)`` view of the mapped samples (no copy)."""
+    frame_count = len(audio.samples) // frame_len
+    return audio.samples[:frame_count * frame_len].reshape(frame_count, frame_len, audio.samples.shape[1])
+
+
+def _to_float(audio, frames):
+    x = frames[:, :, 0].astype(np.float32) if frames.shape[2] == 1 else frames.mean(axis=2, dtype=np.float32)
+    if audio.offset:
+        x += np.float32(audio.offset)
+    x *= np.float32(audio.scale)
+    return x
+
+
+def frame_energy(audio, frame_len, block_frames=BLOCK_FRAMES):
+    """Short-time energy (dBFS, DC removed) of every frame."""
+    frames = _frame_view(audio, frame_len)
+    energy_db = np.empty(len(frames), dtype=np.float32)
+    for start in range(0, len(frames), block_frames):
+        x = _to_float(audio, frames[start:start + block_frames])
+        mean = x.mean(axis=1)
+        # Var = E[x²] - E[x]²: the DC offset of cheap microphones is not speech
+        power = np.einsum("ij,ij->i", x, x) / frame_len - mean * mean
+        energy_db[start:start + len(x)] = 10.0 * np.log10(np.maximum(power, 0) + 1e-12)
+    return energy_db
+
+
+def voicing_features(audio, frame_len, indices, block_frames=BLOCK_FRAMES):
+    """
+    Zero-crossing rate (crossings per second) and spectral flatness of the
+    frames at ``indices``. Both are taken after decimating to ~4 kHz (sums of
+    adjacent samples, a cheap low-pass): the voiced-speech band is kept, the
+    FFT is a quarter of the size and the frequency resolution is unchanged.
+    """
+    frames = _frame_view(audio, frame_len)
+    factor = max(1, audio.sample_rate // VOICING_RATE_HZ)
+    length = frame_len // factor
+    rate = audio.sample_rate / factor
+    window = np.hanning(length).astype(np.float32)
+    freqs = np.fft.rfftfreq(length, 1.0 / rate)
+    band = (freqs >= SPEECH_BAND_HZ[0]) & (freqs <= min(SPEECH_BAND_HZ[1], rate / 2))
+    zcr = np.empty(len(indices), dtype=np.float32)
+    flatness = np.empty(len(indices), dtype=np.float32)
+
+    for start in range(0, len(indices), block_frames):
+        x = _to_float(audio, frames[indices[start:start + block_frames]])
+        x = sum(x[:, phase:length * factor:factor] for phase in range(factor))
+        x -= x.mean(axis=1, keepdims=True)
+        stop = start + len(x)
+
+        crossings = np.count_nonzero(np.diff(np.signbit(x).view(np.int8), axis=1), axis=1)
+        zcr[start:stop] = crossings * (rate / (length - 1))
+
+        spectrum = np.fft.rfft(x * window, axis=1)[:, band]
+        power = (spectrum.real ** 2 + spectrum.imag ** 2).astype(np.float32) + np.float32(1e-12)
+        flatness[start:stop] = np.exp(np.log(power).mean(axis=1)) / power.mean(axis=1)
+    return zcr, flatness
+
+
+def energy_thresholds(energy_db):
+    """``(low, high)`` dBFS thresholds relative to the recording's noise floor."""
+    floor = float(np.percentile(energy_db, 10))
+    peak = float(np.percentile(energy_db, 95))
+    spread = max(0.0, peak - floor)
+    high = max(floor + max(9.0, 0.35 * spread), MIN_SPEECH_DBFS)
+    low = max(floor + max(4.0, 0.2 * spread), MIN_SPEECH_DBFS)
+    return low, high
+
+
+def _runs(flags):
+    """``(starts, ends)`` frame indices of the runs of True in ``flags`` (ends exclusive)."""
+    edges = np.diff(np.concatenate(([0], flags.view(np.int8), [0])))
+    return np.flatnonzero(edges == 1), np.flatnonzero(edges == -1)
+
+
+def _close_gaps(starts, ends, min_gap):
+    """Merge runs separated by fewer than ``min_gap`` frames."""
+    if len(starts) < 2:
+        return starts, ends
+    keep_gap = (starts[1:] - ends[:-1]) >= min_gap
+    return np.concatenate((starts[:1], starts[1:][keep_gap])), np.concatenate((ends[:-1][keep_gap], ends[-1:]))
+
+
+def speech_segments(energy_db, seeds, low, frame_seconds, min_speech=None, min_pause=None):
+    """
+    Speech segments ``[(start, end), ...]`` in seconds. Runs of frames above
+    ``low`` less than ``min_pause`` apart are joined (so fricatives stay with
+    their vowels), then hysteresis keeps the joined runs that contain at least
+    one ``seeds`` frame (loud and voiced) and blips under ``min_speech`` go.
+    """
+    if min_speech is None:
+        min_speech = int(getattr(settings, "ENERGY_VAD_MIN_SPEECH_MS", 250)) / 1000
+    if min_pause is None:
+        min_pause = int(getattr(settings, "ENERGY_VAD_MIN_PAUSE_MS", 300)) / 1000
+    starts, ends = _runs(energy_db > low)
+    starts, ends = _close_gaps(starts, ends, int(round(min_pause / frame_seconds)))
+    cumulative = np.concatenate(([0], np.cumsum(seeds, dtype=np.int64)))
+    keep = ((cumulative[ends] - cumulative[starts]) > 0) & ((ends - starts) * frame_seconds >= min_speech)
+    return [(float(start * frame_seconds), float(end * frame_seconds)) for start, end in zip(starts[keep], ends[keep])]
+
+
+def pause_segments(segments, duration):
+    """The gaps between (and around) sorted speech ``segments`` up to ``duration``."""
+    pauses = []
+    cursor = 0.0
+    for start, end in segments:
+        if start > cursor:
+            pauses.append((cursor, start))
+        cursor = max(cursor, end)
+    if duration > cursor:
+        pauses.append((cursor, duration))
+    return pauses
+
+
+def analyze_audio(audio, frame_ms=FRAME_MS):
+    """
+    Run the energy/spectral VAD on a ``WavAudio`` (a whole file or a slice of
+    one). Returns a dict with ``duration``, ``speech_segments``,
+    ``pause_segments``, ``speech_time``, ``pause_time`` and ``elapsed_ms``.
+    """
+    started = time.perf_counter()
+    frame_len = max(32, int(audio.sample_rate * frame_ms / 1000))
+    frame_seconds = frame_len / audio.sample_rate
+    energy_db = frame_energy(audio, frame_len)
+
+    seeds = np.zeros(len(energy_db), dtype=bool)
+    low = MIN_SPEECH_DBFS
+    if len(energy_db):
+        low, high = energy_thresholds(energy_db)
+        # Voicing only matters where a frame is loud enough to start speech
+        loud = np.flatnonzero(energy_db > high)
+        zcr, flatness = voicing_features(audio, frame_len, loud)
+        seeds[loud[(flatness < MAX_VOICED_FLATNESS) & (zcr < MAX_VOICED_ZCR)]] = True
+    segments = speech_segments(energy_db, seeds, low, frame_seconds)
+    duration = audio.duration
+
+    speech_time = sum(end - start for start, end in segments)
+    return {
+        "duration": duration,
+        "sample_rate": audio.sample_rate,
+        "speech_segments": segments,
+        "pause_segments": pause_segments(segments, duration),
+        "speech_time": speech_time,
+        "pause_time": max(0.0, duration - speech_time),
+        "elapsed_ms": (time.perf_counter() - started) * 1000,
+    }
+
+
+def detect_speech(path, frame_ms=FRAME_MS):
+    """Run the energy/spectral VAD on a WAV file (see ``analyze_audio``)."""
+    started = time.perf_counter()
+    result = analyze_audio(open_wav(path), frame_ms=frame_ms)
+    result["elapsed_ms"] = (time.perf_counter() - started) * 1000
+    return result
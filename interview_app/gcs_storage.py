@@ -2,6 +2,7 @@
 Google Cloud Storage utility for storing and retrieving PDFs
 """
 import os
+import threading
 from typing import Optional
 from django.conf import settings
 
@@ -11,21 +12,32 @@ try:
     GCS_AVAILABLE = True
 except ImportError:
     GCS_AVAILABLE = False
+    GoogleCloudError = Exception
     print("⚠️ google-cloud-storage not available. PDFs will be stored locally.")
 
 
+_client = None
+_client_lock = threading.Lock()
+
+
 def get_gcs_client():
-    """Get GCS client instance"""
+    """Get the process-wide GCS client (created on first use; thread-safe)"""
+    global _client
     if not GCS_AVAILABLE:
         return None
+    if _client is not None:
+        return _client
     
-    try:
-        # Try to get credentials from environment or service account
-        client = storage.Client()
-        return client
-    except Exception as e:
-        print(f"⚠️ Error creating GCS client: {e}")
-        return None
+    with _client_lock:
+        if _client is None:
+            try:
+                # Try to get credentials from environment or service account
+                _client = storage.Client()
+            except Exception as e:
+                # Not cached: the next call tries again
+                print(f"⚠️ Error creating GCS client: {e}")
+                return None
+    return _client
 
 
 def get_gcs_bucket_name():
@@ -204,36 +216,26 @@ def upload_video_to_gcs(video_file_path: str, gcs_file_path: str, content_type:
     Returns:
         GCS public URL if successful, None otherwise
     """
-    if not GCS_AVAILABLE:
-        print("⚠️ GCS not available, skipping video upload")
-        return None
+    from .gcs_transfer import transfer_manager
     
-    bucket_name = get_gcs_bucket_name()
-    if not bucket_name:
-        print("⚠️ GCS_BUCKET_NAME not configured, skipping video upload")
-        return None
+    # The local stand-in backend (GCS_TRANSFER_BACKEND = "local") needs neither
+    if transfer_manager.backend.name == 'gcs':
+        if not GCS_AVAILABLE:
+            print("⚠️ GCS not available, skipping video upload")
+            return None
+        
+        bucket_name = get_gcs_bucket_name()
+        if not bucket_name:
+            print("⚠️ GCS_BUCKET_NAME not configured, skipping video upload")
+            return None
     
-    import os
     if not os.path.exists(video_file_path):
         print(f"⚠️ Video file not found: {video_file_path}")
         return None
     
     try:
-        client = get_gcs_client()
-        if not client:
-            return None
-        
-        bucket = client.bucket(bucket_name)
-        blob = bucket.blob(gcs_file_path)
-        
-        # Upload video file
-        blob.upload_from_filename(video_file_path, content_type=content_type)
-        
-        # Make blob publicly readable
-        blob.make_public()
-        
-        # Get public URL
-        public_url = blob.public_url
+        # Large files go up as parallel parts composed server-side
+        public_url = transfer_manager.upload_file(video_file_path, gcs_file_path, content_type=content_type)
         print(f"✅ Video uploaded to GCS: {public_url}")
         return public_url
         
@@ -246,3 +248,74 @@ def upload_video_to_gcs(video_file_path: str, gcs_file_path: str, content_type:
         traceback.print_exc()
         return None
 
+
+
+# Resumable upload sessions take every chunk but the last in multiples of 256 KiB
+RESUMABLE_CHUNK_ALIGNMENT = 256 * 1024
+
+
+def create_resumable_upload_session(gcs_file_path: str, content_type: str = 'video/webm') -> Optional[str]:
+    """
+    Open a GCS resumable upload session of unknown final size.
+    
+    Returns:
+        Session URI (itself the credential for the upload), or None when GCS is not configured
+    """
+    if not GCS_AVAILABLE:
+        return None
+    
+    bucket_name = get_gcs_bucket_name()
+    if not bucket_name:
+        return None
+    
+    try:
+        client = get_gcs_client()
+        if not client:
+            return None
+        blob = client.bucket(bucket_name).blob(gcs_file_path)
+        return blob.create_resumable_upload_session(content_type=content_type)
+    except Exception as e:
+        print(f"❌ Error opening GCS resumable session: {e}")
+        return None
+
+
+def upload_resumable_chunk(session_url: str, data: bytes, offset: int, total_size: Optional[int] = None) -> int:
+    """
+    Send ``data`` at ``offset`` of a resumable session; ``total_size`` marks
+    the last chunk. Returns the number of bytes GCS has persisted.
+    Raises RuntimeError when GCS rejects the chunk.
+    """
+    import requests
+    
+    end = offset + len(data) - 1
+    total = str(total_size) if total_size is not None else '*'
+    content_range = f"bytes {offset}-{end}/{total}" if data else f"bytes */{total}"
+    response = requests.put(session_url, data=data, headers={'Content-Range': content_range}, timeout=120)
+    if response.status_code in (200, 201):
+        return total_size if total_size is not None else offset + len(data)
+    if response.status_code == 308:
+        # "Range: bytes=0-N" is what was persisted; no header means nothing yet
+        persisted = response.headers.get('Range')
+        return int(persisted.rsplit('-', 1)[1]) + 1 if persisted else 0
+    raise RuntimeError(f"GCS rejected chunk at {offset}: HTTP {response.status_code} {response.text[:200]}")
+
+
+def make_gcs_blob_public(gcs_file_path: str) -> Optional[str]:
+    """Make an uploaded blob publicly readable and return its public URL."""
+    if not GCS_AVAILABLE:
+        return None
+    
+    bucket_name = get_gcs_bucket_name()
+    if not bucket_name:
+        return None
+    
+    try:
+        client = get_gcs_client()
+        if not client:
+            return None
+        blob = client.bucket(bucket_name).blob(gcs_file_path)
+        blob.make_public()
+        return blob.public_url
+    except Exception as e:
+        print(f"❌ Error making GCS blob public: {e}")
+        return None
@@ -0,0 +1,276 @@
+"""
+Parallel, retried uploads of large recordings to Google Cloud Storage.
+
+``TransferManager.upload_file`` splits a file into parts of
+``GCS_TRANSFER_CHUNK_BYTES`` and uploads them concurrently
+(``GCS_TRANSFER_WORKERS`` threads), each streamed from its offset in the
+file, never read into memory whole. A failed part is retried on its own
+with backoff. The parts are then composed into the destination object
+server-side and deleted. Files smaller than one part go up in a single
+request.
+
+``submit`` runs an upload (or any publishing step) on a background
+executor, so request handlers only queue it. Every transfer's size, time
+and throughput is kept for ``metrics()``.
+
+The backend is GCS, or with ``GCS_TRANSFER_BACKEND = "local"`` a directory
+that stands in for a bucket (same part/compose/publish steps), for tests
+and development without credentials.
+"""
+import math
+import os
+import threading
+import time
+import uuid
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait
+
+from django.conf import settings
+
+from .gcs_storage import GCS_AVAILABLE, get_gcs_bucket_name, get_gcs_client
+
+# GCS composes at most 32 source objects per request
+MAX_COMPOSE_SOURCES = 32
+PART_ALIGNMENT = 256 * 1024
+COPY_BLOCK_SIZE = 1024 * 1024
+# Recent transfers kept for metrics()
+MAX_RECORDED_TRANSFERS = 200
+
+
+class GCSBackend:
+    name = "gcs"
+
+    def available(self):
+        return GCS_AVAILABLE and bool(get_gcs_bucket_name()) and get_gcs_client() is not None
+
+    def _bucket(self):
+        client = get_gcs_client()
+        bucket_name = get_gcs_bucket_name()
+        if client is None or not bucket_name:
+            raise RuntimeError("GCS is not configured")
+        return client.bucket(bucket_name)
+
+    def upload_part(self, local_path, offset, size, name, content_type):
+        blob = self._bucket().blob(name)
+        with open(local_path, "rb") as source:
+            source.seek(offset)
+            blob.upload_from_file(source, size=size, content_type=content_type, rewind=False)
+
+    def compose(self, part_names, destination, content_type):
+        bucket = self._bucket()
+        blob = bucket.blob(destination)
+        blob.content_type = content_type
+        blob.compose([bucket.blob(name) for name in part_names])
+
+    def delete(self, names):
+        bucket = self._bucket()
+        bucket.delete_blobs([bucket.blob(name) for name in names], on_error=lambda blob: None)
+
+    def publish(self, destination):
+        blob = self._bucket().blob(destination)
+        blob.make_public()
+        return blob.public_url
+
+
+class LocalBackend:
+    """A directory standing in for the bucket: parts are files, compose concatenates them."""
+
+    name = "local"
+
+    def __init__(self, root=None):
+        self.root = root or getattr(settings, "GCS_LOCAL_BACKEND_DIR", None) or os.path.join(settings.MEDIA_ROOT, "gcs_local")
+
+    def available(self):
+        return True
+
+    def _path(self, name):
+        return os.path.join(self.root, *name.split("/"))
+
+    def upload_part(self, local_path, offset, size, name, content_type):
+        target = self._path(name)
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        with open(local_path, "rb") as source, open(target, "wb") as part:
+            source.seek(offset)
+            remaining = size
+            while remaining > 0:
+                block = source.read(min(COPY_BLOCK_SIZE, remaining))
+                if not block:
+                    raise IOError(f"{local_path} ended {remaining} bytes early")
+                part.write(block)
+                remaining -= len(block)
+
+    def compose(self, part_names, destination, content_type):
+        target = self._path(destination)
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        with open(target + ".composing", "wb") as composed:
+            for name in part_names:
+                with open(self._path(name), "rb") as part:
+                    for block in iter(lambda: part.read(COPY_BLOCK_SIZE), b""):
+                        composed.write(block)
+        os.replace(target + ".composing", target)
+
+    def delete(self, names):
+        for name in names:
+            try:
+                os.remove(self._path(name))
+            except FileNotFoundError:
+                pass
+        # Parts share a directory (GCS has no directories to leave behind)
+        for directory in {os.path.dirname(self._path(name)) for name in names}:
+            try:
+                os.rmdir(directory)
+            except OSError:
+                pass
+
+    def publish(self, destination):
+        return "file://" + os.path.abspath(self._path(destination)).replace("\\", "/")
+
+
+BACKENDS = {"gcs": GCSBackend, "local": LocalBackend}
+
+
+class TransferManager:
+    """Uploads files to the configured backend in parallel parts and records throughput."""
+
+    def __init__(self, backend=None):
+        self._backend = backend
+        self._part_executor = None
+        self._job_executor = None
+        self._lock = threading.Lock()
+        self._transfers = deque(maxlen=MAX_RECORDED_TRANSFERS)
+        self._totals = {"transfers": 0, "failed": 0, "bytes": 0, "seconds": 0.0, "part_retries": 0}
+
+    @property
+    def backend(self):
+        if self._backend is None:
+            self._backend = BACKENDS[getattr(settings, "GCS_TRANSFER_BACKEND", "gcs")]()
+        return self._backend
+
+    def _executors(self):
+        # Parts and jobs get separate pools: a queued job waiting on its parts cannot starve them
+        with self._lock:
+            if self._part_executor is None:
+                self._part_executor = ThreadPoolExecutor(
+                    max_workers=int(getattr(settings, "GCS_TRANSFER_WORKERS", 8)), thread_name_prefix="gcs-part"
+                )
+                self._job_executor = ThreadPoolExecutor(
+                    max_workers=int(getattr(settings, "GCS_TRANSFER_JOBS", 2)), thread_name_prefix="gcs-job"
+                )
+        return self._part_executor, self._job_executor
+
+    def available(self):
+        return self.backend.available()
+
+    def part_size(self, file_size):
+        """Configured part size, raised when needed so one compose request takes every part."""
+        chunk = int(getattr(settings, "GCS_TRANSFER_CHUNK_BYTES", 32 * 1024 * 1024))
+        chunk = max(chunk, math.ceil(file_size / MAX_COMPOSE_SOURCES))
+        return math.ceil(chunk / PART_ALIGNMENT) * PART_ALIGNMENT
+
+    def _upload_part_with_retry(self, local_path, offset, size, name, content_type):
+        retries = int(getattr(settings, "GCS_TRANSFER_RETRIES", 3))
+        for attempt in range(retries + 1):
+            try:
+                self.backend.upload_part(local_path, offset, size, name, content_type)
+                return attempt
+            except Exception as e:
+                if attempt == retries:
+                    raise
+                delay = 0.5 * 2 ** attempt
+                print(f"⚠️ Part {name} failed ({e}), retrying in {delay:.1f}s")
+                time.sleep(delay)
+
+    def upload_file(self, local_path, destination, content_type="application/octet-stream", make_public=True):
+        """Upload ``local_path`` to ``destination``; returns its public URL (or the path when not public)."""
+        size = os.path.getsize(local_path)
+        part_size = self.part_size(size)
+        started = time.perf_counter()
+        record = {"destination": destination, "bytes": size, "backend": self.backend.name, "parts": 1,
+                  "part_retries": 0, "ok": False}
+        part_names = []
+        try:
+            if size <= part_size:
+                record["part_retries"] = self._upload_part_with_retry(local_path, 0, size, destination, content_type)
+            else:
+                part_executor, _ = self._executors()
+                prefix = f"{destination}.parts-{uuid.uuid4().hex[:8]}"
+                offsets = range(0, size, part_size)
+                part_names = [f"{prefix}/{index:03d}" for index in range(len(offsets))]
+                futures = [
+                    part_executor.submit(self._upload_part_with_retry, local_path, offset,
+                                         min(part_size, size - offset), name, content_type)
+                    for offset, name in zip(offsets, part_names)
+                ]
+                record["parts"] = len(futures)
+                try:
+                    record["part_retries"] = sum(future.result() for future in futures)
+                except Exception:
+                    # Parts still queued are dropped and running ones finish before the parts are deleted
+                    for future in futures:
+                        future.cancel()
+                    wait(futures)
+                    raise
+                self.backend.compose(part_names, destination, content_type)
+            url = self.backend.publish(destination) if make_public else destination
+            record["ok"] = True
+            return url
+        finally:
+            if part_names:
+                try:
+                    self.backend.delete(part_names)
+                except Exception as e:
+                    print(f"⚠️ Could not delete upload parts of {destination}: {e}")
+            self._record(record, time.perf_counter() - started)
+
+    def _record(self, record, seconds):
+        record.update({
+            "seconds": round(seconds, 3),
+            "mb_per_second": round(record["bytes"] / 1024 / 1024 / seconds, 2) if seconds > 0 else None,
+            "finished_at": time.time(),
+        })
+        with self._lock:
+            self._transfers.append(record)
+            self._totals["transfers"] += 1
+            self._totals["failed"] += 0 if record["ok"] else 1
+            self._totals["part_retries"] += record["part_retries"]
+            if record["ok"]:
+                self._totals["bytes"] += record["bytes"]
+                self._totals["seconds"] += seconds
+        if record["ok"]:
+            print(f"✅ Uploaded {record['destination']} ({record['bytes'] / 1024 / 1024:.1f} MB, "
+                  f"{record['parts']} parts) at {record['mb_per_second'] or 0:.1f} MB/s")
+
+    def submit(self, fn, *args, **kwargs):
+        """Run ``fn`` (an upload or publishing step) in the background; returns its Future."""
+        _, job_executor = self._executors()
+
+        def run():
+            from django.db import close_old_connections
+            try:
+                return fn(*args, **kwargs)
+            except Exception:
+                import traceback
+                traceback.print_exc()
+            finally:
+                close_old_connections()
+        return job_executor.submit(run)
+
+    def metrics(self):
+        """Totals, average throughput and the most recent transfers, JSON-serialisable."""
+        with self._lock:
+            totals = dict(self._totals)
+            recent = list(self._transfers)[-20:]
+        totals["mb_per_second"] = (
+            round(totals["bytes"] / 1024 / 1024 / totals["seconds"], 2) if totals["seconds"] > 0 else None
+        )
+        return {
+            "backend": self.backend.name,
+            "chunk_bytes": int(getattr(settings, "GCS_TRANSFER_CHUNK_BYTES", 32 * 1024 * 1024)),
+            "workers": int(getattr(settings, "GCS_TRANSFER_WORKERS", 8)),
+            "totals": totals,
+            "recent": recent,
+        }
+
+
+# Global instance for easy access
+transfer_manager = TransferManager()
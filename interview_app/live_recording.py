@@ -0,0 +1,195 @@
+"""
+Live ingest of MediaRecorder segments while the interview runs.
+
+The browser records with a timeslice and POSTs every segment as it is
+produced, numbered from 0. MediaRecorder segments are consecutive pieces of
+one WebM/fragmented-MP4 stream, so each is appended to the recording's
+partial file (the same MediaUpload storage as chunked uploads). A segment
+that is retried after a lost response is acknowledged again, not appended
+twice; one that arrives early is refused with the index expected next.
+
+With ``gcs_path`` set, what has arrived is also pushed to a GCS resumable
+session in the background, in 256 KiB-aligned pieces, so the object is
+nearly complete when the interview ends. Finalizing is then a stream-copy
+remux (duration and seek index) of the local copy, the last GCS piece and
+the usual processing, instead of uploading and converting the whole
+recording at once. The GCS object stays the stream as recorded, so the
+recording goes up once.
+"""
+import os
+import threading
+from collections import defaultdict
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+
+from .chunked_upload import (
+    UploadError,
+    append_staged,
+    discard_staged,
+    enqueue,
+    finalize_upload,
+    partial_path,
+    stage_chunk,
+)
+from .gcs_storage import (
+    RESUMABLE_CHUNK_ALIGNMENT,
+    create_resumable_upload_session,
+    make_gcs_blob_public,
+    upload_resumable_chunk,
+)
+from .media_finalize import remux
+from .models import MediaUpload
+
+CONTENT_TYPES = {".webm": "video/webm", ".mp4": "video/mp4", ".m4a": "audio/mp4", ".ogg": "audio/ogg"}
+
+# One GCS push at a time per recording: pieces must arrive in order
+_gcs_locks = defaultdict(threading.Lock)
+_gcs_locks_lock = threading.Lock()
+
+
+def _gcs_lock(upload_id):
+    with _gcs_locks_lock:
+        return _gcs_locks[str(upload_id)]
+
+
+def start_live_recording(session, kind, filename="", metadata=None, gcs_path=""):
+    """Open a live recording; segments are then appended with ``append_segment``."""
+    if kind not in MediaUpload.Kind.values:
+        raise UploadError(f"Unknown recording kind: {kind}")
+    upload = MediaUpload.objects.create(
+        session=session, kind=kind, length=0, live=True, filename=os.path.basename(filename or ""),
+        metadata=metadata or {}, gcs_path=gcs_path or "",
+    )
+    path = partial_path(upload)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    open(path, "wb").close()
+    print(f"🔴 Live {kind} recording {upload.id} started" + (f" (streaming to GCS {gcs_path})" if gcs_path else ""))
+    return upload
+
+
+def append_segment(upload_id, index, stream, content_length):
+    """Append segment ``index`` of a live recording; returns ``(segments, bytes)`` received so far."""
+    max_segment = int(getattr(settings, "CHUNKED_UPLOAD_MAX_CHUNK_BYTES", 16 * 1024 * 1024))
+    if content_length <= 0:
+        raise UploadError("Empty segment")
+    if content_length > max_segment:
+        raise UploadError(f"Segment larger than {max_segment} bytes", status=413)
+
+    # Acknowledge a retry or refuse a segment out of order before reading its body
+    upload = MediaUpload.objects.filter(pk=upload_id, live=True).first()
+    if _check_segment(upload, index):
+        return upload.segments, upload.offset
+    staged = stage_chunk(upload_id, stream, content_length)
+    try:
+        with transaction.atomic():
+            upload = MediaUpload.objects.select_for_update().filter(pk=upload_id, live=True).first()
+            if _check_segment(upload, index):
+                return upload.segments, upload.offset
+            append_staged(upload, staged, upload.offset)
+            upload.segments += 1
+            upload.save(update_fields=["offset", "synced_offset", "segments", "updated_at"])
+    finally:
+        discard_staged(staged)
+
+    if upload.gcs_path and upload.offset - upload.gcs_offset >= _gcs_piece_bytes():
+        enqueue(_push_to_gcs, upload.pk)
+    return upload.segments, upload.offset
+
+
+def _check_segment(upload, index):
+    """True when segment ``index`` was already received (its response was lost); raises when it cannot be taken."""
+    if upload is None:
+        raise UploadError("Recording not found", status=404)
+    if index < upload.segments:
+        return True
+    if upload.status != MediaUpload.Status.UPLOADING:
+        raise UploadError(f"Recording is {upload.status.lower()}", status=409)
+    if index > upload.segments:
+        raise UploadError(f"Segment {index} out of order: expected {upload.segments}", status=409)
+    return False
+
+
+def _gcs_piece_bytes():
+    piece = int(getattr(settings, "LIVE_RECORDING_GCS_PIECE_BYTES", 8 * 1024 * 1024))
+    return max(RESUMABLE_CHUNK_ALIGNMENT, piece - piece % RESUMABLE_CHUNK_ALIGNMENT)
+
+
+def _push_to_gcs(upload_id, path=None, final=False):
+    """
+    Send what GCS does not have yet. Until ``final``, only whole aligned
+    pieces go; the final push sends the rest with the total size, which
+    completes the object. Returns the public URL once complete.
+    """
+    with _gcs_lock(upload_id):
+        try:
+            upload = MediaUpload.objects.get(pk=upload_id)
+            if not upload.gcs_path:
+                return None
+            path = path or partial_path(upload)
+            if not upload.gcs_session_url:
+                content_type = CONTENT_TYPES.get(os.path.splitext(upload.filename)[1].lower(), "video/webm")
+                upload.gcs_session_url = create_resumable_upload_session(upload.gcs_path, content_type) or ""
+                if not upload.gcs_session_url:
+                    return None
+                MediaUpload.objects.filter(pk=upload_id).update(gcs_session_url=upload.gcs_session_url)
+
+            piece = _gcs_piece_bytes()
+            sent = upload.gcs_offset
+            with open(path, "rb") as recording:
+                total = os.fstat(recording.fileno()).st_size
+                end = total if final else total - total % RESUMABLE_CHUNK_ALIGNMENT
+                while sent < end or final:
+                    recording.seek(sent)
+                    data = recording.read(min(piece, end - sent))
+                    last = final and sent + len(data) >= total
+                    sent = upload_resumable_chunk(upload.gcs_session_url, data, sent, total if last else None)
+                    MediaUpload.objects.filter(pk=upload_id).update(gcs_offset=sent)
+                    if last:
+                        break
+            if final:
+                return make_gcs_blob_public(upload.gcs_path)
+            return None
+        except FileNotFoundError:
+            # Renamed by finalization meanwhile: the final push sends the rest
+            return None
+        except Exception as e:
+            print(f"⚠️ Live GCS upload of {upload_id} paused: {e}")
+            return None
+        finally:
+            close_old_connections()
+
+
+def finalize_live_recording(upload_id, destination, process):
+    """
+    Close a live recording: the received bytes become its length and it is
+    finalized like a chunked upload. Its processing first completes the GCS
+    object (``upload.result["gcs_url"]``), then remuxes the local file in place.
+    """
+    with transaction.atomic():
+        upload = MediaUpload.objects.select_for_update().filter(pk=upload_id, live=True).first()
+        if upload is None:
+            raise UploadError("Recording not found", status=404)
+        if upload.status == MediaUpload.Status.UPLOADING:
+            if upload.offset == 0:
+                raise UploadError("No segments received", status=409)
+            upload.length = upload.offset
+            upload.save(update_fields=["length", "updated_at"])
+
+    def process_live(upload, path):
+        # The streamed object is completed as recorded; only the local copy is remuxed
+        gcs_url = _push_to_gcs(upload.pk, path=path, final=True) if upload.gcs_path else None
+        base, ext = os.path.splitext(path)
+        remuxed = f"{base}_remux{ext}"
+        if remux(path, remuxed):
+            os.replace(remuxed, path)
+        elif os.path.exists(remuxed):
+            os.remove(remuxed)
+        result = process(upload, path, gcs_url) or {}
+        result["gcs_url"] = result.get("gcs_url") or gcs_url
+        result["segments"] = upload.segments
+        with _gcs_locks_lock:
+            _gcs_locks.pop(str(upload.pk), None)
+        return result
+
+    return finalize_upload(upload_id, destination, process_live)
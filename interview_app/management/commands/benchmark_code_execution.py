@@ -0,0 +1,88 @@
+"""
+Django management command to benchmark coding-round submission latency.
+Usage: python manage.py benchmark_code_execution [--cases 10] [--languages CPP JAVA]
+
+For every compiled language with a toolchain on this host, times one
+``run_test_suite`` call (compile once, run every case on the same binary)
+against the old path of calling the per-case executor for each test case,
+which regenerates the harness and recompiles every time.
+"""
+import time
+
+from django.core.management.base import BaseCommand
+
+from interview_app.code_execution import (
+    COMPILED_LANGUAGES,
+    LANGUAGE_EXECUTORS,
+    run_test_suite,
+)
+
+SAMPLE_SOLUTIONS = {
+    'C': "int add(int a, int b) { return a + b; }",
+    'CPP': "int add(int a, int b) { return a + b; }",
+    'JAVA': (
+        "public class Solution {\n"
+        "    public static int add(int a, int b) { return a + b; }\n"
+        "}\n"
+    ),
+    'GO': "package main\n\nfunc add(a int, b int) int {\n    return a + b\n}\n",
+}
+
+
+class _BenchmarkCase:
+    def __init__(self, input_data, expected_output):
+        self.input_data = input_data
+        self.expected_output = expected_output
+        self.is_hidden = False
+
+
+class Command(BaseCommand):
+    help = 'Benchmark compile-once test suite execution against per-case compilation'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--cases',
+            type=int,
+            default=10,
+            help='Test cases per submission (default: 10)',
+        )
+        parser.add_argument(
+            '--languages',
+            nargs='*',
+            default=sorted(SAMPLE_SOLUTIONS),
+            help='Languages to benchmark (default: C CPP GO JAVA)',
+        )
+
+    def handle(self, *args, **options):
+        test_cases = [
+            _BenchmarkCase(f"{i},{i * 2}", str(i * 3)) for i in range(options['cases'])
+        ]
+
+        for language in options['languages']:
+            language = language.upper()
+            code = SAMPLE_SOLUTIONS.get(language)
+            if code is None or language not in COMPILED_LANGUAGES:
+                self.stdout.write(self.style.WARNING(f'{language}: not a compiled language, skipped'))
+                continue
+
+            probe = LANGUAGE_EXECUTORS[language](code, test_cases[0].input_data)
+            if probe.returncode != 0:
+                self.stdout.write(self.style.WARNING(
+                    f'{language}: toolchain unavailable, skipped ({(probe.stderr or "").strip()[:120]})'
+                ))
+                continue
+
+            start = time.perf_counter()
+            for test_case in test_cases:
+                LANGUAGE_EXECUTORS[language](code, test_case.input_data)
+            per_case_seconds = time.perf_counter() - start
+
+            start = time.perf_counter()
+            all_passed, _, _ = run_test_suite(code, language, test_cases)
+            suite_seconds = time.perf_counter() - start
+
+            speedup = per_case_seconds / suite_seconds if suite_seconds else 0.0
+            self.stdout.write(
+                f'{language}: {len(test_cases)} cases - per-case compile {per_case_seconds:.2f}s, '
+                f'compile once {suite_seconds:.2f}s ({speedup:.1f}x), all passed: {all_passed}'
+            )
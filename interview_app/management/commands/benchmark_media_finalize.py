@@ -0,0 +1,135 @@
+"""
+Django management command to benchmark recording finalization.
+Usage: python manage.py benchmark_media_finalize [--video RAW.mp4 --audio AUDIO.webm]
+                                                 [--minutes 10] [--offset 0.4] [--threads 0]
+
+Compares the single FFmpeg pass of ``media_finalize.finalize_recording``
+against the chain it replaces, run as the equivalent FFmpeg steps:
+
+1. uploaded audio converted to a 44.1 kHz WAV (``convert_audio_to_wav``),
+2. merge with the video re-encoded to H.264/AAC (what the MoviePy merge does),
+3. 16 kHz mono WAV extracted from the merged MP4 for voice analysis.
+
+Without ``--video``/``--audio`` a camera-like recording is synthesized (5 fps
+MPEG-4 Part 2 video, as OpenCV writes it, and Opus/WebM audio, as
+MediaRecorder uploads it). Reports wall time, child CPU time, blocks written
+to disk and the bytes of every file each step read and wrote.
+"""
+import os
+import tempfile
+
+from django.core.management.base import BaseCommand, CommandError
+
+from interview_app.audio_processor import get_ffmpeg_path
+from interview_app.media_finalize import ANALYSIS_SAMPLE_RATE, ffmpeg_threads, finalize_recording, run_measured
+
+
+def _synthesize(ffmpeg, work_dir, minutes):
+    video_path = os.path.join(work_dir, 'raw.mp4')
+    audio_path = os.path.join(work_dir, 'audio.webm')
+    seconds = str(int(minutes * 60))
+    steps = [
+        [ffmpeg, '-y', '-loglevel', 'error', '-f', 'lavfi', '-i', 'testsrc2=size=640x480:rate=5',
+         '-t', seconds, '-c:v', 'mpeg4', '-q:v', '5', video_path],
+        [ffmpeg, '-y', '-loglevel', 'error', '-f', 'lavfi', '-i', 'sine=frequency=220:sample_rate=48000',
+         '-t', seconds, '-c:a', 'libopus', '-b:a', '64k', audio_path],
+    ]
+    for cmd in steps:
+        returncode, stderr, _ = run_measured(cmd)
+        if returncode != 0:
+            raise CommandError(f'Could not synthesize test media: {stderr.strip()[-500:]}')
+    return video_path, audio_path
+
+
+def _size(path):
+    return os.path.getsize(path) if os.path.exists(path) else 0
+
+
+class Command(BaseCommand):
+    help = 'Compare single-pass recording finalization with the previous multi-step FFmpeg chain'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--video', help='Raw camera video (default: synthesized)')
+        parser.add_argument('--audio', help='Uploaded interview audio (default: synthesized)')
+        parser.add_argument('--minutes', type=float, default=10, help='Length of the synthesized recording (default: 10)')
+        parser.add_argument('--offset', type=float, default=0.4, help='Seconds the audio started after the video (default: 0.4)')
+        parser.add_argument('--threads', type=int, default=0, help='FFmpeg threads (default: MEDIA_FFMPEG_THREADS / core count)')
+
+    def _legacy_chain(self, ffmpeg, video_path, audio_path, work_dir, offset, threads):
+        wav_44k = os.path.join(work_dir, 'legacy_audio.wav')
+        merged = os.path.join(work_dir, 'legacy_with_audio.mp4')
+        analysis_wav = os.path.join(work_dir, 'legacy_analysis.wav')
+        steps = [
+            ('audio to WAV', [ffmpeg, '-y', '-loglevel', 'error', '-i', audio_path,
+                              '-acodec', 'pcm_s16le', '-ar', '44100', '-ac', '1', wav_44k],
+             [audio_path], [wav_44k]),
+            ('merge + H.264', [ffmpeg, '-y', '-loglevel', 'error', '-i', video_path, '-i', wav_44k,
+                               '-filter_complex', f'[1:a]adelay={int(offset * 1000)}:all=1[a]',
+                               '-map', '0:v', '-map', '[a]', '-c:v', 'libx264', '-preset', 'veryfast',
+                               '-pix_fmt', 'yuv420p', '-threads', str(threads), '-c:a', 'aac',
+                               '-movflags', '+faststart', '-shortest', merged],
+             [video_path, wav_44k], [merged]),
+            ('analysis WAV', [ffmpeg, '-y', '-loglevel', 'error', '-i', merged, '-vn',
+                              '-ar', str(ANALYSIS_SAMPLE_RATE), '-ac', '1', '-acodec', 'pcm_s16le', analysis_wav],
+             [merged], [analysis_wav]),
+        ]
+        totals = {'wall_seconds': 0.0, 'cpu_seconds': 0.0, 'disk_write_bytes': 0, 'input_bytes': 0, 'output_bytes': 0}
+        for name, cmd, inputs, outputs in steps:
+            returncode, stderr, usage = run_measured(cmd)
+            if returncode != 0:
+                raise CommandError(f'Legacy step "{name}" failed: {stderr.strip()[-500:]}')
+            usage['input_bytes'] = sum(_size(path) for path in inputs)
+            usage['output_bytes'] = sum(_size(path) for path in outputs)
+            self._report(f'  {name}', usage)
+            for key in totals:
+                totals[key] += usage.get(key, 0)
+        return totals
+
+    def _report(self, label, usage):
+        cpu = f"{usage['cpu_seconds']:>8.1f}s" if 'cpu_seconds' in usage else f"{'n/a':>9}"
+        self.stdout.write(
+            f"{label:<22} {usage['wall_seconds']:>8.1f}s {cpu} "
+            f"{usage.get('disk_write_bytes', 0) / 1024 / 1024:>10.1f} MB "
+            f"{usage['input_bytes'] / 1024 / 1024:>9.1f} MB {usage['output_bytes'] / 1024 / 1024:>9.1f} MB"
+        )
+
+    def handle(self, *args, **options):
+        ffmpeg = get_ffmpeg_path()
+        if not ffmpeg:
+            raise CommandError('FFmpeg not found')
+        if bool(options['video']) != bool(options['audio']):
+            raise CommandError('Pass both --video and --audio, or neither')
+        threads = options['threads'] or ffmpeg_threads()
+        offset = max(0.0, options['offset'])
+
+        with tempfile.TemporaryDirectory() as work_dir:
+            if options['video']:
+                video_path, audio_path = options['video'], options['audio']
+                for path in (video_path, audio_path):
+                    if not os.path.exists(path):
+                        raise CommandError(f'{path} does not exist')
+            else:
+                self.stdout.write(f"Synthesizing a {options['minutes']:g} min recording...")
+                video_path, audio_path = _synthesize(ffmpeg, work_dir, options['minutes'])
+
+            self.stdout.write(f"{'':<22} {'wall':>9} {'CPU':>9} {'disk write':>13} {'file in':>12} {'file out':>12}")
+            legacy = self._legacy_chain(ffmpeg, video_path, audio_path, work_dir, offset, threads)
+            self._report('previous chain', legacy)
+
+            single = finalize_recording(
+                video_path, audio_path, os.path.join(work_dir, 'single_with_audio.mp4'),
+                wav_path=os.path.join(work_dir, 'single_analysis.wav'),
+                poster_path=os.path.join(work_dir, 'single_poster.jpg'),
+                video_start_timestamp=1.0, audio_start_timestamp=1.0 + offset, threads=threads,
+            )
+            if single is None:
+                raise CommandError('Single-pass finalization failed')
+            self._report(f'single pass ({threads} thr)', single)
+
+            wall_gain = legacy['wall_seconds'] / max(single['wall_seconds'], 1e-9)
+            cpu_gain = legacy['cpu_seconds'] / max(single.get('cpu_seconds', 0), 1e-9)
+            io_saved = (legacy['input_bytes'] + legacy['output_bytes']) - (single['input_bytes'] + single['output_bytes'])
+            self.stdout.write(self.style.SUCCESS(
+                f"Single pass: {wall_gain:.2f}x faster, {cpu_gain:.2f}x less CPU, "
+                f"{io_saved / 1024 / 1024:.1f} MB less file I/O (also writes the poster)"
+            ))
@@ -0,0 +1,88 @@
+"""
+Django management command to fill and validate the coding question bank.
+Usage: python manage.py populate_question_bank [--file questions.json] [--languages PYTHON CPP]
+                                               [--no-builtin] [--revalidate]
+
+Loads the built-in seed questions and/or a JSON file (a list of objects with
+slug, language, title, description, difficulty, skill_tags, starter_code,
+reference_solution and test_cases), then runs every unvalidated question's
+reference solution against its test cases. Only questions whose reference
+solution passes every case are served to interviews.
+"""
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from interview_app.models import CodingBankQuestion
+from interview_app.question_bank import BUILTIN_QUESTIONS, upsert_bank_question, validate_bank_question
+
+
+class Command(BaseCommand):
+    help = 'Load coding questions into the question bank and validate their reference solutions'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--file',
+            help='JSON file with a list of questions to load',
+        )
+        parser.add_argument(
+            '--languages',
+            nargs='*',
+            help='Only load/validate these languages (default: all)',
+        )
+        parser.add_argument(
+            '--no-builtin',
+            action='store_true',
+            help='Do not load the built-in seed questions',
+        )
+        parser.add_argument(
+            '--revalidate',
+            action='store_true',
+            help='Re-run reference solutions of questions that are already validated',
+        )
+
+    def handle(self, *args, **options):
+        entries = [] if options['no_builtin'] else list(BUILTIN_QUESTIONS)
+        if options['file']:
+            try:
+                with open(options['file'], encoding='utf-8') as handle:
+                    entries.extend(json.load(handle))
+            except (OSError, ValueError) as e:
+                raise CommandError(f"Could not read {options['file']}: {e}")
+
+        languages = {language.upper() for language in options['languages'] or []}
+        if languages:
+            entries = [entry for entry in entries if entry['language'].upper() in languages]
+
+        created_count = 0
+        for entry in entries:
+            try:
+                _, created = upsert_bank_question(entry)
+            except KeyError as e:
+                self.stderr.write(self.style.ERROR(f"Skipping {entry.get('slug', '?')}: missing field {e}"))
+                continue
+            created_count += created
+        self.stdout.write(f"Loaded {len(entries)} questions ({created_count} new)")
+
+        queryset = CodingBankQuestion.objects.filter(is_active=True)
+        if languages:
+            queryset = queryset.filter(language__in=languages)
+        if not options['revalidate']:
+            queryset = queryset.filter(is_validated=False)
+
+        passed, failed = 0, 0
+        for question in queryset.order_by('language', 'slug'):
+            label = f"{question.language:<10} {question.slug}"
+            if validate_bank_question(question):
+                passed += 1
+                self.stdout.write(self.style.SUCCESS(f"✅ {label}"))
+            else:
+                failed += 1
+                self.stdout.write(self.style.WARNING(f"❌ {label}"))
+                for line in (question.validation_log or '').splitlines()[:3]:
+                    self.stdout.write(f"   {line}")
+
+        served = CodingBankQuestion.objects.filter(is_validated=True, is_active=True).count()
+        self.stdout.write(
+            f"Validated {passed}, failed {failed}. {served} questions are available to interviews."
+        )
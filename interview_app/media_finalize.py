@@ -0,0 +1,206 @@
+"""
+Single-pass finalization of an interview recording.
+
+The camera writes a silent OpenCV video and the browser uploads the audio
+separately. ``finalize_recording`` turns the two into everything the rest of
+the app reads with one FFmpeg run: each input is decoded once and the decoded
+streams are split inside the filter graph into
+
+* the browser MP4 (H.264/AAC, faststart) with the audio shifted by the
+  difference between the recording start timestamps,
+* the 16 kHz mono PCM WAV voice analysis reads as is (same timeline as the MP4),
+* a poster JPEG picked from the first seconds of the video.
+
+The previous chain decoded and re-encoded the same media up to four times
+(audio to WAV, merge, H.264 conversion, audio extracted again for analysis).
+"""
+import os
+import subprocess
+import tempfile
+import threading
+import time
+
+from django.conf import settings
+
+from .audio_processor import get_ffmpeg_path
+
+# Offsets below this are treated as already in sync (same threshold as the merge functions)
+SYNC_TOLERANCE_SECONDS = 0.01
+# The poster is the most representative frame of the opening seconds
+POSTER_WINDOW_SECONDS = 3
+ANALYSIS_SAMPLE_RATE = 16000
+FINALIZE_TIMEOUT_SECONDS = 1800
+
+
+def ffmpeg_threads():
+    """
+    Thread count for FFmpeg: ``MEDIA_FFMPEG_THREADS``, or when 0 the cores
+    this process may use divided among the transcode workers.
+    """
+    threads = int(getattr(settings, "MEDIA_FFMPEG_THREADS", 0) or 0)
+    if threads > 0:
+        return threads
+    from .transcode_queue import available_cores, transcode_workers
+    return max(1, available_cores() // transcode_workers())
+
+
+def audio_offset(video_start_timestamp, audio_start_timestamp):
+    """Seconds the audio started after the video (negative: before); 0 when unknown or in sync."""
+    if not video_start_timestamp or not audio_start_timestamp:
+        return 0.0
+    offset = audio_start_timestamp - video_start_timestamp
+    return offset if abs(offset) > SYNC_TOLERANCE_SECONDS else 0.0
+
+
+def build_finalize_command(ffmpeg, video_path, audio_path, output_path, wav_path=None, poster_path=None,
+                           offset=0.0, threads=1):
+    """The FFmpeg argument list writing the MP4 and, when given, the WAV and poster in one run."""
+    cmd = [ffmpeg, "-hide_banner", "-nostdin", "-loglevel", "error", "-y",
+           "-filter_complex_threads", str(threads), "-i", video_path]
+    if offset < 0:
+        # Audio started before the video: skip its head while demuxing
+        cmd += ["-ss", f"{-offset:.3f}"]
+    cmd += ["-i", audio_path]
+
+    # async=1 fills the timestamp gaps MediaRecorder leaves in WebM audio
+    audio_chain = "[1:a]aresample=async=1:first_pts=0"
+    if offset > 0:
+        audio_chain += f",adelay={int(round(offset * 1000))}:all=1"
+    graph = []
+    if wav_path:
+        graph.append(f"{audio_chain},asplit=2[a_mp4][a_wav]")
+    else:
+        graph.append(f"{audio_chain}[a_mp4]")
+    if poster_path:
+        graph.append("[0:v]format=yuv420p,split=2[v_mp4][v_poster]")
+        graph.append(f"[v_poster]trim=end={POSTER_WINDOW_SECONDS},thumbnail[poster]")
+    else:
+        graph.append("[0:v]format=yuv420p[v_mp4]")
+    cmd += ["-filter_complex", ";".join(graph)]
+
+    cmd += [
+        "-map", "[v_mp4]", "-map", "[a_mp4]",
+        "-c:v", "libx264", "-preset", "veryfast", "-crf", "23", "-threads", str(threads),
+        "-c:a", "aac", "-b:a", "128k", "-ar", "44100",
+        "-movflags", "+faststart", "-shortest", output_path,
+    ]
+    if wav_path:
+        cmd += ["-map", "[a_wav]", "-ac", "1", "-ar", str(ANALYSIS_SAMPLE_RATE), "-c:a", "pcm_s16le", wav_path]
+    if poster_path:
+        cmd += ["-map", "[poster]", "-frames:v", "1", "-q:v", "3", poster_path]
+    return cmd
+
+
+def run_measured(cmd, timeout=FINALIZE_TIMEOUT_SECONDS, progress=None):
+    """
+    Run ``cmd`` and return ``(returncode, stderr, usage)``. ``usage`` holds the
+    wall time and, where ``os.wait4`` exists, the child's own CPU time and
+    block I/O (not shared with other children of this process). With
+    ``progress``, ``cmd`` must be an FFmpeg run: ``progress(seconds)`` is
+    called with the output time it has reached as it goes.
+    """
+    if progress:
+        cmd = [cmd[0], "-progress", "pipe:1", "-nostats"] + list(cmd[1:])
+    with tempfile.TemporaryFile() as log:
+        started = time.perf_counter()
+        process = subprocess.Popen(cmd, stdin=subprocess.DEVNULL,
+                                   stdout=subprocess.PIPE if progress else subprocess.DEVNULL, stderr=log)
+        timer = threading.Timer(timeout, process.kill) if timeout else None
+        if timer:
+            timer.start()
+        try:
+            if progress:
+                for line in process.stdout:
+                    if line.startswith(b"out_time_us="):
+                        try:
+                            progress(int(line.split(b"=", 1)[1]) / 1e6)
+                        except ValueError:
+                            pass  # "N/A" until the first frame is out
+                process.stdout.close()
+            if hasattr(os, "wait4"):
+                _, status, rusage = os.wait4(process.pid, 0)
+                process.returncode = os.waitstatus_to_exitcode(status)
+            else:
+                process.wait()
+                rusage = None
+        finally:
+            if timer:
+                timer.cancel()
+        usage = {"wall_seconds": time.perf_counter() - started}
+        if rusage is not None:
+            usage.update({
+                "cpu_seconds": rusage.ru_utime + rusage.ru_stime,
+                # ru_inblock/ru_oublock count 512-byte blocks that reached the disk
+                "disk_read_bytes": rusage.ru_inblock * 512,
+                "disk_write_bytes": rusage.ru_oublock * 512,
+                "max_rss_bytes": rusage.ru_maxrss * 1024,
+            })
+        log.seek(0)
+        stderr = log.read().decode("utf-8", errors="replace")
+    return process.returncode, stderr, usage
+
+
+def finalize_recording(video_path, audio_path, output_path, wav_path=None, poster_path=None,
+                       video_start_timestamp=None, audio_start_timestamp=None, threads=None,
+                       progress=None, duration=None):
+    """
+    Write the merged MP4 (and the analysis WAV and poster when paths are
+    given) from the raw video and the uploaded audio in one FFmpeg run.
+    Returns a stats dict (outputs, sizes, wall/CPU time, I/O), or None when
+    FFmpeg is missing or fails. ``progress(fraction)`` is called as the
+    encode advances when the recording's ``duration`` (seconds) is known.
+    """
+    ffmpeg = get_ffmpeg_path()
+    if not ffmpeg:
+        return None
+    threads = threads or ffmpeg_threads()
+    offset = audio_offset(video_start_timestamp, audio_start_timestamp)
+    outputs = [path for path in (output_path, wav_path, poster_path) if path]
+    for path in outputs:
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+
+    cmd = build_finalize_command(ffmpeg, video_path, audio_path, output_path, wav_path, poster_path, offset, threads)
+    print(f"🎬 Finalizing recording in one FFmpeg pass ({threads} threads, audio offset {offset:+.3f}s)...")
+    on_progress = (lambda seconds: progress(seconds / duration)) if progress and duration else None
+    returncode, stderr, usage = run_measured(cmd, progress=on_progress)
+    if returncode != 0 or not os.path.exists(output_path) or os.path.getsize(output_path) == 0:
+        print(f"❌ FFmpeg finalization failed (exit {returncode}): {stderr.strip()[-1000:]}")
+        for path in outputs:
+            if os.path.exists(path):
+                os.remove(path)
+        return None
+
+    stats = dict(usage)
+    stats.update({
+        "threads": threads,
+        "audio_offset_seconds": offset,
+        "input_bytes": os.path.getsize(video_path) + os.path.getsize(audio_path),
+        "outputs": {path: os.path.getsize(path) for path in outputs if os.path.exists(path)},
+    })
+    stats["output_bytes"] = sum(stats["outputs"].values())
+    cpu = f", {stats['cpu_seconds']:.1f}s CPU" if "cpu_seconds" in stats else ""
+    print(f"✅ Recording finalized in {stats['wall_seconds']:.1f}s{cpu}: "
+          f"{stats['input_bytes'] / 1024 / 1024:.1f} MB in, {stats['output_bytes'] / 1024 / 1024:.1f} MB out")
+    return stats
+
+
+def remux(input_path, output_path):
+    """
+    Copy the streams of a live-recorded file into a fresh container (no
+    re-encode): MediaRecorder output has no duration or seek index until this
+    runs. Returns True on success.
+    """
+    ffmpeg = get_ffmpeg_path()
+    if not ffmpeg:
+        return False
+    cmd = [ffmpeg, "-hide_banner", "-nostdin", "-loglevel", "error", "-y",
+           "-fflags", "+genpts", "-i", input_path, "-map", "0", "-c", "copy"]
+    if output_path.lower().endswith((".mp4", ".m4a")):
+        cmd += ["-movflags", "+faststart"]
+    cmd.append(output_path)
+    returncode, stderr, usage = run_measured(cmd, timeout=600)
+    if returncode != 0 or not os.path.exists(output_path):
+        print(f"⚠️ Remux of {input_path} failed (exit {returncode}): {stderr.strip()[-500:]}")
+        return False
+    print(f"✅ Remuxed {os.path.basename(input_path)} in {usage['wall_seconds']:.2f}s")
+    return True
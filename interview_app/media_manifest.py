@@ -0,0 +1,140 @@
+"""
+Per-session media manifest.
+
+Every artifact of an interview recording (uploaded audio, the analysis WAV,
+raw and merged camera video, poster, screen recording) gets one
+``MediaArtifact`` row per role: its path under ``MEDIA_ROOT``, the Unix time
+its recording started, and its duration, codec and size. Merge and analysis
+steps look an artifact up by (session, role) instead of globbing
+``interview_audio/`` and probing candidate names, and the audio/video start
+timestamps survive restarts and are shared between workers.
+
+A recording's start timestamp is often known before its file is written
+(the browser sends it with the upload request); ``record_artifact`` fills
+in whatever it is given and leaves the other fields as they were. Request
+handlers record the path with ``probe=False`` and leave FFprobe to
+``probe_artifact_later``.
+"""
+import os
+
+from django.conf import settings
+from django.db import close_old_connections
+
+from .chunked_upload import enqueue
+from .models import InterviewSession, MediaArtifact
+
+Role = MediaArtifact.Role
+# Containers whose codec and duration are worth an ffprobe run
+PROBED_ROLES = {Role.AUDIO, Role.ANALYSIS_AUDIO, Role.RAW_VIDEO, Role.VIDEO, Role.SCREEN}
+
+
+def _session_filter(session):
+    """Filter kwargs for a session given as an InterviewSession or its session_key."""
+    if isinstance(session, InterviewSession):
+        return {"session": session}
+    return {"session__session_key": session}
+
+
+def _relative(path):
+    if not os.path.isabs(path):
+        return path.replace("\\", "/")
+    return os.path.relpath(path, settings.MEDIA_ROOT).replace("\\", "/")
+
+
+def _probe(path):
+    """``(duration, codec)`` of a media file; ``(None, "")`` when FFprobe is missing or fails."""
+    try:
+        from .audio_processor import get_audio_info
+        info = get_audio_info(path) or {}
+        return info.get("duration"), (info.get("codec") or "")[:50]
+    except Exception:
+        return None, ""
+
+
+def record_artifact(session, role, path=None, start_timestamp=None, duration=None, codec=None, probe=True):
+    """
+    Record (or update) the ``role`` artifact of ``session``. Only the values
+    given are written; with a ``path``, its size is read and, when not given,
+    its duration and codec are probed. Returns the MediaArtifact, or None
+    when the session does not exist.
+    """
+    fields = {}
+    if path:
+        fields["path"] = _relative(path)
+        full_path = os.path.join(settings.MEDIA_ROOT, fields["path"])
+        if os.path.exists(full_path):
+            fields["size"] = os.path.getsize(full_path)
+            if probe and role in PROBED_ROLES and (duration is None or codec is None):
+                probed_duration, probed_codec = _probe(full_path)
+                duration = probed_duration if duration is None else duration
+                codec = probed_codec if codec is None else codec
+    if start_timestamp is not None:
+        fields["start_timestamp"] = start_timestamp
+    if duration is not None:
+        fields["duration"] = duration
+    if codec is not None:
+        fields["codec"] = codec
+
+    if not isinstance(session, InterviewSession):
+        session = InterviewSession.objects.filter(session_key=session).first()
+        if session is None:
+            return None
+    artifact, _ = MediaArtifact.objects.update_or_create(session=session, role=role, defaults=fields)
+    return artifact
+
+
+def probe_artifact_later(session, role, path):
+    """Queue ``record_artifact`` for ``path`` on the media processing executor, so FFprobe stays off the request thread."""
+    return enqueue(_probe_artifact, session, role, path)
+
+
+def _probe_artifact(session, role, path):
+    try:
+        record_artifact(session, role, path=path)
+    except Exception as e:
+        print(f"⚠️ Could not probe {role} artifact {path}: {e}")
+    finally:
+        close_old_connections()
+
+
+def get_artifact(session, role):
+    """The ``role`` artifact of ``session``, or None."""
+    return MediaArtifact.objects.filter(role=role, **_session_filter(session)).first()
+
+
+def artifact_path(session, *roles):
+    """Absolute path of the first of ``roles`` recorded for ``session`` whose file exists, or None."""
+    artifacts = {
+        artifact.role: artifact
+        for artifact in MediaArtifact.objects.filter(role__in=roles, **_session_filter(session)).exclude(path="")
+    }
+    for role in roles:
+        artifact = artifacts.get(role)
+        if artifact:
+            full_path = os.path.join(settings.MEDIA_ROOT, artifact.path)
+            if os.path.exists(full_path):
+                return full_path
+    return None
+
+
+def start_timestamps(session):
+    """``(audio_start_timestamp, video_start_timestamp)`` recorded for ``session`` (None when unknown)."""
+    timestamps = dict(
+        MediaArtifact.objects.filter(role__in=[Role.AUDIO, Role.RAW_VIDEO], **_session_filter(session))
+        .values_list("role", "start_timestamp")
+    )
+    return timestamps.get(Role.AUDIO), timestamps.get(Role.RAW_VIDEO)
+
+
+def manifest(session):
+    """JSON view of every recorded artifact of ``session``, keyed by role."""
+    return {
+        artifact.role: {
+            "path": artifact.path,
+            "start_timestamp": artifact.start_timestamp,
+            "duration": artifact.duration,
+            "codec": artifact.codec,
+            "size": artifact.size,
+        }
+        for artifact in MediaArtifact.objects.filter(**_session_filter(session))
+    }
@@ -0,0 +1,23 @@
+# Generated by Django 5.1.6 on 2026-10-18 10:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('interview_app', '0022_remove_interviewsession_interview_video_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='codesubmission',
+            name='cpu_time_ms',
+            field=models.FloatField(blank=True, help_text='Total CPU time of all test case runs, in milliseconds', null=True),
+        ),
+        migrations.AddField(
+            model_name='codesubmission',
+            name='peak_memory_kb',
+            field=models.PositiveIntegerField(blank=True, help_text='Highest peak RSS of any test case run, in KB', null=True),
+        ),
+    ]
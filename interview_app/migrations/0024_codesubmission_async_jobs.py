@@ -0,0 +1,28 @@
+# Generated by Django 5.1.6 on 2026-10-18 11:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('interview_app', '0023_codesubmission_resource_usage'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='codesubmission',
+            name='job_id',
+            field=models.UUIDField(blank=True, help_text='Background execution job for async submissions', null=True, unique=True),
+        ),
+        migrations.AddField(
+            model_name='codesubmission',
+            name='status',
+            field=models.CharField(choices=[('QUEUED', 'Queued'), ('RUNNING', 'Running'), ('COMPLETED', 'Completed'), ('FAILED', 'Failed')], default='COMPLETED', max_length=20),
+        ),
+        migrations.AddField(
+            model_name='codesubmission',
+            name='test_results',
+            field=models.JSONField(blank=True, default=list, help_text='Per-test-case results (hidden cases without input/output)'),
+        ),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 5.1.6 on 2026-10-18 11:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('interview_app', '0024_codesubmission_async_jobs'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='testcase',
+            name='scaling_input_template',
+            field=models.TextField(blank=True, help_text="Input with an {n} placeholder, e.g. 'list(range({n}, 0, -1))'", null=True),
+        ),
+        migrations.AddField(
+            model_name='testcase',
+            name='scaling_sizes',
+            field=models.JSONField(blank=True, default=list, help_text='Input sizes substituted for {n}, e.g. [1000, 2000, 4000, 8000, 16000]'),
+        ),
+        migrations.AddField(
+            model_name='testcase',
+            name='expected_complexity',
+            field=models.CharField(blank=True, help_text="Expected growth class, e.g. 'O(n log n)'", max_length=20, null=True),
+        ),
+        migrations.AddField(
+            model_name='codesubmission',
+            name='complexity',
+            field=models.CharField(blank=True, help_text="Fitted time complexity from the scaling series, e.g. 'O(n)'", max_length=20, null=True),
+        ),
+        migrations.AddField(
+            model_name='codesubmission',
+            name='complexity_details',
+            field=models.JSONField(blank=True, help_text='Scaling samples and per-class fit quality', null=True),
+        ),
+    ]
@@ -0,0 +1,53 @@
+# Generated by Django 5.1.6 on 2026-10-18 12:20
+
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('interview_app', '0025_complexity_measurement'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CodingSkillTag',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=50, unique=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='CodingBankQuestion',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('slug', models.SlugField(help_text='Stable identifier; unique per language', max_length=100)),
+                ('title', models.CharField(max_length=200)),
+                ('description', models.TextField()),
+                ('language', models.CharField(choices=[('PYTHON', 'Python'), ('JAVASCRIPT', 'JavaScript'), ('JAVA', 'Java'), ('C', 'C'), ('CPP', 'C++'), ('GO', 'Go'), ('HTML', 'HTML'), ('PHP', 'PHP'), ('RUBY', 'Ruby'), ('CSHARP', 'C#'), ('SQL', 'SQL'), ('SWIFT', 'Swift')], max_length=20)),
+                ('difficulty', models.CharField(choices=[('EASY', 'Easy'), ('MEDIUM', 'Medium'), ('HARD', 'Hard')], default='MEDIUM', max_length=10)),
+                ('starter_code', models.TextField(blank=True, default='')),
+                ('reference_solution', models.TextField(help_text='Must pass every test case before the question is served')),
+                ('test_cases', models.JSONField(default=list, help_text='[{input, expected_output, hidden, scaling_input_template, scaling_sizes, expected_complexity}]')),
+                ('is_validated', models.BooleanField(default=False)),
+                ('validation_log', models.TextField(blank=True, null=True)),
+                ('validated_at', models.DateTimeField(blank=True, null=True)),
+                ('is_active', models.BooleanField(default=True)),
+                ('times_used', models.PositiveIntegerField(default=0)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('skill_tags', models.ManyToManyField(blank=True, related_name='questions', to='interview_app.codingskilltag')),
+            ],
+            options={
+                'unique_together': {('slug', 'language')},
+                'indexes': [models.Index(fields=['language', 'is_validated', 'is_active', 'difficulty'], name='coding_bank_lookup_idx')],
+            },
+        ),
+        migrations.AddField(
+            model_name='interviewquestion',
+            name='bank_question',
+            field=models.ForeignKey(blank=True, help_text='Coding bank question this was copied from', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='session_questions', to='interview_app.codingbankquestion'),
+        ),
+    ]
@@ -0,0 +1,43 @@
+# Generated by Django 5.1.6 on 2026-10-18 14:05
+
+import re
+
+from django.db import migrations, models
+
+LEGACY_RESULTS_PATTERN = re.compile(r'Test Results:\s*(\d+)/(\d+)\s+passed')
+
+
+def backfill_test_counts(apps, schema_editor):
+    # One last parse of the old log format so reports never need to again
+    CodeSubmission = apps.get_model('interview_app', 'CodeSubmission')
+    for submission in CodeSubmission.objects.filter(total_count__isnull=True).iterator():
+        if submission.test_results:
+            passed = sum(1 for case in submission.test_results if case.get('passed'))
+            total = len(submission.test_results)
+        else:
+            match = LEGACY_RESULTS_PATTERN.search(submission.output_log or '')
+            if not match:
+                continue
+            passed, total = int(match.group(1)), int(match.group(2))
+        CodeSubmission.objects.filter(pk=submission.pk).update(passed_count=passed, total_count=total)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('interview_app', '0026_coding_question_bank'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='codesubmission',
+            name='passed_count',
+            field=models.PositiveIntegerField(blank=True, help_text='Test cases passed (null until the submission has run)', null=True),
+        ),
+        migrations.AddField(
+            model_name='codesubmission',
+            name='total_count',
+            field=models.PositiveIntegerField(blank=True, help_text='Test cases run (null until the submission has run)', null=True),
+        ),
+        migrations.RunPython(backfill_test_counts, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,43 @@
+# Generated by Django 5.1.6 on 2026-10-18 15:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('interview_app', '0027_codesubmission_test_counts'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='voiceactivitydetection',
+            name='is_partial',
+            field=models.BooleanField(default=False, help_text='Chunked analysis still in progress'),
+        ),
+        migrations.AddField(
+            model_name='voiceactivitydetection',
+            name='chunks_completed',
+            field=models.PositiveIntegerField(default=0, help_text='Chunks analysed so far'),
+        ),
+        migrations.AddField(
+            model_name='voiceactivitydetection',
+            name='source_fingerprint',
+            field=models.CharField(blank=True, help_text='Source audio and chunking settings', max_length=64),
+        ),
+        migrations.AddField(
+            model_name='speakerdiarization',
+            name='is_partial',
+            field=models.BooleanField(default=False, help_text='Chunked analysis still in progress'),
+        ),
+        migrations.AddField(
+            model_name='speakerdiarization',
+            name='chunks_completed',
+            field=models.PositiveIntegerField(default=0, help_text='Chunks analysed so far'),
+        ),
+        migrations.AddField(
+            model_name='speakerdiarization',
+            name='source_fingerprint',
+            field=models.CharField(blank=True, help_text='Source audio and chunking settings', max_length=64),
+        ),
+    ]
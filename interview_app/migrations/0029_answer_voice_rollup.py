@@ -0,0 +1,61 @@
+# Generated by Django 5.1.6 on 2026-10-18 15:55
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('interview_app', '0028_voice_analysis_checkpoints'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='answervoiceanalysis',
+            name='speech_percentage',
+            field=models.FloatField(blank=True, help_text='Percentage of segment with speech', null=True),
+        ),
+        migrations.AlterField(
+            model_name='answervoiceanalysis',
+            name='silence_percentage',
+            field=models.FloatField(blank=True, help_text='Percentage of segment with silence', null=True),
+        ),
+        migrations.AlterField(
+            model_name='answervoiceanalysis',
+            name='words_per_minute',
+            field=models.FloatField(blank=True, help_text='Speaking rate in words per minute', null=True),
+        ),
+        migrations.AlterField(
+            model_name='answervoiceanalysis',
+            name='response_delay_seconds',
+            field=models.FloatField(blank=True, help_text='Delay before starting response', null=True),
+        ),
+        migrations.AlterField(
+            model_name='answervoiceanalysis',
+            name='speaker_confidence_score',
+            field=models.FloatField(blank=True, help_text='Confidence score for speaker identification', null=True),
+        ),
+        migrations.AlterField(
+            model_name='answervoiceanalysis',
+            name='audio_quality_score',
+            field=models.FloatField(blank=True, help_text='Overall audio quality score', null=True),
+        ),
+        migrations.CreateModel(
+            name='SessionVoiceRollup',
+            fields=[
+                ('session', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='voice_rollup', serialize=False, to='interview_app.interviewsession')),
+                ('answer_count', models.PositiveIntegerField(default=0)),
+                ('total_duration', models.FloatField(default=0, help_text='Seconds of answers with a known duration')),
+                ('timed_words', models.PositiveIntegerField(default=0, help_text='Words of answers with a known duration')),
+                ('total_words', models.PositiveIntegerField(default=0)),
+                ('total_filler_words', models.PositiveIntegerField(default=0)),
+                ('sentiment_sum', models.FloatField(default=0)),
+                ('audio_answer_count', models.PositiveIntegerField(default=0)),
+                ('audio_duration', models.FloatField(default=0)),
+                ('speech_seconds', models.FloatField(default=0)),
+                ('response_delay_sum', models.FloatField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+    ]
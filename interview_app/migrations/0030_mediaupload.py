@@ -0,0 +1,35 @@
+# Generated by Django 5.1.6 on 2026-10-18 16:20
+
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('interview_app', '0029_answer_voice_rollup'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MediaUpload',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('kind', models.CharField(choices=[('audio', 'Interview audio'), ('screen', 'Screen recording'), ('video', 'Interview video')], max_length=10)),
+                ('filename', models.CharField(blank=True, help_text='Client file name (only its extension is used)', max_length=255)),
+                ('length', models.BigIntegerField(help_text='Declared size of the whole file in bytes')),
+                ('offset', models.BigIntegerField(default=0, help_text='Bytes received and acknowledged')),
+                ('synced_offset', models.BigIntegerField(default=0, help_text='Bytes known to be fsynced to disk')),
+                ('checksum', models.CharField(blank=True, help_text='Expected SHA-256 (hex) of the whole file', max_length=64)),
+                ('metadata', models.JSONField(blank=True, default=dict, help_text='Kind-specific form fields sent at creation')),
+                ('status', models.CharField(choices=[('UPLOADING', 'Uploading'), ('PROCESSING', 'Processing'), ('COMPLETED', 'Completed'), ('FAILED', 'Failed')], default='UPLOADING', max_length=20)),
+                ('final_path', models.CharField(blank=True, help_text='Location under MEDIA_ROOT once finalized', max_length=500)),
+                ('result', models.JSONField(blank=True, help_text='Outcome of the media processing', null=True)),
+                ('error', models.TextField(blank=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('session', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='media_uploads', to='interview_app.interviewsession')),
+            ],
+        ),
+    ]
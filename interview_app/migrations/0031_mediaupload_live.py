@@ -0,0 +1,38 @@
+# Generated by Django 5.1.6 on 2026-10-18 16:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('interview_app', '0030_mediaupload'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='mediaupload',
+            name='live',
+            field=models.BooleanField(default=False, help_text='Recorded live as MediaRecorder segments (length known at the end)'),
+        ),
+        migrations.AddField(
+            model_name='mediaupload',
+            name='segments',
+            field=models.PositiveIntegerField(default=0, help_text='Live segments appended so far'),
+        ),
+        migrations.AddField(
+            model_name='mediaupload',
+            name='gcs_path',
+            field=models.CharField(blank=True, help_text='Object path the recording is streamed to, if any', max_length=500),
+        ),
+        migrations.AddField(
+            model_name='mediaupload',
+            name='gcs_session_url',
+            field=models.TextField(blank=True, help_text='GCS resumable upload session of the live recording'),
+        ),
+        migrations.AddField(
+            model_name='mediaupload',
+            name='gcs_offset',
+            field=models.BigIntegerField(default=0, help_text='Bytes already persisted in the GCS session'),
+        ),
+    ]
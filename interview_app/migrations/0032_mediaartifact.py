@@ -0,0 +1,31 @@
+# Generated by Django 5.1.6 on 2026-10-18 17:10
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('interview_app', '0031_mediaupload_live'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MediaArtifact',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('role', models.CharField(choices=[('audio', 'Uploaded interview audio'), ('analysis_audio', 'Audio for voice analysis'), ('raw_video', 'Camera video without audio'), ('video', 'Interview video with audio'), ('poster', 'Video poster'), ('screen', 'Screen recording')], max_length=20)),
+                ('path', models.CharField(blank=True, help_text='Location under MEDIA_ROOT (empty until the file exists)', max_length=500)),
+                ('start_timestamp', models.FloatField(blank=True, help_text='Unix time the recording started, for sync', null=True)),
+                ('duration', models.FloatField(blank=True, help_text='Seconds', null=True)),
+                ('codec', models.CharField(blank=True, max_length=50)),
+                ('size', models.BigIntegerField(blank=True, help_text='Bytes', null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('session', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='media_artifacts', to='interview_app.interviewsession')),
+            ],
+            options={
+                'unique_together': {('session', 'role')},
+            },
+        ),
+    ]
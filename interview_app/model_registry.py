@@ -0,0 +1,204 @@
+"""
+Process-wide registry of the speech models (Whisper, pyannote).
+
+Every model is loaded at most once per worker process, on first use or at
+boot when listed in ``MODEL_PRELOAD``, and the same instance is handed to
+every service. The registry records how long each load took and how much
+memory the model holds (its tensors when it is a torch module, otherwise the
+growth of the process RSS during the load), and ``unload()`` drops a model
+so the memory can be reclaimed; the next ``get()`` loads it again.
+"""
+import gc
+import os
+import threading
+import time
+
+from django.conf import settings
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+
+def _process_rss():
+    """Resident set size of this process in bytes (None when unknown)."""
+    if psutil is not None:
+        return psutil.Process().memory_info().rss
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def _tensor_bytes(model):
+    """
+    Bytes held by the parameters and buffers of a torch module, or of the
+    modules a pipeline object keeps as attributes. None when there are none.
+    """
+    if hasattr(model, "parameters"):
+        modules = [model]
+    else:
+        modules = [value for value in getattr(model, "__dict__", {}).values() if hasattr(value, "parameters")]
+    if not modules:
+        return None
+    seen = set()
+    total = 0
+    for module in modules:
+        tensors = list(module.parameters())
+        if hasattr(module, "buffers"):
+            tensors += list(module.buffers())
+        for tensor in tensors:
+            if id(tensor) not in seen:
+                seen.add(id(tensor))
+                total += tensor.numel() * tensor.element_size()
+    return total
+
+
+def _load_whisper():
+    import whisper
+    name = getattr(settings, "WHISPER_MODEL_NAME", "base")
+    return whisper.load_model(name)
+
+
+def _huggingface_token():
+    token = os.getenv("HUGGINGFACE_TOKEN", "")
+    if not token:
+        raise RuntimeError("HUGGINGFACE_TOKEN not found in environment variables")
+    from huggingface_hub import HfFolder
+    HfFolder.save_token(token)
+    return token
+
+
+def _load_pyannote_vad():
+    from pyannote.audio import Pipeline
+    return Pipeline.from_pretrained("pyannote/voice-activity-detection", use_auth_token=_huggingface_token())
+
+
+def _load_pyannote_diarization():
+    from pyannote.audio import Pipeline
+    import torch
+    pipeline = Pipeline.from_pretrained("pyannote/speaker-diarization-3.1", use_auth_token=_huggingface_token())
+    if pipeline is not None and torch.cuda.is_available():
+        pipeline = pipeline.to(torch.device("cuda"))
+    return pipeline
+
+
+# name -> loader
+MODEL_LOADERS = {
+    "whisper": _load_whisper,
+    "pyannote_vad": _load_pyannote_vad,
+    "pyannote_diarization": _load_pyannote_diarization,
+}
+
+
+class ModelRegistry:
+    """Loads each registered model once per process and shares it."""
+
+    def __init__(self, loaders=None):
+        self._loaders = dict(loaders or MODEL_LOADERS)
+        self._lock = threading.Lock()
+        self._load_locks = {name: threading.Lock() for name in self._loaders}
+        self._models = {}
+        self._info = {}
+        self._errors = {}
+
+    def get(self, name):
+        """The loaded model ``name``, loading it on first use; None when it cannot be loaded."""
+        model = self._models.get(name)
+        if model is not None:
+            info = self._info.get(name)
+            if info is not None:
+                info["last_used"] = time.time()
+            return model
+        if name not in self._loaders:
+            raise KeyError(f"Unknown model: {name}")
+        # One lock per model: loading Whisper does not hold up pyannote
+        with self._load_locks[name]:
+            model = self._models.get(name)
+            if model is None:
+                model = self._load(name)
+        return model
+
+    def _load(self, name):
+        rss_before = _process_rss()
+        started = time.perf_counter()
+        try:
+            model = self._loaders[name]()
+        except Exception as e:
+            print(f"⚠️ Could not load model '{name}': {e}")
+            self._errors[name] = str(e)
+            return None
+        if model is None:
+            self._errors[name] = "loader returned no model"
+            return None
+        rss_after = _process_rss()
+        tensor_bytes = _tensor_bytes(model)
+        if tensor_bytes is None and rss_before is not None and rss_after is not None:
+            tensor_bytes = max(0, rss_after - rss_before)
+        with self._lock:
+            self._models[name] = model
+            self._errors.pop(name, None)
+            self._info[name] = {
+                "loaded_at": time.time(),
+                "last_used": time.time(),
+                "load_seconds": round(time.perf_counter() - started, 2),
+                "memory_bytes": tensor_bytes,
+            }
+        size = f", {tensor_bytes / (1024 * 1024):.0f} MB" if tensor_bytes else ""
+        print(f"✅ Model '{name}' loaded in {self._info[name]['load_seconds']}s{size}")
+        return model
+
+    def loaded(self, name):
+        """The model if it is already loaded (never loads)."""
+        return self._models.get(name)
+
+    def is_loaded(self, name):
+        return name in self._models
+
+    def preload(self, names=None):
+        """Load ``names`` (default: the ``MODEL_PRELOAD`` setting) now rather than on first use."""
+        if names is None:
+            names = getattr(settings, "MODEL_PRELOAD", [])
+        return {name: self.get(name) is not None for name in names}
+
+    def unload(self, name):
+        """Drop a model so its memory can be reclaimed; returns whether it was loaded."""
+        if name not in self._loaders:
+            return False
+        with self._load_locks[name], self._lock:
+            model = self._models.pop(name, None)
+            self._info.pop(name, None)
+        if model is None:
+            return False
+        del model
+        gc.collect()
+        try:
+            import torch
+            if torch.cuda.is_available():
+                torch.cuda.empty_cache()
+        except ImportError:
+            pass
+        print(f"♻️ Model '{name}' unloaded")
+        return True
+
+    def unload_all(self):
+        return [name for name in list(self._models) if self.unload(name)]
+
+    def memory_report(self):
+        """Per-model state and memory, plus the process RSS, JSON-serialisable."""
+        with self._lock:
+            models = {
+                name: dict(self._info.get(name, {}), loaded=name in self._models, error=self._errors.get(name))
+                for name in self._loaders
+            }
+        return {
+            "process_rss_bytes": _process_rss(),
+            "models_bytes": sum(info.get("memory_bytes") or 0 for info in models.values()),
+            "models": models,
+        }
+
+
+# Global instance for easy access
+model_registry = ModelRegistry()
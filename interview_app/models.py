@@ -3,7 +3,7 @@ from django.db import models
 from django.utils import timezone
 
 # Import voice analysis models
-from .voice_models import VoiceActivityDetection, SpeakerDiarization, AnswerVoiceAnalysis
+from .voice_models import VoiceActivityDetection, SpeakerDiarization, AnswerVoiceAnalysis, SessionVoiceRollup
 
 class InterviewSession(models.Model):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
@@ -98,6 +98,8 @@ class InterviewQuestion(models.Model):
     ]
     role = models.CharField(max_length=20, choices=ROLE_CHOICES, default='AI', help_text="Role: AI or INTERVIEWEE")
     
+    bank_question = models.ForeignKey('CodingBankQuestion', null=True, blank=True, on_delete=models.SET_NULL, related_name='session_questions', help_text="Coding bank question this was copied from")
+    
     LANGUAGE_CHOICES = [
         ('PYTHON', 'Python'),
         ('JAVASCRIPT', 'JavaScript'),
@@ -148,10 +150,54 @@ class TestCase(models.Model):
     input_data = models.TextField(help_text="Input for the function, e.g., '5' for factorial(5)")
     expected_output = models.TextField(help_text="Expected result, e.g., '120'")
     is_hidden = models.BooleanField(default=False, help_text="Hidden tests are not shown to the candidate but are used for final scoring.")
+    # Optional input-size scaling series for complexity measurement
+    scaling_input_template = models.TextField(null=True, blank=True, help_text="Input with an {n} placeholder, e.g. 'list(range({n}, 0, -1))'")
+    scaling_sizes = models.JSONField(default=list, blank=True, help_text="Input sizes substituted for {n}, e.g. [1000, 2000, 4000, 8000, 16000]")
+    expected_complexity = models.CharField(max_length=20, null=True, blank=True, help_text="Expected growth class, e.g. 'O(n log n)'")
 
     def __str__(self):
         return f"Test case for Q: {self.question.id}"
 
+# --- Coding question bank (filled offline by manage.py populate_question_bank) ---
+class CodingSkillTag(models.Model):
+    name = models.CharField(max_length=50, unique=True)
+
+    def __str__(self):
+        return self.name
+
+class CodingBankQuestion(models.Model):
+    DIFFICULTY_CHOICES = [
+        ('EASY', 'Easy'),
+        ('MEDIUM', 'Medium'),
+        ('HARD', 'Hard'),
+    ]
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    slug = models.SlugField(max_length=100, help_text="Stable identifier; unique per language")
+    title = models.CharField(max_length=200)
+    description = models.TextField()
+    language = models.CharField(max_length=20, choices=InterviewQuestion.LANGUAGE_CHOICES)
+    difficulty = models.CharField(max_length=10, choices=DIFFICULTY_CHOICES, default='MEDIUM')
+    skill_tags = models.ManyToManyField(CodingSkillTag, related_name='questions', blank=True)
+    starter_code = models.TextField(blank=True, default='')
+    reference_solution = models.TextField(help_text="Must pass every test case before the question is served")
+    test_cases = models.JSONField(default=list, help_text="[{input, expected_output, hidden, scaling_input_template, scaling_sizes, expected_complexity}]")
+    is_validated = models.BooleanField(default=False)
+    validation_log = models.TextField(null=True, blank=True)
+    validated_at = models.DateTimeField(null=True, blank=True)
+    is_active = models.BooleanField(default=True)
+    times_used = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = [('slug', 'language')]
+        indexes = [
+            models.Index(fields=['language', 'is_validated', 'is_active', 'difficulty'], name='coding_bank_lookup_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.title} ({self.language}, {self.difficulty})"
+
 class InterviewQA(models.Model):
     """
     Simplified model for storing interview questions and answers in the same record.
@@ -207,11 +253,42 @@ class CodeSubmission(models.Model):
     passed_all_tests = models.BooleanField(default=False)
     output_log = models.TextField(null=True, blank=True, help_text="Stores the results of running against all test cases.")
     gemini_evaluation = models.JSONField(null=True, blank=True, help_text="Stores Gemini API evaluation results")
+    cpu_time_ms = models.FloatField(null=True, blank=True, help_text="Total CPU time of all test case runs, in milliseconds")
+    peak_memory_kb = models.PositiveIntegerField(null=True, blank=True, help_text="Highest peak RSS of any test case run, in KB")
+    job_id = models.UUIDField(null=True, blank=True, unique=True, help_text="Background execution job for async submissions")
+    status = models.CharField(max_length=20, choices=[
+        ('QUEUED', 'Queued'),
+        ('RUNNING', 'Running'),
+        ('COMPLETED', 'Completed'),
+        ('FAILED', 'Failed'),
+    ], default='COMPLETED')
+    test_results = models.JSONField(default=list, blank=True, help_text="Per-test-case results (hidden cases without input/output)")
+    complexity = models.CharField(max_length=20, null=True, blank=True, help_text="Fitted time complexity from the scaling series, e.g. 'O(n)'")
+    complexity_details = models.JSONField(null=True, blank=True, help_text="Scaling samples and per-class fit quality")
+    passed_count = models.PositiveIntegerField(null=True, blank=True, help_text="Test cases passed (null until the submission has run)")
+    total_count = models.PositiveIntegerField(null=True, blank=True, help_text="Test cases run (null until the submission has run)")
     created_at = models.DateTimeField(auto_now_add=True)
 
     def __str__(self):
         return f"Code submission by {self.session.candidate_name} for Q: {self.question_id}"
 
+    def failure_counts(self):
+        """Failed test cases per error type (wrong_answer, timeout, memory, ...)."""
+        counts = {}
+        for case in self.test_results or []:
+            if not case.get('passed'):
+                error_type = case.get('error_type') or 'unknown'
+                counts[error_type] = counts.get(error_type, 0) + 1
+        return counts
+
+    @classmethod
+    def session_test_totals(cls, session):
+        """``(passed, total, submissions)`` over every evaluated submission of ``session``, in one query."""
+        totals = cls.objects.filter(session=session, total_count__isnull=False).aggregate(
+            passed=models.Sum('passed_count'), total=models.Sum('total_count'), submissions=models.Count('id')
+        )
+        return totals['passed'] or 0, totals['total'] or 0, totals['submissions']
+
 # --- NEW MODEL: For storing separate question answer for technical interview ---
 class TechnicalInterviewQA(models.Model):
     session = models.ForeignKey(InterviewSession, related_name='technical_qa', on_delete=models.CASCADE)
@@ -262,4 +339,69 @@ class QAConversationPair(models.Model):
         ]
     
     def __str__(self):
-        return f"Q{self.question_number}: {self.question_text[:50]}... - {self.session.candidate_name} ({self.session_key})"
\ No newline at end of file
+        return f"Q{self.question_number}: {self.question_text[:50]}... - {self.session.candidate_name} ({self.session_key})"
+
+class MediaUpload(models.Model):
+    """A recording arriving in pieces: a resumable chunked upload (chunked_upload.py) or a live recording (live_recording.py)."""
+
+    class Kind(models.TextChoices):
+        AUDIO = 'audio', 'Interview audio'
+        SCREEN = 'screen', 'Screen recording'
+        VIDEO = 'video', 'Interview video'
+
+    class Status(models.TextChoices):
+        UPLOADING = 'UPLOADING', 'Uploading'
+        PROCESSING = 'PROCESSING', 'Processing'
+        COMPLETED = 'COMPLETED', 'Completed'
+        FAILED = 'FAILED', 'Failed'
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    session = models.ForeignKey(InterviewSession, related_name='media_uploads', on_delete=models.CASCADE)
+    kind = models.CharField(max_length=10, choices=Kind.choices)
+    filename = models.CharField(max_length=255, blank=True, help_text="Client file name (only its extension is used)")
+    length = models.BigIntegerField(help_text="Declared size of the whole file in bytes")
+    offset = models.BigIntegerField(default=0, help_text="Bytes received and acknowledged")
+    synced_offset = models.BigIntegerField(default=0, help_text="Bytes known to be fsynced to disk")
+    checksum = models.CharField(max_length=64, blank=True, help_text="Expected SHA-256 (hex) of the whole file")
+    metadata = models.JSONField(default=dict, blank=True, help_text="Kind-specific form fields sent at creation")
+    status = models.CharField(max_length=20, choices=Status.choices, default=Status.UPLOADING)
+    final_path = models.CharField(max_length=500, blank=True, help_text="Location under MEDIA_ROOT once finalized")
+    live = models.BooleanField(default=False, help_text="Recorded live as MediaRecorder segments (length known at the end)")
+    segments = models.PositiveIntegerField(default=0, help_text="Live segments appended so far")
+    gcs_path = models.CharField(max_length=500, blank=True, help_text="Object path the recording is streamed to, if any")
+    gcs_session_url = models.TextField(blank=True, help_text="GCS resumable upload session of the live recording")
+    gcs_offset = models.BigIntegerField(default=0, help_text="Bytes already persisted in the GCS session")
+    result = models.JSONField(null=True, blank=True, help_text="Outcome of the media processing")
+    error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.get_kind_display()} upload {self.id} ({self.status})"
+
+
+class MediaArtifact(models.Model):
+    """One entry of a session's media manifest (media_manifest.py): where an artifact is and what it holds."""
+
+    class Role(models.TextChoices):
+        AUDIO = 'audio', 'Uploaded interview audio'
+        ANALYSIS_AUDIO = 'analysis_audio', 'Audio for voice analysis'
+        RAW_VIDEO = 'raw_video', 'Camera video without audio'
+        VIDEO = 'video', 'Interview video with audio'
+        POSTER = 'poster', 'Video poster'
+        SCREEN = 'screen', 'Screen recording'
+
+    session = models.ForeignKey(InterviewSession, related_name='media_artifacts', on_delete=models.CASCADE)
+    role = models.CharField(max_length=20, choices=Role.choices)
+    path = models.CharField(max_length=500, blank=True, help_text="Location under MEDIA_ROOT (empty until the file exists)")
+    start_timestamp = models.FloatField(null=True, blank=True, help_text="Unix time the recording started, for sync")
+    duration = models.FloatField(null=True, blank=True, help_text="Seconds")
+    codec = models.CharField(max_length=50, blank=True)
+    size = models.BigIntegerField(null=True, blank=True, help_text="Bytes")
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = [('session', 'role')]
+
+    def __str__(self):
+        return f"{self.get_role_display()} of {self.session_id}: {self.path or '(pending)'}"
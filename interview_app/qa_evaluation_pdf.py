@@ -251,6 +251,8 @@ def generate_skills_assessment_with_llm(main_questions, code_submissions):
                 qa_text_parts.append(f"\nCoding {i + 1}: Challenge (ID: {submission.question_id})")
                 
             qa_text_parts.append(f"Code: {submission.submitted_code}")
+            if submission.total_count is not None:
+                qa_text_parts.append(f"Tests Passed: {submission.passed_count}/{submission.total_count}")
             qa_text_parts.append(f"Test Results: {submission.output_log or 'No results'}")
         
         # Create LLM prompt for skills assessment
@@ -378,16 +380,8 @@ def get_fallback_skills_assessment(main_questions, code_submissions):
     
     # Coding Skills (based on submissions)
     if code_submissions:
-        passed_tests = 0
-        total_tests = 0
-        for submission in code_submissions:
-            if submission.output_log:
-                # Parse test results
-                if 'passed' in submission.output_log.lower():
-                    passed_tests += 1
-                    total_tests += 1
-                else:
-                    total_tests += 1
+        passed_tests = sum(submission.passed_count or 0 for submission in code_submissions)
+        total_tests = sum(submission.total_count or 0 for submission in code_submissions)
         
         coding_score = (passed_tests / total_tests * 100) if total_tests > 0 else 0
         
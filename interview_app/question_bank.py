@@ -0,0 +1,289 @@
+"""
+Pre-validated coding question bank.
+
+Questions are loaded offline by ``manage.py populate_question_bank``, which
+runs each question's reference solution through the normal test-suite executor
+and only marks it validated when every case passes. Interview setup then picks
+a validated question with one indexed query and copies its test cases with a
+single ``bulk_create``. No LLM call happens during session setup.
+"""
+from django.db import transaction
+from django.db.models import Count, F, Q
+from django.utils import timezone
+
+from .code_execution import run_test_suite
+from .models import CodeSubmission, CodingBankQuestion, CodingSkillTag, InterviewQuestion, TestCase
+
+# Seed questions: the questions the portal used to build inline per session
+BUILTIN_QUESTIONS = [
+    {
+        "slug": "reverse-string",
+        "language": "PYTHON",
+        "title": "Reverse a String",
+        "description": "Write a function reverse_string(s: str) -> str that returns the reversed string.",
+        "difficulty": "EASY",
+        "skill_tags": ["strings"],
+        "starter_code": "def reverse_string(s: str) -> str:\n    # TODO: implement\n    pass",
+        "reference_solution": "def reverse_string(s: str) -> str:\n    return s[::-1]",
+        "test_cases": [
+            {"input": "'hello'", "expected_output": "olleh"},
+            {"input": "''", "expected_output": ""},
+            {"input": "'abc'", "expected_output": "cba"},
+            {
+                "input": "'racecar!'", "expected_output": "!racecar", "hidden": True,
+                "scaling_input_template": "'ab' * {n}",
+                "scaling_sizes": [100000, 200000, 400000, 800000, 1600000],
+                "expected_complexity": "O(n)",
+            },
+        ],
+    },
+    {
+        "slug": "reverse-string",
+        "language": "JAVASCRIPT",
+        "title": "Reverse a String",
+        "description": "Implement function reverseString(s) that returns the reversed string.",
+        "difficulty": "EASY",
+        "skill_tags": ["strings"],
+        # The executor calls solve(...); the starter wires it to the function to implement
+        "starter_code": "function reverseString(s){\n  // TODO\n}\nconst solve = reverseString;",
+        "reference_solution": "function reverseString(s){\n  return s.split('').reverse().join('');\n}\nconst solve = reverseString;",
+        "test_cases": [
+            {"input": "'hello'", "expected_output": "olleh"},
+            {"input": "''", "expected_output": ""},
+            {"input": "'abc'", "expected_output": "cba"},
+        ],
+    },
+    {
+        "slug": "add-two-numbers",
+        "language": "JAVA",
+        "title": "Add Two Numbers",
+        "description": "Implement a static method add(int a, int b) that returns a+b.",
+        "difficulty": "EASY",
+        "skill_tags": ["arithmetic"],
+        "starter_code": "public class Solution {\n  public static int add(int a,int b){\n    // TODO\n    return 0;\n  }\n}",
+        "reference_solution": "public class Solution {\n  public static int add(int a,int b){\n    return a + b;\n  }\n}",
+        "test_cases": [
+            {"input": "1,2", "expected_output": "3"},
+            {"input": "-5,5", "expected_output": "0"},
+            {"input": "10,15", "expected_output": "25"},
+        ],
+    },
+    {
+        "slug": "reverse-string",
+        "language": "PHP",
+        "title": "Reverse a String",
+        "description": "Implement function reverse_string($s) that returns the reversed string.",
+        "difficulty": "EASY",
+        "skill_tags": ["strings"],
+        # The executor adds the <?php tags and calls solve(...)
+        "starter_code": "function reverse_string($s){\n  // TODO\n}\nfunction solve($s){\n  return reverse_string($s);\n}",
+        "reference_solution": (
+            "function reverse_string($s){\n  return strrev($s);\n}\n"
+            "function solve($s){\n  return reverse_string($s);\n}"
+        ),
+        "test_cases": [
+            {"input": "'hello'", "expected_output": "olleh"},
+            {"input": "''", "expected_output": ""},
+            {"input": "'abc'", "expected_output": "cba"},
+        ],
+    },
+    {
+        "slug": "add-two-numbers",
+        "language": "C",
+        "title": "Add Two Numbers",
+        "description": "Write a function int add(int a,int b) that returns a+b.",
+        "difficulty": "EASY",
+        "skill_tags": ["arithmetic"],
+        "starter_code": "int add(int a,int b){\n  // TODO\n  return 0;\n}",
+        "reference_solution": "int add(int a,int b){\n  return a + b;\n}",
+        "test_cases": [
+            {"input": "1,2", "expected_output": "3"},
+            {"input": "-5,5", "expected_output": "0"},
+            {"input": "10,15", "expected_output": "25"},
+        ],
+    },
+    {
+        "slug": "add-two-numbers",
+        "language": "CPP",
+        "title": "Add Two Numbers",
+        "description": "Implement int add(int a,int b) that returns a+b.",
+        "difficulty": "EASY",
+        "skill_tags": ["arithmetic"],
+        "starter_code": "int add(int a,int b){\n  // TODO\n  return 0;\n}",
+        "reference_solution": "int add(int a,int b){\n  return a + b;\n}",
+        "test_cases": [
+            {"input": "1,2", "expected_output": "3"},
+            {"input": "-5,5", "expected_output": "0"},
+            {"input": "10,15", "expected_output": "25"},
+        ],
+    },
+    {
+        "slug": "reverse-string",
+        "language": "GO",
+        "title": "Reverse a String",
+        "description": "Implement func Reverse(s string) string that returns the reversed string.",
+        "difficulty": "EASY",
+        "skill_tags": ["strings"],
+        "starter_code": "package main\nfunc Reverse(s string) string {\n  // TODO\n  return \"\"\n}",
+        "reference_solution": (
+            "package main\nfunc Reverse(s string) string {\n  r := []rune(s)\n"
+            "  for i, j := 0, len(r)-1; i < j; i, j = i+1, j-1 {\n    r[i], r[j] = r[j], r[i]\n  }\n"
+            "  return string(r)\n}"
+        ),
+        "test_cases": [
+            {"input": '"hello"', "expected_output": "olleh"},
+            {"input": '""', "expected_output": ""},
+            {"input": '"abc"', "expected_output": "cba"},
+        ],
+    },
+    {
+        "slug": "simple-heading",
+        "language": "HTML",
+        "title": "Simple Heading",
+        "description": "Return an HTML string with an <h1>Hello</h1> element.",
+        "difficulty": "EASY",
+        "skill_tags": ["markup"],
+        "starter_code": "<!-- return <h1>Hello</h1> -->",
+        "reference_solution": "<h1>Hello</h1>",
+        "test_cases": [
+            {"input": "n/a", "expected_output": "<h1>Hello</h1>"},
+        ],
+    },
+]
+
+
+def _test_case_objects(test_cases, question=None):
+    """Unsaved TestCase rows for a bank question's JSON test cases."""
+    return [
+        TestCase(
+            question=question,
+            input_data=str(case.get("input", "")),
+            expected_output=str(case.get("expected_output", case.get("output", ""))),
+            is_hidden=bool(case.get("hidden", False)),
+            scaling_input_template=case.get("scaling_input_template"),
+            scaling_sizes=case.get("scaling_sizes") or [],
+            expected_complexity=case.get("expected_complexity"),
+        )
+        for case in test_cases
+    ]
+
+
+def upsert_bank_question(entry):
+    """Create or update a bank question from a dict; changed content must be re-validated."""
+    tags = [CodingSkillTag.objects.get_or_create(name=name.strip().lower())[0] for name in entry.get("skill_tags", [])]
+    fields = {
+        "title": entry["title"],
+        "description": entry["description"],
+        "difficulty": entry.get("difficulty", "MEDIUM").upper(),
+        "starter_code": entry.get("starter_code", ""),
+        "reference_solution": entry["reference_solution"],
+        "test_cases": entry["test_cases"],
+    }
+    question, created = CodingBankQuestion.objects.get_or_create(
+        slug=entry["slug"], language=entry["language"].upper(), defaults=fields
+    )
+    if not created and any(getattr(question, name) != value for name, value in fields.items()):
+        for name, value in fields.items():
+            setattr(question, name, value)
+        question.is_validated = False
+        question.save()
+    question.skill_tags.set(tags)
+    return question, created
+
+
+def validate_bank_question(question):
+    """Run the reference solution against the question's test cases and record the verdict."""
+    test_cases = _test_case_objects(question.test_cases)
+    all_passed, output_log, _ = run_test_suite(question.reference_solution, question.language, test_cases)
+    question.is_validated = bool(all_passed)
+    question.validation_log = output_log
+    question.validated_at = timezone.now()
+    question.save(update_fields=["is_validated", "validation_log", "validated_at", "updated_at"])
+    return question.is_validated
+
+
+def skills_for_text(text):
+    """Bank skill tags mentioned in ``text`` (e.g. a job description)."""
+    text = (text or "").lower()
+    if not text:
+        return []
+    return [name for name in CodingSkillTag.objects.values_list("name", flat=True) if name in text]
+
+
+def select_bank_question(language, difficulty=None, skills=None):
+    """
+    Pick the validated question for ``language`` that matches the most
+    ``skills``, preferring the least used one. One indexed query.
+    """
+    queryset = CodingBankQuestion.objects.filter(language=language, is_validated=True, is_active=True)
+    if difficulty:
+        queryset = queryset.filter(difficulty=difficulty.upper())
+    if skills:
+        skills = [skill.strip().lower() for skill in skills]
+        queryset = queryset.annotate(
+            skill_matches=Count("skill_tags", filter=Q(skill_tags__name__in=skills))
+        ).order_by("-skill_matches", "times_used", "created_at")
+    else:
+        queryset = queryset.order_by("times_used", "created_at")
+    return queryset.first()
+
+
+def _builtin_entry(language):
+    for entry in BUILTIN_QUESTIONS:
+        if entry["language"] == language:
+            return entry
+    raise ValueError(f"No coding question available for language '{language}'")
+
+
+def assign_coding_question(session, language, order, difficulty=None, skills=None):
+    """
+    Give ``session`` its coding question: replaces any existing one, creates the
+    InterviewQuestion and bulk-creates its test cases. Returns the dict the
+    portal template expects (hidden test cases are not included).
+    """
+    bank_question = select_bank_question(language, difficulty, skills)
+    if bank_question is None and difficulty:
+        bank_question = select_bank_question(language, skills=skills)
+    if bank_question is not None:
+        entry = {
+            "title": bank_question.title,
+            "description": bank_question.description,
+            "language": bank_question.language,
+            "starter_code": bank_question.starter_code,
+            "test_cases": bank_question.test_cases,
+        }
+    else:
+        print(f"⚠️ No validated {language} question in the coding bank; using the built-in question. "
+              f"Run 'manage.py populate_question_bank' to fill the bank.")
+        entry = _builtin_entry(language)
+
+    with transaction.atomic():
+        session.questions.filter(question_type='CODING').delete()
+        question = InterviewQuestion.objects.create(
+            session=session,
+            question_text=entry["description"],
+            question_type='CODING',
+            coding_language=entry["language"],
+            order=order,
+            question_level='MAIN',
+            bank_question=bank_question,
+        )
+        TestCase.objects.bulk_create(_test_case_objects(entry["test_cases"], question))
+        # Placeholder row, filled in when the candidate submits
+        CodeSubmission.objects.create(session=session, question_id=str(question.id), submitted_code='')
+        if bank_question is not None:
+            CodingBankQuestion.objects.filter(pk=bank_question.pk).update(times_used=F("times_used") + 1)
+
+    print(f"✅ Assigned coding question '{entry['title']}' ({entry['language']}) with ID: {question.id}")
+    return {
+        "id": str(question.id),
+        "type": "CODING",
+        "title": entry["title"],
+        "description": entry["description"],
+        "language": entry["language"],
+        "starter_code": entry["starter_code"],
+        "test_cases": [
+            {"input": case.get("input", ""), "output": case.get("expected_output", case.get("output", ""))}
+            for case in entry["test_cases"] if not case.get("hidden")
+        ],
+    }
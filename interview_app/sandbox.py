@@ -0,0 +1,193 @@
+"""
+Resource-limited process execution for coding-round test cases (Linux).
+
+Each run gets RLIMIT_CPU / RLIMIT_AS / RLIMIT_FSIZE (and RLIMIT_NPROC when
+``SANDBOX_MAX_PROCESSES`` is set) applied in ``preexec_fn``, its own process
+group (killed as a whole on timeout) and a private temp directory exposed as
+TMPDIR. The process is reaped with
+``os.wait4`` for its exact CPU time. Peak memory comes from the kernel's
+VmHWM high-water mark sampled while the process runs: ``ru_maxrss`` of a
+child forked from the web worker includes the worker's own RSS before exec.
+
+On platforms without ``resource``/``os.wait4`` (Windows) callers keep using
+the plain wall-clock-timeout path.
+"""
+import math
+import os
+import signal
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections import namedtuple
+
+from django.conf import settings
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - Windows
+    resource = None
+
+SANDBOX_SUPPORTED = (
+    sys.platform.startswith("linux") and resource is not None and hasattr(os, "wait4")
+)
+
+# memory_bytes=None leaves the address space unlimited (JVM / V8 reserve far
+# more virtual memory than they use and cap their heap with flags instead);
+# max_processes=None leaves RLIMIT_NPROC unset (it counts every thread of the
+# server's uid, and the JVM / Go runtime start dozens of threads)
+SandboxLimits = namedtuple(
+    "SandboxLimits", ["cpu_seconds", "memory_bytes", "max_processes", "max_file_bytes"]
+)
+
+
+def default_limits(timeout, limit_memory=True, limit_processes=True):
+    memory_mb = int(getattr(settings, "SANDBOX_MEMORY_LIMIT_MB", 512))
+    max_processes = int(getattr(settings, "SANDBOX_MAX_PROCESSES", 0) or 0)
+    return SandboxLimits(
+        cpu_seconds=max(1, math.ceil(timeout)),
+        memory_bytes=memory_mb * 1024 * 1024 if limit_memory else None,
+        max_processes=max_processes if limit_processes and max_processes > 0 else None,
+        max_file_bytes=int(getattr(settings, "SANDBOX_MAX_FILE_MB", 16)) * 1024 * 1024,
+    )
+
+
+def _apply_limits(limits):
+    # Runs in the forked child before exec: only async-signal-safe-ish calls here
+    resource.setrlimit(resource.RLIMIT_CPU, (limits.cpu_seconds, limits.cpu_seconds + 1))
+    if limits.memory_bytes:
+        resource.setrlimit(resource.RLIMIT_AS, (limits.memory_bytes, limits.memory_bytes))
+    if limits.max_processes:
+        resource.setrlimit(resource.RLIMIT_NPROC, (limits.max_processes, limits.max_processes))
+    if limits.max_file_bytes:
+        resource.setrlimit(resource.RLIMIT_FSIZE, (limits.max_file_bytes, limits.max_file_bytes))
+
+
+def _read_stream(stream, sink):
+    try:
+        sink.append(stream.read())
+    except (OSError, ValueError):
+        pass
+    finally:
+        stream.close()
+
+
+def _read_peak_rss_kb(pid):
+    try:
+        with open(f"/proc/{pid}/status", encoding="ascii", errors="ignore") as status:
+            for line in status:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1])
+    except (OSError, ValueError, IndexError):
+        pass
+    return None
+
+
+def describe_signal(returncode):
+    """Readable reason for a process killed by a signal (negative returncode), else None."""
+    if returncode >= 0:
+        return None
+    signum = -returncode
+    if signum == signal.SIGXCPU:
+        return "CPU time limit exceeded."
+    if signum == signal.SIGXFSZ:
+        return "Output file size limit exceeded."
+    if signum == signal.SIGSEGV:
+        return "Segmentation fault (invalid memory access or memory limit exceeded)."
+    try:
+        return f"Process killed by signal {signal.Signals(signum).name}."
+    except ValueError:
+        return f"Process killed by signal {signum}."
+
+
+def run_sandboxed(command, cwd=None, input_data=None, env=None, timeout=5, limits=None):
+    """
+    Run ``command`` under ``limits`` and return a CompletedProcess carrying
+    ``cpu_ms`` (user + system) and ``peak_rss_kb`` attributes.
+    """
+    limits = limits or default_limits(timeout)
+    with tempfile.TemporaryDirectory(prefix="sandbox-") as private_tmp:
+        run_env = dict(env if env is not None else os.environ)
+        run_env.update({"TMPDIR": private_tmp, "TMP": private_tmp, "TEMP": private_tmp})
+
+        try:
+            proc = subprocess.Popen(
+                command,
+                stdin=subprocess.PIPE if input_data is not None else subprocess.DEVNULL,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                cwd=cwd or private_tmp,
+                env=run_env,
+                preexec_fn=lambda: _apply_limits(limits),
+                start_new_session=True,
+            )
+        except Exception as e:
+            return subprocess.CompletedProcess(command, 1, stdout=None, stderr=f"Server execution error: {str(e)}")
+
+        stdout_chunks, stderr_chunks = [], []
+        readers = [
+            threading.Thread(target=_read_stream, args=(proc.stdout, stdout_chunks), daemon=True),
+            threading.Thread(target=_read_stream, args=(proc.stderr, stderr_chunks), daemon=True),
+        ]
+        for reader in readers:
+            reader.start()
+        if input_data is not None:
+            try:
+                proc.stdin.write(input_data.encode("utf-8"))
+            except (OSError, ValueError):
+                pass
+            finally:
+                proc.stdin.close()
+
+        # Popen returns after exec, so every VmHWM sample belongs to the solution.
+        # VmHWM only grows: the last sample before exit is the peak so far.
+        peak_rss_kb = None
+        deadline = time.monotonic() + timeout
+        interval = 0.001
+        timed_out = False
+        while True:
+            sample = _read_peak_rss_kb(proc.pid)
+            if sample:
+                peak_rss_kb = max(peak_rss_kb or 0, sample)
+            pid, status, usage = os.wait4(proc.pid, os.WNOHANG)
+            if pid:
+                break
+            if time.monotonic() >= deadline:
+                timed_out = True
+                try:
+                    os.killpg(proc.pid, signal.SIGKILL)
+                except (OSError, ProcessLookupError):
+                    pass
+                _, status, usage = os.wait4(proc.pid, 0)
+                break
+            time.sleep(interval)
+            interval = min(interval * 2, 0.02)
+        if not timed_out:
+            # Do not leave background children of the solution behind
+            try:
+                os.killpg(proc.pid, signal.SIGKILL)
+            except (OSError, ProcessLookupError):
+                pass
+        for reader in readers:
+            reader.join(1)
+
+    returncode = os.waitstatus_to_exitcode(status)
+    # Reaped with wait4, so tell Popen not to wait for it again
+    proc.returncode = returncode
+
+    stdout = b"".join(stdout_chunks).decode("utf-8", errors="replace")
+    stderr = b"".join(stderr_chunks).decode("utf-8", errors="replace")
+    if timed_out:
+        returncode = 1
+        stderr = f"Execution timed out after {timeout} seconds. Code may be too slow or have infinite loops."
+    else:
+        reason = describe_signal(returncode)
+        if reason:
+            stderr = f"{stderr.rstrip()}\n{reason}".strip()
+
+    result = subprocess.CompletedProcess(command, returncode, stdout=stdout, stderr=stderr)
+    result.cpu_ms = round((usage.ru_utime + usage.ru_stime) * 1000, 1)
+    # None when the process finished before it could be sampled
+    result.peak_rss_kb = peak_rss_kb
+    return result
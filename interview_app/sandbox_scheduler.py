@@ -0,0 +1,148 @@
+"""
+Process-wide capacity control for coding-round sandboxes.
+
+Every test-case execution (one compiled binary run, one warm-worker job or
+one interpreter subprocess) holds a sandbox slot. The number of slots is
+capped at ``SANDBOX_MAX_CONCURRENCY`` (default: CPU core count) so concurrent
+submissions cannot oversubscribe the host. Waiting cases are granted slots
+round-robin across sessions, so a 20-case submission cannot starve a
+candidate who submitted a single case behind it.
+"""
+import os
+import statistics
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+from django.conf import settings
+
+# Samples kept for the queue-wait / run-time percentiles
+METRICS_WINDOW = 1000
+
+
+def _percentile(samples, fraction):
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))
+    return ordered[index]
+
+
+class SandboxScheduler:
+    """Counting semaphore with a per-session round-robin wait queue."""
+
+    def __init__(self, capacity=None):
+        self._capacity = capacity
+        self._cond = threading.Condition()
+        self._running = 0
+        # session key -> deque of waiting tickets; order is the round-robin order
+        self._waiting = OrderedDict()
+        self._queue_waits = deque(maxlen=METRICS_WINDOW)
+        self._run_times = deque(maxlen=METRICS_WINDOW)
+        self.totals = {"executions": 0, "queued": 0}
+
+    @property
+    def capacity(self):
+        if self._capacity is None:
+            configured = getattr(settings, "SANDBOX_MAX_CONCURRENCY", None)
+            self._capacity = int(configured or os.cpu_count() or 1)
+        return self._capacity
+
+    @property
+    def per_submission(self):
+        return max(1, int(getattr(settings, "SANDBOX_PER_SUBMISSION_PARALLELISM", 4)))
+
+    def _next_ticket(self):
+        for tickets in self._waiting.values():
+            return tickets[0]
+        return None
+
+    def acquire(self, session_key=None):
+        """Block until a slot is granted; returns the seconds spent queued."""
+        ticket = object()
+        started = time.monotonic()
+        with self._cond:
+            tickets = self._waiting.setdefault(session_key, deque())
+            tickets.append(ticket)
+            if self._running >= self.capacity:
+                self.totals["queued"] += 1
+            while self._running >= self.capacity or self._next_ticket() is not ticket:
+                self._cond.wait()
+            tickets.popleft()
+            if tickets:
+                # This session goes to the back of the line for its next case
+                self._waiting.move_to_end(session_key)
+            else:
+                del self._waiting[session_key]
+            self._running += 1
+            self._cond.notify_all()
+        waited = time.monotonic() - started
+        self._queue_waits.append(waited)
+        return waited
+
+    def release(self, run_seconds=None):
+        with self._cond:
+            self._running -= 1
+            self.totals["executions"] += 1
+            self._cond.notify_all()
+        if run_seconds is not None:
+            self._run_times.append(run_seconds)
+
+    @contextmanager
+    def slot(self, session_key=None):
+        self.acquire(session_key)
+        started = time.monotonic()
+        try:
+            yield
+        finally:
+            self.release(time.monotonic() - started)
+
+    def map(self, function, items, session_key=None):
+        """
+        Run ``function(index, item)`` for every item, up to ``per_submission``
+        at a time, each inside a sandbox slot. Results keep input order.
+        """
+        items = list(items)
+
+        def run(index):
+            with self.slot(session_key):
+                return function(index, items[index])
+
+        workers = min(self.per_submission, len(items))
+        if workers <= 1:
+            return [run(index) for index in range(len(items))]
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="sandbox") as executor:
+            return list(executor.map(run, range(len(items))))
+
+    def metrics(self):
+        waits = list(self._queue_waits)
+        runs = list(self._run_times)
+        with self._cond:
+            running = self._running
+            waiting = sum(len(tickets) for tickets in self._waiting.values())
+            sessions_waiting = len(self._waiting)
+        return {
+            "capacity": self.capacity,
+            "per_submission": self.per_submission,
+            "running": running,
+            "waiting": waiting,
+            "sessions_waiting": sessions_waiting,
+            "executions": self.totals["executions"],
+            "queued_executions": self.totals["queued"],
+            "queue_wait_ms": {
+                "mean": round(statistics.fmean(waits) * 1000, 2) if waits else 0.0,
+                "p95": round(_percentile(waits, 0.95) * 1000, 2),
+                "max": round(max(waits) * 1000, 2) if waits else 0.0,
+            },
+            "run_time_ms": {
+                "mean": round(statistics.fmean(runs) * 1000, 2) if runs else 0.0,
+                "p95": round(_percentile(runs, 0.95) * 1000, 2),
+                "max": round(max(runs) * 1000, 2) if runs else 0.0,
+            },
+        }
+
+
+# Global instance for easy access
+sandbox_scheduler = SandboxScheduler()
@@ -398,6 +398,88 @@ GEMINI_API_KEY = os.environ.get(
     os.environ.get("GOOGLE_API_KEY", ""),  # Empty string if not set - will fail gracefully
 )
 
+# Semantic resume pre-filter (utils.semantic_matcher)
+# Resumes whose embedding cosine similarity to the JD is below the threshold
+# skip the Gemini deep analysis during bulk extraction.
+SEMANTIC_PREFILTER_ENABLED = os.environ.get("SEMANTIC_PREFILTER_ENABLED", "true").lower() == "true"
+SEMANTIC_MATCH_THRESHOLD = float(os.environ.get("SEMANTIC_MATCH_THRESHOLD", "0.35"))
+
+# Coding round build cache (interview_app.artifact_cache)
+# Compiled submissions are reused when language, toolchain and harness source
+# are unchanged; least recently used builds are evicted past the size limit.
+# Set CODE_ARTIFACT_CACHE_MAX_MB=0 to disable.
+CODE_ARTIFACT_CACHE_DIR = os.environ.get("CODE_ARTIFACT_CACHE_DIR", str(BASE_DIR / "code_artifact_cache"))
+CODE_ARTIFACT_CACHE_MAX_MB = int(os.environ.get("CODE_ARTIFACT_CACHE_MAX_MB", "512"))
+
+# Warm Python/Node workers for coding round test cases (interview_app.warm_workers)
+WARM_WORKERS_ENABLED = os.environ.get("WARM_WORKERS_ENABLED", "true").lower() == "true"
+WARM_WORKER_POOL_SIZE = int(os.environ.get("WARM_WORKER_POOL_SIZE", "2"))
+WARM_WORKER_MAX_JOBS = int(os.environ.get("WARM_WORKER_MAX_JOBS", "50"))
+WARM_WORKER_MEMORY_MB = int(os.environ.get("WARM_WORKER_MEMORY_MB", "512"))
+
+# Coding sandbox capacity (interview_app.sandbox_scheduler)
+# Total concurrent test-case executions on this host (empty = CPU core count)
+# and how many cases of a single submission may run in parallel.
+SANDBOX_MAX_CONCURRENCY = int(os.environ.get("SANDBOX_MAX_CONCURRENCY", "0")) or None
+SANDBOX_PER_SUBMISSION_PARALLELISM = int(os.environ.get("SANDBOX_PER_SUBMISSION_PARALLELISM", "4"))
+
+# Linux rlimit sandbox for test-case runs (interview_app.sandbox)
+# RLIMIT_NPROC counts every process/thread of the user, so SANDBOX_MAX_PROCESSES
+# is off (0) unless the sandbox runs under a dedicated account; never applied to Java/Go.
+SANDBOX_ENABLED = os.environ.get("SANDBOX_ENABLED", "true").lower() == "true"
+SANDBOX_MEMORY_LIMIT_MB = int(os.environ.get("SANDBOX_MEMORY_LIMIT_MB", "512"))
+SANDBOX_MAX_PROCESSES = int(os.environ.get("SANDBOX_MAX_PROCESSES", "0"))
+SANDBOX_MAX_FILE_MB = int(os.environ.get("SANDBOX_MAX_FILE_MB", "16"))
+
+# Async coding jobs: background executor size and how long one SSE response
+# stays open before the client reconnects (or polls the job status)
+CODE_JOB_WORKERS = int(os.environ.get("CODE_JOB_WORKERS", "4"))
+CODE_JOB_STREAM_TIMEOUT_SECONDS = int(os.environ.get("CODE_JOB_STREAM_TIMEOUT_SECONDS", "25"))
+
+# Complexity measurement over test-case scaling series (runs per input size, best time kept)
+CODE_COMPLEXITY_ENABLED = os.environ.get("CODE_COMPLEXITY_ENABLED", "true").lower() == "true"
+CODE_COMPLEXITY_REPEATS = int(os.environ.get("CODE_COMPLEXITY_REPEATS", "2"))
+
+# CPU voice activity detection (used without pyannote): shortest speech run kept, shortest pause reported
+ENERGY_VAD_MIN_SPEECH_MS = int(os.environ.get("ENERGY_VAD_MIN_SPEECH_MS", "250"))
+ENERGY_VAD_MIN_PAUSE_MS = int(os.environ.get("ENERGY_VAD_MIN_PAUSE_MS", "300"))
+
+# Interview recordings longer than this are diarized in overlapping windows, checkpointed per window (0 disables)
+VOICE_ANALYSIS_CHUNK_SECONDS = int(os.environ.get("VOICE_ANALYSIS_CHUNK_SECONDS", "600"))
+VOICE_ANALYSIS_CHUNK_OVERLAP_SECONDS = int(os.environ.get("VOICE_ANALYSIS_CHUNK_OVERLAP_SECONDS", "30"))
+
+# Background workers that decode and VAD each uploaded answer (interview_app.answer_metrics)
+ANSWER_METRICS_WORKERS = int(os.environ.get("ANSWER_METRICS_WORKERS", "2"))
+
+# Speech models (see model_registry.py): Whisper size, and models to load at startup instead of on first use
+WHISPER_MODEL_NAME = os.environ.get("WHISPER_MODEL_NAME", "base")
+MODEL_PRELOAD = [name.strip() for name in os.environ.get("MODEL_PRELOAD", "").split(",") if name.strip()]
+
+# FFmpeg threads for recording finalization (0 = the cores this process may use, shared among TRANSCODE_WORKERS)
+MEDIA_FFMPEG_THREADS = int(os.environ.get("MEDIA_FFMPEG_THREADS", "0"))
+
+# Resumable chunked uploads: largest accepted chunk, bytes between fsyncs, threads processing finalized uploads
+CHUNKED_UPLOAD_MAX_CHUNK_BYTES = int(os.environ.get("CHUNKED_UPLOAD_MAX_CHUNK_BYTES", str(16 * 1024 * 1024)))
+CHUNKED_UPLOAD_FSYNC_BYTES = int(os.environ.get("CHUNKED_UPLOAD_FSYNC_BYTES", str(8 * 1024 * 1024)))
+MEDIA_PROCESSING_WORKERS = int(os.environ.get("MEDIA_PROCESSING_WORKERS", "2"))
+
+# Live screen recordings: stream to GCS while recording by default, in pieces of this size (multiple of 256 KiB)
+LIVE_RECORDING_GCS_UPLOAD = os.environ.get("LIVE_RECORDING_GCS_UPLOAD", "false").lower() == "true"
+LIVE_RECORDING_GCS_PIECE_BYTES = int(os.environ.get("LIVE_RECORDING_GCS_PIECE_BYTES", str(8 * 1024 * 1024)))
+
+# Recording uploads to storage (see gcs_transfer.py): "gcs", or "local" to write to GCS_LOCAL_BACKEND_DIR instead;
+# parts of this size uploaded by this many threads, each retried on its own, on GCS_TRANSFER_JOBS background jobs
+GCS_TRANSFER_BACKEND = os.environ.get("GCS_TRANSFER_BACKEND", "gcs")
+GCS_LOCAL_BACKEND_DIR = os.environ.get("GCS_LOCAL_BACKEND_DIR", "")
+GCS_TRANSFER_CHUNK_BYTES = int(os.environ.get("GCS_TRANSFER_CHUNK_BYTES", str(32 * 1024 * 1024)))
+GCS_TRANSFER_WORKERS = int(os.environ.get("GCS_TRANSFER_WORKERS", "8"))
+GCS_TRANSFER_RETRIES = int(os.environ.get("GCS_TRANSFER_RETRIES", "3"))
+GCS_TRANSFER_JOBS = int(os.environ.get("GCS_TRANSFER_JOBS", "2"))
+
+# Recording transcodes (see transcode_queue.py): jobs run at once (0 = half the cores) and their nice level
+TRANSCODE_WORKERS = int(os.environ.get("TRANSCODE_WORKERS", "0"))
+TRANSCODE_NICE = int(os.environ.get("TRANSCODE_NICE", "10"))
+
 # Deepgram configuration
 # IMPORTANT: Set DEEPGRAM_API_KEY in your .env file for security
 DEEPGRAM_API_KEY = os.environ.get("DEEPGRAM_API_KEY", "")
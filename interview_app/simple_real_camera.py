@@ -1467,6 +1467,9 @@ class SimpleRealVideoCamera:
         if not os.path.exists(video_path):
             return None
         
+        from interview_app.transcode_queue import report_progress
+        report_progress("converting")
+        
         try:
             # Use PyAV for conversion
             if not PYAV_AVAILABLE:
@@ -1607,9 +1610,20 @@ class SimpleRealVideoCamera:
                     self._video_writer.release()
                     self._video_writer = None
                     print(f"✅ Video recording stopped for session {self.session_id} at {video_stop_timestamp}")
+                    if video_path and os.path.exists(video_path):
+                        from interview_app.models import MediaArtifact
+                        self._record_artifact(
+                            MediaArtifact.Role.RAW_VIDEO, video_path,
+                            start_timestamp=getattr(self, '_recording_start_timestamp', None),
+                        )
             except Exception as e:
                 print(f"⚠️ Error stopping video writer: {e}")
         
+        # Already merged (called again after the merge, e.g. by cleanup): nothing left to do
+        if (not self._recording_active and video_path and '_with_audio' in os.path.basename(video_path)
+                and os.path.exists(video_path)):
+            return os.path.relpath(video_path, settings.MEDIA_ROOT).replace('\\', '/')
+        
         # Debug logging
         print(f"🔍 stop_video_recording called:")
         print(f"   audio_file_path: {audio_file_path}")
@@ -1628,6 +1642,15 @@ class SimpleRealVideoCamera:
             # Convert relative paths to absolute
             audio_file_path = os.path.join(settings.MEDIA_ROOT, audio_file_path)
         
+        # Start timestamps the caller does not have were recorded with the uploads
+        if audio_file_path and (audio_start_timestamp is None or video_start_timestamp is None):
+            from interview_app.media_manifest import start_timestamps
+            session = self._interview_session()
+            if session:
+                manifest_audio_ts, manifest_video_ts = start_timestamps(session)
+                audio_start_timestamp = audio_start_timestamp if audio_start_timestamp is not None else manifest_audio_ts
+                video_start_timestamp = video_start_timestamp if video_start_timestamp is not None else manifest_video_ts
+        
         # If no video path exists, try to find it from the session or file system
         if not video_path or not os.path.exists(video_path):
             print(f"⚠️ Video path not set or file doesn't exist: {video_path}")
@@ -1639,8 +1662,18 @@ class SimpleRealVideoCamera:
                 os.path.join(settings.MEDIA_ROOT, 'interview_videos'),  # Old folder
             ]
             
-            # Search for video files matching this session_id
+            # The media manifest knows the raw video; the scans below are for recordings made before it
             found_video = None
+            session = self._interview_session()
+            if session:
+                from interview_app.media_manifest import artifact_path
+                from interview_app.models import MediaArtifact
+                found_video = artifact_path(session, MediaArtifact.Role.RAW_VIDEO)
+            if found_video:
+                print(f"✅ Found raw video in media manifest: {found_video}")
+                search_dirs = []
+            
+            # Search for video files matching this session_id
             for search_dir in search_dirs:
                 if not os.path.exists(search_dir):
                     continue
@@ -1790,13 +1823,9 @@ class SimpleRealVideoCamera:
                 print(f"   MoviePy available: {MOVIEPY_AVAILABLE}")
                 print(f"   FFmpeg available: Checking...")
                 
-                ffmpeg_available = False
-                try:
-                    subprocess.run(['ffmpeg', '-version'], capture_output=True, timeout=5)
-                    ffmpeg_available = True
-                    print(f"   FFmpeg available: True")
-                except (FileNotFoundError, subprocess.TimeoutExpired):
-                    print(f"   FFmpeg available: False")
+                from interview_app.audio_processor import get_ffmpeg_path
+                ffmpeg_available = get_ffmpeg_path() is not None
+                print(f"   FFmpeg available: {ffmpeg_available}")
                 
                 if not MOVIEPY_AVAILABLE and not ffmpeg_available:
                     raise RuntimeError("Neither MoviePy nor FFmpeg is available for video/audio merging. Install MoviePy: pip install moviepy")
@@ -1820,9 +1849,10 @@ class SimpleRealVideoCamera:
                             print(f"   Channels: {audio_info['channels']}")
                             print(f"   Codec: {audio_info['codec']}")
                         
-                        # Process audio if needed (convert to WAV for better compatibility)
+                        # Process audio if needed (convert to WAV for better compatibility);
+                        # the single FFmpeg pass below decodes any format itself
                         file_ext = os.path.splitext(audio_file_path)[1].lower()
-                        if file_ext not in ['.wav', '.mp3', '.m4a', '.aac']:
+                        if not ffmpeg_available and file_ext not in ['.wav', '.mp3', '.m4a', '.aac']:
                             print(f"🔄 Audio format ({file_ext}) may not be optimal, converting to WAV...")
                             processed_audio = process_uploaded_audio(audio_file_path, convert_to_wav=True)
                             if processed_audio and os.path.exists(processed_audio):
@@ -1834,8 +1864,6 @@ class SimpleRealVideoCamera:
                         print(f"⚠️ Error processing audio before merge: {e}")
                         # Continue with original audio file
                     
-                    print(f"✅ FFmpeg available - using FFmpeg for merging (more reliable)")
-                    
                     # CRITICAL: Convert all paths to absolute paths for accurate file access
                     # Normalize paths first to handle separators correctly
                     video_path = os.path.normpath(video_path)
@@ -1905,8 +1933,42 @@ class SimpleRealVideoCamera:
                     print(f"   video_start_timestamp: {video_ts}")
                     print(f"   audio_start_timestamp: {audio_start_timestamp}")
                     
-                    # Use MoviePy for merging (preferred)
-                    if MOVIEPY_AVAILABLE:
+                    # Single FFmpeg pass: merged MP4, analysis WAV and poster from one decode
+                    finalized = None
+                    poster_path = os.path.join(merged_video_dir, f"{base_name}_poster.jpg")
+                    wav_path = os.path.abspath(self._analysis_wav_path())
+                    if ffmpeg_available and wav_path == audio_file_path:
+                        # The converted upload would be both input and output: decode the original upload instead
+                        original_audio = self._find_audio_file_for_session()
+                        if original_audio:
+                            audio_file_path = os.path.abspath(original_audio)
+                        else:
+                            wav_path = None
+                    if ffmpeg_available:
+                        from interview_app.media_finalize import finalize_recording
+                        from interview_app.media_manifest import get_artifact
+                        from interview_app.models import MediaArtifact
+                        from interview_app.transcode_queue import report_progress
+                        session = self._interview_session()
+                        raw_video = get_artifact(session, MediaArtifact.Role.RAW_VIDEO) if session else None
+                        report_progress("merging")
+                        finalized = finalize_recording(
+                            video_path,
+                            audio_file_path,
+                            merged_video_path,
+                            wav_path=wav_path,
+                            poster_path=poster_path,
+                            video_start_timestamp=video_ts,
+                            audio_start_timestamp=audio_start_timestamp,
+                            progress=lambda fraction: report_progress(fraction=fraction),
+                            duration=raw_video.duration if raw_video else None,
+                        )
+                    if finalized:
+                        merge_success = True
+                        merge_lib_name = "FFmpeg (single pass)"
+                    # Use MoviePy for merging (preferred fallback)
+                    elif MOVIEPY_AVAILABLE:
+                        merge_lib_name = "MoviePy"
                         merge_success = merge_video_audio_moviepy(
                             video_path=video_path,
                             audio_file_path=audio_file_path,
@@ -1916,6 +1978,7 @@ class SimpleRealVideoCamera:
                             video_duration=None  # Let MoviePy calculate from video
                         )
                     else:
+                        merge_lib_name = "FFmpeg"
                         # Fallback to FFmpeg if MoviePy not available
                         merge_success = merge_video_audio_ffmpeg(
                             video_path=video_path,
@@ -1928,7 +1991,6 @@ class SimpleRealVideoCamera:
                     
                     # CRITICAL: Verify merged file exists and has content
                     if not merge_success:
-                        merge_lib_name = "MoviePy" if MOVIEPY_AVAILABLE else "FFmpeg"
                         print(f"❌ {merge_lib_name} merge function returned False!")
                         raise Exception(f"{merge_lib_name} merge function returned False")
                     
@@ -1961,7 +2023,13 @@ class SimpleRealVideoCamera:
                     
                     video_path = merged_video_path
                     self._video_file_path = merged_video_path
-                    merge_lib_name = "MoviePy" if MOVIEPY_AVAILABLE else "FFmpeg"
+                    from interview_app.models import MediaArtifact
+                    self._record_artifact(MediaArtifact.Role.VIDEO, merged_video_path)
+                    if finalized:
+                        for role, output in ((MediaArtifact.Role.ANALYSIS_AUDIO, wav_path),
+                                             (MediaArtifact.Role.POSTER, poster_path)):
+                            if output in finalized['outputs']:
+                                self._record_artifact(role, output)
                     print(f"✅ Video and audio merged successfully using {merge_lib_name}!")
                     print(f"   Final video path: {merged_video_path}")
                     print(f"   Final video size: {merged_size_mb:.2f} MB")
@@ -2812,6 +2880,21 @@ class SimpleRealVideoCamera:
             if frame is not None:
                 self._log_warning_with_snapshot_async('tab_switched', True, False, frame, rate_limit_seconds=3)
 
+    def stop_capture(self, synchronized_stop_time=None):
+        """
+        Stop reading and recording frames (at ``synchronized_stop_time`` when
+        it is ahead) and free the capture device. The video file is finished
+        later by ``stop_video_recording``/``cleanup`` on a transcode worker.
+        """
+        if synchronized_stop_time:
+            time.sleep(max(0.0, synchronized_stop_time - time.time()))
+        self._running = False
+        t = getattr(self, '_detector_thread', None)
+        if t and t.is_alive() and t is not threading.current_thread():
+            t.join(timeout=1.5)
+        if self.video:
+            self.video.release()
+
     def cleanup(self):
         """Clean up camera resources and return video path if recording was active."""
         print(f"🧹 Cleaning up simple camera for session {self.session_id}")
@@ -2832,26 +2915,66 @@ class SimpleRealVideoCamera:
         print(f"✅ Simple camera cleanup completed for session {self.session_id}")
         return video_path
 
-    def _find_audio_file_for_session(self):
-        """Attempt to locate the most recent audio file for this session."""
+    def _interview_session(self):
+        """The InterviewSession this camera records (None when it cannot be resolved)."""
         try:
             from interview_app.models import InterviewSession
-            session = InterviewSession.objects.get(id=self.session_id)
-            session_key = session.session_key
+            return InterviewSession.objects.filter(id=self.session_id).first()
         except Exception as e:
-            print(f"⚠️ Could not resolve session key for audio lookup: {e}")
-            session_key = None
-        
+            print(f"⚠️ Could not resolve InterviewSession {self.session_id}: {e}")
+            return None
+
+    def _record_artifact(self, role, path=None, **fields):
+        """Record an artifact of this recording in the session's media manifest (best effort)."""
+        try:
+            from interview_app.media_manifest import record_artifact
+            session = self._interview_session()
+            if session:
+                record_artifact(session, role, path=path, **fields)
+        except Exception as e:
+            print(f"⚠️ Could not update media manifest ({role}): {e}")
+
+    def _analysis_wav_path(self):
+        """Where voice analysis looks first for this session's 16 kHz WAV."""
+        session = self._interview_session()
+        session_key = session.session_key if session else self.session_id
+        return os.path.join(settings.MEDIA_ROOT, 'interview_audio', f"{session_key}_interview_audio_converted.wav")
+
+    def _find_audio_file_for_session(self):
+        """The uploaded interview audio of this session: its media manifest, else the newest upload in interview_audio/."""
+        from interview_app.media_manifest import artifact_path
+        from interview_app.models import MediaArtifact
+        session = self._interview_session()
+        if session:
+            found_audio = artifact_path(session, MediaArtifact.Role.AUDIO)
+            if found_audio:
+                return found_audio
+        
+        # Recordings made before the manifest: scan for the session's uploads
         audio_dir = os.path.join(settings.MEDIA_ROOT, 'interview_audio')
         if not os.path.isdir(audio_dir):
             return None
         
         prefixes = []
-        if session_key:
-            prefixes.append(session_key)
-        prefixes.append(str(self.session_id))
+        if session:
+            prefixes.append(f"{session.session_key}_")
+        prefixes.append(f"{self.session_id}_")
         
         latest_file = None
+        latest_mtime = None
+        for filename in os.listdir(audio_dir):
+            # The converted WAV is derived from the upload, not the upload itself
+            if not filename.startswith(tuple(prefixes)) or os.path.splitext(filename)[0].endswith('_converted'):
+                continue
+            candidate = os.path.join(audio_dir, filename)
+            if not os.path.isfile(candidate):
+                continue
+            mtime = os.path.getmtime(candidate)
+            if latest_mtime is None or mtime > latest_mtime:
+                latest_file, latest_mtime = candidate, mtime
+        if latest_file:
+            print(f"✅ Found interview audio by directory scan: {latest_file}")
+        return latest_file
 
 
 class PyAudioAudioRecorder:
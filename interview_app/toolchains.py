@@ -0,0 +1,272 @@
+"""
+Registry of the language toolchains used by the coding round.
+
+Locating a compiler walks PATH, settings, JAVA_HOME and the usual Windows
+install directories, and reading its version starts a process. The registry
+does this once per worker process, on first use, and records every
+toolchain's path, version and capabilities; executors then only do a dict
+lookup per run. ``refresh()`` re-probes after a toolchain is installed or
+upgraded without restarting the server.
+"""
+import os
+import shutil
+import subprocess
+import threading
+import time
+from functools import lru_cache
+
+from django.conf import settings
+
+from .sandbox import SANDBOX_SUPPORTED
+
+CPP_STANDARD = "c++17"
+
+# Languages served by each toolchain (used by health checks)
+TOOLCHAIN_LANGUAGES = {
+    "python": ["PYTHON"],
+    "node": ["JAVASCRIPT"],
+    "cpp": ["C", "CPP"],
+    "javac": ["JAVA"],
+    "java": ["JAVA"],
+    "go": ["GO"],
+    "php": ["PHP"],
+    "ruby": ["RUBY"],
+    "dotnet": ["CSHARP"],
+}
+
+
+@lru_cache(maxsize=None)
+def toolchain_version(binary, *version_args):
+    """First line of ``binary <version_args>`` output, probed once per process."""
+    try:
+        result = subprocess.run(
+            [binary, *version_args], capture_output=True, text=True, timeout=10
+        )
+    except Exception as e:
+        return f"{binary} (unknown version: {e})"
+    output = (result.stdout or "").strip() or (result.stderr or "").strip()
+    return output.splitlines()[0] if output else binary
+
+
+def _resolve_php_binary():
+    php_cmd = shutil.which("php")
+    if php_cmd:
+        return php_cmd
+
+    configured = getattr(settings, "PHP_PATH", None) or os.environ.get("PHP_PATH")
+    if configured:
+        if os.path.isfile(configured):
+            return configured
+        possible = os.path.join(configured, "php.exe")
+        if os.path.isfile(possible):
+            return possible
+
+    common_candidates = [
+        r"C:\tools\php84\php.exe",
+        r"C:\tools\php\php.exe",
+        r"C:\Program Files\PHP\php.exe",
+        r"C:\Program Files\Php\php.exe",
+        r"C:\Program Files (x86)\PHP\php.exe",
+    ]
+    for candidate in common_candidates:
+        if os.path.isfile(candidate):
+            return candidate
+
+    return None
+
+
+def _resolve_cpp_compiler():
+    configured = getattr(settings, "CPP_COMPILER", None) or os.environ.get("CPP_COMPILER")
+    if configured:
+        if os.path.isfile(configured):
+            return configured
+        possible = os.path.join(configured, "g++.exe")
+        if os.path.isfile(possible):
+            return possible
+
+    compiler = shutil.which("g++")
+    if compiler:
+        return compiler
+
+    candidates = [
+        r"C:\msys641\mingw64\bin\g++.exe",
+        r"C:\msys64\mingw64\bin\g++.exe",
+        r"C:\msys64\ucrt64\bin\g++.exe",
+        r"C:\mingw64\bin\g++.exe",
+    ]
+    for candidate in candidates:
+        if os.path.isfile(candidate):
+            return candidate
+    return None
+
+
+def _resolve_java_binary(binary_name: str):
+    """
+    Locate the full path for a Java executable (e.g., javac, java).
+    Checks PATH, Django settings, JAVA_HOME, and common Windows install directories.
+    """
+    if not binary_name:
+        return None
+
+    exe_name = binary_name
+    if os.name == "nt" and not binary_name.lower().endswith(".exe"):
+        exe_name = f"{binary_name}.exe"
+
+    # PATH lookup first
+    for name in {binary_name, exe_name}:
+        located = shutil.which(name)
+        if located:
+            return located
+
+    # Django settings or environment JAVA_HOME
+    java_home = getattr(settings, "JAVA_HOME", None) or os.environ.get("JAVA_HOME")
+    if java_home:
+        candidate = os.path.join(java_home, "bin", exe_name)
+        if os.path.exists(candidate):
+            return candidate
+
+    # Common Windows install locations
+    if os.name == "nt":
+        potential_roots = [
+            os.environ.get("PROGRAMFILES"),
+            os.environ.get("PROGRAMFILES(X86)"),
+            r"C:\Program Files\Java",
+            r"C:\Program Files (x86)\Java",
+        ]
+        for root in filter(None, potential_roots):
+            if not os.path.isdir(root):
+                continue
+            try:
+                entries = sorted(os.listdir(root))
+            except OSError:
+                continue
+            for entry in entries:
+                entry_lower = entry.lower()
+                if not (entry_lower.startswith("java") or entry_lower.startswith("jdk") or entry_lower.startswith("jre")):
+                    continue
+                candidate = os.path.join(root, entry, "bin", exe_name)
+                if os.path.exists(candidate):
+                    return candidate
+
+    return None
+
+
+def _accepts_flag(compiler, flag):
+    """Whether ``compiler`` accepts ``flag`` (an empty C++ translation unit is compiled)."""
+    try:
+        result = subprocess.run(
+            [compiler, flag, "-x", "c++", "-fsyntax-only", "-"],
+            input="", capture_output=True, text=True, timeout=30,
+        )
+    except Exception:
+        return False
+    return result.returncode == 0
+
+
+# name -> (resolver, version arguments)
+TOOLCHAIN_PROBES = {
+    "python": (lambda: shutil.which("python") or shutil.which("python3"), ("--version",)),
+    "node": (lambda: shutil.which("node"), ("--version",)),
+    "cpp": (_resolve_cpp_compiler, ("--version",)),
+    "javac": (lambda: _resolve_java_binary("javac"), ("-version",)),
+    "java": (lambda: _resolve_java_binary("java"), ("-version",)),
+    "go": (lambda: shutil.which("go"), ("version",)),
+    "php": (_resolve_php_binary, ("--version",)),
+    "ruby": (lambda: shutil.which("ruby"), ("--version",)),
+    "dotnet": (lambda: shutil.which("dotnet"), ("--version",)),
+}
+
+
+class ToolchainRegistry:
+    """Toolchain paths, versions and capabilities, probed once per process."""
+
+    def __init__(self, probes=None):
+        self._probes = probes or TOOLCHAIN_PROBES
+        self._lock = threading.Lock()
+        self._entries = None
+        self._cpp_env = None
+        self.probed_at = None
+
+    def _probe_one(self, name):
+        resolver, version_args = self._probes[name]
+        try:
+            path = resolver()
+        except Exception as e:
+            print(f"⚠️ Toolchain probe for {name} failed: {e}")
+            path = None
+        entry = {
+            "name": name,
+            "path": path,
+            "available": bool(path),
+            "version": toolchain_version(path, *version_args) if path else None,
+            "languages": TOOLCHAIN_LANGUAGES.get(name, []),
+            "capabilities": {"sandbox": SANDBOX_SUPPORTED},
+        }
+        if name in ("python", "node"):
+            entry["capabilities"]["warm_workers"] = bool(getattr(settings, "WARM_WORKERS_ENABLED", True))
+        if name == "cpp" and path:
+            entry["capabilities"]["std"] = CPP_STANDARD if _accepts_flag(path, f"-std={CPP_STANDARD}") else None
+        return entry
+
+    def _probe_all(self):
+        entries = {name: self._probe_one(name) for name in self._probes}
+        cpp_env = dict(os.environ)
+        compiler = entries.get("cpp", {}).get("path")
+        if compiler:
+            # MinGW needs its own bin directory on PATH to find its DLLs
+            cpp_env["PATH"] = os.path.dirname(compiler) + os.pathsep + cpp_env.get("PATH", "")
+        # Published together so readers never see entries without their env
+        self._cpp_env = cpp_env
+        self._entries = entries
+        self.probed_at = time.time()
+        available = [name for name, entry in entries.items() if entry["available"]]
+        print(f"✅ Toolchains probed: {', '.join(available) or 'none available'}")
+        return entries
+
+    def probe(self):
+        """Probe every toolchain (once); later calls return the recorded entries."""
+        entries = self._entries
+        if entries is not None:
+            return entries
+        with self._lock:
+            if self._entries is None:
+                return self._probe_all()
+            return self._entries
+
+    def refresh(self):
+        """Probe every toolchain again, e.g. after one was installed or upgraded."""
+        with self._lock:
+            toolchain_version.cache_clear()
+            print("♻️ Re-probing toolchains")
+            return self._probe_all()
+
+    def get(self, name):
+        return self.probe().get(name)
+
+    def path(self, name):
+        entry = self.probe().get(name)
+        return entry["path"] if entry else None
+
+    def version(self, name):
+        entry = self.probe().get(name)
+        return entry["version"] if entry else None
+
+    def command(self, name):
+        """Executable to launch for ``name``; the bare name when it was not found."""
+        return self.path(name) or name
+
+    def cpp_env(self):
+        """Environment for compiling and running C/C++ (shared, do not mutate)."""
+        self.probe()
+        return self._cpp_env
+
+    def snapshot(self):
+        """JSON-serialisable copy of every entry."""
+        return {
+            name: dict(entry, capabilities=dict(entry["capabilities"]))
+            for name, entry in self.probe().items()
+        }
+
+
+# Global instance for easy access
+toolchains = ToolchainRegistry()
@@ -0,0 +1,196 @@
+"""
+Bounded queue for recording transcodes (stop, merge, browser conversion).
+
+Request handlers and finalization threads only ``submit`` a job; at most
+``TRANSCODE_WORKERS`` run at once (default: half the cores this process may
+use), and FFmpeg in each job gets its share of the cores (see
+``media_finalize.ffmpeg_threads``). When several interviews end together
+the encodes queue up instead of all competing for the CPU with the
+requests being served.
+
+Jobs are keyed, one per session and operation: submitting a key that is
+queued, running or done returns that job instead of encoding again, so a
+recording released from two places is merged once. A failed job can be
+submitted again, and a done one when the caller has new work under its key
+(``replace_done``).
+
+Each job runs at its own nice level (``TRANSCODE_NICE`` by default), which
+FFmpeg and the other encoders it starts inherit, and reports its stage and
+progress through ``report_progress``.
+"""
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+
+# Finished jobs kept for status polling
+MAX_FINISHED_JOBS = 500
+
+
+def available_cores():
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+def transcode_workers():
+    """Jobs run at once: ``TRANSCODE_WORKERS``, or half the cores this process may use when 0."""
+    workers = int(getattr(settings, "TRANSCODE_WORKERS", 0) or 0)
+    return workers if workers > 0 else max(1, available_cores() // 2)
+
+
+class TranscodeJob:
+    QUEUED = "queued"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+
+    def __init__(self, key, session_key=None, label="", nice=0):
+        self.key = key
+        self.session_key = session_key
+        self.label = label or key
+        self.nice = nice
+        self.state = self.QUEUED
+        self.stage = ""
+        self.progress = None
+        self.result = None
+        self.error = ""
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self._finished = threading.Event()
+
+    @property
+    def finished(self):
+        return self.state in (self.DONE, self.FAILED)
+
+    def wait(self, timeout=None):
+        """Block until the job has finished; returns its result (None if it failed or timed out)."""
+        self._finished.wait(timeout)
+        return self.result
+
+    def to_dict(self):
+        return {
+            "key": self.key,
+            "label": self.label,
+            "state": self.state,
+            "stage": self.stage,
+            "progress": round(self.progress, 3) if self.progress is not None else None,
+            "nice": self.nice,
+            "error": self.error or None,
+            "queued_seconds": round((self.started_at or time.time()) - self.created_at, 1),
+            "run_seconds": round((self.finished_at or time.time()) - self.started_at, 1) if self.started_at else None,
+        }
+
+
+class TranscodeQueue:
+    """Runs keyed transcode jobs on a bounded pool."""
+
+    def __init__(self):
+        self._executor = None
+        self._jobs = {}
+        self._lock = threading.Lock()
+        self._current = threading.local()
+
+    def _get_executor(self):
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=transcode_workers(), thread_name_prefix="transcode")
+        return self._executor
+
+    def submit(self, key, fn, *args, session_key=None, label="", nice=None, replace_done=False, **kwargs):
+        """
+        Queue ``fn(*args, **kwargs)`` as job ``key`` and return the job. If a
+        job with this key is queued, running or done, that job is returned
+        and ``fn`` is not run again; with ``replace_done`` a done job is
+        replaced by a new one.
+        """
+        if nice is None:
+            nice = int(getattr(settings, "TRANSCODE_NICE", 10))
+        with self._lock:
+            existing = self._jobs.get(key)
+            replaceable = (TranscodeJob.FAILED, TranscodeJob.DONE) if replace_done else (TranscodeJob.FAILED,)
+            if existing and existing.state not in replaceable:
+                return existing
+            job = TranscodeJob(key, session_key=session_key, label=label, nice=nice)
+            self._jobs[key] = job
+            self._prune()
+        print(f"🎬 Transcode job queued: {job.label} ({key})")
+        self._get_executor().submit(self._run, job, fn, args, kwargs)
+        return job
+
+    def _prune(self):
+        finished = [job for job in self._jobs.values() if job.finished]
+        for job in sorted(finished, key=lambda job: job.finished_at)[:max(0, len(finished) - MAX_FINISHED_JOBS)]:
+            del self._jobs[job.key]
+
+    def _run(self, job, fn, args, kwargs):
+        # A fresh thread per job: niceness is per thread on Linux and an
+        # unprivileged thread cannot lower it again for the next job
+        runner = threading.Thread(target=self._execute, args=(job, fn, args, kwargs), name=f"transcode-{job.key}")
+        runner.start()
+        runner.join()
+
+    def _execute(self, job, fn, args, kwargs):
+        from django.db import close_old_connections
+        self._current.job = job
+        if job.nice and hasattr(os, "setpriority"):
+            try:
+                os.setpriority(os.PRIO_PROCESS, threading.get_native_id(), job.nice)
+            except OSError as e:
+                print(f"⚠️ Could not set nice {job.nice} for {job.key}: {e}")
+        job.state = TranscodeJob.RUNNING
+        job.started_at = time.time()
+        try:
+            job.result = fn(*args, **kwargs)
+            job.state = TranscodeJob.DONE
+            job.progress = 1.0
+            print(f"✅ Transcode job {job.key} done in {time.time() - job.started_at:.1f}s")
+        except Exception as e:
+            import traceback
+            traceback.print_exc()
+            job.error = str(e)
+            job.state = TranscodeJob.FAILED
+        finally:
+            job.finished_at = time.time()
+            job._finished.set()
+            self._current.job = None
+            close_old_connections()
+
+    def report_progress(self, stage=None, fraction=None):
+        """Update the stage and/or completed fraction (0-1) of the job running on this thread, if any."""
+        job = getattr(self._current, "job", None)
+        if job is None:
+            return
+        if stage is not None and stage != job.stage:
+            job.stage = stage
+            job.progress = None
+        if fraction is not None:
+            job.progress = max(0.0, min(1.0, fraction))
+
+    def job(self, key):
+        return self._jobs.get(key)
+
+    def jobs_for_session(self, session_key):
+        with self._lock:
+            return [job for job in self._jobs.values() if job.session_key == session_key]
+
+    def stats(self):
+        with self._lock:
+            jobs = list(self._jobs.values())
+        return {
+            "workers": transcode_workers(),
+            "queued": sum(job.state == TranscodeJob.QUEUED for job in jobs),
+            "running": sum(job.state == TranscodeJob.RUNNING for job in jobs),
+        }
+
+
+# Global instance for easy access
+transcode_queue = TranscodeQueue()
+
+
+def report_progress(stage=None, fraction=None):
+    transcode_queue.report_progress(stage, fraction)
@@ -37,6 +37,12 @@ urlpatterns = [
     
     # --- NEW URL FOR FINAL SUBMISSION OF THE CODING CHALLENGE ---
     path('submit_coding_challenge/', views.submit_coding_challenge, name='submit_coding_challenge'),
+    path('api/coding/sandbox-metrics/', views.coding_sandbox_metrics, name='coding_sandbox_metrics'),
+    path('api/coding/toolchains/', views.coding_toolchains, name='coding_toolchains'),
+    path('api/voice/models/', views.speech_models, name='speech_models'),
+    path('api/storage/transfers/', views.storage_transfers, name='storage_transfers'),
+    path('api/coding/jobs/<uuid:job_id>/', views.code_job_status, name='code_job_status'),
+    path('api/coding/jobs/<uuid:job_id>/stream/', views.code_job_stream, name='code_job_stream'),
     
     # --- NEW API ENDPOINTS FOR INTERVIEW RESULTS ---
     path('api/results/<uuid:session_id>/', views.InterviewResultsAPIView.as_view(), name='interview_results_api'),
@@ -47,6 +53,13 @@ urlpatterns = [
     path('ai/recording/upload_video/', views.upload_interview_video, name='upload_interview_video'),
     path('ai/recording/upload_screen/', views.upload_screen_recording, name='upload_screen_recording'),
     path('ai/recording/upload_audio/', views.upload_interview_audio, name='upload_interview_audio'),
+    path('ai/recording/uploads/', views.create_media_upload, name='create_media_upload'),
+    path('ai/recording/uploads/<uuid:upload_id>/', views.media_upload, name='media_upload'),
+    path('ai/recording/uploads/<uuid:upload_id>/finalize/', views.finalize_media_upload, name='finalize_media_upload'),
+    path('ai/recording/live/', views.start_live_recording, name='start_live_recording'),
+    path('ai/recording/live/<uuid:upload_id>/segments/', views.live_recording_segment, name='live_recording_segment'),
+    path('ai/recording/live/<uuid:upload_id>/finalize/', views.finalize_live_recording, name='finalize_live_recording'),
+    path('ai/recording/jobs/<str:session_key>/', views.recording_jobs, name='recording_jobs'),
     
     # Video serving endpoint with proper headers (supports both old and new folder structure)
     path('media/interview_videos/<path:video_path>', views.serve_interview_video, name='serve_interview_video'),
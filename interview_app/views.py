@@ -1,19 +1,12 @@
 import os
 import google.generativeai as genai
-# Whisper import with fallback (optional dependency)
-try:
-    import whisper
-    WHISPER_AVAILABLE = True
-except ImportError:
-    whisper = None
-    WHISPER_AVAILABLE = False
-    print("⚠️ Warning: openai-whisper not available. Whisper transcription features will be disabled.")
 import PyPDF2
 import docx
 import re
 import json
 import threading
 import csv
+import uuid
 import shutil
 # from gtts import gTTS  # Removed - using only Google Cloud TTS
 from pathlib import Path
@@ -30,7 +23,6 @@ except ImportError:
 import subprocess
 import tempfile
 import psutil
-import sqlite3
 
 # Google Cloud Text-to-Speech import with fallback
 try:
@@ -59,6 +51,7 @@ except ImportError:
 import base64
 from django.utils import timezone
 from django.core.files.base import ContentFile
+from django.db import transaction
 from datetime import datetime, timedelta
 import urllib.parse
 
@@ -66,6 +59,7 @@ import urllib.parse
 from django.http import JsonResponse, StreamingHttpResponse, HttpResponse, FileResponse
 from django.views.decorators.cache import never_cache
 from django.shortcuts import render, redirect, get_object_or_404
+from django.urls import reverse
 from django.template.loader import render_to_string
 from django.utils.safestring import mark_safe
 from django.core.mail import send_mail
@@ -95,7 +89,23 @@ except (ImportError, OSError) as e:
 # from .real_camera import RealVideoCamera as VideoCamera
 # from .simple_real_camera import SimpleRealVideoCamera as VideoCamera
 from .simple_real_camera import SimpleRealVideoCamera as VideoCamera
-from .models import InterviewSession, WarningLog, InterviewQuestion, CodeSubmission, TechnicalInterviewQA, QAConversationPair
+from .models import InterviewSession, WarningLog, InterviewQuestion, CodeSubmission, TechnicalInterviewQA, QAConversationPair, MediaArtifact
+from .code_execution import run_test_suite
+from .code_jobs import FINISHED_STATES, get_job_state, public_case, start_code_job
+from .complexity import describe_complexity, estimate_complexity
+from .question_bank import assign_coding_question, skills_for_text
+from .artifact_cache import artifact_cache
+from .sandbox_scheduler import sandbox_scheduler
+from .toolchains import toolchains
+from .model_registry import MODEL_LOADERS, model_registry
+from .whisper_loader import get_whisper_model
+from .answer_metrics import submit_answer_metrics
+from .gcs_transfer import transfer_manager
+from .transcode_queue import transcode_queue
+from .media_manifest import probe_artifact_later, record_artifact
+from .warm_workers import node_workers, python_workers
+from file_management.blob_store import attach_blob, release_blob_for_name
+from file_management.models import StoredBlob
 from .ai_chatbot import (
     ai_start_django,
     ai_upload_answer_django,
@@ -141,17 +151,6 @@ if google_credentials:
 # This does NOT affect AI evaluation in the report or email sending.
 DEV_MODE = False
 
-# Initialize Whisper model if available
-whisper_model = None
-if WHISPER_AVAILABLE and whisper:
-    try:
-        whisper_model = whisper.load_model("base")
-        print("Whisper model 'base' loaded.")
-    except Exception as e:
-        print(f"Error loading Whisper model: {e}")
-        whisper_model = None
-else:
-    print("Whisper not available - transcription features disabled")
 
 FILLER_WORDS = ['um', 'uh', 'er', 'ah', 'like', 'okay', 'right', 'so', 'you know', 'i mean', 'basically', 'actually', 'literally']
 CAMERAS, camera_lock = {}, threading.Lock()
@@ -193,106 +192,164 @@ def get_camera_for_session(session_key):
             traceback.print_exc()
             return None
 
-def release_camera_for_session(session_key, audio_file_path=None):
-    """Release camera and save video recording to InterviewSession. Optionally merge with audio."""
-    with camera_lock:
-        if session_key in CAMERAS:
-            print(f"--- Releasing camera for session {session_key} ---")
-            camera = CAMERAS[session_key]
-            
-            # Convert audio path to absolute if provided
-            audio_full_path = None
-            if audio_file_path:
-                if not os.path.isabs(audio_file_path):
-                    audio_full_path = os.path.join(settings.MEDIA_ROOT, audio_file_path)
-                else:
-                    audio_full_path = audio_file_path
-                if not os.path.exists(audio_full_path):
-                    print(f"⚠️ Audio file not found for merging: {audio_full_path}")
-                    audio_full_path = None
-            
-            video_path = camera.cleanup()
+def _publish_interview_video(session, session_key, video_path):
+    """Upload the finalized interview video to GCS (if configured) and link it on the session and Interview."""
+    try:
+        from .gcs_storage import upload_video_to_gcs
+        import os
+        from django.utils import timezone
+        
+        # Get full path to video file
+        if os.path.isabs(video_path):
+            video_full_path = video_path
+        else:
+            video_full_path = os.path.join(settings.MEDIA_ROOT, video_path.lstrip('/'))
+        
+        if os.path.exists(video_full_path):
+            # Generate GCS file path
+            video_filename = os.path.basename(video_full_path)
+            gcs_video_path = f"interview_videos/{session.id}_{video_filename}"
             
-            # If cleanup returns video path and we have audio, merge them
-            if video_path and audio_full_path and hasattr(camera, 'stop_video_recording'):
-                try:
-                    # Stop recording with audio merge
-                    video_path = camera.stop_video_recording(audio_file_path=audio_full_path)
-                except:
-                    pass
+            # Determine content type based on file extension
+            content_type = 'video/mp4'
+            if video_filename.lower().endswith('.webm'):
+                content_type = 'video/webm'
+            elif video_filename.lower().endswith('.mov'):
+                content_type = 'video/quicktime'
             
-            # Save video path to InterviewSession if recording was active
-            if video_path:
+            # Upload to GCS
+            gcs_video_url = upload_video_to_gcs(video_full_path, gcs_video_path, content_type)
+            if gcs_video_url:
+                print(f"✅ Video uploaded to GCS: {gcs_video_url}")
+                # Store GCS URL in video_gcs_url field
+                session.video_gcs_url = gcs_video_url
+                session.save(update_fields=['video_gcs_url'])
+                print(f"✅ GCS video URL saved to session.video_gcs_url: {gcs_video_url}")
+                
+                # Update interviews.Interview model if exists
                 try:
-                    session = InterviewSession.objects.get(session_key=session_key)
-                    print(f"ℹ️ Interview video functionality removed - not saving to database")
+                    from interviews.models import Interview
+                    interview = Interview.objects.filter(session_key=session_key).first()
+                    if interview:
+                        interview.video_url = gcs_video_url
+                        interview.save(update_fields=['video_url'])
+                        print(f"✅ Updated Interview model video_url from release_camera: {gcs_video_url}")
+                except Exception as interview_err:
+                    print(f"⚠️ Could not update Interview model with video_url: {interview_err}")
                     
-                    # Upload video to Google Cloud Storage if configured
-                    try:
-                        from .gcs_storage import upload_video_to_gcs
-                        import os
-                        from django.utils import timezone
-                        
-                        # Get full path to video file
-                        if os.path.isabs(video_path):
-                            video_full_path = video_path
-                        else:
-                            video_full_path = os.path.join(settings.MEDIA_ROOT, video_path.lstrip('/'))
-                        
-                        if os.path.exists(video_full_path):
-                            # Generate GCS file path
-                            video_filename = os.path.basename(video_full_path)
-                            gcs_video_path = f"interview_videos/{session.id}_{video_filename}"
-                            
-                            # Determine content type based on file extension
-                            content_type = 'video/mp4'
-                            if video_filename.lower().endswith('.webm'):
-                                content_type = 'video/webm'
-                            elif video_filename.lower().endswith('.mov'):
-                                content_type = 'video/quicktime'
-                            
-                            # Upload to GCS
-                            gcs_video_url = upload_video_to_gcs(video_full_path, gcs_video_path, content_type)
-                            if gcs_video_url:
-                                print(f"✅ Video uploaded to GCS: {gcs_video_url}")
-                                # Store GCS URL in video_gcs_url field
-                                session.video_gcs_url = gcs_video_url
-                                session.save(update_fields=['video_gcs_url'])
-                                print(f"✅ GCS video URL saved to session.video_gcs_url: {gcs_video_url}")
-                                
-                                # Update interviews.Interview model if exists
-                                try:
-                                    from interviews.models import Interview
-                                    interview = Interview.objects.filter(session_key=session_key).first()
-                                    if interview:
-                                        interview.video_url = gcs_video_url
-                                        interview.save(update_fields=['video_url'])
-                                        print(f"✅ Updated Interview model video_url from release_camera: {gcs_video_url}")
-                                except Exception as interview_err:
-                                    print(f"⚠️ Could not update Interview model with video_url: {interview_err}")
-                                    
-                        else:
-                            print(f"⚠️ Video file not found for GCS upload: {video_full_path}")
-                            
-                        # Update Interview model with file path regardless of GCS
-                        try:
-                            from interviews.models import Interview
-                            interview = Interview.objects.filter(session_key=session_key).first()
-                            if interview and not interview.video_url:
-                                # Use relative path for FileField assignment if possible, or just URL if already set from GCS
-                                pass
-                        except:
-                            pass
-                            
-                    except Exception as gcs_error:
-                        print(f"⚠️ Error uploading video to GCS (non-critical): {gcs_error}")
-                        import traceback
-                        traceback.print_exc()
-                        
-                except Exception as e:
-                    print(f"❌ Error saving video path to InterviewSession: {e}")
+        else:
+            print(f"⚠️ Video file not found for GCS upload: {video_full_path}")
+            
+    except Exception as gcs_error:
+        print(f"⚠️ Error uploading video to GCS (non-critical): {gcs_error}")
+        import traceback
+        traceback.print_exc()
+
+
+def _finish_camera_recording(session_key, camera, audio_full_path=None, audio_start_timestamp=None,
+                             video_start_timestamp=None, synchronized_stop_time=None):
+    """Transcode job: finish the camera's video, merge the audio in and queue its GCS upload; returns the video path."""
+    from .transcode_queue import report_progress
+    video_path = None
+    try:
+        # Capture already stopped (stop_capture); without an audio path the upload is taken from the media manifest
+        video_path = camera.stop_video_recording(
+            audio_file_path=audio_full_path,
+            audio_start_timestamp=audio_start_timestamp,
+            video_start_timestamp=video_start_timestamp,
+            synchronized_stop_time=synchronized_stop_time,
+        )
+    except Exception as e:
+        print(f"⚠️ Error finishing video recording for session {session_key}: {e}")
+    
+    if video_path:
+        # Convert if needed
+        try:
+            video_full_path = os.path.join(settings.MEDIA_ROOT, video_path)
+            if os.path.exists(video_full_path) and '_converted' not in video_path and '_with_audio' not in video_path:
+                camera.ensure_browser_compatible_video(video_full_path)
+        except Exception as e:
+            print(f"⚠️ Conversion error: {e}")
+    
+    # Save video path to InterviewSession if recording was active
+    if video_path:
+        try:
+            session = InterviewSession.objects.get(session_key=session_key)
+            print(f"ℹ️ Interview video functionality removed - not saving to database")
             
-            del CAMERAS[session_key]
+            # Upload to GCS on the transfer workers: the transcode slot is not held for the transfer
+            report_progress("uploading")
+            transfer_manager.submit(_publish_interview_video, session, session_key, video_path)
+        except Exception as e:
+            print(f"❌ Error saving video path to InterviewSession: {e}")
+    return video_path
+
+
+def _merge_raw_recording(raw_video, audio_path, output_path, video_start_timestamp=None, audio_start_timestamp=None):
+    """Transcode job: merge a raw video found on disk with the session audio; returns the merged path or None."""
+    from .simple_real_camera import merge_video_audio_pyav
+    os.makedirs(os.path.dirname(output_path), exist_ok=True)
+    merged = merge_video_audio_pyav(
+        video_path=raw_video,
+        audio_file_path=audio_path,
+        output_path=output_path,
+        video_start_timestamp=video_start_timestamp,
+        audio_start_timestamp=audio_start_timestamp,
+        video_duration=None,
+    )
+    return output_path if merged and os.path.exists(output_path) else None
+
+
+def _finish_after(job, fn, *args, **kwargs):
+    """Transcode job: wait for ``job`` to finish, then run ``fn``."""
+    job.wait()
+    return fn(*args, **kwargs)
+
+
+def release_camera_for_session(session_key, audio_file_path=None, audio_start_timestamp=None,
+                               video_start_timestamp=None, synchronized_stop_time=None):
+    """
+    Stop the session's camera now and queue the rest (finishing the video,
+    merging the audio, upload) as its transcode job; returns the job, or
+    the session's existing job / None when the camera was already released.
+    """
+    job_key = f"recording:{session_key}"
+    with camera_lock:
+        camera = CAMERAS.pop(session_key, None)
+    if camera is None:
+        return transcode_queue.job(job_key)
+    print(f"--- Releasing camera for session {session_key} ---")
+    
+    # Convert audio path to absolute if provided
+    audio_full_path = None
+    if audio_file_path:
+        if not os.path.isabs(audio_file_path):
+            audio_full_path = os.path.join(settings.MEDIA_ROOT, audio_file_path)
+        else:
+            audio_full_path = audio_file_path
+        if not os.path.exists(audio_full_path):
+            print(f"⚠️ Audio file not found for merging: {audio_full_path}")
+            audio_full_path = None
+    
+    camera.stop_capture(synchronized_stop_time=synchronized_stop_time)
+    finish_kwargs = dict(
+        audio_start_timestamp=audio_start_timestamp,
+        video_start_timestamp=video_start_timestamp,
+        synchronized_stop_time=synchronized_stop_time,
+    )
+    pending = transcode_queue.job(job_key)
+    if pending and not pending.finished:
+        # A camera created while the session's job is pending gets its own job, run after that one
+        return transcode_queue.submit(
+            f"{job_key}:{uuid.uuid4().hex[:8]}", _finish_after, pending, _finish_camera_recording,
+            session_key, camera, audio_full_path, **finish_kwargs,
+            session_key=session_key, label="Interview recording",
+        )
+    # A camera created after the session's job finished has its own writer to close
+    return transcode_queue.submit(
+        job_key, _finish_camera_recording, session_key, camera, audio_full_path, **finish_kwargs,
+        session_key=session_key, label="Interview recording", replace_done=True,
+    )
 
 SUPPORTED_LANGUAGES = {'en': 'English'}
 
@@ -1024,7 +1081,7 @@ def interview_portal(request):
                 generate_new_questions = True
             # Load coding questions from database (generated by generate_coding_questions.py)
             coding_questions = []
-            db_coding_questions = session.questions.filter(question_type='CODING').order_by('order')
+            db_coding_questions = session.questions.filter(question_type='CODING').select_related('bank_question').order_by('order')
             
             print(f"DEBUG: Found {db_coding_questions.count()} coding questions in database")
             
@@ -1077,9 +1134,9 @@ def interview_portal(request):
                     print(f"⚠️ Error deleting wrong language questions: {e}")
             
             for q in db_coding_questions:
-                # Get test cases for this question
+                # Get test cases for this question (hidden ones are only used for scoring)
                 test_cases_data = []
-                for tc in q.test_cases.all():
+                for tc in q.test_cases.filter(is_hidden=False):
                     test_cases_data.append({
                         'input': tc.input_data,
                         'output': tc.expected_output
@@ -1096,9 +1153,9 @@ def interview_portal(request):
                 # Try to match with hardcoded questions to get proper starter_code
                 hardcoded_starter_map = {
                     'PYTHON': 'def reverse_string(s: str) -> str:\n    # TODO: implement\n    pass',
-                    'JAVASCRIPT': 'function reverseString(s){\n  // TODO\n}\nmodule.exports = reverseString;',
+                    'JAVASCRIPT': 'function reverseString(s){\n  // TODO\n}\nconst solve = reverseString;',
                     'JAVA': 'public class Solution {\n  public static int add(int a,int b){\n    // TODO\n    return 0;\n  }\n}',
-                    'PHP': '<?php\nfunction reverse_string($s){\n  // TODO\n}\n?>',
+                    'PHP': 'function reverse_string($s){\n  // TODO\n}\nfunction solve($s){\n  return reverse_string($s);\n}',
                     'C': 'int add(int a,int b){\n  // TODO\n  return 0;\n}',
                     'CPP': 'int add(int a,int b){\n  // TODO\n  return 0;\n}',
                     'GO': 'package main\nfunc Reverse(s string) string {\n  // TODO\n  return ""\n}',
@@ -1106,6 +1163,8 @@ def interview_portal(request):
                 }
                 if lang in hardcoded_starter_map:
                     starter_code = hardcoded_starter_map[lang]
+                if q.bank_question_id and q.bank_question.starter_code:
+                    starter_code = q.bank_question.starter_code
                 
                 coding_q = {
                     'id': str(q.id),
@@ -1122,149 +1181,17 @@ def interview_portal(request):
             if coding_questions:
                 print(f"✅ Loaded {len(coding_questions)} coding questions from database")
             else:
-                print(f"⚠️ No coding questions found. Creating hardcoded question...")
+                print(f"⚠️ No coding questions found. Assigning one from the question bank...")
                 # Use the correct_lang that was already determined above (from job.coding_language)
                 # This ensures we use the language from the job, not default to PYTHON
                 requested_lang = correct_lang if correct_lang else 'PYTHON'
                 print(f"✅ Using determined language for new coding question: {requested_lang}")
                 
-                # Import hardcoded map
-                hardcoded_map = {
-                    'PYTHON': {
-                        'title': 'Reverse a String',
-                        'description': 'Write a function reverse_string(s: str) -> str that returns the reversed string.',
-                        'language': 'PYTHON',
-                        'starter_code': 'def reverse_string(s: str) -> str:\n    # TODO: implement\n    pass',
-                        'test_cases': [
-                            {'input': "'hello'", 'expected_output': 'olleh'},
-                            {'input': "''", 'expected_output': ''},
-                            {'input': "'abc'", 'expected_output': 'cba'}
-                        ]
-                    },
-                    'JAVASCRIPT': {
-                        'title': 'Reverse a String',
-                        'description': 'Implement function reverseString(s) that returns the reversed string.',
-                        'language': 'JAVASCRIPT',
-                        'starter_code': 'function reverseString(s){\n  // TODO\n}\nmodule.exports = reverseString;',
-                        'test_cases': [
-                            {'input': "'hello'", 'expected_output': 'olleh'},
-                            {'input': "''", 'expected_output': ''},
-                            {'input': "'abc'", 'expected_output': 'cba'}
-                        ]
-                    },
-                    'JAVA': {
-                        'title': 'Add Two Numbers',
-                        'description': 'Implement a static method add(int a, int b) that returns a+b.',
-                        'language': 'JAVA',
-                        'starter_code': 'public class Solution {\n  public static int add(int a,int b){\n    // TODO\n    return 0;\n  }\n}',
-                        'test_cases': [
-                            {'input': '1,2', 'expected_output': '3'},
-                            {'input': '-5,5', 'expected_output': '0'},
-                            {'input': '10,15', 'expected_output': '25'}
-                        ]
-                    },
-                    'PHP': {
-                        'title': 'Reverse a String',
-                        'description': 'Implement function reverse_string($s) that returns the reversed string.',
-                        'language': 'PHP',
-                        'starter_code': '<?php\nfunction reverse_string($s){\n  // TODO\n}\n?>',
-                        'test_cases': [
-                            {'input': "'hello'", 'expected_output': 'olleh'},
-                            {'input': "''", 'expected_output': ''},
-                            {'input': "'abc'", 'expected_output': 'cba'}
-                        ]
-                    },
-                    'C': {
-                        'title': 'Add Two Numbers',
-                        'description': 'Write a function int add(int a,int b) that returns a+b.',
-                        'language': 'C',
-                        'starter_code': 'int add(int a,int b){\n  // TODO\n  return 0;\n}',
-                        'test_cases': [
-                            {'input': '1,2', 'expected_output': '3'},
-                            {'input': '-5,5', 'expected_output': '0'},
-                            {'input': '10,15', 'expected_output': '25'}
-                        ]
-                    },
-                    'CPP': {
-                        'title': 'Add Two Numbers',
-                        'description': 'Implement int add(int a,int b) that returns a+b.',
-                        'language': 'CPP',
-                        'starter_code': 'int add(int a,int b){\n  // TODO\n  return 0;\n}',
-                        'test_cases': [
-                            {'input': '1,2', 'expected_output': '3'},
-                            {'input': '-5,5', 'expected_output': '0'},
-                            {'input': '10,15', 'expected_output': '25'}
-                        ]
-                    },
-                    'GO': {
-                        'title': 'Reverse a String',
-                        'description': 'Implement func Reverse(s string) string that returns the reversed string.',
-                        'language': 'GO',
-                        'starter_code': 'package main\nfunc Reverse(s string) string {\n  // TODO\n  return ""\n}',
-                        'test_cases': [
-                            {'input': '"hello"', 'expected_output': 'olleh'},
-                            {'input': '""', 'expected_output': ''},
-                            {'input': '"abc"', 'expected_output': 'cba'}
-                        ]
-                    },
-                    'HTML': {
-                        'title': 'Simple Heading',
-                        'description': 'Return an HTML string with an <h1>Hello</h1> element.',
-                        'language': 'HTML',
-                        'starter_code': '<!-- return <h1>Hello</h1> -->',
-                        'test_cases': [
-                            {'input': 'n/a', 'expected_output': '<h1>Hello</h1>'}
-                        ]
-                    }
-                }
-                
-                coding_questions = [hardcoded_map[requested_lang]]
-                print(f"🧩 Prepared hardcoded coding question for {requested_lang}: {coding_questions[0].get('title')}")
-                
-                # Delete any existing coding questions to prevent duplicates
-                try:
-                    session.questions.filter(question_type='CODING').delete()
-                    print(f"✅ Deleted existing coding questions to prevent duplicates")
-                except Exception as e:
-                    print(f"⚠️ Error deleting existing coding questions: {e}")
-                
-                # Save to database - ONLY ONE coding question
-                for i, coding_q in enumerate(coding_questions[:1]):  # Limit to 1 question
-                    coding_question_obj = InterviewQuestion.objects.create(
-                        session=session,
-                        question_text=coding_q['description'],
-                        question_type='CODING',
-                        coding_language=coding_q['language'],
-                        order=(len(all_questions) + i) if all_questions else i,
-                        question_level='MAIN'
-                    )
-                    
-                    # Also save to CodeSubmission model for proper tracking
-                    try:
-                        CodeSubmission.objects.create(
-                            session=session,
-                            question_id=str(coding_question_obj.id),
-                            submitted_code=''  # Will be filled when candidate submits solution
-                        )
-                        print(f"✅ Created CodeSubmission record for coding question")
-                    except Exception as e:
-                        print(f"⚠️ Error creating CodeSubmission: {e}")
-                    
-                    # Attach test cases
-                    try:
-                        from .models import TestCase
-                        if TestCase and coding_q.get('test_cases'):
-                            for tc in coding_q['test_cases']:
-                                TestCase.objects.create(
-                                    question=coding_question_obj,
-                                    input_data=str(tc.get('input', '')),
-                                    expected_output=str(tc.get('expected_output', ''))
-                                )
-                    except Exception as e:
-                        print(f"⚠️ Error creating test cases: {e}")
-                    # Update ID
-                    coding_q['id'] = str(coding_question_obj.id)
-                print(f"✅ Created hardcoded coding question ({requested_lang}) with ID: {coding_q['id']}")
+                # One indexed query on the validated question bank plus a bulk insert of its test cases
+                coding_questions = [assign_coding_question(
+                    session, requested_lang, order=len(all_questions),
+                    skills=skills_for_text(session.job_description),
+                )]
             
             # Check if we need to generate new questions
             print(f"DEBUG: generate_new_questions flag: {generate_new_questions if 'generate_new_questions' in locals() else 'NOT SET'}")
@@ -1307,98 +1234,8 @@ def interview_portal(request):
                         requested_lang = 'PYTHON'
                         print(f"⚠️ Invalid language, defaulting to PYTHON")
                     
-                    # Use hardcoded questions instead of Gemini
-                    hardcoded_map = {
-                        'PYTHON': {
-                            'title': 'Reverse a String',
-                            'description': 'Write a function reverse_string(s: str) -> str that returns the reversed string.',
-                            'language': 'PYTHON',
-                            'starter_code': 'def reverse_string(s: str) -> str:\n    # TODO: implement\n    pass',
-                            'test_cases': [
-                                {'input': "'hello'", 'expected_output': 'olleh'},
-                                {'input': "''", 'expected_output': ''},
-                                {'input': "'abc'", 'expected_output': 'cba'}
-                            ]
-                        },
-                        'JAVASCRIPT': {
-                            'title': 'Reverse a String',
-                            'description': 'Implement function reverseString(s) that returns the reversed string.',
-                            'language': 'JAVASCRIPT',
-                            'starter_code': 'function reverseString(s){\n  // TODO\n}\nmodule.exports = reverseString;',
-                            'test_cases': [
-                                {'input': "'hello'", 'expected_output': 'olleh'},
-                                {'input': "''", 'expected_output': ''},
-                                {'input': "'abc'", 'expected_output': 'cba'}
-                            ]
-                        },
-                        'JAVA': {
-                            'title': 'Add Two Numbers',
-                            'description': 'Implement a static method add(int a, int b) that returns a+b.',
-                            'language': 'JAVA',
-                            'starter_code': 'public class Solution {\n  public static int add(int a,int b){\n    // TODO\n    return 0;\n  }\n}',
-                            'test_cases': [
-                                {'input': '1,2', 'expected_output': '3'},
-                                {'input': '-5,5', 'expected_output': '0'},
-                                {'input': '10,15', 'expected_output': '25'}
-                            ]
-                        },
-                        'PHP': {
-                            'title': 'Reverse a String',
-                            'description': 'Implement function reverse_string($s) that returns the reversed string.',
-                            'language': 'PHP',
-                            'starter_code': '<?php\nfunction reverse_string($s){\n  // TODO\n}\n?>',
-                            'test_cases': [
-                                {'input': "'hello'", 'expected_output': 'olleh'},
-                                {'input': "''", 'expected_output': ''},
-                                {'input': "'abc'", 'expected_output': 'cba'}
-                            ]
-                        },
-                        'C': {
-                            'title': 'Add Two Numbers',
-                            'description': 'Write a function int add(int a,int b) that returns a+b.',
-                            'language': 'C',
-                            'starter_code': 'int add(int a,int b){\n  // TODO\n  return 0;\n}',
-                            'test_cases': [
-                                {'input': '1,2', 'expected_output': '3'},
-                                {'input': '-5,5', 'expected_output': '0'},
-                                {'input': '10,15', 'expected_output': '25'}
-                            ]
-                        },
-                        'CPP': {
-                            'title': 'Add Two Numbers',
-                            'description': 'Implement int add(int a,int b) that returns a+b.',
-                            'language': 'CPP',
-                            'starter_code': 'int add(int a,int b){\n  // TODO\n  return 0;\n}',
-                            'test_cases': [
-                                {'input': '1,2', 'expected_output': '3'},
-                                {'input': '-5,5', 'expected_output': '0'},
-                                {'input': '10,15', 'expected_output': '25'}
-                            ]
-                        },
-                        'GO': {
-                            'title': 'Reverse a String',
-                            'description': 'Implement func Reverse(s string) string that returns the reversed string.',
-                            'language': 'GO',
-                            'starter_code': 'package main\nfunc Reverse(s string) string {\n  // TODO\n  return ""\n}',
-                            'test_cases': [
-                                {'input': '"hello"', 'expected_output': 'olleh'},
-                                {'input': '""', 'expected_output': ''},
-                                {'input': '"abc"', 'expected_output': 'cba'}
-                            ]
-                        },
-                        'HTML': {
-                            'title': 'Simple Heading',
-                            'description': 'Return an HTML string with an <h1>Hello</h1> element.',
-                            'language': 'HTML',
-                            'starter_code': '<!-- return <h1>Hello</h1> -->',
-                            'test_cases': [
-                                {'input': 'n/a', 'expected_output': '<h1>Hello</h1>'}
-                            ]
-                        }
-                    }
-                    
-                    coding_questions = [hardcoded_map[requested_lang]]
-                    print(f"🧩 Prepared hardcoded coding question for {requested_lang}: {coding_questions[0].get('title')}")
+                    # The question comes from the validated bank (assigned below); only its language is chosen here
+                    coding_questions = [{'language': requested_lang}]
                 
                 # Save spoken questions to database
                 for i, q_data in enumerate(all_questions):
@@ -1414,48 +1251,12 @@ def interview_portal(request):
                         question_level='MAIN'
                     )
                 
-                # Delete any existing coding questions to prevent duplicates
-                try:
-                    session.questions.filter(question_type='CODING').delete()
-                except Exception as e:
-                    print(f"⚠️ Error deleting existing coding questions: {e}")
-                
-                # Save coding questions to database - ONLY ONE coding question
-                for i, coding_q in enumerate(coding_questions[:1]):
-                    coding_question_obj = InterviewQuestion.objects.create(
-                        session=session,
-                        question_text=coding_q['description'],
-                        question_type='CODING',
-                        coding_language=coding_q['language'],
-                        order=len(all_questions) + i,
-                        question_level='MAIN'
-                    )
-                    
-                    # Also save to CodeSubmission model for proper tracking
-                    try:
-                        CodeSubmission.objects.create(
-                            session=session,
-                            question_id=str(coding_question_obj.id),
-                            submitted_code=''  # Will be filled when candidate submits solution
-                        )
-                        print(f"✅ Created CodeSubmission record for coding question")
-                    except Exception as e:
-                        print(f"⚠️ Error creating CodeSubmission: {e}")
-                    
-                    # Attach test cases
-                    try:
-                        from .models import TestCase
-                        if TestCase and coding_q.get('test_cases'):
-                            for tc in coding_q['test_cases']:
-                                TestCase.objects.create(
-                                    question=coding_question_obj,
-                                    input_data=str(tc.get('input', '')),
-                                    expected_output=str(tc.get('expected_output', ''))
-                                )
-                    except Exception as e:
-                        print(f"⚠️ Error creating test cases: {e}")
-                    # Update the coding_questions_data with the real database ID
-                    coding_q['id'] = str(coding_question_obj.id)
+                # The coding question assigned above is kept; only assign one when it is missing
+                if coding_questions and not coding_questions[0].get('id'):
+                    coding_questions = [assign_coding_question(
+                        session, coding_questions[0]['language'], order=len(all_questions),
+                        skills=skills_for_text(session.job_description),
+                    )]
         else:
             DEV_MODE = False
 
@@ -1514,110 +1315,9 @@ def interview_portal(request):
                     requested_lang = 'PYTHON'
                     print(f"⚠️ Invalid language, defaulting to PYTHON")
                 
-                # Use hardcoded questions based on language
-                hardcoded_map = {
-                    'PYTHON': {
-                        'title': 'Reverse a String',
-                        'description': 'Write a function reverse_string(s: str) -> str that returns the reversed string.',
-                        'language': 'PYTHON',
-                        'starter_code': 'def reverse_string(s: str) -> str:\n    # TODO: implement\n    pass',
-                        'test_cases': [
-                            {'input': "'hello'", 'expected_output': 'olleh'},
-                            {'input': "''", 'expected_output': ''},
-                            {'input': "'abc'", 'expected_output': 'cba'}
-                        ]
-                    },
-                    'JAVASCRIPT': {
-                        'title': 'Reverse a String',
-                        'description': 'Implement function reverseString(s) that returns the reversed string.',
-                        'language': 'JAVASCRIPT',
-                        'starter_code': 'function reverseString(s){\n  // TODO\n}\nmodule.exports = reverseString;',
-                        'test_cases': [
-                            {'input': "'hello'", 'expected_output': 'olleh'},
-                            {'input': "''", 'expected_output': ''},
-                            {'input': "'abc'", 'expected_output': 'cba'}
-                        ]
-                    },
-                    'JAVA': {
-                        'title': 'Add Two Numbers',
-                        'description': 'Implement a static method add(int a, int b) that returns a+b.',
-                        'language': 'JAVA',
-                        'starter_code': 'public class Solution {\n  public static int add(int a,int b){\n    // TODO\n    return 0;\n  }\n}',
-                        'test_cases': [
-                            {'input': '1,2', 'expected_output': '3'},
-                            {'input': '-5,5', 'expected_output': '0'},
-                            {'input': '10,15', 'expected_output': '25'}
-                        ]
-                    },
-                    'PHP': {
-                        'title': 'Reverse a String',
-                        'description': 'Implement function reverse_string($s) that returns the reversed string.',
-                        'language': 'PHP',
-                        'starter_code': '<?php\nfunction reverse_string($s){\n  // TODO\n}\n?>',
-                        'test_cases': [
-                            {'input': "'hello'", 'expected_output': 'olleh'},
-                            {'input': "''", 'expected_output': ''},
-                            {'input': "'abc'", 'expected_output': 'cba'}
-                        ]
-                    },
-                    'C': {
-                        'title': 'Add Two Numbers',
-                        'description': 'Write a function int add(int a,int b) that returns a+b.',
-                        'language': 'C',
-                        'starter_code': 'int add(int a,int b){\n  // TODO\n  return 0;\n}',
-                        'test_cases': [
-                            {'input': '1,2', 'expected_output': '3'},
-                            {'input': '-5,5', 'expected_output': '0'},
-                            {'input': '10,15', 'expected_output': '25'}
-                        ]
-                    },
-                    'CPP': {
-                        'title': 'Add Two Numbers',
-                        'description': 'Implement int add(int a,int b) that returns a+b.',
-                        'language': 'CPP',
-                        'starter_code': 'int add(int a,int b){\n  // TODO\n  return 0;\n}',
-                        'test_cases': [
-                            {'input': '1,2', 'expected_output': '3'},
-                            {'input': '-5,5', 'expected_output': '0'},
-                            {'input': '10,15', 'expected_output': '25'}
-                        ]
-                    },
-                    'GO': {
-                        'title': 'Reverse a String',
-                        'description': 'Implement func Reverse(s string) string that returns the reversed string.',
-                        'language': 'GO',
-                        'starter_code': 'package main\nfunc Reverse(s string) string {\n  // TODO\n  return ""\n}',
-                        'test_cases': [
-                            {'input': '"hello"', 'expected_output': 'olleh'},
-                            {'input': '""', 'expected_output': ''},
-                            {'input': '"abc"', 'expected_output': 'cba'}
-                        ]
-                    },
-                    'HTML': {
-                        'title': 'Simple Heading',
-                        'description': 'Return an HTML string with an <h1>Hello</h1> element.',
-                        'language': 'HTML',
-                        'starter_code': '<!-- return <h1>Hello</h1> -->',
-                        'test_cases': [
-                            {'input': 'n/a', 'expected_output': '<h1>Hello</h1>'}
-                        ]
-                    }
-                }
-                
-                # Add coding question using the correct language
-                coding_q_data = hardcoded_map.get(requested_lang, hardcoded_map['PYTHON'])
-                coding_questions = [
-                    {
-                        'id': 'coding_1',
-                        'type': 'CODING',
-                        'title': coding_q_data['title'],
-                        'description': coding_q_data['description'],
-                        'language': coding_q_data['language'],
-                        'starter_code': coding_q_data['starter_code'],
-                        'test_cases': coding_q_data['test_cases']
-                    }
-                ]
-                print(f"✅ Using hardcoded coding question in {requested_lang} for DEV MODE")
+                # The question comes from the validated bank (assigned below); only its language is chosen here
+                coding_questions = [{'language': requested_lang}]
+                print(f"✅ Using a {requested_lang} coding question for DEV MODE")
             else:
                 print("--- RUNNING IN PRODUCTION MODE: Calling Gemini API. ---")
                 model = genai.GenerativeModel('gemini-2.0-flash')
@@ -1781,98 +1481,8 @@ def interview_portal(request):
                     requested_lang = 'PYTHON'
                     print(f"⚠️ Invalid language, defaulting to PYTHON")
 
-                # Define one question with test cases per language
-                hardcoded_map = {
-                    'PYTHON': {
-                        'title': 'Reverse a String',
-                        'description': 'Write a function reverse_string(s: str) -> str that returns the reversed string.',
-                        'language': 'PYTHON',
-                        'starter_code': 'def reverse_string(s: str) -> str:\n    # TODO: implement\n    pass',
-                        'test_cases': [
-                            {'input': "'hello'", 'expected_output': 'olleh'},
-                            {'input': "''", 'expected_output': ''},
-                            {'input': "'abc'", 'expected_output': 'cba'}
-                        ]
-                    },
-                    'JAVASCRIPT': {
-                        'title': 'Reverse a String',
-                        'description': 'Implement function reverseString(s) that returns the reversed string.',
-                        'language': 'JAVASCRIPT',
-                        'starter_code': 'function reverseString(s){\n  // TODO\n}\nmodule.exports = reverseString;',
-                        'test_cases': [
-                            {'input': "'hello'", 'expected_output': 'olleh'},
-                            {'input': "''", 'expected_output': ''},
-                            {'input': "'abc'", 'expected_output': 'cba'}
-                        ]
-                    },
-                    'JAVA': {
-                        'title': 'Add Two Numbers',
-                        'description': 'Implement a static method add(int a, int b) that returns a+b.',
-                        'language': 'JAVA',
-                        'starter_code': 'public class Solution {\n  public static int add(int a,int b){\n    // TODO\n    return 0;\n  }\n}',
-                        'test_cases': [
-                            {'input': '1,2', 'expected_output': '3'},
-                            {'input': '-5,5', 'expected_output': '0'},
-                            {'input': '10,15', 'expected_output': '25'}
-                        ]
-                    },
-                    'PHP': {
-                        'title': 'Reverse a String',
-                        'description': 'Implement function reverse_string($s) that returns the reversed string.',
-                        'language': 'PHP',
-                        'starter_code': '<?php\nfunction reverse_string($s){\n  // TODO\n}\n?>',
-                        'test_cases': [
-                            {'input': "'hello'", 'expected_output': 'olleh'},
-                            {'input': "''", 'expected_output': ''},
-                            {'input': "'abc'", 'expected_output': 'cba'}
-                        ]
-                    },
-                    'C': {
-                        'title': 'Add Two Numbers',
-                        'description': 'Write a function int add(int a,int b) that returns a+b.',
-                        'language': 'C',
-                        'starter_code': 'int add(int a,int b){\n  // TODO\n  return 0;\n}',
-                        'test_cases': [
-                            {'input': '1,2', 'expected_output': '3'},
-                            {'input': '-5,5', 'expected_output': '0'},
-                            {'input': '10,15', 'expected_output': '25'}
-                        ]
-                    },
-                    'CPP': {
-                        'title': 'Add Two Numbers',
-                        'description': 'Implement int add(int a,int b) that returns a+b.',
-                        'language': 'CPP',
-                        'starter_code': 'int add(int a,int b){\n  // TODO\n  return 0;\n}',
-                        'test_cases': [
-                            {'input': '1,2', 'expected_output': '3'},
-                            {'input': '-5,5', 'expected_output': '0'},
-                            {'input': '10,15', 'expected_output': '25'}
-                        ]
-                    },
-                    'GO': {
-                        'title': 'Reverse a String',
-                        'description': 'Implement func Reverse(s string) string that returns the reversed string.',
-                        'language': 'GO',
-                        'starter_code': 'package main\nfunc Reverse(s string) string {\n  // TODO\n  return ""\n}',
-                        'test_cases': [
-                            {'input': '"hello"', 'expected_output': 'olleh'},
-                            {'input': '""', 'expected_output': ''},
-                            {'input': '"abc"', 'expected_output': 'cba'}
-                        ]
-                    },
-                    'HTML': {
-                        'title': 'Simple Heading',
-                        'description': 'Return an HTML string with an <h1>Hello</h1> element.',
-                        'language': 'HTML',
-                        'starter_code': '<!-- return <h1>Hello</h1> -->',
-                        'test_cases': [
-                            {'input': 'n/a', 'expected_output': '<h1>Hello</h1>'}
-                        ]
-                    }
-                }
-
-                # Enforce exactly one coding question
-                coding_questions = [hardcoded_map[requested_lang]]
+                # The question comes from the validated bank (assigned below); only its language is chosen here
+                coding_questions = [{'language': requested_lang}]
             if not all_questions: raise ValueError("No questions were generated or parsed.")
             if all_questions and "welcome" in all_questions[0]['text'].lower():
                 all_questions[0]['type'] = 'Ice-Breaker'
@@ -1892,51 +1502,12 @@ def interview_portal(request):
                     question_level='MAIN'
                 )
             
-            # Ensure no duplicate coding questions remain from previous runs
-            try:
-                session.questions.filter(question_type='CODING').delete()
-            except Exception as e:
-                print(f"⚠️ Error deleting existing coding questions: {e}")
-                
-            # Save coding questions to database - ONLY ONE coding question
-            for i, coding_q in enumerate(coding_questions[:1]):
-                coding_question_obj = InterviewQuestion.objects.create(
-                    session=session,
-                    question_text=coding_q['description'],
-                    question_type='CODING',
-                    coding_language=coding_q['language'],
-                    order=len(all_questions) + i,
-                    question_level='MAIN'
-                )
-                
-                # Also save to CodeSubmission model for proper tracking
-                try:
-                    CodeSubmission.objects.create(
-                        session=session,
-                        question_id=str(coding_question_obj.id),
-                        submitted_code=''  # Will be filled when candidate submits solution
-                    )
-                    print(f"✅ Created CodeSubmission record for coding question")
-                except Exception as e:
-                    print(f"⚠️ Error creating CodeSubmission: {e}")
-                
-                # Attach test cases
-                try:
-                    from .models import TestCase
-                    if TestCase and coding_q.get('test_cases'):
-                        for tc in coding_q['test_cases']:
-                            try:
-                                TestCase.objects.create(
-                                    question=coding_question_obj,
-                                    input_data=str(tc.get('input', '')),
-                                    expected_output=str(tc.get('expected_output', ''))
-                                )
-                            except Exception:
-                                pass
-                except Exception as e:
-                    print(f"⚠️ Error attaching test cases: {e}")
-                # Update the coding_questions_data with the real database ID
-                coding_q['id'] = str(coding_question_obj.id)
+            # Assign the session's coding question from the validated question bank
+            if coding_questions:
+                coding_questions = [assign_coding_question(
+                    session, coding_questions[0]['language'], order=len(all_questions),
+                    skills=skills_for_text(session.job_description),
+                )]
         
         # Debug: Print what we're sending to the template
         print(f"\n{'='*70}")
@@ -2157,6 +1728,8 @@ def interview_report(request, session_id):
                     
                     code_text += f"Coding Challenge: {question_text}\n"
                     code_text += f"Language: {submission.language}\n"
+                    if submission.total_count is not None:
+                        code_text += f"Tests Passed: {submission.passed_count}/{submission.total_count}\n"
                     code_text += f"Test Case Results:\n{submission.output_log}\n"
                     code_text += f"Submitted Code:\n```\n{submission.submitted_code}\n```\n\n"
 
@@ -2315,25 +1888,10 @@ def download_report_pdf(request, session_id):
         # Coding round understanding (calculate from code submissions)
         coding_understanding = 0
         if code_submissions.exists():
-            total_tests = 0
-            passed_tests = 0
-            for submission in code_submissions:
-                # Parse test results from output_log
-                if submission.output_log:
-                    test_matches = re.findall(r'(\d+)/(\d+)', submission.output_log)
-                    if test_matches:
-                        for passed, total in test_matches:
-                            passed_tests += int(passed)
-                            total_tests += int(total)
-                    else:
-                        # If no test results, check if there's any success indicator
-                        if 'passed' in submission.output_log.lower() or 'success' in submission.output_log.lower():
-                            coding_understanding = 70
-                        else:
-                            coding_understanding = 40
+            passed_tests, total_tests, _ = CodeSubmission.session_test_totals(session)
             if total_tests > 0:
                 coding_understanding = min(100, int((passed_tests / total_tests) * 100))
-            elif coding_understanding == 0:
+            else:
                 coding_understanding = 60  # Default if code was submitted but no test results
         else:
             coding_understanding = 0  # No code submitted
@@ -2622,23 +2180,10 @@ def download_report_pdf_public(request, session_id):
         
         coding_understanding = 0
         if code_submissions.exists():
-            total_tests = 0
-            passed_tests = 0
-            for submission in code_submissions:
-                if submission.output_log:
-                    test_matches = re.findall(r'(\d+)/(\d+)', submission.output_log)
-                    if test_matches:
-                        for passed, total in test_matches:
-                            passed_tests += int(passed)
-                            total_tests += int(total)
-                    else:
-                        if 'passed' in submission.output_log.lower() or 'success' in submission.output_log.lower():
-                            coding_understanding = 70
-                        else:
-                            coding_understanding = 40
+            passed_tests, total_tests, _ = CodeSubmission.session_test_totals(session)
             if total_tests > 0:
                 coding_understanding = min(100, int((passed_tests / total_tests) * 100))
-            elif coding_understanding == 0:
+            else:
                 coding_understanding = 60
         else:
             coding_understanding = 0
@@ -2742,8 +2287,6 @@ def end_interview_session(request):
                 # Stop video recording and merge with audio if provided
                 video_path = None
                 try:
-                    # First, try to get the video path from InterviewSession if camera doesn't have it
-                    video_path_from_db = None
                     session_id_uuid = None
                     try:
                         from interview_app.models import InterviewSession
@@ -2755,50 +2298,42 @@ def end_interview_session(request):
                     except Exception as e:
                         print(f"⚠️ Background: Error looking up session: {e}")
 
-                    camera = get_camera_for_session(session_key_bg)
-                    if camera and hasattr(camera, 'stop_video_recording'):
-                        if video_path_from_db:
-                            if not hasattr(camera, '_video_file_path') or not camera._video_file_path:
-                                camera._video_file_path = video_path_from_db
-                        
-                        # Use data from the background-captured data_bg
-                        audio_full_path = None
-                        audio_start_ts = data_bg.get('audio_start_timestamp')
-                        video_start_ts = data_bg.get('video_start_timestamp')
-                        synchronized_stop_time = data_bg.get('synchronized_stop_time')
-                        
-                        # If audio_file_path_bg (relative) is provided, convert to absolute
-                        if audio_file_path_bg:
-                            audio_full_path = os.path.join(settings.MEDIA_ROOT, audio_file_path_bg) if not os.path.isabs(audio_file_path_bg) else audio_file_path_bg
-                        
-                        # PyAudio recorder handling
-                        if PYAudio_AVAILABLE and session_key_bg in AUDIO_RECORDERS:
-                            try:
-                                with audio_lock:
-                                    audio_recorder = AUDIO_RECORDERS.get(session_key_bg)
-                                    if audio_recorder:
-                                        path = audio_recorder.stop_recording(synchronized_stop_time=synchronized_stop_time)
-                                        if path:
-                                            audio_full_path = os.path.join(settings.MEDIA_ROOT, path)
-                                            audio_start_ts = audio_recorder.recording_start_timestamp
-                            except Exception as e:
-                                print(f"⚠️ Background: PyAudio stop error: {e}")
-
-                        video_path = camera.stop_video_recording(
-                            audio_file_path=audio_full_path,
+                    # Use data from the background-captured data_bg
+                    audio_full_path = None
+                    audio_start_ts = data_bg.get('audio_start_timestamp')
+                    video_start_ts = data_bg.get('video_start_timestamp')
+                    synchronized_stop_time = data_bg.get('synchronized_stop_time')
+                    
+                    # If audio_file_path_bg (relative) is provided, convert to absolute
+                    if audio_file_path_bg:
+                        audio_full_path = os.path.join(settings.MEDIA_ROOT, audio_file_path_bg) if not os.path.isabs(audio_file_path_bg) else audio_file_path_bg
+                    
+                    # PyAudio recorder handling
+                    if PYAudio_AVAILABLE and session_key_bg in AUDIO_RECORDERS:
+                        try:
+                            with audio_lock:
+                                audio_recorder = AUDIO_RECORDERS.get(session_key_bg)
+                                if audio_recorder:
+                                    path = audio_recorder.stop_recording(synchronized_stop_time=synchronized_stop_time)
+                                    if path:
+                                        audio_full_path = os.path.join(settings.MEDIA_ROOT, path)
+                                        audio_start_ts = audio_recorder.recording_start_timestamp
+                        except Exception as e:
+                            print(f"⚠️ Background: PyAudio stop error: {e}")
+                    
+                    # Stop, merge and convert on the transcode workers (bounded; one job per session).
+                    # A camera is only recreated when the session has no job (e.g. after a restart);
+                    # it then finds the recording on disk.
+                    job = transcode_queue.job(f"recording:{session_key_bg}")
+                    if session_key_bg in CAMERAS or (job is None and get_camera_for_session(session_key_bg)):
+                        job = release_camera_for_session(
+                            session_key_bg, audio_file_path=audio_full_path,
                             audio_start_timestamp=audio_start_ts,
                             video_start_timestamp=video_start_ts,
-                            synchronized_stop_time=synchronized_stop_time
+                            synchronized_stop_time=synchronized_stop_time,
                         )
-                        
-                        if video_path:
-                            # Convert if needed
-                            try:
-                                video_full_path = os.path.join(settings.MEDIA_ROOT, video_path)
-                                if os.path.exists(video_full_path) and '_converted' not in video_path and '_with_audio' not in video_path:
-                                    camera.ensure_browser_compatible_video(video_full_path)
-                            except Exception as e:
-                                print(f"⚠️ Background: Conversion error: {e}")
+                    if job:
+                        video_path = job.wait()
                 except Exception as e:
                     print(f"⚠️ Background: Video processing error: {e}")
 
@@ -2889,34 +2424,23 @@ def end_interview_session(request):
                                         raw_video = os.path.join(raw_video_dir, filename)
                                         if os.path.exists(raw_video) and os.path.getsize(raw_video) > 0:
                                             print(f"   Found raw video: {raw_video}")
-                                            # Try to merge
+                                            # Merge on the transcode workers, as the session's recording job
                                             try:
-                                                from interview_app.simple_real_camera import merge_video_audio_pyav
-                                                video_ts = getattr(camera, '_recording_start_timestamp', None) if camera else None
-                                                merge_success = merge_video_audio_pyav(
-                                                    video_path=raw_video,
-                                                    audio_file_path=audio_full_path,
-                                                    output_path=os.path.join(merged_video_dir, f"{os.path.splitext(filename)[0]}_with_audio.mp4"),
-                                                    video_start_timestamp=video_ts,
+                                                from interview_app.media_manifest import start_timestamps
+                                                merged_path = os.path.join(merged_video_dir, f"{os.path.splitext(filename)[0]}_with_audio.mp4")
+                                                merge_job = transcode_queue.submit(
+                                                    f"recording:{session_key_bg}", _merge_raw_recording,
+                                                    raw_video, audio_full_path, merged_path,
+                                                    video_start_timestamp=start_timestamps(session)[1],
                                                     audio_start_timestamp=audio_start_ts,
-                                                    video_duration=None
+                                                    session_key=session_key_bg, label="Interview recording (raw merge)",
+                                                    replace_done=True,
                                                 )
-                                                if merge_success:
-                                                    merged_path = os.path.join(merged_video_dir, f"{os.path.splitext(filename)[0]}_with_audio.mp4")
-                                                    if os.path.exists(merged_path):
-                                                        video_path = os.path.relpath(merged_path, settings.MEDIA_ROOT).replace('\\', '/')
-                                                        # Use proper FileField.save() method to ensure file is stored in database
-                                                        try:
-                                                            with open(merged_path, 'rb') as video_file:
-                                                                from django.core.files.base import ContentFile
-                                                                video_content = ContentFile(video_file.read(), name=os.path.basename(merged_path))
-                                                                print(f"ℹ️ Interview video functionality removed - not saving merged video to database")
-                                                        except Exception as save_error:
-                                                            print(f"⚠️ Interview video functionality removed - error handling: {save_error}")
-                                                            # Fallback: interview video functionality removed
-                                                            print(f"ℹ️ Interview video functionality removed - not saving path")
-                                                        found_video = merged_path
-                                                        break
+                                                if merge_job.wait():
+                                                    video_path = os.path.relpath(merged_path, settings.MEDIA_ROOT).replace('\\', '/')
+                                                    print(f"ℹ️ Interview video functionality removed - not saving merged video to database")
+                                                    found_video = merged_path
+                                                    break
                                             except Exception as merge_err:
                                                 print(f"   ❌ Merge failed: {merge_err}")
                         
@@ -2977,13 +2501,6 @@ def end_interview_session(request):
                     import traceback
                     traceback.print_exc()
                 
-                release_camera_for_session(session_key_bg)
-                
-                # Cleanup camera object
-                with camera_lock:
-                    if session_key_bg in CAMERAS:
-                        del CAMERAS[session_key_bg]
-                
                 print(f"✅ Background finalization COMPLETE for session: {session_key_bg}")
                 
                 # Trigger voice analysis after interview completion
@@ -3229,6 +2746,26 @@ def generate_and_save_follow_up(session, parent_question, transcribed_answer):
     
     return None
 
+def _record_answer_metrics(question, answer_text, audio_file=None, audio_path=None, response_time=None,
+                           delete_audio=False):
+    """
+    Queue per-answer voice metrics; the audio is analysed on the answer-metrics
+    workers, not here. With ``delete_audio`` they remove ``audio_path`` when
+    done. Returns True once queued; never fails the upload.
+    """
+    try:
+        # The upload is gone once the request ends, so only its bytes are read here
+        audio_bytes = b"".join(audio_file.chunks()) if audio_file is not None and audio_path is None else None
+        submit_answer_metrics(
+            question.session, question, answer_text,
+            response_time_seconds=response_time if response_time is not None else question.response_time_seconds,
+            audio_path=audio_path, audio_bytes=audio_bytes, delete_audio=delete_audio,
+        )
+        return True
+    except Exception as e:
+        print(f"⚠️ Could not record answer voice metrics: {e}")
+        return False
+
 @csrf_exempt
 def transcribe_audio(request):
     if request.method == 'POST':
@@ -3260,6 +2797,7 @@ def transcribe_audio(request):
                         except ValueError:
                             pass
                     question_to_update.save(update_fields=fields_to_update)
+                    _record_answer_metrics(question_to_update, answer_text, request.FILES.get('audio_data'))
 
                     # --- NEW: Save to separate TechnicalInterviewQA table (Single Row Update) ---
                     if question_to_update.question_type == 'TECHNICAL':
@@ -3302,6 +2840,7 @@ def transcribe_audio(request):
                 return JsonResponse({'error': 'Question not found'}, status=404)
 
         # Fallback to Whisper if no transcript provided (for backward compatibility)
+        whisper_model = get_whisper_model()
         if not whisper_model:
             return JsonResponse({'error': 'Whisper model not available.'}, status=500)
 
@@ -3311,6 +2850,8 @@ def transcribe_audio(request):
 
         file_path = default_storage.save('temp_audio.webm', audio_file)
         full_path = os.path.join(settings.MEDIA_ROOT, file_path)
+        # Set once the answer-metrics worker has taken over (and will delete) the file
+        metrics_own_audio = False
         try:
             result = whisper_model.transcribe(full_path, fp16=False)
             transcribed_text = result.get('text', '')
@@ -3333,6 +2874,9 @@ def transcribe_audio(request):
                         except ValueError:
                             pass
                     question_to_update.save(update_fields=fields_to_update)
+                    metrics_own_audio = _record_answer_metrics(
+                        question_to_update, answer_text, audio_path=full_path, delete_audio=True
+                    )
                     
                     # --- NEW: Save to separate TechnicalInterviewQA table (Single Row Update) ---
                     if question_to_update.question_type == 'TECHNICAL':
@@ -3353,10 +2897,11 @@ def transcribe_audio(request):
                         )
                 except InterviewQuestion.DoesNotExist:
                     print(f"Warning: Could not find question with ID {question_id} to save answer.")
-            os.remove(full_path)
+            if not metrics_own_audio:
+                os.remove(full_path)
             return JsonResponse({'text': transcribed_text, 'follow_up_question': follow_up_data})
         except Exception as e:
-            if os.path.exists(full_path):
+            if not metrics_own_audio and os.path.exists(full_path):
                 os.remove(full_path)
             return JsonResponse({'error': str(e)}, status=500)
     return JsonResponse({'error': 'Invalid request'}, status=400)
@@ -4765,6 +4310,8 @@ def ai_upload_answer(request):
                     )
                     
                     print(f"✅ Q&A pair saved with ID: {qa_pair.id if qa_pair else 'None'}")
+                    # The chatbot clients post JSON transcripts without audio, so these metrics are transcript-only
+                    _record_answer_metrics(last_ai_question, transcript, response_time=response_time)
                     
                     # Trigger LLM analysis asynchronously
                     if qa_pair:
@@ -5046,7 +4593,14 @@ def verify_id(request):
         format, imgstr = image_data.split(';base64,')
         ext = format.split('/')[-1]
         img_file = ContentFile(base64.b64decode(imgstr), name=f"id_{timezone.now().strftime('%Y%m%d%H%M%S')}.{ext}")
-        session.id_card_image.save(img_file.name, img_file, save=True)
+        # Retries with the same photo share one content-addressed file
+        previous_image = session.id_card_image.name if session.id_card_image else None
+        session.id_card_image = img_file
+        with transaction.atomic():
+            attach_blob(session.id_card_image, StoredBlob.Kind.ID_IMAGE)
+            session.save(update_fields=['id_card_image'])
+        if previous_image and previous_image != session.id_card_image.name:
+            release_blob_for_name(previous_image)
         
         tmp_path = session.id_card_image.path
         
@@ -5151,752 +4705,107 @@ def verify_id(request):
         return JsonResponse({'status': 'error', 'message': f'An unexpected error occurred: {str(e)}'}, status=500)
     pass
 
-# --- Multi-Language Code Execution Logic (Windows Compatible) ---
-def run_subprocess_windows(command, cwd=None, input_data=None, env=None):
-    try:
-        # Reduced timeout to 5 seconds per test case for faster execution
-        # Multiple test cases can accumulate, so keep individual timeouts very short
-        result = subprocess.run(
-            command,
-            capture_output=True,
-            text=True,
-            timeout=5,
-            cwd=cwd,
-            input=input_data,
-            env=env,
-        )
-        return result
-    except subprocess.TimeoutExpired:
-        return subprocess.CompletedProcess(command, 1, stdout=None, stderr="Execution timed out after 5 seconds. Code may be too slow or have infinite loops.")
-    except Exception as e:
-        return subprocess.CompletedProcess(command, 1, stdout=None, stderr=f"Server execution error: {str(e)}")
+# --- Multi-Language Code Execution Logic (see code_execution.py) ---
+
+def _is_admin_user(user):
+    """Staff and ADMIN-role users may see the operational endpoints below."""
+    return user.is_authenticated and (user.is_staff or (getattr(user, "role", "") or "").upper() == "ADMIN")
 
-def execute_python_windows(code, test_input):
-    """
-    Execute Python code with test input.
-    Handles both function-based and class-based code.
-    """
-    import re
-    
-    print(f"🔍 execute_python_windows called with test_input='{test_input}'")
-    
-    # Check if code contains a class definition (for OOP questions)
-    class_match = re.search(r'class\s+(\w+)', code)
-    
-    if class_match:
-        # Class-based code: test_input should be executable Python code
-        # Example: "finder = MedianFinder(); finder.addNum(1); finder.findMedian()"
-        # Split by semicolon, execute all but last, then print the result of the last
-        statements = [s.strip() for s in test_input.split(';') if s.strip()]
-        if len(statements) > 1:
-            # Execute all statements except the last
-            setup = '\n'.join(statements[:-1])
-            # Print the result of the last statement
-            full_script = f"{code}\n{setup}\nprint({statements[-1]})"
-        else:
-            # Single statement - just execute and print
-            full_script = f"{code}\nprint({test_input})"
-    else:
-        # Function-based code: find function name and call it
-        function_match = re.search(r'def\s+(\w+)\s*\(', code)
-        if function_match:
-            function_name = function_match.group(1)
-            # test_input already contains quotes (e.g., "'hello'" or '"hello"')
-            # so we can use it directly: reverse_string('hello')
-            # Use repr() to ensure the output is properly formatted for comparison
-            full_script = f"{code}\nresult = {function_name}({test_input})\nif result is not None:\n    print(result)\nelse:\n    print('None')"
-            print(f"🔍 Generated script (preview): {full_script[:300]}...")
-            print(f"🔍 Function name detected: {function_name}")
-        else:
-            # Fallback to 'solve' if no function found
-            full_script = f"{code}\nresult = solve({test_input})\nif result is not None:\n    print(result)\nelse:\n    print('None')"
-            print(f"🔍 Using fallback 'solve' function")
-    
-    result = run_subprocess_windows(['python', '-c', full_script])
-    
-    # Clean up the output - remove any trailing newlines and normalize
-    if result.stdout:
-        result.stdout = result.stdout.strip()
-    if result.stderr:
-        result.stderr = result.stderr.strip()
-    
-    print(f"🔍 Execution result - stdout: '{result.stdout}', stderr: '{result.stderr}', returncode: {result.returncode}")
-    return result
 
-def execute_javascript_windows(code, test_input):
-    full_script = f"{code}\nconsole.log(solve({test_input}));"
-    return run_subprocess_windows(['node', '-e', full_script])
+@api_view(["GET"])
+@permission_classes([IsAuthenticated])
+def coding_sandbox_metrics(request):
+    """Queue-wait / run-time metrics of the coding sandbox (staff and admins only)."""
+    if not _is_admin_user(request.user):
+        return JsonResponse({"status": "error", "message": "Admin access required."}, status=403)
+    return JsonResponse({
+        "status": "success",
+        "scheduler": sandbox_scheduler.metrics(),
+        "build_cache": dict(artifact_cache.stats),
+        "warm_workers": {
+            "python": dict(python_workers.stats),
+            "node": dict(node_workers.stats),
+        },
+    })
 
-def _extract_go_imports_and_body(code: str):
+@never_cache
+def coding_toolchains(request):
     """
-    Separate Go imports from the rest of the source so we can rebuild a harness.
-    Returns (imports_set, body_string).
+    Toolchain health check: availability, version and capabilities of every
+    coding-round language. Paths are shown to staff and admins only, who can
+    also re-probe with ``?refresh=1``.
     """
-    imports = []
-    body_lines = []
-    lines = code.splitlines()
-    i = 0
-
-    # Skip leading shebang/comments/blank lines but capture everything else
-    while i < len(lines):
-        stripped = lines[i].strip()
-        if stripped.startswith("package "):
-            i += 1
-            break
-        if stripped:
-            break
-        i += 1
-
-    while i < len(lines):
-        line = lines[i]
-        stripped = line.strip()
-        if stripped.startswith("import"):
-            if stripped.startswith("import (") or stripped == "import(":
-                i += 1
-                while i < len(lines):
-                    inner = lines[i].strip()
-                    if inner == ")":
-                        break
-                    if inner:
-                        pkg = inner.split("//")[0].strip().strip('"').strip('`')
-                        if pkg:
-                            imports.append(pkg)
-                    i += 1
-            else:
-                remainder = stripped[len("import"):].split("//")[0].strip()
-                if remainder:
-                    pkg = remainder.split()[-1].strip('"').strip('`')
-                    if pkg:
-                        imports.append(pkg)
-        else:
-            body_lines.extend(lines[i:])
-            break
-        i += 1
-
-    body = "\n".join(body_lines).strip()
-    return set(imports), body
-
-def _format_go_arguments(raw_input: str) -> str:
-    if not raw_input or raw_input.lower() == "n/a":
-        return ""
-    raw = raw_input.strip()
-    if raw.startswith("(") and raw.endswith(")"):
-        raw = raw[1:-1]
-
-    parts = [p.strip() for p in raw.split(",") if p.strip()]
-    formatted = []
-    for part in parts:
-        lower = part.lower()
-        if re.fullmatch(r"-?\d+", part) or re.fullmatch(r"-?\d+\.\d+", part):
-            formatted.append(part)
-        elif lower in {"true", "false", "nil"}:
-            formatted.append(lower)
-        elif part.startswith('"') and part.endswith('"'):
-            formatted.append(part)
-        elif part.startswith("'") and part.endswith("'"):
-            inner = part[1:-1]
-            if len(inner) == 1:
-                formatted.append(f"'{inner}'")
-            else:
-                escaped = inner.replace('"', '\\"')
-                formatted.append(f"\"{escaped}\"")
-        else:
-            formatted.append(part)
-    return ", ".join(formatted)
-
-def _detect_go_entrypoint(code_body: str) -> str:
-    candidates = re.findall(r'^\s*func\s+(\w+)\s*\(', code_body, flags=re.MULTILINE)
-    for name in candidates:
-        if name and name != "main":
-            return name
-    return "solve"
+    is_admin = _is_admin_user(request.user)
+    if request.GET.get("refresh") and not is_admin:
+        return JsonResponse({"status": "error", "message": "Admin access required."}, status=403)
+    snapshot = toolchains.refresh() if request.GET.get("refresh") else toolchains.probe()
+    entries = {}
+    for name, entry in snapshot.items():
+        entry = dict(entry, capabilities=dict(entry["capabilities"]))
+        if not is_admin:
+            entry.pop("path")
+        entries[name] = entry
+    languages = {}
+    for entry in entries.values():
+        for language in entry["languages"]:
+            languages[language] = languages.get(language, True) and entry["available"]
+    return JsonResponse({
+        "status": "success",
+        "probed_at": toolchains.probed_at,
+        "languages": languages,
+        "toolchains": entries,
+    })
 
-def execute_go_windows(code, test_input):
+@never_cache
+def speech_models(request):
     """
-    Compile and execute Go code by wrapping the submission with a harness
-    that calls the detected function using the provided test input.
+    Speech model registry (admins only): which models this worker has loaded
+    and the memory they hold. POST ``{"unload": name}`` frees a model under
+    memory pressure, ``{"load": name}`` loads one ahead of use.
     """
-    go_cmd = shutil.which("go")
-    if not go_cmd:
-        message = (
-            "Go toolchain is not available on the server. "
-            "Install Go and ensure the 'go' binary is on PATH."
-        )
-        return subprocess.CompletedProcess(["go"], 1, stdout="", stderr=message)
-
-    imports, body = _extract_go_imports_and_body(code)
-    body = re.sub(r'func\s+main\s*\([^)]*\)\s*{[\s\S]*?}\s*', '', body)
-    imports.add("fmt")
-
-    function_name = _detect_go_entrypoint(body)
-    arg_expr = _format_go_arguments(test_input or "")
-    call_expr = f"{function_name}({arg_expr})" if arg_expr else f"{function_name}()"
-
-    if len(imports) == 1:
-        import_section = f'import "{next(iter(imports))}"\n'
-    else:
-        import_section = "import (\n"
-        for pkg in sorted(imports):
-            import_section += f'    "{pkg}"\n'
-        import_section += ")\n"
-
-    harness = (
-        "package main\n\n"
-        f"{import_section}\n"
-        f"{body}\n\n"
-        "func main() {\n"
-        f"    fmt.Println({call_expr})\n"
-        "}\n"
-    )
-
-    with tempfile.TemporaryDirectory() as temp_dir:
-        go_file_path = os.path.join(temp_dir, "main.go")
-        with open(go_file_path, "w", encoding="utf-8") as go_file:
-            go_file.write(harness)
-
-        run_result = run_subprocess_windows([go_cmd, "run", go_file_path], cwd=temp_dir)
-        return run_result
-
-def _resolve_php_binary():
-    php_cmd = shutil.which("php")
-    if php_cmd:
-        return php_cmd
-
-    configured = getattr(settings, "PHP_PATH", None) or os.environ.get("PHP_PATH")
-    if configured:
-        if os.path.isfile(configured):
-            return configured
-        possible = os.path.join(configured, "php.exe")
-        if os.path.isfile(possible):
-            return possible
-
-    common_candidates = [
-        r"C:\tools\php84\php.exe",
-        r"C:\tools\php\php.exe",
-        r"C:\Program Files\PHP\php.exe",
-        r"C:\Program Files\Php\php.exe",
-        r"C:\Program Files (x86)\PHP\php.exe",
-    ]
-    for candidate in common_candidates:
-        if os.path.isfile(candidate):
-            return candidate
-
-    return None
-
-def _detect_cpp_entrypoint(code: str) -> str:
-    pattern = re.compile(r'^\s*[^\s#][\w\s:<>,*&\[\]]+\s+([A-Za-z_]\w*)\s*\(', flags=re.MULTILINE)
-    for match in pattern.finditer(code):
-        name = match.group(1)
-        if name and name not in {"if", "for", "while", "switch", "return", "main"}:
-            return name
-    return "solve"
-
-def _format_cpp_arguments(raw_input: str) -> str:
-    if not raw_input or raw_input.lower() == "n/a":
-        return ""
-    raw = raw_input.strip()
-    if raw.startswith(("'", '"')) and raw.endswith(("'", '"')) and "," in raw:
-        raw = raw[1:-1]
-    if raw.startswith("(") and raw.endswith(")"):
-        raw = raw[1:-1]
-
-    parts = [p.strip() for p in raw.split(",") if p.strip()]
-    formatted = []
-    for part in parts:
-        lower = part.lower()
-        if re.fullmatch(r"-?\d+", part) or re.fullmatch(r"-?\d+\.\d+", part):
-            formatted.append(part)
-        elif lower in {"true", "false", "nullptr", "null"}:
-            formatted.append(lower)
-        elif part.startswith('"') and part.endswith('"'):
-            inner = part[1:-1].replace('"', r'\"')
-            formatted.append(f"\"{inner}\"")
-        elif part.startswith("'") and part.endswith("'"):
-            inner = part[1:-1]
-            if len(inner) == 1:
-                formatted.append(f"'{inner}'")
-            else:
-                escaped = inner.replace('"', '\\"')
-                formatted.append(f"\"{escaped}\"")
+    if not _is_admin_user(request.user):
+        return JsonResponse({"status": "error", "message": "Admin access required."}, status=403)
+    if request.method == "POST":
+        try:
+            data = json.loads(request.body or b"{}")
+        except ValueError:
+            return JsonResponse({"status": "error", "message": "Invalid JSON body."}, status=400)
+        name = data.get("unload") or data.get("load")
+        if name not in MODEL_LOADERS:
+            return JsonResponse({"status": "error", "message": f"Unknown model: {name}"}, status=400)
+        if data.get("unload"):
+            model_registry.unload(name)
         else:
-            formatted.append(part)
-    return ", ".join(formatted)
-
-def _resolve_cpp_compiler():
-    configured = getattr(settings, "CPP_COMPILER", None) or os.environ.get("CPP_COMPILER")
-    if configured:
-        if os.path.isfile(configured):
-            return configured
-        possible = os.path.join(configured, "g++.exe")
-        if os.path.isfile(possible):
-            return possible
-
-    compiler = shutil.which("g++")
-    if compiler:
-        return compiler
-
-    candidates = [
-        r"C:\msys641\mingw64\bin\g++.exe",
-        r"C:\msys64\mingw64\bin\g++.exe",
-        r"C:\msys64\ucrt64\bin\g++.exe",
-        r"C:\mingw64\bin\g++.exe",
-    ]
-    for candidate in candidates:
-        if os.path.isfile(candidate):
-            return candidate
-    return None
+            model_registry.get(name)
+    return JsonResponse(dict(model_registry.memory_report(), status="success"))
 
-def execute_cpp_windows(code, test_input, treat_as_c=False):
-    compiler = _resolve_cpp_compiler()
-    if not compiler:
-        message = (
-            "C/C++ compiler not available on the server. "
-            "Install MinGW-w64 (g++) and ensure it is on PATH."
-        )
-        return subprocess.CompletedProcess(["g++"], 1, stdout="", stderr=message)
-
-    function_name = _detect_cpp_entrypoint(code)
-    arg_expr = _format_cpp_arguments(test_input or "")
-    call_expr = f"{function_name}({arg_expr})" if arg_expr else f"{function_name}()"
+@never_cache
+def storage_transfers(request):
+    """Storage upload throughput (admins only): totals and the recent transfers of this worker."""
+    if not _is_admin_user(request.user):
+        return JsonResponse({"status": "error", "message": "Admin access required."}, status=403)
+    return JsonResponse(dict(transfer_manager.metrics(), status="success"))
 
-    base_includes = [
-        "#include <bits/stdc++.h>",
-        "#include <type_traits>",
-        "#include <functional>",
-    ]
+@csrf_exempt
+@require_POST
+def execute_code(request):
+    try:
+        data = json.loads(request.body)
+    except Exception as e:
+        return JsonResponse({"status": "error", "message": f"Invalid JSON body: {str(e)}"}, status=400)
+    code_to_run = data.get('code')
+    language = (data.get('language') or 'PYTHON').upper()
+    question_id = data.get('question_id')
+    # Get session_key from request body or query params
+    session_key = data.get('session_key') or request.GET.get('session_key')
 
-    extra_includes = []
-    body_content = code
-    if treat_as_c:
-        user_lines = code.splitlines()
-        remaining_lines = []
-        for line in user_lines:
-            stripped = line.strip()
-            if stripped.startswith("#include"):
-                extra_includes.append(line)
-            else:
-                remaining_lines.append(line)
-        body_content = "\n".join(remaining_lines)
-
-    includes_block = "\n".join(base_includes + extra_includes) + "\n\n"
-    harness = includes_block
-    if treat_as_c:
-        harness += "#ifdef __cplusplus\nextern \"C\" {\n#endif\n"
-        harness += body_content + "\n"
-        harness += "#ifdef __cplusplus\n}\n#endif\n"
-    else:
-        harness += body_content + "\n"
-
-    harness += """
-template <typename Func, typename... Args>
-void invoke_and_print(Func&& func, Args&&... args) {
-    using Result = std::invoke_result_t<Func, Args...>;
-    if constexpr (std::is_void_v<Result>) {
-        std::invoke(std::forward<Func>(func), std::forward<Args>(args)...);
-    } else {
-        auto result = std::invoke(std::forward<Func>(func), std::forward<Args>(args)...);
-        std::cout << result;
-    }
-}
-
-int main() {
-    std::ios::sync_with_stdio(false);
-    std::cin.tie(nullptr);
-"""
-    if arg_expr:
-        harness += f"    invoke_and_print({function_name}, {arg_expr});\n"
-    else:
-        harness += f"    invoke_and_print({function_name});\n"
-    harness += "    return 0;\n}\n"
-
-    compiler_dir = os.path.dirname(compiler)
-    env = os.environ.copy()
-    env["PATH"] = compiler_dir + os.pathsep + env.get("PATH", "")
-
-    with tempfile.TemporaryDirectory() as temp_dir:
-        source_path = os.path.join(temp_dir, "solution.cpp")
-        with open(source_path, "w", encoding="utf-8") as cpp_file:
-            cpp_file.write(harness)
-
-        executable_path = os.path.join(temp_dir, "solution.exe")
-        compile_result = run_subprocess_windows(
-            [compiler, "-std=c++17", source_path, "-o", executable_path],
-            env=env,
-        )
-        if compile_result.returncode != 0:
-            return compile_result
-
-        run_result = run_subprocess_windows([executable_path], cwd=temp_dir, env=env)
-        return run_result
-
-def _resolve_java_binary(binary_name: str):
-    """
-    Locate the full path for a Java executable (e.g., javac, java).
-    Checks PATH, Django settings, JAVA_HOME, and common Windows install directories.
-    """
-    if not binary_name:
-        return None
-
-    candidates = []
-    exe_name = binary_name
-    if os.name == "nt" and not binary_name.lower().endswith(".exe"):
-        exe_name = f"{binary_name}.exe"
-
-    # PATH lookup first
-    for name in {binary_name, exe_name}:
-        located = shutil.which(name)
-        if located:
-            return located
-
-    # Django settings or environment JAVA_HOME
-    java_home = getattr(settings, "JAVA_HOME", None) or os.environ.get("JAVA_HOME")
-    if java_home:
-        candidate = os.path.join(java_home, "bin", exe_name)
-        if os.path.exists(candidate):
-            return candidate
-
-    # Common Windows install locations
-    if os.name == "nt":
-        potential_roots = [
-            os.environ.get("PROGRAMFILES"),
-            os.environ.get("PROGRAMFILES(X86)"),
-            r"C:\Program Files\Java",
-            r"C:\Program Files (x86)\Java",
-        ]
-        for root in filter(None, potential_roots):
-            if not os.path.isdir(root):
-                continue
-            try:
-                entries = sorted(os.listdir(root))
-            except OSError:
-                continue
-            for entry in entries:
-                entry_lower = entry.lower()
-                if not (entry_lower.startswith("java") or entry_lower.startswith("jdk") or entry_lower.startswith("jre")):
-                    continue
-                candidate = os.path.join(root, entry, "bin", exe_name)
-                if os.path.exists(candidate):
-                    return candidate
-
-    return None
-
-def _format_java_arguments(raw_input: str) -> str:
-    """
-    Convert stored test case input (e.g., '1,2' or '\'hello\'') into
-    Java-friendly argument expressions.
-    """
-    if raw_input is None:
-        return ""
-
-    raw = raw_input.strip()
-    if not raw:
-        return ""
-
-    if raw.startswith("(") and raw.endswith(")"):
-        raw = raw[1:-1]
-
-    parts = [part.strip() for part in raw.split(",") if part.strip()]
-    formatted_parts = []
-
-    for part in parts:
-        if re.fullmatch(r"-?\d+", part) or re.fullmatch(r"-?\d+\.\d+", part):
-            formatted_parts.append(part)
-        elif part.lower() in {"true", "false", "null"}:
-            formatted_parts.append(part.lower())
-        elif part.startswith('"') and part.endswith('"'):
-            formatted_parts.append(part)
-        elif part.startswith("'") and part.endswith("'"):
-            inner = part[1:-1]
-            if len(inner) == 1:
-                formatted_parts.append(f"'{inner}'")
-            else:
-                escaped = inner.replace('"', '\\"')
-                formatted_parts.append(f"\"{escaped}\"")
-        else:
-            formatted_parts.append(part)
-
-    return ", ".join(formatted_parts)
-
-def _detect_java_entrypoint(code: str):
-    """
-    Determine class name, method name, and whether the method is static.
-    Defaults to Solution.solve if not found.
-    """
-    class_match = re.search(r'class\s+(\w+)', code)
-    class_name = class_match.group(1) if class_match else "Solution"
-
-    preferred_methods = ["solve", "add", "answer", "result"]
-    method_name = "solve"
-    is_static = True
-
-    for method in preferred_methods:
-        pattern = re.compile(r'(public\s+)?(static\s+)?[^\s]+\s+' + re.escape(method) + r'\s*\(')
-        match = pattern.search(code)
-        if match:
-            method_name = method
-            is_static = bool(match.group(2))
-            break
-    else:
-        generic_match = re.search(r'(public\s+)?(static\s+)?[^\s]+\s+(\w+)\s*\(', code)
-        if generic_match:
-            method_name = generic_match.group(3)
-            is_static = bool(generic_match.group(2))
-
-    return class_name, method_name, is_static
-
-def _ensure_java_class_wrapper(code: str, class_name: str) -> str:
-    """
-    If user code does not declare a class, wrap it in a public class so it compiles.
-    """
-    if re.search(r'\bclass\b', code):
-        return code
-
-    indented = []
-    for line in code.splitlines():
-        if line.strip():
-            indented.append(f"    {line}")
-        else:
-            indented.append("")
-    body = "\n".join(indented)
-    return f"public class {class_name} {{\n{body}\n}}\n"
-
-def execute_java_windows(code, test_input):
-    """
-    Compiles and then executes Java code safely on Windows.
-    This function creates a temporary directory, writes the user's code into a
-    standard Java class structure, compiles it, and then runs it.
-    It returns a standard subprocess.CompletedProcess object for consistency.
-    """
-    # Create a temporary directory that will be automatically cleaned up
-    javac_cmd = _resolve_java_binary("javac")
-    java_cmd = _resolve_java_binary("java")
-
-    missing = []
-    if not javac_cmd:
-        missing.append("javac")
-    if not java_cmd:
-        missing.append("java")
-
-    if missing:
-        message = (
-            "Java runtime is not available on the server. "
-            f"Missing executables: {', '.join(missing)}. "
-            "Install a JDK (17+) and ensure JAVA_HOME or PATH is configured."
-        )
-        return subprocess.CompletedProcess(missing, 1, stdout="", stderr=message)
-
-    class_name, method_name, is_static = _detect_java_entrypoint(code)
-    prepared_code = _ensure_java_class_wrapper(code, class_name)
-    solution_filename = f"{class_name}.java"
-
-    formatted_args = _format_java_arguments(test_input or "")
-    invocation_target = f"{class_name}.{method_name}" if is_static else f"(new {class_name}()).{method_name}"
-    invocation_call = f"{invocation_target}({formatted_args})" if formatted_args else f"{invocation_target}()"
-
-    main_code = (
-        "public class Main {\n"
-        "    public static void main(String[] args) {\n"
-        "        try {\n"
-        f"            System.out.println({invocation_call});\n"
-        "        } catch (Exception e) {\n"
-        "            e.printStackTrace();\n"
-        "        }\n"
-        "    }\n"
-        "}\n"
-    )
-
-    with tempfile.TemporaryDirectory() as temp_dir:
-        solution_path = os.path.join(temp_dir, solution_filename)
-        main_path = os.path.join(temp_dir, "Main.java")
-
-        with open(solution_path, "w", encoding="utf-8") as solution_file:
-            solution_file.write(prepared_code)
-
-        with open(main_path, "w", encoding="utf-8") as main_file:
-            main_file.write(main_code)
-
-        compile_result = run_subprocess_windows(
-            [javac_cmd, "Main.java", solution_filename], cwd=temp_dir
-        )
-
-        if compile_result.returncode != 0:
-            if not compile_result.stderr and compile_result.stdout:
-                compile_result.stderr = compile_result.stdout
-            return compile_result
-
-        run_result = run_subprocess_windows([java_cmd, "-cp", ".", "Main"], cwd=temp_dir)
-        return run_result
-
-def execute_php_windows(code, test_input):
-    full_script = f"<?php {code} echo solve({test_input}); ?>"
-    php_cmd = _resolve_php_binary()
-    if not php_cmd:
-        message = (
-            "PHP runtime is not available on the server. "
-            "Install PHP and ensure the executable is on PATH or configure PHP_PATH."
-        )
-        return subprocess.CompletedProcess(["php"], 1, stdout="", stderr=message)
-
-    temp_file = tempfile.NamedTemporaryFile(mode='w', suffix='.php', delete=False, encoding='utf-8')
-    try:
-        temp_file.write(full_script)
-        temp_file.flush()
-        temp_file.close()
-        result = run_subprocess_windows([php_cmd, temp_file.name])
-    finally:
-        try:
-            os.remove(temp_file.name)
-        except OSError:
-            pass
-    return result
-
-def execute_ruby_windows(code, test_input):
-    full_script = f"{code}\nputs solve({test_input})"
-    return run_subprocess_windows(['ruby', '-e', full_script])
-
-def execute_csharp_windows(code, test_input):
-    with tempfile.TemporaryDirectory() as temp_dir:
-        subprocess.run(['dotnet', 'new', 'console', '--force'], cwd=temp_dir, capture_output=True)
-        program_cs_path = os.path.join(temp_dir, 'Program.cs')
-        full_code = f"using System; public class Program {{ public static void Main(string[] args) {{ Console.WriteLine(Solve({test_input})); }} {code} }}"
-        with open(program_cs_path, 'w') as f: f.write(full_code)
-        return run_subprocess_windows(['dotnet', 'run'], cwd=temp_dir)
-
-def execute_sql_windows(code, test_input):
-    try:
-        con = sqlite3.connect(":memory:")
-        cur = con.cursor()
-        cur.executescript(code)
-        res = cur.fetchall()
-        output_str = "\n".join([str(row) for row in res])
-        con.close()
-        return subprocess.CompletedProcess(None, 0, stdout=output_str, stderr=None)
-    except Exception as e:
-        return subprocess.CompletedProcess(None, 1, stdout=None, stderr=str(e))
-
-def execute_html_windows(code, test_input):
-    """
-    HTML doesn't need execution; evaluate by returning the provided markup.
-    Test cases simply compare the submitted HTML to the expected output.
-    """
-    normalized = code.strip()
-    return subprocess.CompletedProcess(None, 0, stdout=normalized, stderr=None)
-    
-def run_test_suite(code, language, test_cases):
-    """
-    Runs the given code against a set of test cases for a specific language.
-    Returns a tuple: (all_passed, output_log_string)
-    """
-    if not test_cases:
-        return False, "No test cases found for this question."
-
-    output_log_lines = []
-    all_passed = True
-    
-    lang_map = {
-        'PYTHON': execute_python_windows,
-        'JAVASCRIPT': execute_javascript_windows,
-        'JAVA': execute_java_windows,
-        'GO': execute_go_windows,
-        'C': lambda code, test_input: execute_cpp_windows(code, test_input, treat_as_c=True),
-        'CPP': execute_cpp_windows,
-        'PHP': execute_php_windows,
-        'RUBY': execute_ruby_windows,
-        'CSHARP': execute_csharp_windows,
-        'HTML': execute_html_windows,
-        'SQL': execute_sql_windows,
-    }
-    
-    execution_function = lang_map.get(language)
-    if not execution_function:
-        return False, f"Language '{language}' is not supported."
-
-    for i, test_case in enumerate(test_cases):
-        stdout, stderr = None, None
-        test_case_label = f"Test Case {i+1}"
-        if test_case.is_hidden:
-            test_case_label += " (Hidden)"
-
-        # Use test_case.input_data directly - it should be in correct format for the language
-        test_input = test_case.input_data.strip()
-        expected = test_case.expected_output.strip()
-        
-        print(f"🧪 Running test case {i+1}:")
-        print(f"   Input data: '{test_input}'")
-        print(f"   Expected output: '{expected}'")
-        print(f"   Code preview: {code[:100]}...")
-        
-        try:
-            result_obj = execution_function(code, test_input)
-            stdout = result_obj.stdout.strip() if result_obj.stdout else ""
-            stderr = result_obj.stderr.strip() if result_obj.stderr else ""
-            returncode = result_obj.returncode
-            
-            print(f"🧪 Test case {i+1} execution result:")
-            print(f"   Return code: {returncode}")
-            print(f"   Stdout: '{stdout}'")
-            print(f"   Stderr: '{stderr}'")
-            print(f"   Expected: '{expected}'")
-            print(f"   Match: {stdout == expected}")
-            
-            if returncode != 0 or stderr:
-                all_passed = False
-                output_log_lines.append(f"{test_case_label}: FAILED (Error)")
-                if stderr:
-                    output_log_lines.append(f"  Error: {stderr}")
-                else:
-                    output_log_lines.append(f"  Exit code: {returncode}")
-                output_log_lines.append(f"  Input: {test_case.input_data}")
-                output_log_lines.append(f"  Expected: '{expected}'")
-                if stdout:
-                    output_log_lines.append(f"  Got: '{stdout}'")
-            else:
-                # Normalize outputs for comparison (trim whitespace)
-                actual_output = stdout.strip() if stdout else ""
-                expected_output = expected
-                
-                # For string outputs, compare without quotes if they're present
-                if actual_output == expected_output:
-                    output_log_lines.append(f"{test_case_label}: PASSED ✅")
-                else:
-                    all_passed = False
-                    output_log_lines.append(f"{test_case_label}: FAILED ❌")
-                    output_log_lines.append(f"  Input: {test_case.input_data}")
-                    output_log_lines.append(f"  Expected: '{expected_output}'")
-                    output_log_lines.append(f"  Got: '{actual_output}'")
-                    output_log_lines.append(f"  (Character diff: expected {len(expected_output)} chars, got {len(actual_output)} chars)")
-        except Exception as e:
-            all_passed = False
-            error_msg = str(e)
-            output_log_lines.append(f"{test_case_label}: FAILED (Exception)")
-            output_log_lines.append(f"  Exception: {error_msg}")
-            output_log_lines.append(f"  Input: {test_case.input_data}")
-            output_log_lines.append(f"  Expected: '{expected}'")
-            print(f"❌ Exception in test case {i+1}: {error_msg}")
-            import traceback
-            traceback.print_exc()
-    
-    return all_passed, "\n".join(output_log_lines)
-@csrf_exempt
-@require_POST
-def execute_code(request):
-    try:
-        data = json.loads(request.body)
-    except Exception as e:
-        return JsonResponse({"status": "error", "message": f"Invalid JSON body: {str(e)}"}, status=400)
-    code_to_run = data.get('code')
-    language = (data.get('language') or 'PYTHON').upper()
-    question_id = data.get('question_id')
-    # Get session_key from request body or query params
-    session_key = data.get('session_key') or request.GET.get('session_key')
-
-    # Validate required fields
-    if not session_key:
-        return JsonResponse({"status": "error", "message": "Missing session_key"}, status=400)
-    if not question_id:
-        return JsonResponse({"status": "error", "message": "Missing question_id"}, status=400)
-    if not code_to_run:
-        return JsonResponse({"status": "error", "message": "Missing code"}, status=400)
+    # Validate required fields
+    if not session_key:
+        return JsonResponse({"status": "error", "message": "Missing session_key"}, status=400)
+    if not question_id:
+        return JsonResponse({"status": "error", "message": "Missing question_id"}, status=400)
+    if not code_to_run:
+        return JsonResponse({"status": "error", "message": "Missing code"}, status=400)
 
     # Fix: Convert question_id to UUID if it's an integer
     if isinstance(question_id, int):
@@ -5962,8 +4871,13 @@ def execute_code(request):
     else:
         test_cases = list(test_cases_qs)
     
+    # Async mode: return a job id now, results stream from the job endpoints
+    if data.get('async'):
+        job_id = start_code_job(code_to_run, language, test_cases, session_key=session_key)
+        return JsonResponse(_code_job_links(job_id), status=202)
+
     # Run code against all test cases
-    all_passed, output_log = run_test_suite(code_to_run, language, test_cases)
+    all_passed, output_log, summary = run_test_suite(code_to_run, language, test_cases, session_key=session_key)
     
     # Return detailed results
     return JsonResponse({
@@ -5971,9 +4885,185 @@ def execute_code(request):
         'output': output_log,
         'passed': all_passed,
         'all_passed': all_passed,
-        'test_summary': output_log
+        'test_summary': output_log,
+        'resource_usage': {
+            'cpu_time_ms': summary['cpu_time_ms'],
+            'peak_memory_kb': summary['peak_memory_kb'],
+        },
     })
+
+
+def _code_job_links(job_id):
+    return {
+        "status": "queued",
+        "job_id": job_id,
+        "status_url": f"/api/coding/jobs/{job_id}/",
+        "stream_url": f"/api/coding/jobs/{job_id}/stream/",
+    }
+
+
+def _measure_submission_complexity(code_submission, submitted_code, language, test_cases, session_key, final_log):
+    """Estimate the growth of a correct submission and store it on its CodeSubmission."""
+    try:
+        complexity_details = estimate_complexity(submitted_code, language, test_cases, session_key=session_key)
+    except Exception as e:
+        print(f"⚠️ Complexity measurement failed: {e}")
+        traceback.print_exc()
+        return None, final_log
+    if complexity_details:
+        final_log += f"Complexity: {describe_complexity(complexity_details)}\n"
+        CodeSubmission.objects.filter(pk=code_submission.pk).update(
+            complexity=complexity_details.get('complexity'),
+            complexity_details=complexity_details,
+            output_log=final_log,
+        )
+    return complexity_details, final_log
+
+
+def _finalize_coding_submission(session, question, submitted_code, language, test_cases,
+                                all_passed, output_log, summary, code_submission=None,
+                                defer_complexity=False):
+    """
+    Store the result of a final coding submission, mark the interview as
+    COMPLETED and start the comprehensive evaluation in the background.
+    With ``defer_complexity`` (request-thread callers) the complexity
+    measurement runs in that background thread too.
+    Returns ``(passed_all_tests, final_log)``.
+    """
+    cases_by_index = {case['index']: case for case in summary['cases']}
+    passed_count = sum(1 for case in summary['cases'] if case['passed'])
+    total_count = len(test_cases)
+    test_results = []
+    for idx, tc in enumerate(test_cases, 1):
+        case = cases_by_index.get(idx - 1)
+        test_results.append({
+            'test_case': idx,
+            'input': tc.input_data,
+            'expected': tc.expected_output,
+            'actual': case['actual'] if case else '',
+            'passed': bool(case and case['passed']),
+            'error': bool(case and case['status'] in ('ERROR', 'EXCEPTION'))
+        })
+    
+    print(f"✅ Test Results: {passed_count}/{total_count} passed")
+
+    # Create detailed log (no Gemini evaluation)
+    final_log = f"Test Results: {passed_count}/{total_count} passed\n\n"
+    for result in test_results:
+        status_emoji = "✅" if result['passed'] else "❌"
+        final_log += f"{status_emoji} Test Case {result['test_case']}:\n"
+        final_log += f"   Input: {result['input']}\n"
+        final_log += f"   Expected: {result['expected']}\n"
+        final_log += f"   Actual: {result['actual']}\n"
+        if result.get('error'):
+            final_log += f"   Error: Yes\n"
+        final_log += "\n"
+    if summary['cpu_time_ms'] is not None:
+        final_log += f"Resources: CPU {summary['cpu_time_ms']:.1f} ms total"
+        if summary['peak_memory_kb'] is not None:
+            final_log += f", peak memory {summary['peak_memory_kb'] / 1024:.1f} MB"
+        final_log += "\n"
+
+    passed_all_tests = total_count > 0 and passed_count == total_count
+
+    submission_fields = {
+        'passed_all_tests': passed_all_tests,
+        'output_log': final_log,
+        'cpu_time_ms': summary['cpu_time_ms'],
+        'peak_memory_kb': summary['peak_memory_kb'],
+        'test_results': [
+            public_case(case, test_cases[case['index']]) for case in summary['cases']
+        ],
+        'passed_count': passed_count,
+        'total_count': total_count,
+        'status': 'COMPLETED',
+        'complexity': None,
+        'complexity_details': None,
+    }
+    if code_submission is None:
+        # Store submission with AI evaluation feedback (if available)
+        code_submission = CodeSubmission.objects.create(
+            session=session,
+            question_id=str(question.id),
+            submitted_code=submitted_code,
+            language=language,
+            gemini_evaluation=None,
+            **submission_fields
+        )
+    else:
+        CodeSubmission.objects.filter(pk=code_submission.pk).update(**submission_fields)
+
+    # Growth is only meaningful for a correct solution
+    measure_complexity = passed_all_tests
+    if measure_complexity and not defer_complexity:
+        _, final_log = _measure_submission_complexity(
+            code_submission, submitted_code, language, test_cases, session.session_key, final_log
+        )
     
+    # Also update the InterviewQuestion with the actual submitted code
+    # This ensures the code is available even if CodeSubmission lookup fails
+    try:
+        # Save the actual code to transcribed_answer so it's always available
+        # Format: Store the code with a prefix indicating test results
+        code_with_results = f"Code submitted: {passed_count}/{total_count} test cases passed\n\nSubmitted Code:\n{submitted_code}"
+        question.transcribed_answer = code_with_results
+        question.save(update_fields=['transcribed_answer'])
+        print(f"✅ Updated InterviewQuestion {question.id} with code submission (code length: {len(submitted_code)} chars)")
+        print(f"   CodeSubmission saved with question_id: {str(question.id)}")
+    except Exception as e:
+        print(f"⚠️ Error updating InterviewQuestion: {e}")
+        import traceback
+        traceback.print_exc()
+
+    # Set coding round completion time and calculate total duration
+    session.coding_round_completed_at = timezone.now()
+    print(f"⏱️ Coding round completed at: {session.coding_round_completed_at}")
+    
+    # Calculate total completion time in minutes
+    if session.technical_interview_started_at:
+        time_difference = session.coding_round_completed_at - session.technical_interview_started_at
+        session.total_completion_time_minutes = time_difference.total_seconds() / 60.0
+        print(f"⏱️ Total completion time: {session.total_completion_time_minutes:.2f} minutes")
+    else:
+        print(f"⚠️ Technical interview start time not set, cannot calculate total duration")
+    
+    session.status = 'COMPLETED'
+    session.save(update_fields=['coding_round_completed_at', 'total_completion_time_minutes', 'status'])
+    print(f"--- Session {session.session_key} with coding challenge marked as COMPLETED. ---")
+    
+    # NEW: Trigger comprehensive evaluation in BACKGROUND if final submission
+    def run_background_evaluation(sess_key):
+        try:
+            print(f"🧵 Background evaluation thread started for session: {sess_key}")
+            if measure_complexity and defer_complexity:
+                # Measured before the evaluation reads the submission
+                _measure_submission_complexity(
+                    code_submission, submitted_code, language, test_cases, sess_key, final_log
+                )
+            from evaluation.services import create_evaluation_from_session
+            evaluation = create_evaluation_from_session(sess_key)
+            if evaluation and evaluation.details:
+                ai_analysis = evaluation.details.get('ai_analysis', {})
+                overall = ai_analysis.get('overall_score_10') or (ai_analysis.get('overall_score', 0) / 10.0)
+                recommendation = ai_analysis.get('recommendation') or ai_analysis.get('hiring_recommendation')
+                print(f"--- Comprehensive evaluation stored for session {sess_key} ---")
+                print(f"Overall Score (0-10): {overall:.2f}")
+                if recommendation:
+                    print(f"Recommendation: {recommendation}")
+            print(f"✅ Background evaluation COMPLETE for session: {sess_key}")
+        except Exception as e:
+            print(f"❌ Error in background evaluation: {e}")
+            import traceback
+            traceback.print_exc()
+
+    eval_thread = threading.Thread(target=run_background_evaluation, args=(session.session_key,))
+    eval_thread.daemon = True
+    eval_thread.start()
+    
+    release_camera_for_session(session.session_key)
+    return passed_all_tests, final_log
+
+
 @csrf_exempt
 @require_POST
 def submit_coding_challenge(request):
@@ -6002,120 +5092,120 @@ def submit_coding_challenge(request):
         test_cases = list(question.test_cases.all())
         print(f"📝 Running code against {len(test_cases)} test cases...")
         
-        # Evaluate using the same executor as Run & Test for consistency
-        all_passed, output_log = run_test_suite(submitted_code, language, test_cases)
-        
-        # Convert output_log into structured results for UI
-        # Simple parse: count PASSED/FAILED lines
-        passed_count = output_log.count('PASSED')
-        total_count = len(test_cases)
-        test_results = []
-        for idx, tc in enumerate(test_cases, 1):
-            # Best-effort parse; include actual not available without re-run per test
-            test_results.append({
-                'test_case': idx,
-                'input': tc.input_data,
-                'expected': tc.expected_output,
-                'actual': '',
-                'passed': 'Test Case %d: PASSED' % idx in output_log,
-                'error': 'FAILED (Error)' in output_log
-            })
-        
-        print(f"✅ Test Results: {passed_count}/{total_count} passed")
+        if data.get('async'):
+            # Return immediately; the submission row is filled in when the job ends
+            code_submission = CodeSubmission.objects.create(
+                session=session,
+                question_id=str(question.id),
+                submitted_code=submitted_code,
+                language=language,
+                passed_all_tests=False,
+                job_id=uuid.uuid4(),
+                status='QUEUED',
+            )
 
-        # Create detailed log (no Gemini evaluation)
-        final_log = f"Test Results: {passed_count}/{total_count} passed\n\n"
-        for result in test_results:
-            status_emoji = "✅" if result['passed'] else "❌"
-            final_log += f"{status_emoji} Test Case {result['test_case']}:\n"
-            final_log += f"   Input: {result['input']}\n"
-            final_log += f"   Expected: {result['expected']}\n"
-            final_log += f"   Actual: {result['actual']}\n"
-            if result.get('error'):
-                final_log += f"   Error: Yes\n"
-            final_log += "\n"
-        
-        
-        # Store submission with AI evaluation feedback (if available)
-        code_submission = CodeSubmission.objects.create(
-            session=session,
-            question_id=str(question.id),
-            submitted_code=submitted_code,
-            language=language,
-            passed_all_tests=(passed_count == total_count),
-            output_log=final_log,
-            gemini_evaluation=None
-        )
-        
-        # Also update the InterviewQuestion with the actual submitted code
-        # This ensures the code is available even if CodeSubmission lookup fails
-        try:
-            # Save the actual code to transcribed_answer so it's always available
-            # Format: Store the code with a prefix indicating test results
-            code_with_results = f"Code submitted: {passed_count}/{total_count} test cases passed\n\nSubmitted Code:\n{submitted_code}"
-            question.transcribed_answer = code_with_results
-            question.save(update_fields=['transcribed_answer'])
-            print(f"✅ Updated InterviewQuestion {question.id} with code submission (code length: {len(submitted_code)} chars)")
-            print(f"   CodeSubmission saved with question_id: {str(question.id)}")
-        except Exception as e:
-            print(f"⚠️ Error updating InterviewQuestion: {e}")
-            import traceback
-            traceback.print_exc()
+            def on_complete(all_passed, output_log, summary):
+                _finalize_coding_submission(
+                    session, question, submitted_code, language, test_cases,
+                    all_passed, output_log, summary, code_submission=code_submission,
+                )
 
-        # Set coding round completion time and calculate total duration
-        from django.utils import timezone
-        from datetime import datetime
-        
-        session.coding_round_completed_at = timezone.now()
-        print(f"⏱️ Coding round completed at: {session.coding_round_completed_at}")
-        
-        # Calculate total completion time in minutes
-        if session.technical_interview_started_at:
-            time_difference = session.coding_round_completed_at - session.technical_interview_started_at
-            session.total_completion_time_minutes = time_difference.total_seconds() / 60.0
-            print(f"⏱️ Total completion time: {session.total_completion_time_minutes:.2f} minutes")
-        else:
-            print(f"⚠️ Technical interview start time not set, cannot calculate total duration")
-        
-        session.status = 'COMPLETED'
-        session.save(update_fields=['coding_round_completed_at', 'total_completion_time_minutes', 'status'])
-        print(f"--- Session {session.session_key} with coding challenge marked as COMPLETED. ---")
-        
-        # NEW: Trigger comprehensive evaluation in BACKGROUND if final submission
-        def run_background_evaluation(sess_key):
-            try:
-                print(f"🧵 Background evaluation thread started for session: {sess_key}")
-                from evaluation.services import create_evaluation_from_session
-                evaluation = create_evaluation_from_session(sess_key)
-                if evaluation and evaluation.details:
-                    ai_analysis = evaluation.details.get('ai_analysis', {})
-                    overall = ai_analysis.get('overall_score_10') or (ai_analysis.get('overall_score', 0) / 10.0)
-                    recommendation = ai_analysis.get('recommendation') or ai_analysis.get('hiring_recommendation')
-                    print(f"--- Comprehensive evaluation stored for session {sess_key} ---")
-                    print(f"Overall Score (0-10): {overall:.2f}")
-                    if recommendation:
-                        print(f"Recommendation: {recommendation}")
-                print(f"✅ Background evaluation COMPLETE for session: {sess_key}")
-            except Exception as e:
-                print(f"❌ Error in background evaluation: {e}")
-                import traceback
-                traceback.print_exc()
+            job_id = start_code_job(
+                submitted_code, language, test_cases, session_key=session.session_key,
+                submission=code_submission, on_complete=on_complete,
+            )
+            return JsonResponse(dict(_code_job_links(job_id), submission_id=code_submission.id), status=202)
 
-        eval_thread = threading.Thread(target=run_background_evaluation, args=(session.session_key,))
-        eval_thread.daemon = True
-        eval_thread.start()
-        
-        release_camera_for_session(session.session_key)
+        # Evaluate using the same executor as Run & Test for consistency
+        all_passed, output_log, summary = run_test_suite(submitted_code, language, test_cases, session_key=session.session_key)
+        passed_all_tests, final_log = _finalize_coding_submission(
+            session, question, submitted_code, language, test_cases, all_passed, output_log, summary,
+            defer_complexity=True,
+        )
         return JsonResponse({
             "status": "success", 
             "message": "Coding challenge submitted and interview marked as COMPLETED. Final processing started in background.",
-            "passed_all_tests": (passed_count == total_count),
+            "passed_all_tests": passed_all_tests,
             "output_log": final_log
         })
     except Exception as e:
         traceback.print_exc()
         return JsonResponse({"status": "error", "message": str(e)}, status=500)
 
+@never_cache
+def code_job_status(request, job_id):
+    """Current state of an async Run / Submit job, including finished cases."""
+    state = get_job_state(job_id)
+    if state is None:
+        return JsonResponse({"status": "error", "message": "Job not found."}, status=404)
+    return JsonResponse(state)
+
+
+def _sse_event(event, payload, event_id=None):
+    id_line = f"id: {event_id}\n" if event_id is not None else ""
+    return f"{id_line}event: {event}\ndata: {json.dumps(payload)}\n\n"
+
+
+@never_cache
+def code_job_stream(request, job_id):
+    """
+    Server-sent events for an async job: one ``result`` event per finished
+    test case (in completion order), then a ``done`` event with the final state.
+
+    A stream stays open for at most ``CODE_JOB_STREAM_TIMEOUT_SECONDS`` so it
+    does not hold a server worker for a whole run; it then ends and the
+    browser's EventSource reconnects, sending ``Last-Event-ID`` (the number of
+    results already received) so only newer results are sent.
+    """
+    if get_job_state(job_id) is None:
+        return JsonResponse({"status": "error", "message": "Job not found."}, status=404)
+
+    poll_interval = 0.25
+    max_seconds = int(getattr(settings, 'CODE_JOB_STREAM_TIMEOUT_SECONDS', 25))
+    last_event_id = request.headers.get('Last-Event-ID') or request.GET.get('last_event_id') or '0'
+    try:
+        already_sent = max(0, int(last_event_id))
+    except ValueError:
+        already_sent = 0
+
+    def events():
+        sent = already_sent
+        last_status = None
+        deadline = time.monotonic() + max_seconds
+        last_event = time.monotonic()
+        # Reconnect quickly once this window ends
+        yield "retry: 1000\n\n"
+        while True:
+            state = get_job_state(job_id)
+            if state is None:
+                yield _sse_event("error", {"message": "Job expired."})
+                return
+            if state["status"] != last_status:
+                last_status = state["status"]
+                yield _sse_event("status", {"job_id": state["job_id"], "status": last_status, "total": state["total"]})
+            if state["status"] in FINISHED_STATES:
+                # Finished results are re-ordered by test case; ``done`` carries all of them
+                yield _sse_event("done", state, event_id=len(state["results"]))
+                return
+            for result in state["results"][sent:]:
+                sent += 1
+                last_event = time.monotonic()
+                yield _sse_event("result", result, event_id=sent)
+            if time.monotonic() >= deadline:
+                # Ends this response; EventSource reconnects, or poll status_url instead
+                yield _sse_event("reconnect", {"job_id": state["job_id"], "status_url": f"/api/coding/jobs/{state['job_id']}/"}, event_id=sent)
+                return
+            if time.monotonic() - last_event >= 15:
+                # Keeps proxies from closing an idle connection during long cases
+                last_event = time.monotonic()
+                yield ": keep-alive\n\n"
+            time.sleep(poll_interval)
+
+    response = StreamingHttpResponse(events(), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+    return response
+
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
@@ -6595,6 +5685,84 @@ def serve_interview_video(request, video_path):
         raise Http404(f"Error serving video: {str(e)}")
 
 
+def _parse_timestamp(value, name):
+    """A client-sent Unix timestamp as float, or None when missing or invalid."""
+    if not value:
+        return None
+    try:
+        timestamp = float(value)
+        print(f"📥 Received {name.replace('_', ' ')}: {timestamp}")
+        return timestamp
+    except (ValueError, TypeError):
+        print(f"⚠️ Invalid {name}: {value}")
+        return None
+
+
+def _record_start_timestamps(session, audio_ts, video_ts):
+    """Keep the recording start timestamps of a session in its media manifest for the audio/video merge."""
+    if audio_ts:
+        record_artifact(session, MediaArtifact.Role.AUDIO, start_timestamp=audio_ts)
+    if video_ts:
+        record_artifact(session, MediaArtifact.Role.RAW_VIDEO, start_timestamp=video_ts)
+    if audio_ts or video_ts:
+        print(f"✅ Stored timestamps in media manifest for session {session.session_key}")
+
+
+def _interview_audio_path(session_key, original_filename):
+    file_ext = os.path.splitext(original_filename or '')[1] or '.webm'
+    return os.path.join(settings.MEDIA_ROOT, 'interview_audio', f"{session_key}_interview_audio{file_ext}")
+
+
+def _process_interview_audio(session, audio_path):
+    """Verify uploaded interview audio, convert it to WAV and record both in the media manifest; returns the path to merge with."""
+    try:
+        from interview_app.audio_processor import process_uploaded_audio, verify_audio_file
+        
+        # Verify audio file first
+        if not verify_audio_file(audio_path):
+            print(f"⚠️ Audio file verification failed, but continuing...")
+        
+        # Process and convert to WAV for better compatibility
+        processed_audio_path = process_uploaded_audio(audio_path, convert_to_wav=True)
+        
+        if processed_audio_path and os.path.exists(processed_audio_path):
+            # Use processed audio path (converted WAV if conversion succeeded)
+            final_audio_path = processed_audio_path
+            print(f"✅ Audio processed successfully: {final_audio_path}")
+        else:
+            # Fallback to original if processing failed
+            final_audio_path = audio_path
+            print(f"⚠️ Audio processing failed, using original: {final_audio_path}")
+    except Exception as e:
+        print(f"⚠️ Error processing audio: {e}")
+        import traceback
+        traceback.print_exc()
+        # Use original audio file if processing fails
+        final_audio_path = audio_path
+    
+    # Paths are recorded now for the merge; FFprobe fills in duration and codec off the request thread
+    recorded = [(MediaArtifact.Role.AUDIO, audio_path)]
+    if final_audio_path != audio_path:
+        recorded.append((MediaArtifact.Role.ANALYSIS_AUDIO, final_audio_path))
+    for role, path in recorded:
+        record_artifact(session, role, path=path, probe=False)
+        probe_artifact_later(session, role, path)
+    return final_audio_path
+
+
+def _audio_upload_payload(final_audio_path):
+    # Get relative path for merging (use processed audio if available)
+    relative_audio_path = os.path.relpath(final_audio_path, settings.MEDIA_ROOT).replace('\\', '/')
+    print(f"✅ Final audio path for merging: {relative_audio_path}")
+    # Return both audio_path and audio_file_path for compatibility
+    return {
+        'audio_path': relative_audio_path,
+        'audio_file_path': relative_audio_path,  # Also return as audio_file_path for frontend compatibility
+        'audio_size_mb': round(os.path.getsize(final_audio_path) / 1024 / 1024, 2),
+        'audio_format': os.path.splitext(final_audio_path)[1].lower()
+    }
+
+
 @csrf_exempt
 @require_POST
 def upload_interview_audio(request):
@@ -6622,97 +5790,26 @@ def upload_interview_audio(request):
                 'message': 'Session not found'
             }, status=404)
         
-        # Store timestamps in session metadata (using JSONField if available, or store in a separate way)
-        # Note: InterviewSession model doesn't have timestamp fields, so we'll store them in a way that can be retrieved later
-        # For now, we'll just log them and pass them directly to the merge function
-        if audio_start_timestamp:
-            try:
-                audio_ts = float(audio_start_timestamp)
-                print(f"📥 Received audio start timestamp: {audio_ts}")
-            except (ValueError, TypeError):
-                print(f"⚠️ Invalid audio_start_timestamp: {audio_start_timestamp}")
-                audio_ts = None
-        else:
-            audio_ts = None
-            
-        if video_start_timestamp:
-            try:
-                video_ts = float(video_start_timestamp)
-                print(f"📥 Received video start timestamp: {video_ts}")
-            except (ValueError, TypeError):
-                print(f"⚠️ Invalid video_start_timestamp: {video_start_timestamp}")
-                video_ts = None
-        else:
-            video_ts = None
-        
-        # Store timestamps in a way that can be retrieved later (we'll use session metadata or pass directly)
-        # For now, we'll store them in a simple cache/dict that can be retrieved by session_key
-        if not hasattr(upload_interview_audio, '_timestamp_cache'):
-            upload_interview_audio._timestamp_cache = {}
-        
-        if audio_ts or video_ts:
-            upload_interview_audio._timestamp_cache[session_key] = {
-                'audio_start_timestamp': audio_ts,
-                'video_start_timestamp': video_ts
-            }
-            print(f"✅ Stored timestamps in cache for session {session_key}")
-        
-        # Save audio file
-        audio_dir = os.path.join(settings.MEDIA_ROOT, 'interview_audio')
-        os.makedirs(audio_dir, exist_ok=True)
-        
-        # Get file extension from uploaded file
-        original_filename = audio_file.name
-        file_ext = os.path.splitext(original_filename)[1] or '.webm'
-        audio_filename = f"{session_key}_interview_audio{file_ext}"
-        audio_path = os.path.join(audio_dir, audio_filename)
+        _record_start_timestamps(
+            session,
+            _parse_timestamp(audio_start_timestamp, 'audio_start_timestamp'),
+            _parse_timestamp(video_start_timestamp, 'video_start_timestamp'),
+        )
         
         # Save audio file
+        audio_path = _interview_audio_path(session_key, audio_file.name)
+        os.makedirs(os.path.dirname(audio_path), exist_ok=True)
         with open(audio_path, 'wb+') as destination:
             for chunk in audio_file.chunks():
                 destination.write(chunk)
         
         print(f"✅ Interview audio saved: {audio_path} ({audio_file.size / 1024 / 1024:.2f} MB)")
         
-        # Process and convert audio to WAV for better compatibility with FFmpeg
-        try:
-            from interview_app.audio_processor import process_uploaded_audio, verify_audio_file
-            
-            # Verify audio file first
-            if not verify_audio_file(audio_path):
-                print(f"⚠️ Audio file verification failed, but continuing...")
-            
-            # Process and convert to WAV for better compatibility
-            processed_audio_path = process_uploaded_audio(audio_path, convert_to_wav=True)
-            
-            if processed_audio_path and os.path.exists(processed_audio_path):
-                # Use processed audio path (converted WAV if conversion succeeded)
-                final_audio_path = processed_audio_path
-                print(f"✅ Audio processed successfully: {final_audio_path}")
-            else:
-                # Fallback to original if processing failed
-                final_audio_path = audio_path
-                print(f"⚠️ Audio processing failed, using original: {final_audio_path}")
-        except Exception as e:
-            print(f"⚠️ Error processing audio: {e}")
-            import traceback
-            traceback.print_exc()
-            # Use original audio file if processing fails
-            final_audio_path = audio_path
-        
-        # Get relative path for merging (use processed audio if available)
-        relative_audio_path = os.path.relpath(final_audio_path, settings.MEDIA_ROOT).replace('\\', '/')
-        
-        print(f"✅ Final audio path for merging: {relative_audio_path}")
-        
-        # Return both audio_path and audio_file_path for compatibility
+        final_audio_path = _process_interview_audio(session, audio_path)
         return JsonResponse({
             'status': 'success',
             'message': 'Audio uploaded and processed successfully',
-            'audio_path': relative_audio_path,
-            'audio_file_path': relative_audio_path,  # Also return as audio_file_path for frontend compatibility
-            'audio_size_mb': round(os.path.getsize(final_audio_path) / 1024 / 1024, 2),
-            'audio_format': os.path.splitext(final_audio_path)[1].lower()
+            **_audio_upload_payload(final_audio_path)
         })
         
     except Exception as e:
@@ -6723,6 +5820,63 @@ def upload_interview_audio(request):
             'message': f'Error uploading audio: {str(e)}'
         }, status=500)
 
+def _publish_screen_recording(session, session_key, video_filename, gcs_video_url=None):
+    """
+    Upload a saved screen recording to GCS (if configured) and link it on the
+    Interview; returns the GCS URL. ``gcs_video_url`` is an object already
+    uploaded (a live recording streamed to GCS), which is only linked.
+    """
+    try:
+        from .gcs_storage import upload_video_to_gcs
+        
+        video_full_path = session.screen_recording.path
+        record_artifact(session, MediaArtifact.Role.SCREEN, path=video_full_path)
+        if os.path.exists(video_full_path) or gcs_video_url:
+            # Generate GCS file path
+            gcs_video_path = f"screen_recordings/{session.id}_{video_filename}"
+            
+            # Determine content type
+            content_type = 'video/webm'
+            if video_filename.lower().endswith('.mp4'):
+                content_type = 'video/mp4'
+            
+            # Upload to GCS
+            if not gcs_video_url:
+                gcs_video_url = upload_video_to_gcs(video_full_path, gcs_video_path, content_type)
+            if gcs_video_url:
+                print(f"✅ Screen recording uploaded to GCS: {gcs_video_url}")
+                # Store GCS URL in screen_recording_gcs_url field
+                session.screen_recording_gcs_url = gcs_video_url
+                session.save(update_fields=['screen_recording_gcs_url'])
+                
+                # Update interviews.Interview model if exists
+                try:
+                    from interviews.models import Interview
+                    interview = Interview.objects.filter(session_key=session_key).first()
+                    if interview:
+                        interview.screen_recording_url = gcs_video_url
+                        interview.save(update_fields=['screen_recording_url'])
+                        print(f"✅ Updated Interview model screen_recording_url: {gcs_video_url}")
+                except Exception as interview_err:
+                    print(f"⚠️ Could not update Interview model with gcs_url: {interview_err}")
+        else:
+            print(f"⚠️ Screen recording file not found for GCS upload: {video_full_path}")
+        
+        # Non-GCS update for Interview model (file field)
+        try:
+            from interviews.models import Interview
+            interview = Interview.objects.filter(session_key=session_key).first()
+            if interview and not interview.screen_recording_file:
+                interview.screen_recording_file = session.screen_recording
+                interview.save(update_fields=['screen_recording_file'])
+                print(f"✅ Updated Interview model screen_recording_file: {session.screen_recording.name}")
+        except Exception as interview_err:
+            print(f"⚠️ Could not update Interview model with file: {interview_err}")
+    except Exception as gcs_error:
+        print(f"⚠️ Error uploading screen recording to GCS (non-critical): {gcs_error}")
+    return gcs_video_url
+
+
 @csrf_exempt
 @require_POST
 def upload_screen_recording(request):
@@ -6754,67 +5908,15 @@ def upload_screen_recording(request):
         
         print(f"✅ Screen recording saved to InterviewSession: {video_path}")
         
-        # Upload to Google Cloud Storage if configured
-        gcs_video_url = None
-        try:
-            from .gcs_storage import upload_video_to_gcs
-            import os
-            
-            # Get full path to video file
-            if hasattr(session.screen_recording, 'path'):
-                video_full_path = session.screen_recording.path
-            else:
-                video_full_path = os.path.join(settings.MEDIA_ROOT, video_path)
-            
-            if os.path.exists(video_full_path):
-                # Generate GCS file path
-                gcs_video_path = f"screen_recordings/{session.id}_{video_filename}"
-                
-                # Determine content type
-                content_type = 'video/webm'
-                if video_filename.lower().endswith('.mp4'):
-                    content_type = 'video/mp4'
-                
-                # Upload to GCS
-                gcs_video_url = upload_video_to_gcs(video_full_path, gcs_video_path, content_type)
-                if gcs_video_url:
-                    print(f"✅ Screen recording uploaded to GCS: {gcs_video_url}")
-                    # Store GCS URL in screen_recording_gcs_url field
-                    session.screen_recording_gcs_url = gcs_video_url
-                    session.save(update_fields=['screen_recording_gcs_url'])
-                    
-                    # Update interviews.Interview model if exists
-                    try:
-                        from interviews.models import Interview
-                        interview = Interview.objects.filter(session_key=session_key).first()
-                        if interview:
-                            interview.screen_recording_url = gcs_video_url
-                            interview.save(update_fields=['screen_recording_url'])
-                            print(f"✅ Updated Interview model screen_recording_url: {gcs_video_url}")
-                    except Exception as interview_err:
-                        print(f"⚠️ Could not update Interview model with gcs_url: {interview_err}")
-            
-            # Non-GCS update for Interview model (file field)
-            try:
-                from interviews.models import Interview
-                interview = Interview.objects.filter(session_key=session_key).first()
-                if interview and not interview.screen_recording_file:
-                    interview.screen_recording_file = session.screen_recording
-                    interview.save(update_fields=['screen_recording_file'])
-                    print(f"✅ Updated Interview model screen_recording_file: {session.screen_recording.name}")
-            except Exception as interview_err:
-                print(f"⚠️ Could not update Interview model with file: {interview_err}")
-                
-            else:
-                print(f"⚠️ Screen recording file not found for GCS upload: {video_full_path}")
-        except Exception as gcs_error:
-            print(f"⚠️ Error uploading screen recording to GCS (non-critical): {gcs_error}")
+        # GCS upload and Interview linking run in the background (the URL lands on the session)
+        transfer_manager.submit(_publish_screen_recording, session, session_key, video_filename)
         
         return JsonResponse({
             'status': 'success',
             'message': 'Screen recording uploaded successfully',
             'video_url': session.screen_recording.url if session.screen_recording else None,
-            'gcs_url': gcs_video_url
+            'gcs_url': None,
+            'gcs_upload': 'queued'
         })
         
     except Exception as e:
@@ -6825,6 +5927,32 @@ def upload_screen_recording(request):
             'message': str(e)
         }, status=500)
 
+def _complete_interview_video(session, session_key, question_timestamps):
+    """Mark the Interview completed once its video has been uploaded."""
+    # Non-GCS update for Interview model (started_at, ended_at, status)
+    try:
+        from interviews.models import Interview
+        interview = Interview.objects.filter(session_key=session_key).first()
+        if interview:
+            if not interview.started_at and session.scheduled_at:
+                interview.started_at = session.scheduled_at
+            interview.status = Interview.Status.COMPLETED
+            interview.ended_at = timezone.now()
+            interview.save(update_fields=['status', 'ended_at', 'started_at'])
+            print(f"✅ Updated Interview model status to COMPLETED")
+    except Exception as interview_err:
+        print(f"⚠️ Could not update Interview model status: {interview_err}")
+    
+    # Parse and store question timestamps if provided
+    try:
+        timestamps = json.loads(question_timestamps) if question_timestamps else []
+        if timestamps:
+            # Store timestamps in session metadata (could use a JSONField if available)
+            print(f"📝 Stored {len(timestamps)} question timestamps for video")
+    except Exception as e:
+        print(f"⚠️ Could not parse question timestamps: {e}")
+
+
 def upload_interview_video(request):
     """Upload complete interview video (camera + microphone + TTS audio)"""
     try:
@@ -6856,28 +5984,7 @@ def upload_interview_video(request):
         gcs_video_url = None
         print(f"ℹ️ Interview video functionality removed - not uploading to GCS")
         
-        # Non-GCS update for Interview model (started_at, ended_at, status)
-        try:
-            from interviews.models import Interview
-            interview = Interview.objects.filter(session_key=session_key).first()
-            if interview:
-                if not interview.started_at and session.scheduled_at:
-                    interview.started_at = session.scheduled_at
-                interview.status = Interview.Status.COMPLETED
-                interview.ended_at = timezone.now()
-                interview.save(update_fields=['status', 'ended_at', 'started_at'])
-                print(f"✅ Updated Interview model status to COMPLETED")
-        except Exception as interview_err:
-            print(f"⚠️ Could not update Interview model status: {interview_err}")
-        
-        # Parse and store question timestamps if provided
-        try:
-            timestamps = json.loads(question_timestamps) if question_timestamps else []
-            if timestamps:
-                # Store timestamps in session metadata (could use a JSONField if available)
-                print(f"📝 Stored {len(timestamps)} question timestamps for video")
-        except Exception as e:
-            print(f"⚠️ Could not parse question timestamps: {e}")
+        _complete_interview_video(session, session_key, question_timestamps)
         
         print(f"ℹ️ Interview video functionality removed - not saving to database")
         
@@ -6897,6 +6004,239 @@ def upload_interview_video(request):
         }, status=500)
 
 
+# =================== RESUMABLE CHUNKED UPLOADS ===================
+# create -> PATCH chunks at Upload-Offset (HEAD to resume) -> finalize (see chunked_upload.py)
+
+# Form fields kept with an upload until it is finalized, per kind
+UPLOAD_METADATA_FIELDS = {
+    'audio': ('audio_start_timestamp', 'video_start_timestamp'),
+    'screen': (),
+    'video': ('question_timestamps', 'duration'),
+}
+
+
+def _upload_error(error):
+    return JsonResponse({'status': 'error', 'message': str(error)}, status=error.status)
+
+
+def _upload_response(state, status=200, **extra):
+    response = JsonResponse({'status': 'success', **extra, **state}, status=status)
+    response['Upload-Offset'] = str(state['offset'])
+    response['Upload-Length'] = str(state['length'])
+    response['Cache-Control'] = 'no-store'
+    return response
+
+
+@csrf_exempt
+@require_POST
+def create_media_upload(request):
+    """Start a resumable upload of interview audio, screen recording or video."""
+    from .chunked_upload import UploadError, create_upload, upload_state
+    try:
+        data = json.loads(request.body) if request.content_type == 'application/json' else request.POST
+        session_key = data.get('session_key')
+        kind = data.get('kind')
+        length = int(data.get('length') or request.headers.get('Upload-Length') or 0)
+    except (ValueError, TypeError):
+        return JsonResponse({'status': 'error', 'message': 'Invalid upload request'}, status=400)
+    if not session_key or kind not in UPLOAD_METADATA_FIELDS:
+        return JsonResponse({
+            'status': 'error',
+            'message': 'Missing required data: session_key and kind (audio, screen or video)'
+        }, status=400)
+    
+    session = InterviewSession.objects.filter(session_key=session_key).first()
+    if session is None:
+        return JsonResponse({'status': 'error', 'message': 'Session not found'}, status=404)
+    
+    metadata = {name: data.get(name) for name in UPLOAD_METADATA_FIELDS[kind] if data.get(name) is not None}
+    try:
+        upload = create_upload(session, kind, length, data.get('filename', ''), data.get('checksum', ''), metadata)
+    except UploadError as e:
+        return _upload_error(e)
+    upload_url = reverse('media_upload', args=[upload.id])
+    response = _upload_response(
+        upload_state(upload), status=201, upload_url=upload_url,
+        chunk_size=int(getattr(settings, 'CHUNKED_UPLOAD_MAX_CHUNK_BYTES', 16 * 1024 * 1024)),
+    )
+    response['Location'] = upload_url
+    return response
+
+
+@csrf_exempt
+def media_upload(request, upload_id):
+    """HEAD/GET: offset to resume from and processing status. PATCH: append one chunk at ``Upload-Offset``."""
+    from .chunked_upload import UploadError, upload_state, write_chunk
+    from .models import MediaUpload
+    if request.method in ('GET', 'HEAD'):
+        upload = MediaUpload.objects.filter(pk=upload_id).first()
+        if upload is None:
+            return JsonResponse({'status': 'error', 'message': 'Upload not found'}, status=404)
+        return _upload_response(upload_state(upload))
+    if request.method != 'PATCH':
+        return JsonResponse({'status': 'error', 'message': 'Method not allowed'}, status=405)
+    
+    try:
+        offset = int(request.headers.get('Upload-Offset', ''))
+        content_length = int(request.META.get('CONTENT_LENGTH') or 0)
+    except ValueError:
+        return JsonResponse({'status': 'error', 'message': 'Upload-Offset and Content-Length headers are required'}, status=400)
+    try:
+        # The request itself is the stream: the chunk goes to disk block by block
+        new_offset = write_chunk(upload_id, request, offset, content_length, request.headers.get('Upload-Checksum'))
+    except UploadError as e:
+        return _upload_error(e)
+    response = JsonResponse({'status': 'success', 'offset': new_offset})
+    response['Upload-Offset'] = str(new_offset)
+    return response
+
+
+def _upload_processing(upload):
+    """``(destination, process)`` for a complete upload or live recording of ``upload.kind``."""
+    from .models import MediaUpload
+    session = upload.session
+    session_key = session.session_key
+    metadata = upload.metadata or {}
+    
+    if upload.kind == MediaUpload.Kind.AUDIO:
+        _record_start_timestamps(
+            session,
+            _parse_timestamp(metadata.get('audio_start_timestamp'), 'audio_start_timestamp'),
+            _parse_timestamp(metadata.get('video_start_timestamp'), 'video_start_timestamp'),
+        )
+        
+        def process(upload, path, gcs_url=None):
+            return _audio_upload_payload(_process_interview_audio(session, path))
+        return _interview_audio_path(session_key, upload.filename), process
+    
+    if upload.kind == MediaUpload.Kind.SCREEN:
+        file_ext = os.path.splitext(upload.filename)[1] or '.webm'
+        video_filename = f"screen_{session_key}_{timezone.now().strftime('%Y%m%d_%H%M%S')}{file_ext}"
+        
+        def process(upload, path, gcs_url=None):
+            session.screen_recording.name = upload.final_path
+            session.save(update_fields=['screen_recording'])
+            print(f"✅ Screen recording saved to InterviewSession: {upload.final_path}")
+            gcs_video_url = _publish_screen_recording(session, session_key, video_filename, gcs_video_url=gcs_url)
+            return {'video_url': session.screen_recording.url, 'gcs_url': gcs_video_url}
+        return os.path.join(settings.MEDIA_ROOT, 'screen_recordings', video_filename), process
+    
+    # Interview video is not stored (see upload_interview_video): only the bookkeeping runs
+    def process(upload, path, gcs_url=None):
+        _complete_interview_video(session, session_key, metadata.get('question_timestamps'))
+        os.remove(path)
+        return {'video_url': None, 'video_size_mb': round(upload.length / 1024 / 1024, 2)}
+    return None, process
+
+
+@csrf_exempt
+@require_POST
+def finalize_media_upload(request, upload_id):
+    """Verify a complete upload and queue its processing; poll ``media_upload`` for the result."""
+    from .chunked_upload import UploadError, finalize_upload, upload_state
+    from .models import MediaUpload
+    upload = MediaUpload.objects.select_related('session').filter(pk=upload_id, live=False).first()
+    if upload is None:
+        return JsonResponse({'status': 'error', 'message': 'Upload not found'}, status=404)
+    destination, process = _upload_processing(upload)
+    try:
+        upload = finalize_upload(upload_id, destination, process)
+    except UploadError as e:
+        return _upload_error(e)
+    return _upload_response(upload_state(upload), status=202, message='Upload complete, processing queued')
+
+
+@never_cache
+def recording_jobs(request, session_key):
+    """Transcode jobs of a session (stage and progress of its merge/conversion) and its media manifest."""
+    from .media_manifest import manifest
+    session = InterviewSession.objects.filter(session_key=session_key).first()
+    if session is None:
+        return JsonResponse({'status': 'error', 'message': 'Session not found'}, status=404)
+    return JsonResponse({
+        'status': 'success',
+        'jobs': [job.to_dict() for job in transcode_queue.jobs_for_session(session_key)],
+        'queue': transcode_queue.stats(),
+        'media': manifest(session),
+    })
+
+
+# =================== LIVE RECORDING INGEST ===================
+# start -> POST each MediaRecorder segment while the interview runs -> finalize (see live_recording.py)
+
+@csrf_exempt
+@require_POST
+def start_live_recording(request):
+    """Open a live recording of interview audio or the screen; returns the URL segments are POSTed to."""
+    from .chunked_upload import UploadError, upload_state
+    from .live_recording import start_live_recording as start_recording
+    try:
+        data = json.loads(request.body) if request.content_type == 'application/json' else request.POST
+    except ValueError:
+        return JsonResponse({'status': 'error', 'message': 'Invalid JSON data'}, status=400)
+    session_key = data.get('session_key')
+    kind = data.get('kind')
+    if not session_key or kind not in ('audio', 'screen'):
+        return JsonResponse({
+            'status': 'error',
+            'message': 'Missing required data: session_key and kind (audio or screen)'
+        }, status=400)
+    
+    session = InterviewSession.objects.filter(session_key=session_key).first()
+    if session is None:
+        return JsonResponse({'status': 'error', 'message': 'Session not found'}, status=404)
+    
+    filename = data.get('filename') or ('screen.webm' if kind == 'screen' else 'audio.webm')
+    gcs_path = ''
+    if kind == 'screen' and str(data.get('stream_to_gcs', getattr(settings, 'LIVE_RECORDING_GCS_UPLOAD', False))).lower() in ('1', 'true'):
+        gcs_path = f"screen_recordings/{session.id}_live_{timezone.now().strftime('%Y%m%d_%H%M%S')}{os.path.splitext(filename)[1] or '.webm'}"
+    metadata = {name: data.get(name) for name in UPLOAD_METADATA_FIELDS[kind] if data.get(name) is not None}
+    try:
+        recording = start_recording(session, kind, filename, metadata, gcs_path)
+    except UploadError as e:
+        return _upload_error(e)
+    return _upload_response(
+        upload_state(recording), status=201,
+        segment_url=reverse('live_recording_segment', args=[recording.id]),
+        status_url=reverse('media_upload', args=[recording.id]),
+    )
+
+
+@csrf_exempt
+@require_POST
+def live_recording_segment(request, upload_id):
+    """Append one MediaRecorder segment (raw body, numbered from 0 in ``Segment-Index``) to a live recording."""
+    from .chunked_upload import UploadError
+    from .live_recording import append_segment
+    try:
+        index = int(request.headers.get('Segment-Index', request.GET.get('index', '')))
+        content_length = int(request.META.get('CONTENT_LENGTH') or 0)
+    except ValueError:
+        return JsonResponse({'status': 'error', 'message': 'Segment-Index and Content-Length headers are required'}, status=400)
+    try:
+        segments, received = append_segment(upload_id, index, request, content_length)
+    except UploadError as e:
+        return _upload_error(e)
+    return JsonResponse({'status': 'success', 'segments': segments, 'bytes': received})
+
+
+@csrf_exempt
+@require_POST
+def finalize_live_recording(request, upload_id):
+    """Close a live recording: remux and process it in the background; poll ``media_upload`` for the result."""
+    from .chunked_upload import UploadError, upload_state
+    from .live_recording import finalize_live_recording as finalize_recording
+    from .models import MediaUpload
+    recording = MediaUpload.objects.select_related('session').filter(pk=upload_id, live=True).first()
+    if recording is None:
+        return JsonResponse({'status': 'error', 'message': 'Recording not found'}, status=404)
+    destination, process = _upload_processing(recording)
+    try:
+        recording = finalize_recording(upload_id, destination, process)
+    except UploadError as e:
+        return _upload_error(e)
+    return _upload_response(upload_state(recording), status=202, message='Recording closed, processing queued')
+
 # Video recording functionality removed
 
 # =================== VOICE ANALYSIS FUNCTIONALITY ===================
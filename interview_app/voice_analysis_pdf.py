@@ -13,6 +13,7 @@ from django.db import models
 from weasyprint import HTML, CSS
 from .models import InterviewSession
 from .voice_models import VoiceActivityDetection, SpeakerDiarization, AnswerVoiceAnalysis
+from .answer_metrics import session_voice_summary
 
 def generate_voice_analysis_pdf(session_key, save_to_session=True):
     """
@@ -30,8 +31,8 @@ def generate_voice_analysis_pdf(session_key, save_to_session=True):
         session = InterviewSession.objects.get(session_key=session_key)
         
         # Get voice analysis data - prioritize overall analysis
-        vad_data = VoiceActivityDetection.objects.filter(session=session).order_by('analysis_start_time')
-        diar_data = SpeakerDiarization.objects.filter(session=session).order_by('analysis_start_time')
+        vad_data = VoiceActivityDetection.objects.filter(session=session, is_partial=False).order_by('analysis_start_time')
+        diar_data = SpeakerDiarization.objects.filter(session=session, is_partial=False).order_by('analysis_start_time')
         
         # Separate overall analysis (no question) from per-question analysis
         overall_vad = vad_data.filter(question__isnull=True).first()
@@ -132,7 +133,7 @@ def generate_voice_analysis_pdf(session_key, save_to_session=True):
                 })
                 voice_analysis_data['has_warnings'] = True
             
-            if answer.silence_percentage > 50:  # High threshold for individual answers
+            if answer.silence_percentage is not None and answer.silence_percentage > 50:  # High threshold for individual answers
                 voice_analysis_data['warnings'].append({
                     'type': 'High Silence in Answer',
                     'severity': 'warning',
@@ -199,47 +200,20 @@ def generate_voice_analysis_pdf(session_key, save_to_session=True):
             voice_analysis_data['interviewer_speech_percentage'] = 0
             voice_analysis_data['num_speakers'] = 0
         
-        # Calculate answer-specific metrics
-        answer_metrics = {}
-        if answer_analyses.exists():
-            answer_metrics = answer_analyses.aggregate(
-                avg_silence=models.Avg('silence_percentage'),
-                avg_speech=models.Avg('speech_percentage'),
-                avg_duration=models.Avg('segment_duration'),
-                avg_wpm=models.Avg('words_per_minute'),
-                avg_filler_count=models.Avg('filler_word_count'),
-                total_duration=models.Sum('segment_duration'),
-                multiple_speaker_count=models.Count('id', filter=models.Q(multiple_speakers_detected=True))
-            )
-            
-            total_filler_words = 0
-            if answer_analyses:
-                for answer in answer_analyses:
-                    total_filler_words += answer.filler_word_count
-            
-            voice_analysis_data['answer_metrics'] = {
-                'avg_silence_percentage': answer_metrics['avg_silence'] or 0,
-                'avg_speech_percentage': answer_metrics['avg_speech'] or 0,
-                'avg_duration_seconds': answer_metrics['avg_duration'] or 0,
-                'avg_words_per_minute': answer_metrics['avg_wpm'] or 0,
-                'avg_filler_word_count': answer_metrics['avg_filler_count'] or 0,
-                'total_filler_words': total_filler_words or 0,
-                'total_answer_duration': answer_metrics['total_duration'] or 0,
-                'multiple_speaker_answers': answer_metrics['multiple_speaker_count'],
-                'multiple_speaker_percentage': (answer_metrics['multiple_speaker_count'] / answer_analyses.count() * 100) if answer_analyses.count() > 0 else 0
-            }
-        else:
-            voice_analysis_data['answer_metrics'] = {
-                'avg_silence_percentage': 0,
-                'avg_speech_percentage': 0,
-                'avg_duration_seconds': 0,
-                'avg_words_per_minute': 0,
-                'avg_filler_word_count': 0,
-                'total_filler_words': 0,
-                'total_answer_duration': 0,
-                'multiple_speaker_answers': 0,
-                'multiple_speaker_percentage': 0
-            }
+        # Answer-level metrics: running sums kept up to date as answers were uploaded
+        answer_metrics = session_voice_summary(session)
+        multiple_speaker_count = answer_analyses.filter(multiple_speakers_detected=True).count()
+        voice_analysis_data['answer_metrics'] = {
+            'avg_silence_percentage': answer_metrics['avg_silence_percentage'],
+            'avg_speech_percentage': answer_metrics['avg_speech_percentage'],
+            'avg_duration_seconds': answer_metrics['avg_duration_seconds'],
+            'avg_words_per_minute': answer_metrics['avg_words_per_minute'],
+            'avg_filler_word_count': answer_metrics['avg_filler_word_count'],
+            'total_filler_words': answer_metrics['total_filler_words'],
+            'total_answer_duration': answer_metrics['total_answer_duration'],
+            'multiple_speaker_answers': multiple_speaker_count,
+            'multiple_speaker_percentage': (multiple_speaker_count / answer_metrics['total_answers'] * 100) if answer_metrics['total_answers'] else 0
+        }
         
         # Render HTML template
         html_string = render_to_string('voice_analysis_report_simple.html', {
@@ -248,7 +222,7 @@ def generate_voice_analysis_pdf(session_key, save_to_session=True):
             'diar_data': diar_data,
             'answer_analyses': answer_analyses,
             'total_answers': voice_analysis_data.get('total_answers', 0),
-            'answer_metrics': answer_metrics,
+            'answer_metrics': voice_analysis_data['answer_metrics'] if answer_metrics['total_answers'] else {},
             'overall_vad': overall_vad,
             'overall_diar': overall_diar,
             'has_answer_analysis': voice_analysis_data.get('has_answer_analysis', False),
@@ -256,7 +230,7 @@ def generate_voice_analysis_pdf(session_key, save_to_session=True):
             'warnings': voice_analysis_data.get('warnings', []),
             'avg_silence': voice_analysis_data.get('avg_silence', 0),
             'avg_response_delay': voice_analysis_data.get('avg_response_delay', 0),
-            'total_filler_words': voice_analysis_data.get('total_filler_words', 0)
+            'total_filler_words': answer_metrics['total_filler_words']
         })
         
         # Create PDF
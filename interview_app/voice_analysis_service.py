@@ -8,7 +8,10 @@ import json
 import logging
 from datetime import datetime
 from django.conf import settings
+from django.db import transaction
 from django.utils import timezone
+from .energy_vad import open_wav
+from .model_registry import model_registry
 from .models import (
     InterviewSession, 
     InterviewQuestion, 
@@ -18,6 +21,14 @@ from .voice_models import (
     SpeakerDiarization,
     AnswerVoiceAnalysis,
 )
+from .voice_chunking import (
+    audio_fingerprint,
+    chunk_plan,
+    clip_segments,
+    iter_pcm_chunks,
+    map_speakers,
+    stitch_segments,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -26,72 +37,30 @@ class VoiceAnalysisService:
     
     def __init__(self):
         self.hf_token = os.getenv('HUGGINGFACE_TOKEN', '')
-        self.vad_model = None
-        self.diarization_model = None
-        self._models_loaded = False
-        # Don't load models immediately - use lazy loading
+        # Models live in the process-wide registry and are loaded lazily, once
+    
+    @property
+    def vad_model(self):
+        return model_registry.loaded('pyannote_vad')
+    
+    @property
+    def diarization_model(self):
+        return model_registry.loaded('pyannote_diarization')
     
     def _ensure_models_loaded(self):
-        """Load models if not already loaded"""
-        if self._models_loaded:
+        """Load models if not already loaded (shared by every service instance)"""
+        if self.vad_model is not None and self.diarization_model is not None:
             return True
-            
-        try:
-            if not self.hf_token:
-                logger.warning("HUGGINGFACE_TOKEN not found in environment variables")
-                return False
-            
-            # Save token to huggingface hub
-            from huggingface_hub import HfFolder
-            HfFolder.save_token(self.hf_token)
-            logger.info("HuggingFace token saved to HfFolder")
-            
-            # Import here to avoid import errors if models are not installed
-            try:
-                from pyannote.audio import Pipeline
-                import torch
-                
-                # Load Voice Activity Detection model
-                logger.info("Loading Voice Activity Detection model...")
-                self.vad_model = Pipeline.from_pretrained(
-                    "pyannote/voice-activity-detection",
-                    use_auth_token=self.hf_token
-                )
-                logger.info("✅ VAD model loaded successfully")
-                
-                # Load Speaker Diarization model
-                logger.info("Loading Speaker Diarization model...")
-                self.diarization_model = Pipeline.from_pretrained(
-                    "pyannote/speaker-diarization-3.1",
-                    use_auth_token=self.hf_token
-                )
-                logger.info("✅ Diarization model loaded successfully")
-                
-                # Move to GPU if available
-                if torch.cuda.is_available():
-                    self.diarization_model = self.diarization_model.to(torch.device("cuda"))
-                    logger.info("Models loaded on GPU")
-                else:
-                    logger.info("Models loaded on CPU")
-                
-                # Verify models are actually loaded
-                if self.vad_model is None or self.diarization_model is None:
-                    logger.error("Models failed to load properly")
-                    return False
-                
-                self._models_loaded = True
-                return True
-                    
-            except ImportError as e:
-                logger.error(f"Failed to import required libraries: {e}")
-                logger.error("Please install: pyannote.audio, torch")
-                return False
-                
-        except Exception as e:
-            logger.error(f"Error loading models: {e}")
-            import traceback
-            traceback.print_exc()
+        
+        if not self.hf_token:
+            logger.warning("HUGGINGFACE_TOKEN not found in environment variables")
             return False
+        
+        logger.info("Loading Voice Activity Detection and Speaker Diarization models...")
+        if model_registry.get('pyannote_vad') is None or model_registry.get('pyannote_diarization') is None:
+            logger.error("Models failed to load properly (requires pyannote.audio and torch)")
+            return False
+        return True
     
     def analyze_complete_interview_audio(self, audio_file_path, session_key):
         """
@@ -105,32 +74,56 @@ class VoiceAnalysisService:
             dict: Overall analysis results for the entire interview
         """
         try:
-            # Ensure models are loaded before analysis
-            if not self._ensure_models_loaded():
-                logger.error("Voice analysis models could not be loaded")
-                return {
-                    'error': 'Failed to load voice analysis models. Please check HUGGINGFACE_TOKEN and accept user agreements.',
-                    'success': False
-                }
-            
             # Get session object
             session = InterviewSession.objects.get(session_key=session_key)
-            
-            logger.info(f"🎯 Analyzing complete interview audio: {audio_file_path}")
-            
-            # Perform Voice Activity Detection on entire audio
-            vad_results = self._perform_overall_vad(audio_file_path, session)
-            
-            # Perform Speaker Diarization on entire audio
-            diarization_results = self._perform_overall_diarization(audio_file_path, session)
-            
-            return {
-                'vad': vad_results,
-                'diarization': diarization_results,
-                'success': True,
-                'analysis_type': 'complete_interview'
-            }
-            
+
+            # One 16 kHz mono WAV for every pass below; removed when the analysis ends
+            converted_audio_path = self._ensure_compatible_audio_format(audio_file_path)
+            try:
+                # Without pyannote, measure speech/pauses with the CPU VAD; no diarization
+                if not self._ensure_models_loaded():
+                    logger.warning("Voice analysis models could not be loaded, using the energy/spectral VAD")
+                    vad_results = self._fallback_vad_analysis(converted_audio_path, session)
+                    if vad_results is None:
+                        return {
+                            'error': 'Failed to load voice analysis models and the audio could not be read as WAV.',
+                            'success': False
+                        }
+                    return {
+                        'vad': vad_results,
+                        'diarization': None,
+                        'success': True,
+                        'analysis_type': 'energy_vad'
+                    }
+
+                logger.info(f"🎯 Analyzing complete interview audio: {audio_file_path}")
+
+                # Long recordings go through the models in fixed windows, checkpointed per window
+                chunk_seconds = float(getattr(settings, 'VOICE_ANALYSIS_CHUNK_SECONDS', 600))
+                if chunk_seconds > 0:
+                    try:
+                        duration = open_wav(converted_audio_path).duration
+                    except (OSError, ValueError) as e:
+                        logger.warning(f"Could not read converted audio, analysing it in one pass: {e}")
+                        duration = 0
+                    if duration > chunk_seconds:
+                        return self._analyze_in_chunks(audio_file_path, converted_audio_path, session, duration)
+
+                # Perform Voice Activity Detection on entire audio
+                vad_results = self._perform_overall_vad(converted_audio_path, session)
+
+                # Perform Speaker Diarization on entire audio
+                diarization_results = self._perform_overall_diarization(converted_audio_path, session)
+
+                return {
+                    'vad': vad_results,
+                    'diarization': diarization_results,
+                    'success': True,
+                    'analysis_type': 'complete_interview'
+                }
+            finally:
+                self._remove_converted_audio(converted_audio_path, audio_file_path)
+
         except Exception as e:
             logger.error(f"Error analyzing complete interview audio: {e}")
             return {
@@ -138,8 +131,136 @@ class VoiceAnalysisService:
                 'success': False
             }
     
+    def _analyze_in_chunks(self, audio_file_path, wav_path, session, duration):
+        """
+        VAD and diarization of a long recording in overlapping fixed windows
+        streamed from the converted WAV (see voice_chunking.py). The stitched
+        segments are saved after every window on ``is_partial`` records, so a
+        crashed analysis of the same file resumes from the last saved window.
+        """
+        import torch
+        
+        # Held for the whole run so an unload in between cannot pull a model away mid-file
+        vad_model, diarization_model = self.vad_model, self.diarization_model
+        chunk_seconds = float(getattr(settings, 'VOICE_ANALYSIS_CHUNK_SECONDS', 600))
+        overlap_seconds = float(getattr(settings, 'VOICE_ANALYSIS_CHUNK_OVERLAP_SECONDS', 30))
+        chunk_count = len(chunk_plan(duration, chunk_seconds, overlap_seconds))
+        fingerprint = audio_fingerprint(audio_file_path, chunk_seconds, overlap_seconds)
+        
+        checkpoint = {'session': session, 'question__isnull': True, 'is_partial': True, 'source_fingerprint': fingerprint}
+        vad_record = VoiceActivityDetection.objects.filter(**checkpoint).first()
+        diarization_record = SpeakerDiarization.objects.filter(**checkpoint).first()
+        if vad_record and diarization_record and vad_record.chunks_completed == diarization_record.chunks_completed:
+            start_chunk = vad_record.chunks_completed
+            logger.info(f"♻️ Resuming chunked voice analysis at chunk {start_chunk + 1}/{chunk_count}")
+        else:
+            start_chunk = 0
+            with transaction.atomic():
+                # Clear any existing overall records (finished or stale partial) for this session
+                VoiceActivityDetection.objects.filter(session=session, question__isnull=True).delete()
+                SpeakerDiarization.objects.filter(session=session, question__isnull=True).delete()
+                vad_record = VoiceActivityDetection.objects.create(
+                    session=session, question=None, pause_duration=0, total_speech_time=0,
+                    speech_percentage=0, silence_percentage=0, vad_segments=[],
+                    is_partial=True, source_fingerprint=fingerprint,
+                )
+                diarization_record = SpeakerDiarization.objects.create(
+                    session=session, question=None, speaker_changes=0, num_speakers=0,
+                    candidate_speech_percentage=0, interviewer_speech_percentage=0, diarization_segments=[],
+                    is_partial=True, source_fingerprint=fingerprint,
+                )
+        
+        logger.info(f"🎯 Chunked analysis: {duration:.0f}s in {chunk_count} windows of {chunk_seconds:.0f}s ({overlap_seconds:.0f}s overlap)")
+        speech = list(vad_record.vad_segments)
+        turns = list(diarization_record.diarization_segments)
+        for chunk in iter_pcm_chunks(wav_path, chunk_seconds, overlap_seconds, start_chunk=start_chunk):
+            audio = {'waveform': torch.from_numpy(chunk.waveform())[None], 'sample_rate': chunk.audio.sample_rate}
+            
+            chunk_speech = [
+                {'start': chunk.start + segment.start, 'end': chunk.start + segment.end, 'label': label}
+                for segment, _, label in vad_model(audio).itertracks(yield_label=True)
+            ]
+            stitch_segments(speech, clip_segments(chunk_speech, chunk.own_start, chunk.own_end))
+            
+            chunk_turns = [
+                {'start': chunk.start + turn.start, 'end': chunk.start + turn.end, 'speaker': speaker}
+                for turn, _, speaker in diarization_model(audio).itertracks(yield_label=True)
+            ]
+            # Speaker labels are per call: carry the global ones over through the overlap
+            mapping = map_speakers(turns, chunk_turns, chunk.start, chunk.own_start)
+            for turn in chunk_turns:
+                turn['speaker'] = mapping[turn['speaker']]
+            stitch_segments(turns, clip_segments(chunk_turns, chunk.own_start, chunk.own_end), key='speaker')
+            
+            with transaction.atomic():
+                VoiceActivityDetection.objects.filter(pk=vad_record.pk).update(
+                    vad_segments=speech, chunks_completed=chunk.index + 1
+                )
+                SpeakerDiarization.objects.filter(pk=diarization_record.pk).update(
+                    diarization_segments=turns, chunks_completed=chunk.index + 1
+                )
+            logger.info(f"📊 Chunk {chunk.index + 1}/{chunk_count} analysed ({chunk.start:.0f}-{chunk.end:.0f}s)")
+        
+        # Final metrics over the whole recording
+        speech_duration = sum(segment['duration'] for segment in speech if segment['label'] == 'SPEECH')
+        pause_duration = max(0.0, duration - speech_duration)
+        speech_percentage = (speech_duration / duration * 100) if duration > 0 else 0
+        silence_percentage = (pause_duration / duration * 100) if duration > 0 else 0
+        metrics = self._diarization_metrics((turn['start'], turn['end'], turn['speaker']) for turn in turns)
+        
+        with transaction.atomic():
+            VoiceActivityDetection.objects.filter(pk=vad_record.pk).update(
+                pause_duration=pause_duration,
+                total_speech_time=speech_duration,
+                speech_percentage=speech_percentage,
+                silence_percentage=silence_percentage,
+                is_partial=False,
+                analysis_end_time=timezone.now(),
+            )
+            SpeakerDiarization.objects.filter(pk=diarization_record.pk).update(
+                speaker_changes=metrics['speaker_changes'],
+                speaker_change_timestamps=metrics['speaker_change_timestamps'],
+                num_speakers=metrics['num_speakers'],
+                speaker_labels=metrics['speaker_labels'],
+                candidate_speech_percentage=metrics['candidate_percentage'],
+                interviewer_speech_percentage=metrics['interviewer_percentage'],
+                is_partial=False,
+                analysis_end_time=timezone.now(),
+            )
+        
+        logger.info(f"✅ Chunked analysis completed: Speech={speech_percentage:.1f}%, {len(metrics['speaker_labels'])} speakers, {metrics['speaker_changes']} changes")
+        
+        return {
+            'vad': {
+                'id': str(vad_record.id),
+                'total_duration': duration,
+                'pause_duration': pause_duration,
+                'total_speech_time': speech_duration,
+                'speech_percentage': speech_percentage,
+                'silence_percentage': silence_percentage,
+                'segments': speech,
+                'analysis_type': 'overall_interview'
+            },
+            'diarization': {
+                'id': str(diarization_record.id),
+                'speaker_changes': metrics['speaker_changes'],
+                'speaker_change_timestamps': metrics['speaker_change_timestamps'],
+                'num_speakers': len(metrics['speaker_labels']),
+                'speaker_labels': metrics['speaker_labels'],
+                'candidate_speech_percentage': metrics['candidate_percentage'],
+                'interviewer_speech_percentage': metrics['interviewer_percentage'],
+                'total_interview_time': metrics['total_time'],
+                'candidate_time': metrics['candidate_time'],
+                'interviewer_time': metrics['interviewer_time'],
+                'analysis_type': 'overall_interview'
+            },
+            'success': True,
+            'analysis_type': 'complete_interview'
+        }
+    
     def _perform_overall_vad(self, audio_file_path, session):
         """Perform Voice Activity Detection on complete interview audio"""
+        converted_audio_path = None
         try:
             if not self.vad_model:
                 logger.warning("VAD model not loaded")
@@ -158,7 +279,6 @@ class VoiceAnalysisService:
             
             # Convert audio to compatible format if needed
             converted_audio_path = self._ensure_compatible_audio_format(audio_file_path)
-            
             # Run VAD on entire audio
             logger.info("🔄 Running VAD model...")
             vad_result = self.vad_model(converted_audio_path)
@@ -240,17 +360,28 @@ class VoiceAnalysisService:
         except Exception as e:
             logger.error(f"Error in overall VAD analysis: {e}")
             return None
+        finally:
+            self._remove_converted_audio(converted_audio_path, audio_file_path)
     
     def _ensure_compatible_audio_format(self, audio_file_path):
         """
         Convert audio to format compatible with VAD models
         Returns path to converted audio file
         """
+        temp_audio = None
         try:
             import os
             import tempfile
             import subprocess
-            
+
+            # Already 16kHz mono 16-bit PCM (e.g. converted earlier): nothing to do
+            try:
+                audio = open_wav(audio_file_path)
+                if audio.sample_rate == 16000 and audio.samples.shape[1] == 1 and audio.samples.dtype.itemsize == 2:
+                    return audio_file_path
+            except (OSError, ValueError):
+                pass
+
             # Create temporary file for converted audio
             temp_audio = tempfile.NamedTemporaryFile(suffix='.wav', delete=False)
             temp_audio.close()
@@ -273,65 +404,55 @@ class VoiceAnalysisService:
                 return temp_audio.name
             else:
                 logger.error(f"❌ Audio conversion failed: {result.stderr}")
+                self._remove_converted_audio(temp_audio.name, audio_file_path)
                 return audio_file_path  # Return original if conversion fails
                 
         except Exception as e:
             logger.error(f"❌ Error converting audio: {e}")
+            if temp_audio is not None:
+                self._remove_converted_audio(temp_audio.name, audio_file_path)
             return audio_file_path  # Return original if conversion fails
     
+    def _remove_converted_audio(self, converted_audio_path, audio_file_path):
+        """Delete a temporary WAV made by _ensure_compatible_audio_format (never the original)"""
+        if not converted_audio_path or converted_audio_path == audio_file_path:
+            return
+        try:
+            os.remove(converted_audio_path)
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logger.warning(f"Could not delete converted audio {converted_audio_path}: {e}")
+
     def _fallback_vad_analysis(self, audio_file_path, session):
         """
-        Fallback VAD analysis using basic audio processing
-        This provides reasonable estimates when VAD models fail
+        VAD without pyannote: framewise energy, zero-crossing rate and spectral
+        flatness over the memory-mapped WAV (see energy_vad.py)
         """
         try:
-            import os
-            import wave
-            import numpy as np
-            
-            logger.info("🔄 Performing fallback VAD analysis")
-            
-            # Get audio duration from file
-            try:
-                # Try to get duration using wave library
-                with wave.open(audio_file_path, 'rb') as wav_file:
-                    frames = wav_file.getnframes()
-                    sample_rate = wav_file.getframerate()
-                    duration = frames / sample_rate
-                    logger.info(f"📊 Audio duration: {duration:.1f}s")
-            except:
-                # Fallback: estimate duration from file size
-                file_size = os.path.getsize(audio_file_path)
-                # Rough estimate: 1MB = 1 minute for WAV
-                duration = (file_size / (1024 * 1024)) * 60
-                logger.info(f"📊 Estimated audio duration: {duration:.1f}s")
-            
-            # Basic speech estimation based on typical interview patterns
-            # Assume 70% speech, 30% silence for a typical interview
-            speech_percentage = 70.0
-            silence_percentage = 30.0
-            
-            speech_duration = duration * (speech_percentage / 100)
-            pause_duration = duration * (silence_percentage / 100)
-            
-            # Create basic segments (every 30 seconds with speech)
-            segments = []
-            segment_duration = 30.0  # 30-second segments
-            num_segments = int(duration / segment_duration)
-            
-            for i in range(num_segments):
-                start_time = i * segment_duration
-                end_time = min((i + 1) * segment_duration, duration)
-                segments.append({
-                    'start': start_time,
-                    'end': end_time,
-                    'label': 'SPEECH',
-                    'duration': end_time - start_time
-                })
+            from .energy_vad import detect_speech
+            
+            logger.info("🔄 Performing energy/spectral VAD analysis")
+            result = detect_speech(audio_file_path)
+            
+            duration = result['duration']
+            speech_duration = result['speech_time']
+            pause_duration = result['pause_time']
+            speech_percentage = (speech_duration / duration * 100) if duration > 0 else 0
+            silence_percentage = (pause_duration / duration * 100) if duration > 0 else 0
+            
+            segments = [
+                {'start': start, 'end': end, 'label': 'SPEECH', 'duration': end - start}
+                for start, end in result['speech_segments']
+            ] + [
+                {'start': start, 'end': end, 'label': 'PAUSE', 'duration': end - start}
+                for start, end in result['pause_segments']
+            ]
+            segments.sort(key=lambda segment: segment['start'])
             
-            logger.info(f"📊 Fallback VAD Metrics: Duration={duration:.1f}s, Speech={speech_duration:.1f}s, Pause={pause_duration:.1f}s")
-            logger.info(f"📊 Fallback VAD Percentages: Speech={speech_percentage:.1f}%, Silence={silence_percentage:.1f}%")
-            logger.info(f"📊 Fallback segments created: {len(segments)}")
+            logger.info(f"📊 Energy VAD Metrics: Duration={duration:.1f}s, Speech={speech_duration:.1f}s, Pause={pause_duration:.1f}s ({result['elapsed_ms']:.0f} ms)")
+            logger.info(f"📊 Energy VAD Percentages: Speech={speech_percentage:.1f}%, Silence={silence_percentage:.1f}%")
+            logger.info(f"📊 Speech segments found: {len(result['speech_segments'])}")
             
             # Clear any existing overall VAD records for this session
             VoiceActivityDetection.objects.filter(
@@ -339,7 +460,6 @@ class VoiceAnalysisService:
                 question__isnull=True
             ).delete()
             
-            # Save fallback VAD record
             vad_record = VoiceActivityDetection.objects.create(
                 session=session,
                 question=None,
@@ -352,7 +472,7 @@ class VoiceAnalysisService:
                 analysis_end_time=timezone.now()
             )
             
-            logger.info(f"✅ Fallback VAD analysis completed")
+            logger.info(f"✅ Energy VAD analysis completed")
             
             return {
                 'id': str(vad_record.id),
@@ -362,15 +482,16 @@ class VoiceAnalysisService:
                 'speech_percentage': speech_percentage,
                 'silence_percentage': silence_percentage,
                 'segments': segments,
-                'analysis_type': 'fallback_interview'
+                'analysis_type': 'energy_vad'
             }
             
         except Exception as e:
-            logger.error(f"❌ Error in fallback VAD analysis: {e}")
+            logger.error(f"❌ Error in energy VAD analysis: {e}")
             return None
     
     def _perform_overall_diarization(self, audio_file_path, session):
         """Perform Speaker Diarization on complete interview audio"""
+        converted_audio_path = None
         try:
             if not self.diarization_model:
                 logger.warning("Diarization model not loaded")
@@ -380,108 +501,29 @@ class VoiceAnalysisService:
             
             # Convert audio to compatible format if needed
             converted_audio_path = self._ensure_compatible_audio_format(audio_file_path)
-            
             # Run diarization on entire audio
             logger.info("🔄 Running diarization model...")
             diarization = self.diarization_model(converted_audio_path)
             
             # Process diarization results
-            speaker_changes = 0
-            speaker_change_timestamps = []
-            speaker_labels = {}
-            candidate_time = 0
-            interviewer_time = 0
-            
-            # Track speakers and their speech time
-            speaker_times = {}
-            last_speaker = None
-            
-            # Iterate through diarization segments
-            for turn, _, speaker in diarization.itertracks(yield_label=True):
-                start_time = turn.start
-                end_time = turn.end
-                duration = end_time - start_time
-                
-                # Track speaker changes
-                if last_speaker != speaker:
-                    speaker_changes += 1
-                    speaker_change_timestamps.append(start_time)
-                    last_speaker = speaker
-                
-                # Accumulate speaker time
-                if speaker not in speaker_times:
-                    speaker_times[speaker] = 0
-                speaker_times[speaker] += duration
-                
-                # Track speaker labels
-                if speaker not in speaker_labels:
-                    speaker_labels[speaker] = []
-                speaker_labels[speaker].append({
-                    'start': start_time,
-                    'end': end_time,
-                    'duration': duration
-                })
-            
-            # Filter out very short speech segments (likely noise)
-            min_segment_duration = 2.0  # 2 seconds minimum
-            filtered_speaker_times = {}
-            
-            for speaker, segments in speaker_labels.items():
-                valid_duration = sum(seg['duration'] for seg in segments if seg['duration'] >= min_segment_duration)
-                if valid_duration > 0:
-                    filtered_speaker_times[speaker] = valid_duration
-            
-            # Use filtered times if available, otherwise use original
-            if filtered_speaker_times:
-                speaker_times = filtered_speaker_times
-                logger.info(f"Filtered out short speech segments. Updated speaker times: {speaker_times}")
-            
-            # Determine number of speakers and handle single speaker with background noise
-            num_speakers = len(speaker_times)
-            total_speech_time = sum(speaker_times.values())
-            
-            # If 2 speakers detected but one is dominant (>80%), treat as single speaker
-            if num_speakers == 2:
-                dominant_speaker = max(speaker_times, key=speaker_times.get)
-                dominant_time = speaker_times[dominant_speaker]
-                dominant_percentage = (dominant_time / total_speech_time) * 100
-                
-                if dominant_percentage > 80:
-                    logger.info(f"Dominant speaker {dominant_speaker} has {dominant_percentage:.1f}% of speech time - treating as single speaker")
-                    num_speakers = 1
-                    candidate_time = dominant_time
-                    interviewer_time = 0
-                else:
-                    # Genuine multi-speaker scenario
-                    # Assign candidate and interviewer based on speech time
-                    sorted_speakers = sorted(speaker_times.items(), key=lambda x: x[1], reverse=True)
-                    candidate_time = sorted_speakers[0][1]  # Most speaking time
-                    interviewer_time = sorted_speakers[1][1]  # Second most speaking time
-            elif num_speakers == 1:
-                # Single speaker detected
-                candidate_time = total_speech_time
-                interviewer_time = 0
-            else:
-                # Multiple speakers detected
-                sorted_speakers = sorted(speaker_times.items(), key=lambda x: x[1], reverse=True)
-                if len(sorted_speakers) >= 1:
-                    candidate_time = sorted_speakers[0][1]
-                if len(sorted_speakers) >= 2:
-                    interviewer_time = sorted_speakers[1][1]
-            
-            total_time = candidate_time + interviewer_time
-            candidate_percentage = (candidate_time / total_time * 100) if total_time > 0 else 0
-            interviewer_percentage = (interviewer_time / total_time * 100) if total_time > 0 else 0
+            metrics = self._diarization_metrics(
+                (turn.start, turn.end, speaker) for turn, _, speaker in diarization.itertracks(yield_label=True)
+            )
+            speaker_changes = metrics['speaker_changes']
+            speaker_change_timestamps = metrics['speaker_change_timestamps']
+            speaker_labels = metrics['speaker_labels']
+            num_speakers = metrics['num_speakers']
+            candidate_time = metrics['candidate_time']
+            interviewer_time = metrics['interviewer_time']
+            total_time = metrics['total_time']
+            candidate_percentage = metrics['candidate_percentage']
+            interviewer_percentage = metrics['interviewer_percentage']
             
             # If no speakers detected, use fallback
             if num_speakers == 0:
                 logger.warning("❌ No speakers detected with diarization model, using fallback analysis")
                 return self._fallback_diarization_analysis(converted_audio_path, session)
             
-            total_time = candidate_time + interviewer_time
-            candidate_percentage = (candidate_time / total_time * 100) if total_time > 0 else 0
-            interviewer_percentage = (interviewer_time / total_time * 100) if total_time > 0 else 0
-            
             # Clear any existing overall diarization records for this session
             SpeakerDiarization.objects.filter(
                 session=session, 
@@ -522,6 +564,104 @@ class VoiceAnalysisService:
         except Exception as e:
             logger.error(f"Error in overall diarization analysis: {e}")
             return None
+        finally:
+            self._remove_converted_audio(converted_audio_path, audio_file_path)
+    
+    def _diarization_metrics(self, turns):
+        """Speaker changes, per-speaker turns and the candidate/interviewer split of ``(start, end, speaker)`` turns"""
+        speaker_changes = 0
+        speaker_change_timestamps = []
+        speaker_labels = {}
+        candidate_time = 0
+        interviewer_time = 0
+        
+        # Track speakers and their speech time
+        speaker_times = {}
+        last_speaker = None
+        
+        # Iterate through diarization segments
+        for start_time, end_time, speaker in turns:
+            duration = end_time - start_time
+            
+            # Track speaker changes
+            if last_speaker != speaker:
+                speaker_changes += 1
+                speaker_change_timestamps.append(start_time)
+                last_speaker = speaker
+            
+            # Accumulate speaker time
+            if speaker not in speaker_times:
+                speaker_times[speaker] = 0
+            speaker_times[speaker] += duration
+            
+            # Track speaker labels
+            if speaker not in speaker_labels:
+                speaker_labels[speaker] = []
+            speaker_labels[speaker].append({
+                'start': start_time,
+                'end': end_time,
+                'duration': duration
+            })
+        
+        # Filter out very short speech segments (likely noise)
+        min_segment_duration = 2.0  # 2 seconds minimum
+        filtered_speaker_times = {}
+        
+        for speaker, segments in speaker_labels.items():
+            valid_duration = sum(seg['duration'] for seg in segments if seg['duration'] >= min_segment_duration)
+            if valid_duration > 0:
+                filtered_speaker_times[speaker] = valid_duration
+        
+        # Use filtered times if available, otherwise use original
+        if filtered_speaker_times:
+            speaker_times = filtered_speaker_times
+            logger.info(f"Filtered out short speech segments. Updated speaker times: {speaker_times}")
+        
+        # Determine number of speakers and handle single speaker with background noise
+        num_speakers = len(speaker_times)
+        total_speech_time = sum(speaker_times.values())
+        
+        # If 2 speakers detected but one is dominant (>80%), treat as single speaker
+        if num_speakers == 2:
+            dominant_speaker = max(speaker_times, key=speaker_times.get)
+            dominant_time = speaker_times[dominant_speaker]
+            dominant_percentage = (dominant_time / total_speech_time) * 100
+            
+            if dominant_percentage > 80:
+                logger.info(f"Dominant speaker {dominant_speaker} has {dominant_percentage:.1f}% of speech time - treating as single speaker")
+                num_speakers = 1
+                candidate_time = dominant_time
+                interviewer_time = 0
+            else:
+                # Genuine multi-speaker scenario
+                # Assign candidate and interviewer based on speech time
+                sorted_speakers = sorted(speaker_times.items(), key=lambda x: x[1], reverse=True)
+                candidate_time = sorted_speakers[0][1]  # Most speaking time
+                interviewer_time = sorted_speakers[1][1]  # Second most speaking time
+        elif num_speakers == 1:
+            # Single speaker detected
+            candidate_time = total_speech_time
+            interviewer_time = 0
+        else:
+            # Multiple speakers detected
+            sorted_speakers = sorted(speaker_times.items(), key=lambda x: x[1], reverse=True)
+            if len(sorted_speakers) >= 1:
+                candidate_time = sorted_speakers[0][1]
+            if len(sorted_speakers) >= 2:
+                interviewer_time = sorted_speakers[1][1]
+        
+        total_time = candidate_time + interviewer_time
+        return {
+            'speaker_changes': speaker_changes,
+            'speaker_change_timestamps': speaker_change_timestamps,
+            'speaker_labels': speaker_labels,
+            'num_speakers': num_speakers,
+            'candidate_time': candidate_time,
+            'interviewer_time': interviewer_time,
+            'total_time': total_time,
+            'candidate_percentage': (candidate_time / total_time * 100) if total_time > 0 else 0,
+            'interviewer_percentage': (interviewer_time / total_time * 100) if total_time > 0 else 0,
+        }
     
     def _fallback_diarization_analysis(self, audio_file_path, session):
         """
@@ -25,7 +25,8 @@ class FastVoiceAnalysisService:
             # Check if we already have real VAD data from previous analysis
             existing_vad = VoiceActivityDetection.objects.filter(
                 session=session, 
-                question__isnull=True
+                question__isnull=True,
+                is_partial=False
             ).first()
             
             if existing_vad and existing_vad.vad_segments:  # Only use if we have real segment data
@@ -57,7 +58,8 @@ class FastVoiceAnalysisService:
         """Get existing real diarization data only"""
         existing_diar = SpeakerDiarization.objects.filter(
             session=session, 
-            question__isnull=True
+            question__isnull=True,
+            is_partial=False
         ).first()
         
         if existing_diar and existing_diar.diarization_segments:  # Only use if we have real segment data
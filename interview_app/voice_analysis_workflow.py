@@ -23,6 +23,7 @@ from .voice_models import (
     AnswerVoiceAnalysis,
 )
 from .voice_analysis_pdf import generate_voice_analysis_pdf
+from .answer_metrics import session_voice_summary
 from .voice_analysis_service import VoiceAnalysisService
 
 logger = logging.getLogger(__name__)
@@ -47,7 +48,15 @@ class VoiceAnalysisWorkflow:
         from django.conf import settings
         import os
         import glob
+        from .media_manifest import artifact_path
+        from .models import MediaArtifact
         
+        # The media manifest records the analysis WAV (or at least the upload) of every new session
+        manifest_audio = artifact_path(session_key, MediaArtifact.Role.ANALYSIS_AUDIO, MediaArtifact.Role.AUDIO)
+        if manifest_audio:
+            return manifest_audio
+        
+        # Sessions recorded before the manifest: probe the known file names
         # Priority 1: Check for converted WAV audio file (HuggingFace compatible)
         converted_wav_path = f"{settings.MEDIA_ROOT}/interview_audio/{session_key}_interview_audio_converted.wav"
         if os.path.exists(converted_wav_path):
@@ -280,13 +289,15 @@ class VoiceAnalysisWorkflow:
             # Get overall VAD data
             vad_data = VoiceActivityDetection.objects.filter(
                 session=session, 
-                question__isnull=True
+                question__isnull=True,
+                is_partial=False
             ).first()
             
             # Get overall diarization data
             diar_data = SpeakerDiarization.objects.filter(
                 session=session,
-                question__isnull=True
+                question__isnull=True,
+                is_partial=False
             ).first()
             
             # Prepare template context
@@ -407,13 +418,15 @@ class VoiceAnalysisWorkflow:
             # Get overall VAD data
             vad_data = VoiceActivityDetection.objects.filter(
                 session=session, 
-                question__isnull=True
+                question__isnull=True,
+                is_partial=False
             ).first()
             
             # Get overall diarization data
             diar_data = SpeakerDiarization.objects.filter(
                 session=session,
-                question__isnull=True
+                question__isnull=True,
+                is_partial=False
             ).first()
             
             summary = {
@@ -422,7 +435,8 @@ class VoiceAnalysisWorkflow:
                 "pdf_available": bool(session.voice_analysis_pdf),
                 "pdf_url": session.voice_analysis_pdf.url if session.voice_analysis_pdf else None,
                 "voice_activity": None,
-                "speaker_diarization": None
+                "speaker_diarization": None,
+                "answers": session_voice_summary(session)
             }
             
             if vad_data:
@@ -0,0 +1,145 @@
+"""
+Fixed-window chunking for long interview recordings.
+
+``iter_pcm_chunks`` walks a 16 kHz WAV in windows of ``chunk_seconds`` that
+overlap by ``overlap_seconds``, straight from the memory-mapped file, so only
+one window's PCM is ever resident. Each chunk *owns* the part of its window
+up to the middle of the overlap with its neighbours; segments found in a
+chunk are clipped to what it owns and then stitched onto the result so far:
+
+* speech segments that touch across a boundary are merged,
+* diarization speakers of a new chunk are mapped onto the global speakers
+  they co-occur with in the overlap (pyannote labels are only consistent
+  within one call), unmatched speakers get new global labels.
+
+Stitched results up to a chunk's owned end are final, which is what lets a
+crashed analysis resume from the last completed chunk.
+"""
+import hashlib
+import math
+import os
+
+import numpy as np
+
+from .energy_vad import WavAudio, open_wav
+
+# Segments closer than this across a chunk boundary are one segment
+MERGE_GAP_SECONDS = 0.05
+
+
+class PcmChunk:
+    """One analysis window: ``audio`` is a WavAudio slice starting at ``start`` seconds."""
+
+    def __init__(self, index, start, end, own_start, own_end, audio):
+        self.index = index
+        self.start = start
+        self.end = end
+        self.own_start = own_start
+        self.own_end = own_end
+        self.audio = audio
+
+    def waveform(self):
+        """Mono float32 samples in [-1, 1] (the one copy made per chunk)."""
+        samples = self.audio.samples
+        x = samples[:, 0].astype(np.float32) if samples.shape[1] == 1 else samples.mean(axis=1, dtype=np.float32)
+        if self.audio.offset:
+            x += np.float32(self.audio.offset)
+        x *= np.float32(self.audio.scale)
+        return x
+
+
+def chunk_plan(duration, chunk_seconds, overlap_seconds):
+    """``[(start, end, own_start, own_end), ...]`` windows covering ``duration``."""
+    overlap_seconds = min(overlap_seconds, chunk_seconds / 2)
+    step = chunk_seconds - overlap_seconds
+    count = max(1, math.ceil(max(0.0, duration - overlap_seconds) / step))
+    plan = []
+    for index in range(count):
+        start = index * step
+        end = min(duration, start + chunk_seconds)
+        own_start = 0.0 if index == 0 else start + overlap_seconds / 2
+        own_end = duration if index == count - 1 else start + step + overlap_seconds / 2
+        plan.append((start, end, own_start, own_end))
+    return plan
+
+
+def iter_pcm_chunks(path, chunk_seconds, overlap_seconds, start_chunk=0):
+    """Yield the ``PcmChunk`` windows of a WAV file, beginning at ``start_chunk``."""
+    audio = open_wav(path)
+    rate = audio.sample_rate
+    for index, (start, end, own_start, own_end) in enumerate(chunk_plan(audio.duration, chunk_seconds, overlap_seconds)):
+        if index < start_chunk:
+            continue
+        window = WavAudio(audio.samples[int(start * rate):int(end * rate)], rate, audio.scale, audio.offset)
+        yield PcmChunk(index, start, end, own_start, own_end, window)
+
+
+def audio_fingerprint(path, *config):
+    """Identity of a source recording plus the analysis settings, for resuming."""
+    stat = os.stat(path)
+    key = "|".join(str(part) for part in (os.path.abspath(path), stat.st_size, int(stat.st_mtime), *config))
+    return hashlib.sha1(key.encode("utf-8")).hexdigest()
+
+
+def clip_segments(segments, own_start, own_end):
+    """Segments (dicts with start/end) clipped to ``[own_start, own_end)``."""
+    clipped = []
+    for segment in segments:
+        start, end = max(segment["start"], own_start), min(segment["end"], own_end)
+        if end > start:
+            clipped.append(dict(segment, start=start, end=end, duration=end - start))
+    return clipped
+
+
+def stitch_segments(stitched, segments, key="label"):
+    """Append ``segments`` to ``stitched``, merging touching segments with the same ``key``."""
+    for segment in sorted(segments, key=lambda item: item["start"]):
+        last = stitched[-1] if stitched else None
+        if last is not None and last.get(key) == segment.get(key) and segment["start"] - last["end"] <= MERGE_GAP_SECONDS:
+            last["end"] = max(last["end"], segment["end"])
+            last["duration"] = last["end"] - last["start"]
+        else:
+            stitched.append(dict(segment))
+    return stitched
+
+
+def _overlap(a_start, a_end, b_start, b_end):
+    return max(0.0, min(a_end, b_end) - max(a_start, b_start))
+
+
+def map_speakers(stitched_turns, chunk_turns, region_start, region_end):
+    """
+    Map a chunk's local speaker labels to global ones by co-occurrence in
+    ``[region_start, region_end)``, where both the stitched result and the
+    chunk have turns. Greedy on the longest shared time; returns
+    ``{local_label: global_label}`` with new labels for unmatched speakers.
+    """
+    shared = {}
+    for turn in chunk_turns:
+        for known in stitched_turns:
+            if known["end"] <= region_start:
+                continue
+            seconds = _overlap(
+                max(turn["start"], region_start), min(turn["end"], region_end), known["start"], known["end"]
+            )
+            if seconds > 0:
+                pair = (turn["speaker"], known["speaker"])
+                shared[pair] = shared.get(pair, 0.0) + seconds
+
+    mapping, used = {}, set()
+    for (local, known), _ in sorted(shared.items(), key=lambda item: item[1], reverse=True):
+        if local not in mapping and known not in used:
+            mapping[local] = known
+            used.add(known)
+
+    known_labels = {turn["speaker"] for turn in stitched_turns}
+    next_index = len(known_labels)
+    for local in sorted({turn["speaker"] for turn in chunk_turns}):
+        if local not in mapping:
+            label = f"SPEAKER_{next_index:02d}"
+            while label in known_labels:
+                next_index += 1
+                label = f"SPEAKER_{next_index:02d}"
+            mapping[local] = label
+            known_labels.add(label)
+    return mapping
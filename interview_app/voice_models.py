@@ -31,6 +31,11 @@ class VoiceActivityDetection(models.Model):
     # Raw VAD segments data
     vad_segments = models.JSONField(default=list, help_text="Raw VAD segment data")
     
+    # Chunked analysis checkpoint: partial rows are resumed, never reported
+    is_partial = models.BooleanField(default=False, help_text="Chunked analysis still in progress")
+    chunks_completed = models.PositiveIntegerField(default=0, help_text="Chunks analysed so far")
+    source_fingerprint = models.CharField(max_length=64, blank=True, help_text="Source audio and chunking settings")
+    
     # Analysis timestamps
     analysis_start_time = models.DateTimeField(auto_now_add=True)
     analysis_end_time = models.DateTimeField(auto_now_add=True)
@@ -67,6 +72,11 @@ class SpeakerDiarization(models.Model):
     # Diarization segments
     diarization_segments = models.JSONField(default=list, help_text="Raw diarization segment data")
     
+    # Chunked analysis checkpoint: partial rows are resumed, never reported
+    is_partial = models.BooleanField(default=False, help_text="Chunked analysis still in progress")
+    chunks_completed = models.PositiveIntegerField(default=0, help_text="Chunks analysed so far")
+    source_fingerprint = models.CharField(max_length=64, blank=True, help_text="Source audio and chunking settings")
+    
     # Analysis timestamps
     analysis_start_time = models.DateTimeField(auto_now_add=True)
     analysis_end_time = models.DateTimeField(auto_now_add=True)
@@ -101,16 +111,16 @@ class AnswerVoiceAnalysis(models.Model):
     segment_duration = models.FloatField(help_text="Duration of answer segment in seconds")
     
     # Speech quality metrics
-    speech_percentage = models.FloatField(help_text="Percentage of segment with speech")
-    silence_percentage = models.FloatField(help_text="Percentage of segment with silence")
-    words_per_minute = models.FloatField(help_text="Speaking rate in words per minute")
+    speech_percentage = models.FloatField(null=True, blank=True, help_text="Percentage of segment with speech")
+    silence_percentage = models.FloatField(null=True, blank=True, help_text="Percentage of segment with silence")
+    words_per_minute = models.FloatField(null=True, blank=True, help_text="Speaking rate in words per minute")
     filler_word_count = models.IntegerField(help_text="Number of filler words detected")
-    response_delay_seconds = models.FloatField(help_text="Delay before starting response")
+    response_delay_seconds = models.FloatField(null=True, blank=True, help_text="Delay before starting response")
     
     # Speaker analysis
     multiple_speakers_detected = models.BooleanField(default=False, help_text="Multiple speakers detected in answer")
-    speaker_confidence_score = models.FloatField(help_text="Confidence score for speaker identification")
-    audio_quality_score = models.FloatField(help_text="Overall audio quality score")
+    speaker_confidence_score = models.FloatField(null=True, blank=True, help_text="Confidence score for speaker identification")
+    audio_quality_score = models.FloatField(null=True, blank=True, help_text="Overall audio quality score")
     
     # Analysis insights (JSON)
     insights = models.JSONField(default=dict, help_text="Detailed insights about the answer")
@@ -128,3 +138,45 @@ class AnswerVoiceAnalysis(models.Model):
     
     def __str__(self):
         return f"Answer Analysis - {self.session.candidate_name} (Answer {self.answer_number})"
+
+
+class SessionVoiceRollup(models.Model):
+    """
+    Running sums of the per-answer voice metrics of a session, updated as each
+    answer is uploaded so session-level figures never re-read every answer
+    """
+    
+    session = models.OneToOneField('InterviewSession', on_delete=models.CASCADE, primary_key=True, related_name='voice_rollup')
+    
+    answer_count = models.PositiveIntegerField(default=0)
+    total_duration = models.FloatField(default=0, help_text="Seconds of answers with a known duration")
+    timed_words = models.PositiveIntegerField(default=0, help_text="Words of answers with a known duration")
+    total_words = models.PositiveIntegerField(default=0)
+    total_filler_words = models.PositiveIntegerField(default=0)
+    sentiment_sum = models.FloatField(default=0)
+    
+    # Only answers that came with audio contribute here
+    audio_answer_count = models.PositiveIntegerField(default=0)
+    audio_duration = models.FloatField(default=0)
+    speech_seconds = models.FloatField(default=0)
+    response_delay_sum = models.FloatField(default=0)
+    
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    def summary(self):
+        """Session averages derived from the running sums"""
+        return {
+            'total_answers': self.answer_count,
+            'total_answer_duration': self.total_duration,
+            'avg_duration_seconds': self.total_duration / self.answer_count if self.answer_count else 0,
+            'avg_words_per_minute': self.timed_words / (self.total_duration / 60) if self.total_duration else 0,
+            'total_filler_words': self.total_filler_words,
+            'avg_filler_word_count': self.total_filler_words / self.answer_count if self.answer_count else 0,
+            'avg_sentiment_score': self.sentiment_sum / self.answer_count if self.answer_count else 0,
+            'avg_speech_percentage': self.speech_seconds / self.audio_duration * 100 if self.audio_duration else 0,
+            'avg_silence_percentage': (1 - self.speech_seconds / self.audio_duration) * 100 if self.audio_duration else 0,
+            'avg_response_delay': self.response_delay_sum / self.audio_answer_count if self.audio_answer_count else 0,
+        }
+    
+    def __str__(self):
+        return f"Voice Rollup - {self.session.candidate_name} ({self.answer_count} answers)"
@@ -0,0 +1,421 @@
+"""
+Warm interpreter workers for the coding round.
+
+Starting ``python -c`` / ``node -e`` per test case costs far more than running
+a typical solution. Each language keeps a small pool of long-lived worker
+processes that receive test scripts over a JSON-lines pipe protocol:
+
+    request:  {"script": "...", "timeout": 5}
+    response: {"stdout": "...", "stderr": "...", "returncode": 0,
+               "cpu_ms": 1.2, "peak_rss_kb": 9000}
+
+Python workers fork a fresh child per job on POSIX (in-process ``exec`` with
+a new namespace elsewhere), and the child closes the protocol pipe before
+running user code. Node shares module caches and built-ins between scripts in
+one process, so a Node worker runs a single job (in a ``vm`` context with its
+own ``module``/``exports``) and is replaced by a pre-started one. Every job
+carries a random nonce that its response must echo, so output forged by user
+code is rejected. Workers run under a memory limit, are recycled after
+``WARM_WORKER_MAX_JOBS`` jobs and are killed and replaced on any crash or
+timeout.
+"""
+import atexit
+import json
+import os
+import queue
+import secrets
+import signal
+import subprocess
+import threading
+
+from django.conf import settings
+
+from .sandbox import default_limits, describe_signal
+from .toolchains import toolchains
+
+PYTHON_WORKER_SOURCE = r'''
+import contextlib, io, json, os, sys, traceback
+
+memory_limit = int(sys.argv[1]) if len(sys.argv) > 1 else 0
+if memory_limit:
+    try:
+        import resource
+        resource.setrlimit(resource.RLIMIT_AS, (memory_limit, memory_limit))
+    except Exception:
+        pass
+
+# Keep the protocol on a private fd so stray prints cannot corrupt it
+protocol_out = os.fdopen(os.dup(1), "w")
+devnull = os.open(os.devnull, os.O_RDWR)
+protocol_in = os.fdopen(os.dup(0), "r")
+os.dup2(devnull, 0)
+os.dup2(devnull, 1)
+PROTOCOL_FDS = (protocol_in.fileno(), protocol_out.fileno())
+
+
+def exit_code(exc):
+    if exc.code is None:
+        return 0
+    return exc.code if isinstance(exc.code, int) else 1
+
+
+def run_in_process(job):
+    script = job["script"]
+    out, err = io.StringIO(), io.StringIO()
+    returncode = 0
+    with contextlib.redirect_stdout(out), contextlib.redirect_stderr(err):
+        try:
+            exec(compile(script, "<string>", "exec"), {"__name__": "__main__"})
+        except SystemExit as e:
+            returncode = exit_code(e)
+        except BaseException:
+            traceback.print_exc()
+            returncode = 1
+    return {"stdout": out.getvalue(), "stderr": err.getvalue(), "returncode": returncode,
+            "cpu_ms": None, "peak_rss_kb": None}
+
+
+def run_forked(job):
+    import resource, selectors
+    script = job["script"]
+    cpu_seconds = max(1, int(-(-float(job.get("timeout") or 5) // 1)))
+    out_r, out_w = os.pipe()
+    err_r, err_w = os.pipe()
+    pid = os.fork()
+    if pid == 0:
+        # CPU time restarts at zero in the forked child
+        try:
+            resource.setrlimit(resource.RLIMIT_CPU, (cpu_seconds, cpu_seconds + 1))
+            for limit, value in ((resource.RLIMIT_NPROC, job.get("max_processes")),
+                                 (resource.RLIMIT_FSIZE, job.get("max_file_bytes"))):
+                if value:
+                    resource.setrlimit(limit, (value, value))
+        except Exception:
+            pass
+        os.dup2(out_w, 1)
+        os.dup2(err_w, 2)
+        # User code must not be able to write responses on the protocol pipe
+        for fd in (out_r, out_w, err_r, err_w) + PROTOCOL_FDS:
+            os.close(fd)
+        sys.stdout = io.TextIOWrapper(os.fdopen(1, "wb", closefd=False), write_through=True)
+        sys.stderr = io.TextIOWrapper(os.fdopen(2, "wb", closefd=False), write_through=True)
+        returncode = 0
+        try:
+            exec(compile(script, "<string>", "exec"), {"__name__": "__main__"})
+        except SystemExit as e:
+            returncode = exit_code(e)
+        except BaseException:
+            traceback.print_exc()
+            returncode = 1
+        sys.stdout.flush()
+        sys.stderr.flush()
+        os._exit(returncode)
+
+    os.close(out_w)
+    os.close(err_w)
+    chunks = {out_r: [], err_r: []}
+    selector = selectors.DefaultSelector()
+    selector.register(out_r, selectors.EVENT_READ)
+    selector.register(err_r, selectors.EVENT_READ)
+    open_fds = 2
+    while open_fds:
+        for key, _ in selector.select():
+            data = os.read(key.fd, 65536)
+            if data:
+                chunks[key.fd].append(data)
+            else:
+                selector.unregister(key.fd)
+                os.close(key.fd)
+                open_fds -= 1
+    _, status, usage = os.wait4(pid, 0)
+    returncode = os.waitstatus_to_exitcode(status)
+    return {
+        "stdout": b"".join(chunks[out_r]).decode("utf-8", "replace"),
+        "stderr": b"".join(chunks[err_r]).decode("utf-8", "replace"),
+        "returncode": returncode,
+        "cpu_ms": round((usage.ru_utime + usage.ru_stime) * 1000, 1),
+        "peak_rss_kb": usage.ru_maxrss,
+    }
+
+
+def serve():
+    # Jobs (and their nonces) stay local to this frame, out of reach of __main__
+    run_job = run_forked if hasattr(os, "fork") and hasattr(os, "wait4") else run_in_process
+    for line in protocol_in:
+        if not line.strip():
+            continue
+        job = json.loads(line)
+        nonce = job.pop("nonce", None)
+        response = run_job(job)
+        response["nonce"] = nonce
+        protocol_out.write(json.dumps(response) + "\n")
+        protocol_out.flush()
+
+
+serve()
+'''
+
+NODE_WORKER_SOURCE = r'''
+const readline = require('readline');
+const util = require('util');
+const vm = require('vm');
+
+const rl = readline.createInterface({ input: process.stdin, terminal: false });
+const format = util.format;
+const stdoutWrite = process.stdout.write.bind(process.stdout);
+rl.on('line', (line) => {
+    if (!line.trim()) return;
+    const job = JSON.parse(line);
+    const nonce = job.nonce;
+    delete job.nonce;
+    const out = [];
+    const err = [];
+    const capture = (sink) => (...args) => sink.push(format(...args) + '\n');
+    const sandboxConsole = {
+        log: capture(out), info: capture(out), debug: capture(out),
+        error: capture(err), warn: capture(err),
+    };
+    let returncode = 0;
+    const cpuStart = process.cpuUsage();
+    const sandboxModule = { exports: {} };
+    try {
+        vm.runInNewContext(job.script, {
+            console: sandboxConsole, require, Buffer, module: sandboxModule, exports: sandboxModule.exports,
+        }, {
+            filename: '[eval]',
+            timeout: Math.max(1, Math.floor((job.timeout || 5) * 1000)),
+        });
+    } catch (e) {
+        err.push((e && e.stack ? e.stack : String(e)) + '\n');
+        returncode = 1;
+    }
+    const cpu = process.cpuUsage(cpuStart);
+    stdoutWrite(JSON.stringify({
+        nonce, stdout: out.join(''), stderr: err.join(''), returncode,
+        cpu_ms: Math.round((cpu.user + cpu.system) / 100) / 10,
+        // Worker-wide RSS: jobs share the warm process
+        peak_rss_kb: Math.round(process.memoryUsage().rss / 1024),
+    }) + '\n');
+});
+'''
+
+
+class WarmWorker:
+    """One long-lived interpreter process speaking the JSON-lines protocol."""
+
+    def __init__(self, command, env=None):
+        popen_kwargs = {}
+        if os.name != "nt":
+            # Own process group, so forked job children die with the worker
+            popen_kwargs["start_new_session"] = True
+        self.proc = subprocess.Popen(
+            command,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+            encoding="utf-8",
+            bufsize=1,
+            env=env,
+            **popen_kwargs,
+        )
+        self.jobs = 0
+        self._responses = queue.Queue()
+        threading.Thread(target=self._read_responses, daemon=True).start()
+
+    def _read_responses(self):
+        try:
+            for line in self.proc.stdout:
+                self._responses.put(line)
+        except (OSError, ValueError):
+            pass
+        self._responses.put(None)
+
+    @property
+    def alive(self):
+        return self.proc.poll() is None
+
+    def run(self, script, timeout, limits=None):
+        """
+        Send one job and wait for its reply. Raises TimeoutError when the job
+        overruns and RuntimeError when the worker dies or misbehaves.
+        """
+        self.jobs += 1
+        nonce = secrets.token_hex(16)
+        job = {"script": script, "timeout": timeout, "nonce": nonce}
+        if limits is not None:
+            job.update({"max_processes": limits.max_processes, "max_file_bytes": limits.max_file_bytes})
+        try:
+            self.proc.stdin.write(json.dumps(job) + "\n")
+            self.proc.stdin.flush()
+        except (OSError, ValueError) as e:
+            raise RuntimeError(f"worker pipe closed: {e}")
+        try:
+            line = self._responses.get(timeout=timeout)
+        except queue.Empty:
+            raise TimeoutError
+        if line is None:
+            raise RuntimeError("worker exited")
+        try:
+            response = json.loads(line)
+        except ValueError:
+            raise RuntimeError("malformed worker response")
+        if not isinstance(response, dict) or response.pop("nonce", None) != nonce:
+            raise RuntimeError("worker response does not belong to this job")
+        return response
+
+    def kill(self):
+        try:
+            if os.name != "nt":
+                os.killpg(self.proc.pid, signal.SIGKILL)
+            else:
+                self.proc.kill()
+        except (OSError, ProcessLookupError):
+            pass
+        try:
+            self.proc.wait(timeout=1)
+        except Exception:
+            pass
+
+
+class WarmWorkerPool:
+    """
+    Pre-started workers for one language. ``run`` returns a CompletedProcess,
+    or None when no worker could be started (callers then fall back to a
+    one-off subprocess).
+    """
+
+    def __init__(self, language, command_factory, max_jobs=None):
+        self.language = language
+        self._command_factory = command_factory
+        self._max_jobs = max_jobs
+        self._idle = []
+        self._lock = threading.Lock()
+        self._unavailable = False
+        self.stats = {"jobs": 0, "started": 0, "recycled": 0, "timeouts": 0, "crashes": 0}
+
+    @property
+    def size(self):
+        return int(getattr(settings, "WARM_WORKER_POOL_SIZE", 2))
+
+    @property
+    def max_jobs(self):
+        if self._max_jobs is not None:
+            return self._max_jobs
+        return int(getattr(settings, "WARM_WORKER_MAX_JOBS", 50))
+
+    @property
+    def enabled(self):
+        return bool(getattr(settings, "WARM_WORKERS_ENABLED", True)) and not self._unavailable
+
+    def _spawn(self):
+        try:
+            worker = WarmWorker(self._command_factory())
+        except (OSError, ValueError) as e:
+            print(f"⚠️ {self.language} warm workers unavailable: {e}")
+            self._unavailable = True
+            return None
+        self.stats["started"] += 1
+        return worker
+
+    def _acquire(self):
+        with self._lock:
+            while self._idle:
+                worker = self._idle.pop()
+                if worker.alive:
+                    return worker
+                worker.kill()
+        return self._spawn()
+
+    def _release(self, worker):
+        if not worker.alive or worker.jobs >= self.max_jobs:
+            worker.kill()
+            self.stats["recycled"] += 1
+            worker = None
+        with self._lock:
+            if worker is not None and len(self._idle) < self.size:
+                self._idle.append(worker)
+                worker = None
+            missing = self.size - len(self._idle)
+        if worker is not None:
+            worker.kill()
+        # Keep the pool pre-started; interpreters warm up in the background
+        for _ in range(max(0, missing)):
+            replacement = self._spawn()
+            if replacement is None:
+                break
+            with self._lock:
+                self._idle.append(replacement)
+
+    def run(self, script, timeout=5):
+        if not self.enabled:
+            return None
+        worker = self._acquire()
+        if worker is None:
+            return None
+        self.stats["jobs"] += 1
+        command = [self.language.lower()]
+        try:
+            response = worker.run(script, timeout, default_limits(timeout))
+        except TimeoutError:
+            worker.kill()
+            self.stats["timeouts"] += 1
+            self._release(worker)
+            return subprocess.CompletedProcess(
+                command, 1, stdout=None,
+                stderr=f"Execution timed out after {timeout} seconds. Code may be too slow or have infinite loops.",
+            )
+        except RuntimeError as e:
+            worker.kill()
+            self.stats["crashes"] += 1
+            self._release(worker)
+            print(f"⚠️ {self.language} warm worker crashed: {e}")
+            return subprocess.CompletedProcess(command, 1, stdout=None, stderr=f"Server execution error: {e}")
+        self._release(worker)
+        returncode = response.get("returncode", 1)
+        stderr = response.get("stderr", "")
+        # A forked job child killed by RLIMIT_CPU / RLIMIT_FSIZE exits on a signal with no output
+        reason = describe_signal(returncode) if isinstance(returncode, int) else None
+        if reason:
+            stderr = f"{stderr.rstrip()}\n{reason}".strip()
+        result = subprocess.CompletedProcess(
+            command,
+            returncode,
+            stdout=response.get("stdout", ""),
+            stderr=stderr,
+        )
+        result.cpu_ms = response.get("cpu_ms")
+        result.peak_rss_kb = response.get("peak_rss_kb")
+        return result
+
+    def shutdown(self):
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for worker in idle:
+            worker.kill()
+
+
+def _memory_limit_bytes():
+    return int(getattr(settings, "WARM_WORKER_MEMORY_MB", 512)) * 1024 * 1024
+
+
+def _python_worker_command():
+    return [toolchains.command("python"), "-u", "-c", PYTHON_WORKER_SOURCE, str(_memory_limit_bytes())]
+
+
+def _node_worker_command():
+    # V8 reserves far more address space than it uses, so cap the heap instead of RLIMIT_AS
+    heap_mb = int(getattr(settings, "WARM_WORKER_MEMORY_MB", 512))
+    return [toolchains.command("node"), f"--max-old-space-size={heap_mb}", "-e", NODE_WORKER_SOURCE]
+
+
+# Global instances for easy access
+python_workers = WarmWorkerPool("PYTHON", _python_worker_command)
+# One job per Node process: a job could otherwise patch built-in modules for the next
+node_workers = WarmWorkerPool("NODE", _node_worker_command, max_jobs=1)
+
+
+@atexit.register
+def _shutdown_workers():
+    python_workers.shutdown()
+    node_workers.shutdown()
@@ -0,0 +1,23 @@
+# Generated by Django 5.1.6 on 2026-10-18 09:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0005_alter_job_coding_language'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='job',
+            name='embedding',
+            field=models.BinaryField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='job',
+            name='embedding_source_hash',
+            field=models.CharField(blank=True, editable=False, max_length=64),
+        ),
+    ]
@@ -79,6 +79,10 @@ class Job(models.Model):
     jd_file = models.FileField(upload_to="job_descriptions/", null=True, blank=True)
     jd_link = models.URLField(null=True, blank=True)
 
+    # float16 sentence embedding of job_description (see utils.semantic_matcher)
+    embedding = models.BinaryField(null=True, blank=True, editable=False)
+    embedding_source_hash = models.CharField(max_length=64, blank=True, editable=False)
+
     created_at = models.DateTimeField(auto_now_add=True)
 
     def __str__(self):
@@ -1028,18 +1028,21 @@ This is an automated message. Please do not reply to this email.
             logger.error(f"Failed to send bulk upload notification: {e}")
 
     @staticmethod
-    def send_bulk_candidate_creation_notification(user, successful_count, domain, role):
-        """Send notification for bulk candidate creation completion"""
+    def send_bulk_candidate_creation_notification(user, successful_count, domain, role, failed_count=0):
+        """Send one aggregated notification for a bulk candidate creation batch"""
         try:
             message = f"Bulk candidate creation completed: {successful_count} candidates created for {domain}/{role}"
+            if failed_count > 0:
+                message += f", {failed_count} failed"
 
             NotificationService.create_notification(
-                user=user,
-                notification_type="BULK_CANDIDATE_CREATION_COMPLETED",
+                recipient=user,
+                notification_type=NotificationType.CANDIDATE_ADDED,
                 title="Bulk Candidate Creation Completed",
                 message=message,
-                details={
+                metadata={
                     "successful_count": successful_count,
+                    "failed_count": failed_count,
                     "domain": domain,
                     "role": role,
                 },
@@ -0,0 +1,115 @@
+"""
+Django management command to benchmark resume text preprocessing.
+Usage: python manage.py benchmark_resume_matcher [--files a.pdf b.pdf] [--repeat 20]
+
+Reports the cold import time of ``resumes.utils`` / ``utils.resume_job_matcher``
+(measured in a fresh interpreter) and the per-document preprocessing time of
+the resume matcher, first call vs. warm lemmatization cache.
+"""
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+IMPORT_PROBE = """
+import os, time
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "interview_app.settings")
+import django
+django.setup()
+start = time.perf_counter()
+import {module}
+print("IMPORT_SECONDS=%f" % (time.perf_counter() - start))
+"""
+
+
+class Command(BaseCommand):
+    help = 'Benchmark resumes.utils import time and resume preprocessing time'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--files',
+            nargs='*',
+            default=None,
+            help='Resume PDF/DOCX files to preprocess (default: Resume_template/*.pdf)',
+        )
+        parser.add_argument(
+            '--repeat',
+            type=int,
+            default=20,
+            help='Warm-cache iterations per document (default: 20)',
+        )
+
+    def handle(self, *args, **options):
+        for module in ('utils.resume_job_matcher', 'resumes.utils'):
+            seconds = self._cold_import_seconds(module)
+            if seconds is None:
+                self.stdout.write(self.style.WARNING(f'import {module}: failed'))
+            else:
+                self.stdout.write(f'import {module}: {seconds * 1000:.1f} ms (cold interpreter)')
+
+        from resumes.models import extract_text
+        from utils.resume_job_matcher import get_resume_matcher, lemmatize_token
+
+        files = options['files']
+        if files is None:
+            files = sorted(str(p) for p in Path(settings.BASE_DIR, 'Resume_template').glob('*.pdf'))
+        documents = []
+        for path in files:
+            try:
+                text = extract_text(path)
+            except Exception as e:
+                self.stdout.write(self.style.WARNING(f'skip {path}: {e}'))
+                continue
+            if text:
+                documents.append((os.path.basename(path), text))
+
+        if not documents:
+            self.stdout.write(self.style.WARNING('No documents to preprocess'))
+            return
+
+        start = time.perf_counter()
+        matcher = get_resume_matcher()
+        self.stdout.write(f'matcher construction: {(time.perf_counter() - start) * 1000:.2f} ms')
+
+        lemmatize_token.cache_clear()
+        cold_times = []
+        warm_times = []
+        for name, text in documents:
+            start = time.perf_counter()
+            matcher.preprocess_text(text)
+            cold_times.append(time.perf_counter() - start)
+
+            runs = []
+            for _ in range(max(1, options['repeat'])):
+                start = time.perf_counter()
+                matcher.preprocess_text(text)
+                runs.append(time.perf_counter() - start)
+            warm_times.append(statistics.median(runs))
+            self.stdout.write(
+                f'{name}: {len(text.split())} tokens, first {cold_times[-1] * 1000:.2f} ms, '
+                f'warm median {warm_times[-1] * 1000:.2f} ms'
+            )
+
+        info = lemmatize_token.cache_info()
+        self.stdout.write(self.style.SUCCESS(
+            f'{len(documents)} documents: first-pass mean {statistics.mean(cold_times) * 1000:.2f} ms, '
+            f'warm mean {statistics.mean(warm_times) * 1000:.2f} ms/doc; '
+            f'lemma cache {info.currsize}/{info.maxsize} entries, {info.hits} hits, {info.misses} misses'
+        ))
+
+    def _cold_import_seconds(self, module):
+        result = subprocess.run(
+            [sys.executable, '-c', IMPORT_PROBE.format(module=module)],
+            cwd=str(settings.BASE_DIR),
+            capture_output=True,
+            text=True,
+        )
+        for line in result.stdout.splitlines():
+            if line.startswith('IMPORT_SECONDS='):
+                return float(line.split('=', 1)[1])
+        return None
@@ -4,7 +4,7 @@ from pathlib import Path
 
 import fitz  # PyMuPDF  ➜  pip install pymupdf
 import docx  # python-docx ➜ pip install python-docx
-from django.db import models
+from django.db import models, transaction
 from django.conf import settings
 
 # ---------------------------------------------------------------------------
@@ -84,9 +84,26 @@ class Resume(models.Model):
     parsed_text = models.TextField(blank=True)
     uploaded_at = models.DateTimeField(auto_now_add=True)
 
+    # float16 sentence embedding of parsed_text (see utils.semantic_matcher)
+    embedding = models.BinaryField(null=True, blank=True, editable=False)
+    embedding_source_hash = models.CharField(max_length=64, blank=True, editable=False)
+
     def save(self, *args, **kwargs):
-        # ➊ save file to disk first
-        super().save(*args, **kwargs)
+        from file_management.blob_store import attach_blob, release_blob_for_name, set_cached_text
+        from file_management.models import StoredBlob
+
+        # ➊ store new uploads content-addressed; identical files share one blob
+        previous_file = None
+        if self.file and not self.file._committed and not self._state.adding:
+            previous_file = Resume.objects.filter(pk=self.pk).values_list("file", flat=True).first()
+        with transaction.atomic():
+            blob = attach_blob(self.file, StoredBlob.Kind.RESUME)
+            if blob is not None and blob.extracted_text and not self.parsed_text:
+                # duplicate upload - reuse the text extracted the first time
+                self.parsed_text = blob.extracted_text
+            super().save(*args, **kwargs)
+        if previous_file and previous_file != self.file.name:
+            release_blob_for_name(previous_file)
 
         # ➋ now that the file exists, populate parsed_text once
         if not self.parsed_text and self.file:
@@ -95,6 +112,7 @@ class Resume(models.Model):
                 if hasattr(self.file, "path") and self.file.path:
                     self.parsed_text = extract_text(self.file.path)
                     super().save(update_fields=["parsed_text"])
+                    set_cached_text(blob, self.parsed_text)
                 else:
                     # If file is not yet saved to disk, skip parsing for now
                     # It will be parsed when the file is actually saved
@@ -105,5 +123,12 @@ class Resume(models.Model):
                 self.parsed_text = ""
                 super().save(update_fields=["parsed_text"])
 
+    @property
+    def blob(self):
+        """Content-addressed blob backing this resume's file (None for legacy uploads)"""
+        from file_management.blob_store import blob_for_name
+
+        return blob_for_name(self.file.name if self.file else None)
+
     def __str__(self):
         return f"Resume {self.id}"
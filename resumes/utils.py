@@ -1,5 +1,6 @@
 import re
 from utils.gemini_resume_matcher import gemini_resume_matcher
+from file_management.blob_store import get_cached_analysis, set_cached_analysis
 
 # Email and phone regex patterns
 EMAIL_RE = re.compile(r"[\w\.-]+@[\w\.-]+\.\w+")
@@ -11,7 +12,7 @@ NAME_TCASE = re.compile(r"\b([A-Z][a-z]+(?:\s+[A-Z][a-z]+){1,3})\b")
 NAME_ALLCAP = re.compile(r"\b([A-Z]{3,}(?:\s+[A-Z]{3,})+)\b")
 
 
-def extract_resume_fields(text: str, job_description: str = None) -> dict:
+def extract_resume_fields(text: str, job_description: str = None, deep_analysis: bool = True, blob=None) -> dict:
     """
     Extract structured fields (name, email, phone, experience, domain, job_role) from resume text.
     Uses Gemini AI for comprehensive extraction when available.
@@ -19,6 +20,10 @@ def extract_resume_fields(text: str, job_description: str = None) -> dict:
     Args:
         text (str): The parsed text from resume
         job_description (str): Optional job description for better context
+        deep_analysis (bool): Set to False to skip Gemini and use regex extraction
+            only (e.g. resumes rejected by the semantic pre-filter)
+        blob (StoredBlob): Optional content-addressed file the text came from;
+            Gemini results are cached on it per job description
 
     Returns:
         dict: Dictionary containing extracted fields
@@ -48,39 +53,48 @@ def extract_resume_fields(text: str, job_description: str = None) -> dict:
     domain = None
     job_role = None
     
-    try:
-        # Use the comprehensive method which also extracts name, email, phone etc.
-        analysis = gemini_resume_matcher.extract_resume_comprehensive(text, job_description)
-        if analysis and 'extracted_info' in analysis:
-            info = analysis['extracted_info']
-            name = info.get('full_name', name)
-            email = info.get('email', email_m.group(0) if email_m else None)
-            phone = info.get('phone', phone_m.group(0).strip() if phone_m else None)
-            experience_years = info.get('total_experience_years')
-            domain = info.get('domain')
-            job_role = info.get('job_role')
+    if deep_analysis and blob is not None:
+        cached = get_cached_analysis(blob, job_description)
+        if cached:
+            print(f"♻️ Reusing cached resume analysis for blob {blob.sha256[:12]}")
+            return dict(cached)
+
+    if deep_analysis:
+        try:
+            # Use the comprehensive method which also extracts name, email, phone etc.
+            analysis = gemini_resume_matcher.extract_resume_comprehensive(text, job_description)
+            if analysis and 'extracted_info' in analysis:
+                info = analysis['extracted_info']
+                name = info.get('full_name') or name
+                email = info.get('email') or (email_m.group(0) if email_m else None)
+                phone = info.get('phone') or (phone_m.group(0).strip() if phone_m else None)
+                experience_years = info.get('total_experience_years')
+                domain = info.get('domain')
+                job_role = info.get('job_role')
             
-            print(f"✅ Gemini comprehensive extraction successful for {name}")
+                print(f"✅ Gemini comprehensive extraction successful for {name}")
             
-            # If we also have match scores, we can include them
-            match_scores = analysis.get('match_scores', {})
+                # If we also have match scores, we can include them
+                match_scores = analysis.get('match_scores', {})
             
-            return {
-                "name": name,
-                "email": email,
-                "phone": phone,
-                "work_experience": experience_years,
-                "domain": domain,
-                "job_role": job_role,
-                "match_percentage": match_scores.get('overall_match', 0),
-                "skill_match": match_scores.get('skill_match', 0),
-                "experience_match": match_scores.get('experience_match', 0),
-                "education_match": match_scores.get('education_match', 0),
-                "relevance_score": match_scores.get('relevance_score', 0),
-                "resume_analysis": analysis
-            }
-    except Exception as e:
-        print(f"⚠️ Gemini comprehensive extraction failed: {e}")
+                result = {
+                    "name": name,
+                    "email": email,
+                    "phone": phone,
+                    "work_experience": experience_years,
+                    "domain": domain,
+                    "job_role": job_role,
+                    "match_percentage": match_scores.get('overall_match', 0),
+                    "skill_match": match_scores.get('skill_match', 0),
+                    "experience_match": match_scores.get('experience_match', 0),
+                    "education_match": match_scores.get('education_match', 0),
+                    "relevance_score": match_scores.get('relevance_score', 0),
+                    "resume_analysis": analysis
+                }
+                set_cached_analysis(blob, job_description, result)
+                return result
+        except Exception as e:
+            print(f"⚠️ Gemini comprehensive extraction failed: {e}")
 
     # Fallback if Gemini fails
     if experience_years is None and exp_m:
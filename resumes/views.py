@@ -52,17 +52,18 @@ class ResumeViewSet(DataIsolationMixin, ModelViewSet):
                     from .utils import extract_resume_fields, calculate_resume_job_match, analyze_resume_comprehensive
                     from .models import extract_text
 
-                    # Extract text from file
-                    parsed_text = extract_text(resume.file.path)
+                    # Text is extracted on save (or reused from an identical upload)
+                    parsed_text = resume.parsed_text or extract_text(resume.file.path)
                     if parsed_text:
-                        resume.parsed_text = parsed_text
-                        resume.save(update_fields=["parsed_text"])
+                        if parsed_text != resume.parsed_text:
+                            resume.parsed_text = parsed_text
+                            resume.save(update_fields=["parsed_text"])
 
                         # Extract data from parsed text
                         extracted_data = {}
                         if resume.parsed_text:
                             # Extract basic fields (name, email, phone, experience)
-                            extracted_data = extract_resume_fields(resume.parsed_text)
+                            extracted_data = extract_resume_fields(resume.parsed_text, blob=resume.blob)
 
                             # Log successful text extraction
                             ActionLogger.log_user_action(
@@ -268,7 +269,7 @@ class BulkResumeUploadView(APIView):
             if resume.parsed_text:
                 from .utils import extract_resume_fields
 
-                extracted_data = extract_resume_fields(resume.parsed_text)
+                extracted_data = extract_resume_fields(resume.parsed_text, blob=resume.blob)
 
                 # Log successful text extraction
                 ActionLogger.log_user_action(
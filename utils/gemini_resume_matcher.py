@@ -1,8 +1,88 @@
 import re
 import json
+import hashlib
 from typing import Dict, List, Tuple, Optional
 import google.generativeai as genai
 from django.conf import settings
+from django.core.cache import cache
+
+# Resume profiles (identity + skills) do not depend on the job, so they are
+# cached per resume hash; match scores are cached per (resume, job) pair.
+PROFILE_CACHE_PREFIX = "resume_profile"
+MATCH_CACHE_PREFIX = "resume_match"
+
+MATCH_SCORES_SCHEMA = {
+    "type": "OBJECT",
+    "properties": {
+        "skill_match": {"type": "NUMBER"},
+        "experience_match": {"type": "NUMBER"},
+        "education_match": {"type": "NUMBER"},
+        "relevance_score": {"type": "NUMBER"},
+        "overall_match": {"type": "NUMBER"},
+    },
+    "required": ["skill_match", "experience_match", "education_match", "relevance_score", "overall_match"],
+}
+
+_STRING_LIST = {"type": "ARRAY", "items": {"type": "STRING"}}
+
+EXTRACTED_INFO_SCHEMA = {
+    "type": "OBJECT",
+    "properties": {
+        "full_name": {"type": "STRING"},
+        "email": {"type": "STRING"},
+        "phone": {"type": "STRING"},
+        "total_experience_years": {"type": "NUMBER"},
+        "current_role": {"type": "STRING"},
+        "key_skills": _STRING_LIST,
+        "education": _STRING_LIST,
+        "certifications": _STRING_LIST,
+        "domain": {"type": "STRING"},
+        "job_role": {"type": "STRING"},
+    },
+    "required": ["full_name", "email", "total_experience_years", "key_skills"],
+}
+
+ANALYSIS_SCHEMA = {
+    "type": "OBJECT",
+    "properties": {
+        "career_level": {"type": "STRING", "enum": ["Junior", "Mid", "Senior", "Lead", "Manager"]},
+        "industry_focus": {"type": "STRING"},
+        "strengths": _STRING_LIST,
+        "areas_for_improvement": _STRING_LIST,
+    },
+}
+
+COMPREHENSIVE_SCHEMA = {
+    "type": "OBJECT",
+    "properties": {
+        "extracted_info": EXTRACTED_INFO_SCHEMA,
+        "analysis": ANALYSIS_SCHEMA,
+        "match_scores": MATCH_SCORES_SCHEMA,
+    },
+    "required": ["extracted_info", "analysis", "match_scores"],
+}
+
+EMPTY_MATCH_SCORES = {
+    "overall_match": 0.0,
+    "skill_match": 0.0,
+    "experience_match": 0.0,
+    "education_match": 0.0,
+    "relevance_score": 0.0,
+}
+
+
+def _text_hash(text: str) -> str:
+    return hashlib.sha256((text or "").encode("utf-8", errors="ignore")).hexdigest()
+
+
+def _normalize_scores(scores: Dict) -> Dict[str, float]:
+    normalized = {}
+    for key in EMPTY_MATCH_SCORES:
+        try:
+            normalized[key] = float(scores.get(key, 0) or 0)
+        except (TypeError, ValueError):
+            normalized[key] = 0.0
+    return normalized
 
 
 class GeminiResumeMatcher:
@@ -20,6 +100,91 @@ class GeminiResumeMatcher:
         else:
             print("❌ GEMINI_API_KEY not configured")
             self.model = None
+        self.cache_timeout = getattr(settings, "RESUME_ANALYSIS_CACHE_TIMEOUT", 60 * 60 * 24 * 30)
+
+    def _generate_json(self, prompt: str, schema: Dict) -> Optional[Dict]:
+        """
+        Call Gemini with schema-constrained JSON output and parse the streamed
+        reply incrementally, stopping at the first complete JSON object.
+        Returns None if the model produced nothing parseable.
+        """
+        response = self.model.generate_content(
+            prompt,
+            generation_config=genai.GenerationConfig(
+                response_mime_type="application/json",
+                response_schema=schema,
+                temperature=0,
+            ),
+            stream=True,
+        )
+        decoder = json.JSONDecoder()
+        buffer = ""
+        for chunk in response:
+            try:
+                buffer += chunk.text or ""
+            except ValueError:
+                continue  # chunk without text parts (e.g. safety metadata)
+            stripped = buffer.lstrip()
+            if not stripped.endswith("}"):
+                continue
+            try:
+                result, _ = decoder.raw_decode(stripped)
+                return result
+            except json.JSONDecodeError:
+                continue
+        try:
+            return json.loads(buffer)
+        except json.JSONDecodeError:
+            return None
+
+    def get_cached_profile(self, resume_text: str) -> Optional[Dict]:
+        """Job-independent extraction (extracted_info + analysis) for this resume, if known"""
+        return cache.get(f"{PROFILE_CACHE_PREFIX}:{_text_hash(resume_text)}")
+
+    def _cache_profile(self, resume_text: str, profile: Dict) -> None:
+        cache.set(f"{PROFILE_CACHE_PREFIX}:{_text_hash(resume_text)}", profile, self.cache_timeout)
+
+    def _match_cache_key(self, resume_text: str, job_description: str) -> str:
+        return f"{MATCH_CACHE_PREFIX}:{_text_hash(resume_text)}:{_text_hash(job_description)}"
+
+    @staticmethod
+    def _skills_summary(profile: Dict) -> str:
+        """Compact candidate summary sent instead of the full resume for re-matching"""
+        info = profile.get("extracted_info", {})
+        analysis = profile.get("analysis", {})
+        lines = [
+            f"Current role: {info.get('current_role') or 'Unknown'}",
+            f"Total experience (years): {info.get('total_experience_years') or 0}",
+            f"Career level: {analysis.get('career_level') or 'Unknown'}",
+            f"Domain: {info.get('domain') or 'Unknown'}",
+            f"Key skills: {', '.join(info.get('key_skills') or [])}",
+            f"Education: {'; '.join(info.get('education') or [])}",
+            f"Certifications: {'; '.join(info.get('certifications') or [])}",
+            f"Strengths: {'; '.join(analysis.get('strengths') or [])}",
+        ]
+        return "\n".join(lines)
+
+    def match_profile_to_job(self, profile: Dict, job_description: str) -> Optional[Dict[str, float]]:
+        """
+        Score an already-extracted resume profile against a job using only the
+        skills summary (a few hundred tokens instead of the full resume).
+        """
+        prompt = f"""
+        Score how well this candidate matches the job description.
+
+        JOB DESCRIPTION:
+        {job_description}
+
+        CANDIDATE SUMMARY:
+        {self._skills_summary(profile)}
+
+        Scores are 0-100. overall_match is the weighted average:
+        skill_match 40%, experience_match 30%, education_match 15%, relevance_score 15%.
+        """
+        scores = self._generate_json(prompt, MATCH_SCORES_SCHEMA)
+        if not scores:
+            return None
+        return _normalize_scores(scores)
 
     def extract_experience_from_resume(self, resume_text: str) -> Optional[int]:
         """
@@ -127,15 +292,6 @@ class GeminiResumeMatcher:
         - Education Match: 15%
         - Relevance Score: 15%
         
-        Respond in JSON format only:
-        {{
-            "skill_match": <score>,
-            "experience_match": <score>,
-            "education_match": <score>,
-            "relevance_score": <score>,
-            "overall_match": <score>
-        }}
-        
         Consider:
         - Direct skill matches are more valuable than related skills
         - Recent experience is more valuable than old experience
@@ -144,20 +300,21 @@ class GeminiResumeMatcher:
         """
 
         try:
-            response = self.model.generate_content(prompt)
-            if response and response.text:
-                # Try to extract JSON from response
-                json_match = re.search(r'\{.*\}', response.text.strip(), re.DOTALL)
-                if json_match:
-                    scores = json.loads(json_match.group())
-                    # Ensure all required keys exist and are valid numbers
-                    return {
-                        "overall_match": float(scores.get("overall_match", 0)),
-                        "skill_match": float(scores.get("skill_match", 0)),
-                        "experience_match": float(scores.get("experience_match", 0)),
-                        "education_match": float(scores.get("education_match", 0)),
-                        "relevance_score": float(scores.get("relevance_score", 0))
-                    }
+            cache_key = self._match_cache_key(resume_text, job_description)
+            cached = cache.get(cache_key)
+            if cached:
+                return cached
+
+            profile = self.get_cached_profile(resume_text)
+            if profile:
+                # Known resume: send only the skills summary
+                scores = self.match_profile_to_job(profile, job_description)
+            else:
+                scores = self._generate_json(prompt, MATCH_SCORES_SCHEMA)
+                scores = _normalize_scores(scores) if scores else None
+            if scores:
+                cache.set(cache_key, scores, self.cache_timeout)
+                return scores
             
             # Fallback if JSON parsing fails - use simple keyword matching
             return self._fallback_match_calculation(resume_text, job_description)
@@ -171,6 +328,10 @@ class GeminiResumeMatcher:
         """
         Comprehensive resume analysis using Gemini AI
         
+        The job-independent part (extracted_info + analysis) is cached per
+        resume hash. Re-matching a known resume against a new job only sends
+        the skills summary, not the full resume text.
+        
         Args:
             resume_text: Full resume text
             job_description: Optional job description for context
@@ -181,69 +342,56 @@ class GeminiResumeMatcher:
         if not self.model or not resume_text:
             return {}
 
-        job_context = f"\n\nJOB CONTEXT:\n{job_description}" if job_description else ""
-        
-        prompt = f"""
-        Perform a comprehensive analysis of the following resume{job_context}.
-        
-        RESUME TEXT:
-        {resume_text}
-        
-        Provide analysis in the following JSON format:
-        {{
-            "extracted_info": {{
-                "full_name": "<candidate's full name>",
-                "email": "<email address>",
-                "phone": "<phone number>",
-                "total_experience_years": <integer>,
-                "current_role": "<current/most recent role>",
-                "key_skills": ["<skill1>", "<skill2>", "..."],
-                "education": ["<education1>", "<education2>", "..."],
-                "certifications": ["<cert1>", "<cert2>", "..."],
-                "domain": "<primary professional domain, e.g. Software Development, HR, Marketing>",
-                "job_role": "<the target or current job role most suitable for this candidate>"
-            }},
-            "analysis": {{
-                "career_level": "<Junior|Mid|Senior|Lead|Manager>",
-                "industry_focus": "<primary industry/domain>",
-                "strengths": ["<strength1>", "<strength2>", "..."],
-                "areas_for_improvement": ["<area1>", "<area2>", "..."]
-            }},
-            "match_scores": {{
-                "overall_match": <0-100 float>,
-                "skill_match": <0-100 float>,
-                "experience_match": <0-100 float>,
-                "education_match": <0-100 float>,
-                "relevance_score": <0-100 float>
-            }}
-        }}
-        
-        Instructions:
-        1. Extract all available information accurately.
-        2. If JOB CONTEXT is provided, calculate match_scores comparing the resume to the JD.
-        3. If no JOB CONTEXT is provided, set all match_scores to 0.
-        4. Infer domain and job_role from the candidate's history and current JD if provided.
-        5. Respond with valid JSON only.
-        """
-
         try:
-            response = self.model.generate_content(prompt)
-            if response and response.text:
-                # Try to extract JSON from response
-                json_match = re.search(r'\{.*\}', response.text.strip(), re.DOTALL)
-                if json_match:
-                    analysis = json.loads(json_match.group())
-                    print(f"✅ Gemini comprehensive extraction completed")
-                    # Ensure match_scores exists if not provided by AI
-                    if 'match_scores' not in analysis:
-                        analysis['match_scores'] = {
-                            "overall_match": 0.0, "skill_match": 0.0, 
-                            "experience_match": 0.0, "education_match": 0.0, 
-                            "relevance_score": 0.0
-                        }
-                    return analysis
+            profile = self.get_cached_profile(resume_text)
+            if profile:
+                analysis = dict(profile)
+                if job_description:
+                    analysis["match_scores"] = self.calculate_match_percentage(resume_text, job_description)
+                else:
+                    analysis["match_scores"] = dict(EMPTY_MATCH_SCORES)
+                print(f"✅ Gemini comprehensive extraction served from cached resume profile")
+                return analysis
+
+            job_context = f"\n\nJOB CONTEXT:\n{job_description}" if job_description else ""
             
-            return {}
+            prompt = f"""
+            Perform a comprehensive analysis of the following resume{job_context}.
+            
+            RESUME TEXT:
+            {resume_text}
+            
+            Instructions:
+            1. extracted_info: full name, email, phone, total years of experience, current/most recent role,
+               key skills, education, certifications, primary professional domain
+               (e.g. Software Development, HR, Marketing) and the most suitable job role.
+            2. analysis: career level (Junior|Mid|Senior|Lead|Manager), industry focus, strengths and areas for improvement.
+            3. If JOB CONTEXT is provided, match_scores compare the resume to the JD (0-100 each;
+               overall_match weights skills 40%, experience 30%, education 15%, relevance 15%).
+            4. If no JOB CONTEXT is provided, set all match_scores to 0.
+            5. Use empty strings / empty lists for anything not present in the resume.
+            """
+
+            analysis = self._generate_json(prompt, COMPREHENSIVE_SCHEMA)
+            if not analysis or "extracted_info" not in analysis:
+                return {}
+
+            analysis["match_scores"] = (
+                _normalize_scores(analysis.get("match_scores") or {})
+                if job_description else dict(EMPTY_MATCH_SCORES)
+            )
+            self._cache_profile(resume_text, {
+                "extracted_info": analysis.get("extracted_info", {}),
+                "analysis": analysis.get("analysis", {}),
+            })
+            if job_description:
+                cache.set(
+                    self._match_cache_key(resume_text, job_description),
+                    analysis["match_scores"],
+                    self.cache_timeout,
+                )
+            print(f"✅ Gemini comprehensive extraction completed")
+            return analysis
             
         except Exception as e:
             print(f"❌ Error in comprehensive resume analysis: {e}")
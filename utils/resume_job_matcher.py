@@ -1,69 +1,75 @@
 import re
+import threading
 from difflib import SequenceMatcher
-from typing import Dict, List, Tuple
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
 import string
 
+from utils.stopwords import ENGLISH_STOPWORDS
+
+# Bounded per-token lemmatization cache; resume vocabularies are small and
+# highly repetitive, so this keeps WordNet lookups off the hot path.
+LEMMA_CACHE_SIZE = 50000
+
+_PUNCTUATION_TABLE = str.maketrans("", "", string.punctuation)
+
 # Lazy import NLTK to avoid blocking during module import
 _nltk_loaded = False
 _nltk_modules = {}
+_nltk_lock = threading.Lock()
 
 def _ensure_nltk_loaded():
-    """Lazy load NLTK modules only when needed (not at import time)"""
+    """
+    Lazy load NLTK modules only when needed (not at import time).
+
+    Never downloads anything: if the WordNet corpus is not already installed
+    (e.g. baked into the image with ``python -m nltk.downloader wordnet``)
+    lemmatization is simply disabled.
+    """
     global _nltk_loaded, _nltk_modules
     if _nltk_loaded:
         return _nltk_modules
     
-    try:
-        import nltk
-        from nltk.corpus import stopwords
-        from nltk.stem import WordNetLemmatizer
-        
-        # Download required NLTK data only when first needed (not at import time)
-        # This prevents worker timeouts during request handling
-        try:
-            nltk.data.find("tokenizers/punkt")
-        except LookupError:
-            print("📥 Downloading NLTK punkt data (first use only)...")
-            nltk.download("punkt", quiet=True)
-        
-        try:
-            nltk.data.find("corpora/stopwords")
-        except LookupError:
-            print("📥 Downloading NLTK stopwords data (first use only)...")
-            nltk.download("stopwords", quiet=True)
-        
+    with _nltk_lock:
+        if _nltk_loaded:
+            return _nltk_modules
         try:
+            import nltk
+            from nltk.stem import WordNetLemmatizer
+            
             nltk.data.find("corpora/wordnet")
+            lemmatizer = WordNetLemmatizer()
+            lemmatizer.lemmatize("warmup")  # force the corpus to load once, here
+            _nltk_modules['lemmatizer'] = lemmatizer
+            print("✅ NLTK WordNet lemmatizer loaded")
         except LookupError:
-            print("📥 Downloading NLTK wordnet data (first use only)...")
-            nltk.download("wordnet", quiet=True)
-        
-        _nltk_modules['stopwords'] = stopwords
-        _nltk_modules['WordNetLemmatizer'] = WordNetLemmatizer
+            print("⚠️ NLTK wordnet corpus not installed - lemmatization disabled")
+            _nltk_modules = {}
+        except Exception as e:
+            print(f"⚠️ Warning: NLTK not available: {e}")
+            _nltk_modules = {}
         _nltk_loaded = True
-        print("✅ NLTK modules loaded successfully")
-    except Exception as e:
-        print(f"⚠️ Warning: NLTK not available: {e}")
-        _nltk_modules = {}
     
     return _nltk_modules
 
 
+@lru_cache(maxsize=LEMMA_CACHE_SIZE)
+def lemmatize_token(token: str) -> str:
+    """Memoized WordNet lemmatization of a single lowercase token."""
+    lemmatizer = _ensure_nltk_loaded().get('lemmatizer')
+    if lemmatizer is None:
+        return token  # Fallback if NLTK not available
+    return lemmatizer.lemmatize(token)
+
+
 class ResumeJobMatcher:
     """
     Utility class for matching resume content with job descriptions
     """
 
     def __init__(self):
-        # Lazy load NLTK modules only when needed
-        nltk_modules = _ensure_nltk_loaded()
-        if nltk_modules:
-            self.stop_words = set(nltk_modules['stopwords'].words("english"))
-            self.lemmatizer = nltk_modules['WordNetLemmatizer']()
-        else:
-            # Fallback: use empty set if NLTK not available
-            self.stop_words = set()
-            self.lemmatizer = None
+        # Vendored list - no NLTK corpus needed; the lemmatizer loads on first use
+        self.stop_words = ENGLISH_STOPWORDS
 
         # Common technical skills and keywords
         self.technical_keywords = {
@@ -163,20 +169,18 @@ class ResumeJobMatcher:
         text = text.lower()
 
         # Remove punctuation
-        text = text.translate(str.maketrans("", "", string.punctuation))
+        text = text.translate(_PUNCTUATION_TABLE)
 
         # Simple tokenization without NLTK to avoid punkt_tab error
         tokens = text.split()
 
         # Remove stop words and lemmatize
-        processed_tokens = []
-        for token in tokens:
-            if token not in self.stop_words and len(token) > 2:
-                if self.lemmatizer:
-                    lemmatized = self.lemmatizer.lemmatize(token)
-                else:
-                    lemmatized = token  # Fallback if NLTK not available
-                processed_tokens.append(lemmatized)
+        stop_words = self.stop_words
+        processed_tokens = [
+            lemmatize_token(token)
+            for token in tokens
+            if len(token) > 2 and token not in stop_words
+        ]
 
         return " ".join(processed_tokens)
 
@@ -588,5 +592,22 @@ class ResumeJobMatcher:
         }
 
 
-# Global instance for easy access
-resume_matcher = ResumeJobMatcher()
+_resume_matcher: Optional[ResumeJobMatcher] = None
+_resume_matcher_lock = threading.Lock()
+
+
+def get_resume_matcher() -> ResumeJobMatcher:
+    """Return the shared matcher, building it on first use rather than at import."""
+    global _resume_matcher
+    if _resume_matcher is None:
+        with _resume_matcher_lock:
+            if _resume_matcher is None:
+                _resume_matcher = ResumeJobMatcher()
+    return _resume_matcher
+
+
+def __getattr__(name):
+    # Keep ``from utils.resume_job_matcher import resume_matcher`` working lazily
+    if name == "resume_matcher":
+        return get_resume_matcher()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
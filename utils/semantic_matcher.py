@@ -0,0 +1,267 @@
+"""
+Local embedding-based semantic matcher used as a cheap pre-filter before
+Gemini resume scoring.
+
+Resumes and job descriptions are embedded once with the CPU-only
+``all-MiniLM-L6-v2`` SentenceTransformer (the same model RAGSystem uses) and
+stored as L2-normalised float16 vectors. Scoring a whole batch of resumes
+against a job is a single NumPy matmul; only candidates above the configured
+threshold are sent to Gemini for deep analysis.
+"""
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional, Sequence
+
+import numpy as np
+from django.conf import settings
+
+# Optional dependency - the matcher degrades to "pass everything through"
+try:
+    from sentence_transformers import SentenceTransformer  # type: ignore
+except Exception:  # pragma: no cover - optional at runtime
+    SentenceTransformer = None
+
+
+EMBEDDING_MODEL_NAME = "all-MiniLM-L6-v2"
+EMBEDDING_DIMENSION = 384
+EMBEDDING_DTYPE = np.float16
+
+# MiniLM truncates at 256 word pieces; keep the head of long documents
+MAX_EMBED_CHARS = 4000
+
+
+def text_hash(text: str) -> str:
+    """Stable SHA-256 of the text an embedding was computed from."""
+    return hashlib.sha256((text or "").encode("utf-8", errors="ignore")).hexdigest()
+
+
+def embedding_to_bytes(vector: np.ndarray) -> bytes:
+    return np.asarray(vector, dtype=EMBEDDING_DTYPE).tobytes()
+
+
+def embedding_from_bytes(data) -> Optional[np.ndarray]:
+    if not data:
+        return None
+    vector = np.frombuffer(bytes(data), dtype=EMBEDDING_DTYPE)
+    if vector.shape[0] != EMBEDDING_DIMENSION:
+        return None
+    return vector
+
+
+class SemanticResumeMatcher:
+    """
+    Embed resumes / job descriptions and score them with cosine similarity.
+
+    The model is loaded lazily on first use so importing this module is cheap.
+    Embeddings for texts that are not backed by a model row (e.g. files that
+    are only being previewed in the bulk extract step) are kept in a bounded
+    in-process LRU keyed by text hash.
+    """
+
+    def __init__(self, cache_size: int = 2048):
+        self._model = None
+        self._model_failed = False
+        self._lock = threading.Lock()
+        self._cache: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._cache_size = cache_size
+        # Cumulative pre-filter counters for this process
+        self.totals = {"batches": 0, "hits": 0, "skipped": 0}
+
+    # ------------------------------------------------------------------ config
+    @property
+    def threshold(self) -> float:
+        return float(getattr(settings, "SEMANTIC_MATCH_THRESHOLD", 0.35))
+
+    @property
+    def enabled(self) -> bool:
+        return bool(getattr(settings, "SEMANTIC_PREFILTER_ENABLED", True))
+
+    @property
+    def available(self) -> bool:
+        return self.enabled and self._get_model() is not None
+
+    def _get_model(self):
+        if self._model is not None or self._model_failed:
+            return self._model
+        if SentenceTransformer is None:
+            self._model_failed = True
+            print(
+                "⚠️ Semantic pre-filter disabled: sentence-transformers is not installed "
+                "(see requirements_ai.txt); every resume gets the Gemini analysis"
+            )
+            return None
+        with self._lock:
+            if self._model is None and not self._model_failed:
+                try:
+                    self._model = SentenceTransformer(EMBEDDING_MODEL_NAME, device="cpu")
+                    print(f"✅ Semantic matcher loaded {EMBEDDING_MODEL_NAME}")
+                except Exception as e:
+                    print(f"⚠️ Semantic matcher unavailable: {e}")
+                    self._model_failed = True
+        return self._model
+
+    # --------------------------------------------------------------- embedding
+    def _cache_get(self, key: str) -> Optional[np.ndarray]:
+        with self._lock:
+            vector = self._cache.get(key)
+            if vector is not None:
+                self._cache.move_to_end(key)
+            return vector
+
+    def _cache_put(self, key: str, vector: np.ndarray) -> None:
+        with self._lock:
+            self._cache[key] = vector
+            self._cache.move_to_end(key)
+            while len(self._cache) > self._cache_size:
+                self._cache.popitem(last=False)
+
+    def embed_many(self, texts: Sequence[str]) -> Optional[np.ndarray]:
+        """
+        Return an (N, 384) float16 matrix of normalised embeddings, or None if
+        the embedding model is not available. Cached texts are not re-encoded.
+        """
+        model = self._get_model() if self.enabled else None
+        if model is None:
+            return None
+
+        keys = [text_hash(t) for t in texts]
+        matrix = np.zeros((len(texts), EMBEDDING_DIMENSION), dtype=EMBEDDING_DTYPE)
+        missing = []
+        for i, key in enumerate(keys):
+            cached = self._cache_get(key)
+            if cached is not None:
+                matrix[i] = cached
+            else:
+                missing.append(i)
+
+        if missing:
+            encoded = model.encode(
+                [(texts[i] or "")[:MAX_EMBED_CHARS] for i in missing],
+                batch_size=32,
+                normalize_embeddings=True,
+                convert_to_numpy=True,
+                show_progress_bar=False,
+            ).astype(EMBEDDING_DTYPE)
+            for row, i in zip(encoded, missing):
+                matrix[i] = row
+                self._cache_put(keys[i], row)
+        return matrix
+
+    def embed(self, text: str) -> Optional[np.ndarray]:
+        matrix = self.embed_many([text])
+        return None if matrix is None else matrix[0]
+
+    def embedding_for_instance(self, instance, text: str) -> Optional[np.ndarray]:
+        """
+        Return the stored embedding of a Resume/Job row, computing and saving
+        it when missing or stale (the source text changed).
+        """
+        source_hash = text_hash(text)
+        if instance.embedding_source_hash == source_hash:
+            vector = embedding_from_bytes(instance.embedding)
+            if vector is not None:
+                self._cache_put(source_hash, vector)
+                return vector
+
+        vector = self.embed(text)
+        if vector is None:
+            return None
+        instance.embedding = embedding_to_bytes(vector)
+        instance.embedding_source_hash = source_hash
+        if instance.pk:
+            type(instance).objects.filter(pk=instance.pk).update(
+                embedding=instance.embedding,
+                embedding_source_hash=source_hash,
+            )
+        return vector
+
+    # ----------------------------------------------------------------- scoring
+    @staticmethod
+    def cosine_scores(job_vector: np.ndarray, resume_matrix: np.ndarray) -> np.ndarray:
+        """Cosine similarity of every resume row against the job in one matmul."""
+        if resume_matrix.size == 0:
+            return np.zeros(0, dtype=np.float32)
+        return resume_matrix.astype(np.float32) @ job_vector.astype(np.float32)
+
+    def prefilter(
+        self,
+        resume_texts: Sequence[str],
+        job_description: str,
+        threshold: Optional[float] = None,
+        job=None,
+        resumes: Optional[Sequence] = None,
+    ) -> Dict:
+        """
+        Decide which resumes deserve a Gemini deep analysis.
+
+        ``resumes`` optionally lines up a saved Resume row (or None) with each
+        text; those rows reuse their stored embedding, or get one saved.
+
+        Returns a dict with per-resume ``scores`` (cosine, or None when the
+        model is unavailable), a boolean ``selected`` list and ``stats`` with
+        hit/skip counts. When the model is unavailable or there is no job
+        description every resume is selected, preserving the old behaviour.
+        """
+        count = len(resume_texts)
+        threshold = self.threshold if threshold is None else float(threshold)
+        result = {
+            "scores": [None] * count,
+            "selected": [True] * count,
+            "stats": {
+                "enabled": False,
+                "threshold": threshold,
+                "total": count,
+                "hits": count,
+                "skipped": 0,
+            },
+        }
+        if not count or not job_description:
+            return result
+
+        if job is not None:
+            job_vector = self.embedding_for_instance(job, job_description)
+        else:
+            job_vector = self.embed(job_description)
+        if job_vector is None:
+            return result
+
+        # Stored resume vectors land in the LRU, so embed_many only encodes the rest
+        for resume, text in zip(resumes or [], resume_texts):
+            if resume is not None:
+                self.embedding_for_instance(resume, text)
+        resume_matrix = self.embed_many(resume_texts)
+        if resume_matrix is None:
+            return result
+
+        scores = self.cosine_scores(job_vector, resume_matrix)
+        selected = scores >= threshold
+        hits = int(selected.sum())
+
+        result["scores"] = [round(float(s), 4) for s in scores]
+        result["selected"] = [bool(s) for s in selected]
+        result["stats"].update({
+            "enabled": True,
+            "hits": hits,
+            "skipped": count - hits,
+        })
+        with self._lock:
+            self.totals["batches"] += 1
+            self.totals["hits"] += hits
+            self.totals["skipped"] += count - hits
+        print(
+            f"🔎 Semantic pre-filter: {hits}/{count} resumes above "
+            f"{threshold:.2f}, {count - hits} skipped Gemini analysis"
+        )
+        return result
+
+    @staticmethod
+    def score_to_percentage(score: Optional[float]) -> float:
+        """Map a cosine score onto the 0-100 scale used by match fields."""
+        if score is None:
+            return 0.0
+        return round(max(0.0, min(1.0, float(score))) * 100, 1)
+
+
+# Global instance for easy access
+semantic_matcher = SemanticResumeMatcher()